@@ -18,6 +18,80 @@ class Settings(BaseSettings):
     GOOGLE_CLIENT_ID: str = Field(default="", validation_alias=AliasChoices('GOOGLE_CLIENT_ID', 'VITE_GOOGLE_CLIENT_ID'))
     GEMINI_API_KEY: str = ""
 
+    # Password hashing (bcrypt). Changing the rounds rehashes users on their next login.
+    PASSWORD_HASH_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    PASSWORD_HASH_RETRY_AFTER: int = 2
+
+    # Market Pulse: skip the Gemini call unless sector/mover % moved at least this many points
+    PULSE_MATERIALITY_PP: float = 0.1
+    # ...or unless the market/a sector's 24h news sentiment (-1..1) moved at least this much
+    PULSE_SENTIMENT_MATERIALITY: float = 0.1
+
+    # Company detail cache (seconds)
+    COMPANY_PROFILE_TTL: int = 21600
+    COMPANY_QUOTE_TTL: int = 60
+    CACHE_GENERATION_POLL_SECONDS: int = 5
+
+    # First-paint caches shared by /dashboard, /news and /news/stats (seconds)
+    NEWS_CACHE_TTL: int = 30
+    NEWS_STATS_CACHE_TTL: int = 300
+    # Responses at least this large are gzip/brotli compressed when the client accepts it
+    COMPRESSION_MIN_BYTES: int = 1000
+
+    # News sentiment: hourly buckets kept in db.news_sentiment (days), /news/sentiment cache (seconds)
+    SENTIMENT_RETENTION_DAYS: int = 8
+    SENTIMENT_CACHE_TTL: int = 60
+
+    # Price observations kept in db.price_history
+    PRICE_HISTORY_RETENTION_DAYS: int = 365
+    # Parquet snapshots queried by /analytics/query (rebuilt when older than the max age)
+    ANALYTICS_SNAPSHOT_DIR: str = "snapshots"
+    ANALYTICS_SNAPSHOT_MAX_AGE: int = 3600
+    # Semantic search (/search/semantic): vector index directory, inverted lists probed per query,
+    # and an optional sentence-transformers model (empty = built-in hashing embeddings)
+    SEMANTIC_INDEX_DIR: str = "vectors"
+    SEMANTIC_NPROBE: int = 8
+    EMBEDDING_MODEL: str = ""
+
+    # Price alerts: where triggered alerts go ("outbox" = db.notifications, "log", "memory")
+    ALERT_SINK: str = "outbox"
+    MAX_ALERTS_PER_USER: int = 100
+
+    # Nightly return correlations / betas (/analytics/correlations): trading days of history used,
+    # and the minimum days two tickers must share for a correlation to be reported
+    CORRELATION_LOOKBACK_DAYS: int = 120
+    CORRELATION_MIN_OVERLAP: int = 20
+
+    # Blue/green reseed (POST /companies/admin/seed)
+    RESEED_WORKERS: int = 4
+    # Refuse to swap if fewer than this fraction of the tracked tickers were fetched,
+    # or the rebuilt universe has fewer than this fraction of the live rows
+    RESEED_MIN_RATIO: float = 0.9
+
+    # Background worker (python -m app.worker). Only the lease holder runs the scheduled jobs.
+    SCHEDULER_LEASE_TTL: int = 60
+    # Run the worker loop inside the API process (single-service deployments only)
+    EMBEDDED_WORKER: bool = False
+
+    # /admin endpoints require the `X-Admin-Token` header to match (unset = admin endpoints disabled)
+    ADMIN_TOKEN: str = ""
+
+    # Observability: requests slower than this are logged with their top DB commands
+    SLOW_REQUEST_MS: int = 1000
+    # Port for the worker's own /metrics endpoint (0 = disabled)
+    WORKER_METRICS_PORT: int = 0
+
+    # Upstream (Yahoo Finance / RSS): "live", "record" or "replay" (see services/upstream.py)
+    UPSTREAM_MODE: str = "live"
+    UPSTREAM_FIXTURE_DIR: str = "fixtures/upstream"
+    UPSTREAM_REPLAY_LATENCY_MS: float = 0.0
+    UPSTREAM_REPLAY_JITTER_MS: float = 0.0
+    UPSTREAM_REPLAY_429_RATE: float = 0.0
+    UPSTREAM_REPLAY_TIMEOUT_RATE: float = 0.0
+    UPSTREAM_REPLAY_SEED: int = 0
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 settings = Settings()
\ No newline at end of file
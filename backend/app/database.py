@@ -1,9 +1,20 @@
 from pymongo import MongoClient
 from .config import settings
+from .utils.request_metrics import mongo_listener
 
 import certifi
 
-client = MongoClient(settings.MONGODB_URI, tls=True, tlsCAFile=certifi.where(), tlsAllowInvalidCertificates=True)
+if settings.MONGODB_URI.startswith("mongomock://"):
+    # In-process Mongo stand-in for local tests/benchmarks (pip install mongomock)
+    import mongomock
+    from .utils import mongomock_compat
+    mongomock_compat.install()  # bulk_write, see utils/mongomock_compat.py
+    client = mongomock.MongoClient()
+else:
+    client = MongoClient(
+        settings.MONGODB_URI, tls=True, tlsCAFile=certifi.where(), tlsAllowInvalidCertificates=True,
+        event_listeners=[mongo_listener],  # per-route DB timings for /metrics
+    )
 db = client["PAKIndustryDB"]
 
 try:
@@ -11,4 +22,4 @@ try:
     print("Successfully connected to MongoDB!")
 except Exception as e:
     print(f"Error connecting to MongoDB: {e}")
-    print("Please check your MONGODB_URI in .env file.")
\ No newline at end of file
+    print("Please check your MONGODB_URI in .env file.")
@@ -1,34 +1,29 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .routes import auth_routes, company_routes, industry_routes, news_routes, market_routes, watchlist_routes, ai_routes
+from .routes import auth_routes, company_routes, industry_routes, news_routes, market_routes, watchlist_routes, ai_routes, admin_routes, metrics_routes, export_routes, screener_routes, alert_routes, dashboard_routes, search_routes
+from .utils.compression import CompressionMiddleware
+from .utils.json_response import FastJSONResponse
+from .utils.request_metrics import RequestMetricsMiddleware
 
 from .config import settings
 
-app = FastAPI(title="PAK Industry Insight API")
-
-from apscheduler.schedulers.background import BackgroundScheduler
-from .services.data_engine import DataEngine
-from .services.ai_service import ai_service
-
-scheduler = BackgroundScheduler()
+app = FastAPI(title="PAK Industry Insight API", default_response_class=FastJSONResponse)
 
 @app.on_event("startup")
 async def startup_event():
     print(f"Startup Config: GOOGLE_CLIENT_ID={settings.GOOGLE_CLIENT_ID[:10]}... (masked)")
-    
-    # Schedule daily data refresh at midnight (Full Sync - Metadata)
-    scheduler.add_job(DataEngine.update_all_tracked_companies, 'cron', hour=0)
-
-    # Schedule fast price updates every 120s (Live Data - Price/Vol)
-    # Increased to 2m to allow for rate-limit sleep times (2.5s * 11 chunks = ~30s execution time)
-    # Schedule fast price updates every 300s (5 min) to prevent Yahoo Rate Limits/Bans
-    scheduler.add_job(DataEngine.update_live_prices, 'interval', seconds=300)
-    
-    # Schedule AI Analyst every 15 minutes to respect Free Tier Limits
-    scheduler.add_job(ai_service.analyze_and_store_pulse, 'interval', seconds=900)
-    
-    scheduler.start()
-    print("INFO: Market Data Scheduler Started (Daily + Live 5m + AI 15m)")
+
+    # Scheduled jobs live in the worker (python -m app.worker), not in API processes.
+    # EMBEDDED_WORKER is for single-service deployments; the Mongo lease still
+    # guarantees only one scheduler runs even with several API workers.
+    # The vector index lives on local disk (gone after a redeploy): embed whatever it is missing
+    from .services.semantic_search import start_semantic_backfill
+    start_semantic_backfill()
+
+    if settings.EMBEDDED_WORKER:
+        from .worker import start_embedded_worker
+        start_embedded_worker()
+        print("INFO: Embedded worker started (competing for scheduler lease)")
 
 # CORS Middleware
 app.add_middleware(
@@ -39,6 +34,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Inside the metrics middleware, so response sizes are recorded as sent on the wire
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_BYTES)
+
+# Added last so it wraps everything (incl. CORS) and sees the full request latency
+app.add_middleware(RequestMetricsMiddleware, slow_request_ms=settings.SLOW_REQUEST_MS)
+
 @app.get("/")
 def root():
     return {"message": "Backend API Working!"}
@@ -50,3 +51,10 @@ app.include_router(news_routes.router)
 app.include_router(market_routes.router, prefix="/market", tags=["Market"])
 app.include_router(watchlist_routes.router)
 app.include_router(ai_routes.router)
+app.include_router(admin_routes.router)
+app.include_router(metrics_routes.router)
+app.include_router(export_routes.router)
+app.include_router(screener_routes.router)
+app.include_router(alert_routes.router)
+app.include_router(dashboard_routes.router)
+app.include_router(search_routes.router)
@@ -1,11 +1,252 @@
+import re
 from datetime import datetime
+from typing import Optional
 
-class CompanyModel:
-    def __init__(self, name, industry, founded_year=None, location=None, employees_count=None, growth_tags=None):
-        self.name = name
-        self.industry = industry
-        self.founded_year = founded_year
-        self.location = location
-        self.employees_count = employees_count
-        self.growth_tags = growth_tags or []
-        self.created_at = datetime.utcnow()
+import msgspec
+
+# Field names used by older loaders / seed scripts -> canonical name
+LEGACY_FIELDS = {
+    "founded": "founded_year",
+    "employees": "employees_count",
+    "psx_symbol": "ticker",
+    "stock_symbol": "ticker",
+    "symbol": "ticker",
+    "sector": "industry",
+    "headquarters": "location",
+    "hq": "location",
+}
+
+INT_FIELDS = ("founded_year", "employees_count", "revenue", "net_profit", "market_cap", "volume",
+              "revenue_fiscal_year", "employees_min", "employees_max")
+FLOAT_FIELDS = ("price", "change", "change_percent", "previous_close", "pe_ratio")
+# Monetary fields, stored as whole PKR
+MONEY_FIELDS = ("revenue", "net_profit", "market_cap")
+STR_FIELDS = ("ticker", "description", "website", "location", "ceo", "market_share")
+LIST_FIELDS = ("growth_tags", "sources", "products", "export_markets", "certifications")
+
+# Fields rewritten by the 5-minute price job. Everything else is "profile" data
+# (CEO, revenue, description, ...) which only changes with the daily sync.
+QUOTE_FIELDS = ("price", "change", "change_percent", "volume", "previous_close", "last_updated")
+
+_AMOUNT = re.compile(r"(-?\d+(?:\.\d+)?)\s*([a-z]+)?", re.IGNORECASE)
+_FISCAL_YEAR = re.compile(r"\bFY\s*'?(\d{2}|\d{4})\b", re.IGNORECASE)
+_USD = re.compile(r"\$|\bUSD\b|\bUS\s*dollars?\b", re.IGNORECASE)
+_RANGE = re.compile(r"(\d+(?:\.\d+)?\s*[a-z]*)\s*(?:-|–|to)\s*(\d+(?:\.\d+)?\s*[a-z]*)", re.IGNORECASE)
+# Static USD -> PKR rate for the few USD-denominated legacy values (same as the market fallback)
+USD_PKR = 278.5
+_MULTIPLIERS = {
+    "k": 10**3, "thousand": 10**3,
+    "m": 10**6, "mn": 10**6, "million": 10**6,
+    "b": 10**9, "bn": 10**9, "billion": 10**9,
+    "t": 10**12, "tn": 10**12, "trillion": 10**12,
+    "lakh": 10**5, "lac": 10**5, "cr": 10**7, "crore": 10**7,
+}
+
+
+class Company(msgspec.Struct, kw_only=True, gc=False):
+    """
+    Canonical company record, used for every read and write of `db.companies`.
+
+    A msgspec Struct: slotted (much smaller than the equivalent dict) and
+    encoded/decoded to JSON and BSON-ready dicts in C.
+    """
+    id: Optional[str] = None
+    name: str
+    ticker: Optional[str] = None
+    industry: str = "Other"
+    description: Optional[str] = None
+    website: Optional[str] = None
+    founded_year: Optional[int] = None
+    location: Optional[str] = None
+    employees_count: Optional[int] = None
+    revenue: Optional[int] = None
+    net_profit: Optional[int] = None
+    market_cap: Optional[int] = None
+    ceo: Optional[str] = None
+    growth_tags: list[str] = []
+    # Curated profile fields (companies_enriched.json, seed_data.py); omitted when the source has none
+    is_listed: Optional[bool] = None
+    sources: Optional[list[str]] = None
+    market_share: Optional[str] = None
+    products: Optional[list[str]] = None
+    export_markets: Optional[list[str]] = None
+    certifications: Optional[list[str]] = None
+    # Derived at write time (see normalize_document) for sorting / screening
+    revenue_fiscal_year: Optional[int] = None
+    employees_min: Optional[int] = None
+    employees_max: Optional[int] = None  # None = open-ended ("13,000+")
+    pe_ratio: Optional[float] = None
+    # Live quote (see QUOTE_FIELDS)
+    price: Optional[float] = None
+    change: Optional[float] = None
+    change_percent: Optional[float] = None
+    volume: Optional[int] = None
+    previous_close: Optional[float] = None
+    last_updated: Optional[datetime] = None
+
+    @classmethod
+    def from_document(cls, doc: dict) -> "Company":
+        """Mongo document (any historical shape) -> Company."""
+        data = dict(doc)
+        if "_id" in data:
+            data["id"] = str(data.pop("_id"))
+        if not _LEGACY_KEYS.isdisjoint(data):
+            data = normalize_document(data)
+        try:
+            return msgspec.convert(data, cls, strict=False)
+        except msgspec.ValidationError:
+            return msgspec.convert(normalize_document(data), cls, strict=False)
+
+    @classmethod
+    def normalized(cls, doc: dict) -> "Company":
+        """Like from_document, but always runs normalization (derived fields included). Use on writes."""
+        data = dict(doc)
+        if "_id" in data:
+            data["id"] = str(data.pop("_id"))
+        return msgspec.convert(normalize_document(data), cls, strict=False)
+
+    def to_document(self) -> dict:
+        """Company -> dict for `$set` (no `id`, unset fields omitted)."""
+        return {k: v for k, v in msgspec.structs.asdict(self).items() if k != "id" and v is not None}
+
+    def to_builtins(self) -> dict:
+        """Company -> JSON-able dict (datetimes as ISO strings)."""
+        return msgspec.to_builtins(self)
+
+
+_LEGACY_KEYS = frozenset(LEGACY_FIELDS)
+_encoder = msgspec.json.Encoder()
+
+
+def encode_companies(companies) -> bytes:
+    """JSON-encodes a Company (or list of them) in one call."""
+    return _encoder.encode(companies)
+
+
+def companies_from_documents(docs) -> list[Company]:
+    return [Company.from_document(doc) for doc in docs]
+
+
+def parse_int(value) -> Optional[int]:
+    """
+    Lenient integer coercion for legacy values: Int64, floats, "3,500+", "PKR 1.2B", "$80M", "12 crore".
+    Currency symbols are ignored (the legacy seed values are rough bands, not exact figures).
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, float):
+        return None if value != value else int(value)
+    if isinstance(value, str):
+        match = _AMOUNT.search(value.replace(",", ""))
+        if not match:
+            return None
+        number, suffix = match.groups()
+        return int(float(number) * _MULTIPLIERS.get((suffix or "").lower(), 1))
+    return None
+
+
+def parse_money(value) -> tuple[Optional[int], Optional[int]]:
+    """
+    Monetary value -> (whole PKR, fiscal year or None).
+    "PKR 342.13 Billion (FY24)" -> (342130000000, 2024); "$80M" -> USD converted at USD_PKR.
+    """
+    if not isinstance(value, str):
+        return parse_int(value), None
+    fiscal_year = None
+    match = _FISCAL_YEAR.search(value)
+    if match:
+        year = int(match.group(1))
+        fiscal_year = year + 2000 if year < 100 else year
+    # The fiscal year's digits are not the amount ("FY24 PKR 10bn")
+    amount = parse_int(_FISCAL_YEAR.sub(" ", value))
+    if amount is not None and _USD.search(value):
+        amount = int(amount * USD_PKR)
+    return amount, fiscal_year
+
+
+def parse_employee_range(value) -> tuple[Optional[int], Optional[int]]:
+    """"13,000+" -> (13000, None); "1,000-5,000" -> (1000, 5000); "6,061" or 6061 -> (6061, 6061)."""
+    if value is None or isinstance(value, bool):
+        return None, None
+    if isinstance(value, str):
+        text = value.replace(",", "")
+        match = _RANGE.search(text)
+        if match:
+            low, high = parse_int(match.group(1)), parse_int(match.group(2))
+            return (low, high) if low is not None and high is not None and low <= high else (low, None)
+        count = parse_int(text)
+        if count is None:
+            return None, None
+        return (count, None) if "+" in text else (count, count)
+    count = parse_int(value)
+    return count, count
+
+
+def parse_float(value) -> Optional[float]:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        value = float(str(value).replace(",", "")) if isinstance(value, str) else float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if value != value else value
+
+
+def normalize_document(doc: dict) -> dict:
+    """
+    Renames legacy fields and coerces types to the canonical schema.
+    Keys are kept (including None values, so `$set` can clear stale fields);
+    unknown extra fields are passed through untouched.
+    """
+    data = dict(doc)
+    for legacy, canonical in LEGACY_FIELDS.items():
+        if legacy in data:
+            value = data.pop(legacy)
+            if data.get(canonical) in (None, ""):
+                data[canonical] = value
+
+    # Derived fields need the raw text ("(FY24)", "13,000+"), so they come before coercion
+    for field in MONEY_FIELDS:
+        if isinstance(data.get(field), str):
+            data[field], fiscal_year = parse_money(data[field])
+            if field == "revenue" and fiscal_year:
+                data["revenue_fiscal_year"] = fiscal_year
+    if data.get("revenue") is not None:
+        # A revenue figure without a fiscal year (e.g. Yahoo TTM) must not keep a stale one
+        data.setdefault("revenue_fiscal_year", None)
+    employees = data.get("employees_count")
+    if isinstance(employees, str) or (employees is not None and "employees_min" not in data):
+        data["employees_min"], data["employees_max"] = parse_employee_range(employees)
+
+    for field in INT_FIELDS:
+        if field in data:
+            data[field] = parse_int(data[field])
+    for field in FLOAT_FIELDS:
+        if field in data:
+            data[field] = parse_float(data[field])
+    for field in STR_FIELDS:
+        if field in data:
+            value = data[field]
+            data[field] = (str(value).strip() or None) if value is not None else None
+    if "industry" in data and not data["industry"]:
+        data["industry"] = "Other"
+    for field in LIST_FIELDS:
+        if field in data and not isinstance(data[field], list):
+            data[field] = [str(data[field])] if data[field] else []
+    if "is_listed" in data and not isinstance(data["is_listed"], bool):
+        data["is_listed"] = None if data["is_listed"] is None else str(data["is_listed"]).strip().lower() in ("true", "yes", "1")
+    if not data.get("name"):
+        data["name"] = data.get("ticker") or "Unknown"
+    # Only when this write carries both inputs; partial updates keep the stored ratio
+    if "market_cap" in data and "net_profit" in data:
+        data["pe_ratio"] = pe_ratio(data.get("market_cap"), data.get("net_profit"))
+    return data
+
+
+def pe_ratio(market_cap, net_profit) -> Optional[float]:
+    """Trailing P/E from market cap and annual net profit; None for losses or missing data."""
+    if not market_cap or not net_profit or net_profit <= 0:
+        return None
+    return round(market_cap / net_profit, 2)
@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends
+from ..services.job_telemetry import get_job_report
+from ..utils.auth import require_admin
+from ..utils.json_response import FastJSONRoute
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)], route_class=FastJSONRoute)
+
+@router.get("/jobs")
+def list_job_runs(limit: int = 50):
+    """
+    Scheduled job telemetry: recent runs (newest first) and per-job
+    p50/p95 durations, error/missed/overlap counts and time since the last run.
+    """
+    return get_job_report(limit=min(max(limit, 1), 200))
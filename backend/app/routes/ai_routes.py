@@ -1,11 +1,14 @@
 from fastapi import APIRouter, HTTPException, Depends
 from ..services.ai_service import ai_service
+from ..services.dashboard import SECTIONS
 from ..services.data_engine import data_engine
+from ..services.headline_service import headline_service
 from ..database import db
 from bson import ObjectId
 from datetime import datetime
+from ..utils.json_response import FastJSONRoute
 
-router = APIRouter(prefix="/ai", tags=["AI Integration"])
+router = APIRouter(prefix="/ai", tags=["AI Integration"], route_class=FastJSONRoute)
 
 @router.get("/market-pulse")
 async def get_market_pulse():
@@ -14,21 +17,17 @@ async def get_market_pulse():
     It fetches the latest news and live market data, then asks Gemeni to summarize it.
     """
     # 1. Try Cached Insight (Proactive AI)
-    cached = db.ai_insights.find_one({"_id": "latest_pulse"})
-    if cached and cached.get("summary"):
-        return {
-            "summary": cached["summary"],
-            "timestamp": cached.get("timestamp")
-        }
+    cached = SECTIONS["pulse"].get()
+    if cached:
+        return cached
 
     # 2. Fallback: Generate Fresh (Reactive)
     try:
         # Get live market snapshot
         market_data = await data_engine.fetch_live_market_data()
         
-        # Get latest news headlines from DB
-        news_cursor = db.news.find().sort("published_date", -1).limit(6)
-        news_headlines = [n.get("title", "") for n in news_cursor]
+        # Get latest news headlines (in-memory buffer over db.articles)
+        news_headlines = headline_service.latest_titles(6)
         
         # Call AI Service
         summary = await ai_service.generate_market_pulse(market_data, news_headlines)
@@ -41,6 +40,14 @@ async def get_market_pulse():
         print(f"Error in market-pulse: {e}")
         return {"summary": "Unable to generate AI summary at this time.", "timestamp": None}
 
+@router.get("/market-pulse/stats")
+async def get_market_pulse_stats(days: int = 7):
+    """
+    Daily counters for the scheduled Market Pulse job:
+    how many Gemini calls were made vs. skipped because the inputs did not change materially.
+    """
+    return ai_service.get_pulse_stats(days=min(max(days, 1), 90))
+
 @router.get("/company-insight/{company_id}")
 async def get_company_insight(company_id: str):
     """
@@ -0,0 +1,76 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from bson import ObjectId
+from ..config import settings
+from ..database import db
+from ..schemas.alert_schema import AlertCreate
+from ..services.alerts import ALERTS_COLLECTION
+from ..services.notifications import NOTIFICATIONS_COLLECTION
+from ..utils.json_response import FastJSONRoute, with_id
+from .auth_routes import get_current_user
+
+router = APIRouter(prefix="/alerts", tags=["Alerts"], route_class=FastJSONRoute)
+
+
+@router.get("")
+def list_alerts(current_user: dict = Depends(get_current_user)):
+    """The user's active and triggered alerts, newest first."""
+    alerts = db[ALERTS_COLLECTION].find(
+        {"user_id": str(current_user["_id"]), "status": {"$ne": "deleted"}}, {"user_id": 0, "triggered_cycle": 0}
+    ).sort("created_at", -1)
+    return [with_id(a) for a in alerts]
+
+
+@router.post("", status_code=201)
+def create_alert(body: AlertCreate, current_user: dict = Depends(get_current_user)):
+    """
+    One-shot alert, checked after every live price refresh (every 5 minutes).
+    It triggers once the condition holds, including on the first check.
+    """
+    user_id = str(current_user["_id"])
+    ticker = body.ticker.upper()
+    if not db.companies.find_one({"ticker": ticker}, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="Unknown ticker")
+    if body.kind == "volume_spike" and body.threshold <= 0:
+        raise HTTPException(status_code=400, detail="volume_spike threshold must be a positive multiple")
+    if body.kind in ("price_above", "price_below") and body.threshold <= 0:
+        raise HTTPException(status_code=400, detail="Price level must be positive")
+    active = db[ALERTS_COLLECTION].count_documents({"user_id": user_id, "status": "active"})
+    if active >= settings.MAX_ALERTS_PER_USER:
+        raise HTTPException(status_code=409, detail=f"At most {settings.MAX_ALERTS_PER_USER} active alerts")
+
+    now = datetime.utcnow()
+    alert = {
+        "user_id": user_id,
+        "ticker": ticker,
+        "kind": body.kind,
+        "threshold": body.threshold,
+        "status": "active",
+        "created_at": now,
+        "updated_at": now,
+    }
+    db[ALERTS_COLLECTION].insert_one(alert)
+    alert.pop("user_id")
+    return with_id(alert)
+
+
+@router.delete("/{alert_id}")
+def delete_alert(alert_id: str, current_user: dict = Depends(get_current_user)):
+    if not ObjectId.is_valid(alert_id):
+        raise HTTPException(status_code=400, detail="Invalid alert ID")
+    # Soft delete: the worker picks the change up through updated_at
+    result = db[ALERTS_COLLECTION].update_one(
+        {"_id": ObjectId(alert_id), "user_id": str(current_user["_id"]), "status": {"$ne": "deleted"}},
+        {"$set": {"status": "deleted", "updated_at": datetime.utcnow()}},
+    )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Alert not found")
+    return {"message": "Alert deleted", "id": alert_id}
+
+
+@router.get("/notifications")
+def list_notifications(limit: int = Query(50, ge=1, le=200), current_user: dict = Depends(get_current_user)):
+    notifications = db[NOTIFICATIONS_COLLECTION].find(
+        {"user_id": str(current_user["_id"])}, {"user_id": 0}
+    ).sort("created_at", -1).limit(limit)
+    return [with_id(n) for n in notifications]
@@ -2,8 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
 from datetime import timedelta
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
+from starlette.concurrency import run_in_threadpool
 from ..database import db
 from ..schemas.user_schema import (
     UserCreate,
@@ -17,11 +16,13 @@ from ..schemas.user_schema import (
     UserUpdate,
     ChangePasswordRequest
 )
-from ..utils.auth import get_password_hash, verify_password, create_access_token
+from ..utils.auth import hash_password_async, verify_password_async, create_access_token
+from ..utils.google_verifier import get_google_verifier, TokenVerificationError
 from ..config import settings
 from bson import ObjectId
+from ..utils.json_response import FastJSONRoute
 
-router = APIRouter(prefix="/auth", tags=["Authentication"])
+router = APIRouter(prefix="/auth", tags=["Authentication"], route_class=FastJSONRoute)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
@@ -56,8 +57,8 @@ async def register(user: UserCreate):
         print("DEBUG: Email already registered")
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    # Create new user
-    hashed_password = get_password_hash(user.password)
+    # Create new user (bcrypt runs in the hashing pool, not on the event loop)
+    hashed_password = await hash_password_async(user.password)
     user_in_db = UserInDB(
         email=user.email,
         full_name=user.full_name,
@@ -87,12 +88,17 @@ async def login(form_data: UserLogin):
             detail="User not found",
         )
 
-    if not verify_password(form_data.password, user["hashed_password"]):
+    is_valid, new_hash = await verify_password_async(form_data.password, user.get("hashed_password"))
+    if not is_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    # Transparently upgrade hashes created with old cost parameters
+    if new_hash:
+        db.users.update_one({"_id": user["_id"]}, {"$set": {"hashed_password": new_hash}})
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -114,15 +120,17 @@ async def google_login(payload: GoogleLogin):
     
     print(f"DEBUG: Verifying token with Client ID: {settings.GOOGLE_CLIENT_ID}")
     try:
-        idinfo = id_token.verify_oauth2_token(
-            payload.credential,
-            google_requests.Request(),
-            settings.GOOGLE_CLIENT_ID,
-        )
+        # Signature is checked locally against cached Google keys.
+        # Runs in a thread since a (rare) key refresh does network I/O.
+        idinfo = await run_in_threadpool(get_google_verifier().verify, payload.credential)
         print("DEBUG: Token verified successfully")
-    except Exception as e:
+    except TokenVerificationError as e:
         print(f"ERROR: Token verification failed: {e}")
         raise HTTPException(status_code=400, detail=f"Invalid Google token: {str(e)}")
+    except Exception as e:
+        # Google's key endpoint unreachable (network error / non-200)
+        print(f"ERROR: Could not load Google signing keys: {e}")
+        raise HTTPException(status_code=503, detail="Google login temporarily unavailable")
 
     email = idinfo.get("email")
     full_name = idinfo.get("name")
@@ -181,13 +189,14 @@ async def reset_password(payload: SimplePasswordReset):
         raise HTTPException(status_code=400, detail=str(e))
 
     # Check if new password is same as old password
-    if verify_password(payload.new_password, user["hashed_password"]):
+    is_same, _ = await verify_password_async(payload.new_password, user.get("hashed_password"))
+    if is_same:
         raise HTTPException(
             status_code=400, 
             detail="New password cannot be the same as the current password."
         )
 
-    new_hashed = get_password_hash(payload.new_password)
+    new_hashed = await hash_password_async(payload.new_password)
     db.users.update_one({"_id": user["_id"]}, {"$set": {"hashed_password": new_hashed}})
 
     return {"message": "Password has been reset successfully"}
@@ -220,7 +229,8 @@ async def change_password(payload: ChangePasswordRequest, current_user: dict = D
         # User might be Google-only or has no password set
         raise HTTPException(status_code=400, detail="You do not have a password set (e.g., Google Login).")
 
-    if not verify_password(payload.current_password, stored_password):
+    is_valid, _ = await verify_password_async(payload.current_password, stored_password)
+    if not is_valid:
         raise HTTPException(status_code=400, detail="Incorrect current password")
 
     # 2. Validate New Password
@@ -233,7 +243,7 @@ async def change_password(payload: ChangePasswordRequest, current_user: dict = D
         raise HTTPException(status_code=400, detail=str(e))
 
     # 3. Update Database
-    new_hashed = get_password_hash(payload.new_password)
+    new_hashed = await hash_password_async(payload.new_password)
     db.users.update_one({"_id": user_id}, {"$set": {"hashed_password": new_hashed}})
 
     return {"message": "Password updated successfully"}
@@ -1,26 +1,59 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Response
 from ..database import db
+from ..models.company import Company, companies_from_documents, encode_companies
 from ..schemas.company_schema import CompanySchema
+from ..utils.json_response import FastJSONRoute, with_id
 
-router = APIRouter(prefix="/companies", tags=["Companies"])
+router = APIRouter(prefix="/companies", tags=["Companies"], route_class=FastJSONRoute)
 
 @router.post("")
 def add_company(company: CompanySchema):
-    db.companies.insert_one(company.dict())
+    db.companies.insert_one(Company.normalized(company.model_dump()).to_document())
     return {"message": "Company added successfully"}
 
-from ..utils.seed_tickers import seed_initial_tickers
+from fastapi import BackgroundTasks, Depends
+from ..services.reseed import ReseedInProgress, create_reseed_job, get_reseed_job, run_reseed
+from ..utils.auth import require_admin
 
-@router.post("/admin/seed")
-def trigger_seed():
+@router.post("/admin/seed", status_code=202, dependencies=[Depends(require_admin)])
+def trigger_seed(background_tasks: BackgroundTasks):
     """
-    Triggers the manual seeding of top 15 companies.
+    Starts a blue/green reseed of all tracked companies in the background.
+    The live universe stays readable until the rebuilt one is swapped in.
+    Poll `GET /companies/admin/seed/{job_id}` for progress.
     """
-    seed_initial_tickers()
-    return {"message": "Seeding process initiated"}
+    try:
+        job_id = create_reseed_job()
+    except ReseedInProgress as e:
+        raise HTTPException(status_code=409, detail={"message": "A reseed is already running", "job_id": e.job_id})
+    background_tasks.add_task(run_reseed, job_id)
+    return {"message": "Seeding process initiated", "job_id": job_id, "status_url": f"/companies/admin/seed/{job_id}"}
+
+@router.get("/admin/seed", dependencies=[Depends(require_admin)])
+def latest_seed_status():
+    """Status of the most recent reseed."""
+    job = get_reseed_job()
+    if not job:
+        raise HTTPException(status_code=404, detail="No reseed has run yet")
+    return {"job_id": job.pop("_id"), **job}
+
+@router.get("/admin/seed/{job_id}", dependencies=[Depends(require_admin)])
+def seed_status(job_id: str):
+    """Reseed progress: phase (fetching/validating/swapping/done), fetched/failed/total and row counts."""
+    job = get_reseed_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Reseed job not found")
+    return {"job_id": job.pop("_id"), **job}
 
 from bson import ObjectId
-from fastapi import HTTPException
+from fastapi import Query, Request
+from ..services.article_text import ARTICLE_LIST_PROJECTION
+from ..services.company_cache import company_cache, fragment_body
+from ..utils.http_cache import make_etag, conditional_response
+
+# Clients may reuse a profile for a while; quotes must be revalidated often (prices refresh every 5 min)
+PROFILE_CACHE_CONTROL = "public, max-age=3600"
+QUOTE_CACHE_CONTROL = "public, max-age=30"
 
 @router.get("")
 def list_companies(industry: str = None, location: str = None, growth: str = None):
@@ -32,47 +65,123 @@ def list_companies(industry: str = None, location: str = None, growth: str = Non
     if growth:
         query["growth_tags"] = growth
     
-    companies = list(db.companies.find(query))
-    for company in companies:
-        company["id"] = str(company["_id"])
-        del company["_id"]
-        # Convert BSON Int64 to int for serialization
-        for field in ["market_cap", "revenue", "net_profit"]:
-             if company.get(field) is not None:
-                 company[field] = int(company[field])
-    return companies
+    companies = companies_from_documents(db.companies.find(query))
+    return Response(content=encode_companies(companies), media_type="application/json")
 
 @router.get("/search")
 def search_companies(q: str):
     query = {
         "$or": [
             {"name": {"$regex": q, "$options": "i"}},
-            {"symbol": {"$regex": q, "$options": "i"}}
+            {"ticker": {"$regex": q, "$options": "i"}}
         ]
     }
-    companies = list(db.companies.find(query))
-    for company in companies:
-        company["id"] = str(company["_id"])
-        del company["_id"]
-        # Convert BSON Int64 to int for serialization
-        for field in ["market_cap", "revenue", "net_profit"]:
-             if company.get(field) is not None:
-                 company[field] = int(company[field])
-    return companies
+    companies = companies_from_documents(db.companies.find(query))
+    return Response(content=encode_companies(companies), media_type="application/json")
+
+SCREEN_SORTS = {
+    "market_cap": ("market_cap", -1),
+    "revenue": ("revenue", -1),
+    "net_profit": ("net_profit", -1),
+    "pe": ("pe_ratio", 1),
+    "employees": ("employees_min", -1),
+}
+
+def build_screen_query(sector=None, min_revenue=None, max_revenue=None, min_market_cap=None,
+                       max_market_cap=None, min_pe=None, max_pe=None, min_employees=None, sort="market_cap"):
+    """(filter, sort_field, direction) for a screen. Raises KeyError for an unknown `sort`."""
+    sort_field, direction = SCREEN_SORTS[sort]
+    query = {}
+    if sector:
+        query["industry"] = sector
+    for field, low, high in (
+        ("revenue", min_revenue, max_revenue),
+        ("market_cap", min_market_cap, max_market_cap),
+        ("pe_ratio", min_pe, max_pe),
+        ("employees_min", min_employees, None),
+    ):
+        bounds = {}
+        if low is not None:
+            bounds["$gte"] = low
+        if high is not None:
+            bounds["$lte"] = high
+        if bounds:
+            query[field] = bounds
+    # Companies without the sort metric (e.g. loss-makers for P/E) are excluded rather than sorted last
+    query.setdefault(sort_field, {})["$ne"] = None
+    return query, sort_field, direction
+
+@router.get("/screen")
+def screen_companies(
+    sector: str = None,
+    min_revenue: int = None,
+    max_revenue: int = None,
+    min_market_cap: int = None,
+    max_market_cap: int = None,
+    min_pe: float = None,
+    max_pe: float = None,
+    min_employees: int = None,
+    sort: str = "market_cap",
+    limit: int = Query(50, ge=1, le=500),
+):
+    """
+    Numeric screen over the normalized financials (PKR amounts, trailing P/E).
+    Served by the (industry, metric) compound indexes: sector is the equality
+    prefix, the sort metric the second key, the other bounds are residual filters.
+    """
+    if sort not in SCREEN_SORTS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {', '.join(SCREEN_SORTS)}")
+    query, sort_field, direction = build_screen_query(
+        sector, min_revenue, max_revenue, min_market_cap, max_market_cap, min_pe, max_pe, min_employees, sort
+    )
+    cursor = db.companies.find(query).sort(sort_field, direction).limit(limit)
+    return Response(content=encode_companies(companies_from_documents(cursor)), media_type="application/json")
+
+def _cached_company(company_id: str):
+    if not ObjectId.is_valid(company_id):
+        raise HTTPException(status_code=400, detail="Invalid company ID")
+
+    fragments = company_cache.get(company_id)
+    if fragments is None:
+        raise HTTPException(status_code=404, detail="Company not found")
+    return fragments
 
 @router.get("/{company_id}")
-def get_company(company_id: str):
+def get_company(company_id: str, request: Request):
+    """
+    Full company document (profile + live quote).
+    Served from the fragment cache; supports `If-None-Match` -> 304.
+    """
+    profile, quote = _cached_company(company_id)
+    etag = make_etag(profile.etag, quote.etag)
+    return conditional_response(request, fragment_body(company_id, profile, quote), etag, QUOTE_CACHE_CONTROL)
+
+@router.get("/{company_id}/profile")
+def get_company_profile(company_id: str, request: Request):
+    """Static company profile (CEO, revenue, description...). Changes at most daily."""
+    profile, _ = _cached_company(company_id)
+    return conditional_response(request, fragment_body(company_id, profile), profile.etag, PROFILE_CACHE_CONTROL)
+
+@router.get("/{company_id}/quote")
+def get_company_quote(company_id: str, request: Request):
+    """Volatile price fragment (price, change, volume). Changes every refresh cycle."""
+    _, quote = _cached_company(company_id)
+    return conditional_response(request, fragment_body(company_id, quote), quote.etag, QUOTE_CACHE_CONTROL)
+
+@router.get("/{company_id}/news")
+def get_company_news(company_id: str, skip: int = Query(0, ge=0), limit: int = Query(10, ge=1, le=100),
+                     collapse: bool = False):
+    """Latest articles that mention the company (by name, alias or ticker), newest first."""
     if not ObjectId.is_valid(company_id):
         raise HTTPException(status_code=400, detail="Invalid company ID")
-    
-    company = db.companies.find_one({"_id": ObjectId(company_id)})
+    company = db.companies.find_one({"_id": ObjectId(company_id)}, {"ticker": 1})
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
-    
-    company["id"] = str(company["_id"])
-    del company["_id"]
-    # Convert BSON Int64 to int for serialization
-    for field in ["market_cap", "revenue", "net_profit"]:
-         if company.get(field) is not None:
-             company[field] = int(company[field])
-    return company
+    if not company.get("ticker"):
+        # Articles are tagged by ticker; `{"tickers": None}` would match every untagged article
+        return []
+    query = {"tickers": company["ticker"]}
+    if collapse:
+        query["duplicate"] = {"$ne": True}
+    articles = db.articles.find(query, ARTICLE_LIST_PROJECTION).sort("published_date", -1).skip(skip).limit(limit)
+    return [with_id(article) for article in articles]
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, HTTPException, Query
+from ..services.dashboard import FieldMaskError, build_dashboard, parse_field_mask
+from ..utils.json_response import FastJSONRoute
+
+router = APIRouter(tags=["Dashboard"], route_class=FastJSONRoute)
+
+
+@router.get("/dashboard")
+async def get_dashboard(
+    fields: str = Query(None, max_length=1000, description="e.g. market.top_gainers.ticker,news.title,pulse"),
+):
+    """
+    Everything the dashboard needs for its first paint in one call: live market
+    (`/market/live`), the cached Market Pulse, the latest news and the news stats.
+    `fields` limits the response to comma-separated dotted paths; only the
+    sections named in it are loaded.
+    """
+    try:
+        mask = parse_field_mask(fields) if fields else None
+    except FieldMaskError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await build_dashboard(mask)
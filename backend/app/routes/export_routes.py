@@ -0,0 +1,88 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from ..database import db
+from ..services.analytics import QUERIES, AnalyticsUnavailable, run_query
+from ..services.correlations import MAX_SLICE_TICKERS, correlation_store
+from ..services.parquet_export import export_companies, export_prices
+from ..utils.json_response import FastJSONRoute
+
+router = APIRouter(tags=["Export"], route_class=FastJSONRoute)
+
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+def _parquet_response(chunks, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        chunks,
+        media_type=PARQUET_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@router.get("/export/companies.parquet")
+def export_companies_parquet():
+    """
+    The whole company universe as Parquet (typed columns, zstd), streamed in row
+    groups straight from the Mongo cursor. `pd.read_parquet(url)` reads it directly.
+    """
+    return _parquet_response(export_companies(), "companies.parquet")
+
+@router.get("/export/prices.parquet")
+def export_prices_parquet(
+    start: Optional[datetime] = Query(None, alias="from", description="inclusive, ISO 8601"),
+    end: Optional[datetime] = Query(None, alias="to", description="exclusive, ISO 8601"),
+    ticker: Optional[str] = None,
+):
+    """Price observations (one row per ticker per live refresh) in `[from, to)`, as Parquet."""
+    if start and end and start >= end:
+        raise HTTPException(status_code=400, detail="'from' must be before 'to'")
+    return _parquet_response(export_prices(start, end, ticker), "prices.parquet")
+
+@router.get("/analytics/queries")
+def list_analytics_queries():
+    """Named analytical queries available at /analytics/query."""
+    return {name: description for name, (description, _) in QUERIES.items()}
+
+@router.get("/analytics/query")
+async def analytics_query(name: str, sector: Optional[str] = None, limit: int = Query(100, ge=1, le=1000)):
+    """
+    Runs a named sector/valuation aggregation with DuckDB over the hourly Parquet
+    snapshots (never over the live collections). See /analytics/queries.
+    """
+    if name not in QUERIES:
+        raise HTTPException(status_code=404, detail=f"Unknown query '{name}'")
+    try:
+        return await run_in_threadpool(run_query, name, sector, limit)
+    except AnalyticsUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+def _correlation_snapshot():
+    snapshot = correlation_store.get()
+    if snapshot is None:
+        raise HTTPException(status_code=503, detail="Correlations have not been computed yet (nightly job)")
+    return snapshot
+
+@router.get("/analytics/correlations")
+def correlations(
+    tickers: Optional[str] = Query(None, description="comma-separated, e.g. HBL.KA,UBL.KA,MCB.KA"),
+    sector: Optional[str] = None,
+):
+    """
+    Daily-return correlation matrix for the requested tickers (or a sector's
+    members) plus each one's beta versus KSE-100, from the nightly computation.
+    """
+    if tickers:
+        requested = [t.strip().upper() for t in tickers.split(",") if t.strip()]
+    elif sector:
+        requested = sorted(t for t in db.companies.distinct("ticker", {"industry": sector}) if t)
+    else:
+        raise HTTPException(status_code=400, detail="Pass 'tickers' or 'sector'")
+    if len(requested) > MAX_SLICE_TICKERS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_SLICE_TICKERS} tickers per request")
+    return _correlation_snapshot().tickers_slice(requested)
+
+@router.get("/analytics/sectors/comovement")
+def sector_comovement():
+    """Sector x sector correlation of equal-weighted daily sector returns, and each sector's beta."""
+    return _correlation_snapshot().sector_summary()
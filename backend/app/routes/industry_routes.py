@@ -1,8 +1,9 @@
 from fastapi import APIRouter
 from ..database import db
 from ..schemas.industry_schema import IndustrySchema
+from ..utils.json_response import FastJSONRoute
 
-router = APIRouter(prefix="/industries", tags=["Industries"])
+router = APIRouter(prefix="/industries", tags=["Industries"], route_class=FastJSONRoute)
 
 @router.post("/")
 def add_industry(industry: IndustrySchema):
@@ -1,12 +1,15 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 from ..database import db
 from ..services.data_engine import data_engine
+from ..services.dashboard import SECTIONS
+from ..services.indicators import get_indicators
 from datetime import datetime
+from ..utils.json_response import FastJSONRoute
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 @router.get("/live")
-async def get_market_trends():
+def get_market_trends():
     """
     Returns aggregated market data for the trends page.
     - Currency (USD/PKR) - Mocked or fetched if possible
@@ -14,20 +17,8 @@ async def get_market_trends():
     - Top Stocks (Gainers/Losers mixed)
     """
     try:
-        data = await data_engine.fetch_live_market_data()
-        
-        # 3. Currency (Mock for now or store in DB)
-        currency = {
-            "pair": "USD/PKR",
-            "rate": 278.50, # Static fallback
-            "change": 1.2,
-            "change_percent": 0.45
-        }
-
-        # Merge currency into the response
-        data["currency"] = currency
-        return data
-
+        # Shared with /dashboard; the currency quote is still a static fallback
+        return SECTIONS["market"].get()
     except Exception as e:
         print(f"Error in market trends: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -43,3 +34,17 @@ async def refresh_market_data(background_tasks: BackgroundTasks):
     except Exception as e:
         print(f"Error triggering refresh: {e}")
         raise HTTPException(status_code=500, detail="Failed to start refresh")
+
+@router.get("/indicators/{ticker}")
+def get_ticker_indicators(ticker: str):
+    """
+    SMA 20/50, EMA 12/26, RSI 14, ATR 14 (daily candles) and today's VWAP,
+    maintained incrementally by the live price job. Today's forming candle counts as the latest day.
+    """
+    ticker = ticker.upper()
+    indicators = get_indicators(ticker)
+    if indicators is None and "." not in ticker:
+        indicators = get_indicators(f"{ticker}.KA")
+    if indicators is None:
+        raise HTTPException(status_code=404, detail="No price history for this ticker yet")
+    return indicators
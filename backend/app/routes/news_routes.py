@@ -1,8 +1,13 @@
-from fastapi import APIRouter, BackgroundTasks
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
+from bson import ObjectId
 from ..database import db
 from ..services.aggregator import fetch_news
+from ..services.article_text import ARTICLE_LIST_PROJECTION
+from ..services.dashboard import NEWS_LIMIT, SECTIONS
+from ..services.news_sentiment import SENTIMENT_SECTIONS, WINDOWS
+from ..utils.json_response import FastJSONRoute, with_id
 
-router = APIRouter(prefix="/news", tags=["News"])
+router = APIRouter(prefix="/news", tags=["News"], route_class=FastJSONRoute)
 
 @router.get("/fetch")
 def trigger_fetch(background_tasks: BackgroundTasks):
@@ -10,34 +15,57 @@ def trigger_fetch(background_tasks: BackgroundTasks):
     return {"message": "News fetch started in background. Updates will appear shortly."}
 
 @router.get("")
-def list_news(skip: int = 0, limit: int = 10, sort: str = "latest"):
-    query = {}
+def list_news(skip: int = 0, limit: int = 10, sort: str = "latest", collapse: bool = False):
+    """
+    Latest (or random) articles. With `collapse=true`, one article per story:
+    syndicated copies are left out and the story's first article carries
+    `cluster_size` and `cluster_sources`.
+    """
+    if sort == "latest" and skip == 0 and limit == NEWS_LIMIT and not collapse:
+        # First page is shared with /dashboard
+        return SECTIONS["news"].get()
+
+    query = {"duplicate": {"$ne": True}} if collapse else {}
     
     if sort == "random":
-        pipeline = [{"$match": query}, {"$sample": {"size": limit}}]
-        articles = list(db.articles.aggregate(pipeline))
+        pipeline = [{"$match": query}, {"$sample": {"size": limit}}, {"$project": ARTICLE_LIST_PROJECTION}]
+        articles = db.articles.aggregate(pipeline)
     else:
         # Sort by published_date descending (Latest first)
-        articles = list(db.articles.find(query).sort("published_date", -1).skip(skip).limit(limit))
+        articles = db.articles.find(query, ARTICLE_LIST_PROJECTION).sort("published_date", -1).skip(skip).limit(limit)
     
-    # Convert _id to string if present
-    for article in articles:
-        if "_id" in article:
-            article["id"] = str(article["_id"])
-            del article["_id"]
-            
-    return articles
+    return [with_id(article) for article in articles]
 
 @router.get("/stats")
 def get_stats():
-    total_articles = db.articles.count_documents({})
-    sources = db.articles.distinct("source")
-    source_counts = {}
-    for source in sources:
-        source_counts[source] = db.articles.count_documents({"source": source})
-        
-    return {
-        "total_sources": len(sources),
-        "total_articles": total_articles,
-        "source_counts": source_counts
-    }
+    return SECTIONS["news_stats"].get()
+
+@router.get("/sentiment")
+def get_sentiment(window: str = "24h", limit: int = 20):
+    """
+    News mood over the last `window` (1h, 24h or 7d): the market, each sector and
+    the `limit` most covered tickers. Scores are average article sentiment in [-1, 1].
+    """
+    if window not in WINDOWS:
+        raise HTTPException(status_code=400, detail=f"window must be one of {', '.join(WINDOWS)}")
+    mood = SENTIMENT_SECTIONS[window].get()
+    return {**mood, "tickers": mood["tickers"][:max(limit, 0)]}
+
+@router.get("/sectors/{sector}")
+def sector_news(sector: str, skip: int = Query(0, ge=0), limit: int = Query(10, ge=1, le=100), collapse: bool = False):
+    """Latest articles mentioning a company in `sector` (the company `industry`, e.g. "Cement")."""
+    query = {"sectors": sector}
+    if collapse:
+        query["duplicate"] = {"$ne": True}
+    articles = db.articles.find(query, ARTICLE_LIST_PROJECTION).sort("published_date", -1).skip(skip).limit(limit)
+    return [with_id(article) for article in articles]
+
+@router.get("/{article_id}")
+def get_article(article_id: str):
+    """The full article, including the feed's original HTML `summary`."""
+    if not ObjectId.is_valid(article_id):
+        raise HTTPException(status_code=400, detail="Invalid article ID")
+    article = db.articles.find_one({"_id": ObjectId(article_id)}, {"minhash": 0, "lsh_bands": 0})
+    if not article:
+        raise HTTPException(status_code=404, detail="Article not found")
+    return with_id(article)
@@ -0,0 +1,82 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from ..database import db
+from ..schemas.screener_schema import SavedScreenCreate
+from ..services.screener import (
+    CATEGORY_COLUMNS, DEFAULT_SORT, NUMERIC_COLUMNS, ScreenError, create_saved_screen, find_saved_screen,
+    run_screen, saved_screen_results,
+)
+from .auth_routes import get_current_user
+from ..utils.json_response import FastJSONRoute
+
+router = APIRouter(prefix="/screener", tags=["Screener"], route_class=FastJSONRoute)
+
+
+@router.get("")
+def screen(
+    q: str = Query(..., min_length=1, max_length=1000, description='e.g. sector == "Cement" and change_percent > 2'),
+    sort: str = DEFAULT_SORT,
+    limit: int = Query(50, ge=1, le=500),
+):
+    """
+    Evaluates a screen expression over the whole universe (latest quotes,
+    fundamentals, 20-day indicators). `sort` is a field, `-` prefix for descending.
+    """
+    try:
+        return run_screen(q, sort, limit)
+    except ScreenError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/fields")
+def screen_fields():
+    """Fields usable in expressions and sorts."""
+    return {
+        "numeric": {name: description for name, (_, description) in NUMERIC_COLUMNS.items()},
+        "text": {name: description for name, (_, description) in CATEGORY_COLUMNS.items()},
+    }
+
+
+@router.get("/saved")
+def list_saved_screens(current_user: dict = Depends(get_current_user)):
+    screens = db.saved_screens.find({"user_id": str(current_user["_id"])}, {"matches": 0}).sort("created_at", 1)
+    return [
+        {
+            "id": str(s["_id"]),
+            "name": s["name"],
+            "expression": s["expression"],
+            "sort": s.get("sort") or DEFAULT_SORT,
+            "added": s.get("added", []),
+            "removed": s.get("removed", []),
+            "evaluated_at": s.get("evaluated_at"),
+        }
+        for s in screens
+    ]
+
+
+@router.post("/saved", status_code=201)
+def save_screen(body: SavedScreenCreate, current_user: dict = Depends(get_current_user)):
+    """Saves a screen; it is re-evaluated after every price refresh."""
+    try:
+        screen = create_saved_screen(str(current_user["_id"]), body.name, body.expression, body.sort)
+        return saved_screen_results(screen)
+    except ScreenError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/saved/{screen_id}")
+def get_saved_screen(screen_id: str, limit: int = Query(50, ge=1, le=500),
+                     current_user: dict = Depends(get_current_user)):
+    """Matches as of the last refresh, plus the tickers that entered/left the screen in it."""
+    screen = find_saved_screen(str(current_user["_id"]), screen_id)
+    if screen is None:
+        raise HTTPException(status_code=404, detail="Screen not found")
+    return saved_screen_results(screen, limit)
+
+
+@router.delete("/saved/{screen_id}")
+def delete_saved_screen(screen_id: str, current_user: dict = Depends(get_current_user)):
+    screen = find_saved_screen(str(current_user["_id"]), screen_id)
+    if screen is None:
+        raise HTTPException(status_code=404, detail="Screen not found")
+    db.saved_screens.delete_one({"_id": screen["_id"]})
+    return {"message": "Screen deleted", "id": screen_id}
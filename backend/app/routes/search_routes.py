@@ -0,0 +1,21 @@
+from fastapi import APIRouter, HTTPException
+from ..services.semantic_search import semantic_search
+from ..utils.json_response import FastJSONRoute
+
+router = APIRouter(prefix="/search", tags=["Search"], route_class=FastJSONRoute)
+
+SEARCH_KINDS = {"all": ("articles", "companies"), "articles": ("articles",), "companies": ("companies",)}
+MAX_RESULTS = 50
+
+@router.get("/semantic")
+def semantic(q: str, k: int = 10, kind: str = "all"):
+    """
+    Articles and companies closest in meaning to `q` (e.g. "circular debt in power sector"),
+    best first, each with its cosine `score`.
+    """
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="q must not be empty")
+    if kind not in SEARCH_KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of {', '.join(SEARCH_KINDS)}")
+    k = min(max(k, 1), MAX_RESULTS)
+    return {"query": q, **semantic_search.search(q, k, SEARCH_KINDS[kind])}
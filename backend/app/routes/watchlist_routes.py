@@ -2,8 +2,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from ..database import db
 from .auth_routes import get_current_user
 from bson import ObjectId
+from ..utils.json_response import FastJSONRoute, with_id
 
-router = APIRouter(prefix="/watchlist", tags=["Watchlist"])
+router = APIRouter(prefix="/watchlist", tags=["Watchlist"], route_class=FastJSONRoute)
 
 @router.get("")
 async def get_watchlist(current_user: dict = Depends(get_current_user)):
@@ -23,14 +24,7 @@ async def get_watchlist(current_user: dict = Depends(get_current_user)):
         except:
             continue
             
-    companies = list(db.companies.find({"_id": {"$in": object_ids}}))
-    
-    # Format for response
-    for company in companies:
-        company["id"] = str(company["_id"])
-        del company["_id"]
-        
-    return companies
+    return [with_id(company) for company in db.companies.find({"_id": {"$in": object_ids}})]
 
 @router.post("/{company_id}")
 async def add_to_watchlist(company_id: str, current_user: dict = Depends(get_current_user)):
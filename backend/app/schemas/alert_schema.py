@@ -0,0 +1,9 @@
+from pydantic import BaseModel, Field
+from typing import Literal
+
+
+class AlertCreate(BaseModel):
+    ticker: str = Field(..., min_length=1, max_length=20)
+    kind: Literal["price_above", "price_below", "change_above", "change_below", "volume_spike"]
+    # Price level (PKR), day move (%) or volume multiple of the 20-day average, depending on `kind`
+    threshold: float = Field(..., allow_inf_nan=False)
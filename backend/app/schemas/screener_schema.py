@@ -0,0 +1,7 @@
+from pydantic import BaseModel, Field
+
+
+class SavedScreenCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    expression: str = Field(..., min_length=1, max_length=1000)
+    sort: str = "-market_cap"
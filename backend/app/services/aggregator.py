@@ -1,7 +1,15 @@
 from ..database import db
+from .article_text import summarize_entry
+from .entity_tagger import entity_tagger
+from .headline_service import headline_service
+from .news_clusters import news_clusterer
+from .news_sentiment import record_sentiment, score_article
+from .semantic_search import semantic_search
+from .upstream import upstream
 from datetime import datetime
+from pymongo import InsertOne
+from pymongo.errors import BulkWriteError
 import time
-import feedparser
 
 RSS_FEEDS = [
     "https://techjuice.pk/feed/",
@@ -35,42 +43,96 @@ def clean_source_name(feed_title, feed_url):
     # Fallback: Use title but clean it
     return feed_title.split(" - ")[0].split(" | ")[0].strip()
 
-def fetch_news():
+def _feed_articles(feed_url: str, seen: set) -> list[dict]:
+    """New articles from one feed (links not stored yet and not seen earlier in this fetch), tagged and scored."""
+    feed = upstream.parse_feed(feed_url)
+    # Use generalized cleaner
+    source_name = clean_source_name(feed.feed.title, feed_url)
+    entries = feed.entries[:50]  # Get top 50 from each
+    # One query per feed for the links we already have
+    links = [entry.link for entry in entries]
+    seen.update(doc["link"] for doc in db.articles.find({"link": {"$in": links}}, {"link": 1, "_id": 0}))
+
     articles = []
-    new_count = 0
+    for entry in entries:
+        if entry.link in seen:
+            continue
+        seen.add(entry.link)
+        # Parse date
+        published_date = datetime.utcnow()
+        if hasattr(entry, 'published_parsed') and entry.published_parsed:
+            published_date = datetime.fromtimestamp(time.mktime(entry.published_parsed))
+
+        article = {
+            "title": entry.title,
+            "link": entry.link,
+            "published": entry.published,
+            "published_date": published_date,
+            "summary": entry.summary,  # raw HTML, served by /news/{id}
+            **summarize_entry(entry),
+            "source": source_name,
+            "created_at": datetime.utcnow()
+        }
+        # Companies / sectors mentioned, for /companies/{id}/news and /news/sectors/{sector}
+        article.update(entity_tagger.tag(article["title"], article.get("summary_text")))
+        article.update(score_article(article["title"], article.get("summary_text")))
+        articles.append(article)
+    return articles
+
+
+def _insert(articles: list[dict], joins: list) -> list[dict]:
+    """Writes the articles and the cluster joins in one bulk write; returns the articles inserted."""
+    if not articles:
+        return []
+    try:
+        db.articles.bulk_write([InsertOne(article) for article in articles] + joins, ordered=False)
+    except BulkWriteError as e:
+        failed = {error["index"] for error in e.details.get("writeErrors", [])}
+        print(f"Error saving {len(failed)} articles: {e}")
+        return [article for i, article in enumerate(articles) if i not in failed]
+    return articles
+
+
+def fetch_news():
+    """
+    Fetches every feed, then clusters the new articles (same story from another
+    source -> same cluster_id) and inserts them in one bulk write. Per article,
+    everything but the write runs in memory.
+    """
+    fetched, seen = [], set()
     for feed_url in RSS_FEEDS:
         try:
-            feed = feedparser.parse(feed_url)
-            # Use generalized cleaner
-            source_name = clean_source_name(feed.feed.title, feed_url)
-            
-            for entry in feed.entries[:50]:  # Get top 50 from each
-                # Parse date
-                published_date = datetime.utcnow()
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    published_date = datetime.fromtimestamp(time.mktime(entry.published_parsed))
-                
-                # Check for duplicates
-                if db.articles.find_one({"link": entry.link}):
-                    continue
-
-                article = {
-                    "title": entry.title,
-                    "link": entry.link,
-                    "published": entry.published, 
-                    "published_date": published_date,
-                    "summary": entry.summary,
-                    "source": source_name,
-                    "created_at": datetime.utcnow()
-                }
-                
-                db.articles.insert_one(article)
-                articles.append(article)
-                new_count += 1
-                
+            fetched.extend(_feed_articles(feed_url, seen))
         except Exception as e:
             print(f"Error fetching feed {feed_url}: {e}")
-    
+
+    articles = []
+    try:
+        joins = news_clusterer.assign_batch(fetched)
+        articles = _insert(fetched, joins)
+    except Exception as e:
+        print(f"Error saving articles: {e}")
+    for article in articles:
+        headline_service.push(article)
+    new_count = len(articles)
+
+    if articles:
+        try:
+            # Other processes reload their headline buffers (ours has the pushed articles)
+            headline_service.published()
+        except Exception as e:
+            print(f"Error publishing headlines: {e}")
+    try:
+        # Rolling per-ticker / per-sector mood (/news/sentiment), one bulk update per fetch
+        record_sentiment(articles)
+    except Exception as e:
+        print(f"Error recording news sentiment: {e}")
+    try:
+        # Embeddings for /search/semantic, in batches
+        semantic_search.index_articles(articles)
+    except Exception as e:
+        print(f"Error indexing news for semantic search: {e}")
+
     if new_count > 0:
         print(f"✓ Saved {new_count} new articles")
     else:
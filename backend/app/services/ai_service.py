@@ -1,8 +1,12 @@
 import os
+import json
+import hashlib
 import google.generativeai as genai
 from google.api_core import exceptions
 from ..config import settings
 from ..database import db
+from .news_sentiment import pulse_sentiment
+from .job_telemetry import instrumented_job, record_failure, record_items, upstream_call
 from datetime import datetime
 
 class AiService:
@@ -126,7 +130,6 @@ class AiService:
         try:
             # Request JSON output specifically
             response = self.model.generate_content(prompt, generation_config={"response_mime_type": "application/json"})
-            import json
             return json.loads(response.text)
         except Exception as e:
             print(f"Error generating SWOT: {e}")
@@ -137,39 +140,139 @@ class AiService:
                 "threats": []
             }
 
+    @staticmethod
+    def collect_pulse_inputs() -> dict:
+        """
+        Gathers everything the Market Pulse prompt depends on, in a canonical shape
+        (plain lists/dicts, rounded numbers) so it can be digested and compared.
+        """
+        # 1. Top Gainers
+        stocks_cursor = db.companies.find(
+            {"price": {"$ne": None}, "change_percent": {"$ne": None}},
+            {"ticker": 1, "change_percent": 1}
+        ).sort("change_percent", -1).limit(5)
+        top_movers = [[s.get("ticker"), round(s.get("change_percent") or 0, 2)] for s in stocks_cursor]
+
+        # 2. Sector Perf
+        pipeline = [{"$group": {"_id": "$industry", "avg": {"$avg": "$change_percent"}}}]
+        sectors_cursor = db.companies.aggregate(pipeline)
+        sector_map = {s["_id"]: round(s["avg"] or 0, 2) for s in sectors_cursor if s["_id"]}
+
+        # 3. News mood, scored at ingest (news_sentiment) instead of raw headlines
+        news_sentiment = pulse_sentiment()
+
+        return {"top_movers": top_movers, "sector_map": sector_map, "news_sentiment": news_sentiment}
+
+    @staticmethod
+    def pulse_digest(inputs: dict) -> str:
+        """Stable SHA-256 over the canonical JSON form of the pulse inputs."""
+        canonical = json.dumps(inputs, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def is_material_change(previous: dict, current: dict, threshold_pp: float) -> bool:
+        """
+        Decides whether the inputs moved enough to justify a new LLM call.
+
+        Material if:
+            - The set/order of top movers changed.
+            - A sector appeared/disappeared, or any sector average moved >= `threshold_pp`.
+            - Any top mover's change % moved >= `threshold_pp`.
+            - The market or a sector's news sentiment moved >= `PULSE_SENTIMENT_MATERIALITY`,
+              or the most covered tickers changed.
+        """
+        if not previous:
+            return True
+        if AiService.is_sentiment_change(previous.get("news_sentiment"), current.get("news_sentiment"),
+                                         settings.PULSE_SENTIMENT_MATERIALITY):
+            return True
+
+        prev_movers = previous.get("top_movers") or []
+        cur_movers = current.get("top_movers") or []
+        if [m[0] for m in prev_movers] != [m[0] for m in cur_movers]:
+            return True
+        if any(abs(p[1] - c[1]) >= threshold_pp for p, c in zip(prev_movers, cur_movers)):
+            return True
+
+        prev_sectors = previous.get("sector_map") or {}
+        cur_sectors = current.get("sector_map") or {}
+        if prev_sectors.keys() != cur_sectors.keys():
+            return True
+        return any(abs(prev_sectors[k] - cur_sectors[k]) >= threshold_pp for k in cur_sectors)
+
+    @staticmethod
+    def is_sentiment_change(previous: dict, current: dict, threshold: float) -> bool:
+        if not previous or not current:
+            return previous != current
+        if abs(previous["market"][0] - current["market"][0]) >= threshold:
+            return True
+        if [t[0] for t in previous["tickers"]] != [t[0] for t in current["tickers"]]:
+            return True
+        prev_sectors, cur_sectors = previous["sectors"], current["sectors"]
+        if prev_sectors.keys() != cur_sectors.keys():
+            return True
+        return any(abs(prev_sectors[k] - cur_sectors[k]) >= threshold for k in cur_sectors)
+
+    @staticmethod
+    def record_pulse_outcome(outcome: str):
+        """
+        Increments today's pulse counter for `outcome`
+        ('generated', 'skipped_unchanged', 'skipped_immaterial', 'failed').
+        """
+        record_items(**{outcome: 1})
+        today = datetime.utcnow().strftime("%Y-%m-%d")
+        try:
+            db.ai_insights.update_one(
+                {"_id": f"pulse_stats_{today}"},
+                {"$inc": {outcome: 1}, "$set": {"type": "pulse_stats", "date": today}},
+                upsert=True
+            )
+        except Exception as e:
+            print(f"WARN: Could not record pulse stats: {e}")
+
+    @instrumented_job("analyze_and_store_pulse")
     def analyze_and_store_pulse(self):
         """
         Scheduled Job: Analyzes market data and updates the 'latest_pulse' document in DB.
         Sync method for Scheduler.
+
+        Skips the Gemini call when the inputs digest equals the stored one, or when the
+        change stays below `PULSE_MATERIALITY_PP` (e.g. overnight and on weekends).
         """
         try:
              print("INFO: Starting AI Market Pulse Analysis...")
              # Gather Data (Re-implementing logic directly to ensure synchronous execution)
-             
-             # 1. Top Gainers
-             stocks_cursor = db.companies.find({"price": {"$ne": None}, "change_percent": {"$ne": None}}).sort("change_percent", -1).limit(5)
-             top_gainers = [f"{s.get('ticker')} ({s.get('change_percent', 0):.1f}%)" for s in stocks_cursor]
-             
-             # 2. Sector Perf
-             pipeline = [{"$group": {"_id": "$industry", "avg": {"$avg": "$change_percent"}}}]
-             sectors_cursor = db.companies.aggregate(pipeline)
-             sector_map = {s["_id"]: round(s["avg"] or 0, 2) for s in sectors_cursor if s["_id"]}
-             
-             # 3. News
-             news_cursor = db.news.find().sort("published_date", -1).limit(3)
-             headlines = [n.get("title", "") for n in news_cursor]
-             
+             inputs = self.collect_pulse_inputs()
+             digest = self.pulse_digest(inputs)
+
+             previous = db.ai_insights.find_one({"_id": "latest_pulse"}, {"input_digest": 1, "inputs": 1, "summary": 1})
+             if previous and previous.get("summary"):
+                 if previous.get("input_digest") == digest:
+                     print("INFO: Pulse inputs unchanged, skipping AI call.")
+                     self.record_pulse_outcome("skipped_unchanged")
+                     return
+                 if not self.is_material_change(previous.get("inputs"), inputs, settings.PULSE_MATERIALITY_PP):
+                     print("INFO: Pulse inputs changed below materiality threshold, skipping AI call.")
+                     self.record_pulse_outcome("skipped_immaterial")
+                     return
+
              # 4. Generate AI Insight
              if not self.model:
                  print("WARN: AI Model missing, skipping pulse generation.")
                  return
 
+             top_gainers = [f"{ticker} ({change:.1f}%)" for ticker, change in inputs["top_movers"]]
+             mood = inputs["news_sentiment"]
+             sector_mood = ", ".join(f"{sector} {score:+.2f}" for sector, score in mood["sectors"].items())
+             ticker_mood = ", ".join(f"{ticker} {score:+.2f} ({count} articles)" for ticker, score, count in mood["tickers"])
              prompt = f"""
              You are a high-frequency trading analyst. Analyze this LIVE market data:
              
              **Top Movers:** {', '.join(top_gainers)}
-             **Sector Heatmap:** {str(sector_map)}
-             **Breaking News:** {headlines}
+             **Sector Heatmap:** {str(inputs["sector_map"])}
+             **News Sentiment (last 24h, -1 bearish to +1 bullish):** market {mood["market"][0]:+.2f} over {mood["market"][1]} articles
+             **Sector News Mood:** {sector_mood or "n/a"}
+             **Most Covered Tickers:** {ticker_mood or "n/a"}
              
              **Task:** Write a live, urgency-driven commentary (max 3 sentences) for a trader's dashboard. 
              Highlight where the momentum is RIGHT NOW. Use financial terminology (bullish, breakout, volume, rally).
@@ -177,22 +280,28 @@ class AiService:
              """
              
              try:
-                 response = self.model.generate_content(prompt)
+                 with upstream_call():
+                     response = self.model.generate_content(prompt)
                  summary = response.text.strip()
 
-                 # 5. Store in DB
+                 # 5. Store in DB (with the digest so the next run can skip if nothing changed)
                  db.ai_insights.update_one(
                      {"_id": "latest_pulse"},
                      {"$set": {
                          "summary": summary, 
                          "timestamp": datetime.utcnow(),
-                         "type": "market_pulse"
+                         "type": "market_pulse",
+                         "input_digest": digest,
+                         "inputs": inputs
                      }},
                      upsert=True
                  )
+                 self.record_pulse_outcome("generated")
                  print(f"SUCCESS: AI Pulse Analyzed: {summary[:50]}...")
 
              except Exception as e:
+                  self.record_pulse_outcome("failed")
+                  record_failure(e)
                   if "429" in str(e) or "Quota exceeded" in str(e) or "ResourceExhausted" in str(e):
                       print("WARN: AI Quota Exceeded (429). Keeping previous market pulse.")
                       # Fallback logic if needed
@@ -201,5 +310,23 @@ class AiService:
                       
         except Exception as e:
              print(f"ERROR: AI Pulse Analysis failed: {e}")
+             record_failure(e)
+
+    @staticmethod
+    def get_pulse_stats(days: int = 7) -> list:
+        """Daily pulse counters (newest first), incl. how many LLM calls were avoided."""
+        docs = db.ai_insights.find({"type": "pulse_stats"}).sort("date", -1).limit(days)
+        stats = []
+        for d in docs:
+            skipped = d.get("skipped_unchanged", 0) + d.get("skipped_immaterial", 0)
+            stats.append({
+                "date": d.get("date"),
+                "generated": d.get("generated", 0),
+                "failed": d.get("failed", 0),
+                "skipped_unchanged": d.get("skipped_unchanged", 0),
+                "skipped_immaterial": d.get("skipped_immaterial", 0),
+                "llm_calls_avoided": skipped,
+            })
+        return stats
 
 ai_service = AiService()
@@ -0,0 +1,284 @@
+"""
+User price alerts, evaluated by the live price job after every refresh.
+
+Alerts are one-shot conditions on a ticker's latest quote: price at/above or
+at/below a level, day move at/above or at/below a %, or volume at least N times
+its 20-day average. The worker keeps every active alert in a sorted-threshold
+index: per (ticker, metric, direction), the thresholds in ascending order. An
+"above" list fires exactly its prefix up to the new value (a "below" list its
+suffix), so a refresh costs one vectorized comparison of each list's nearest
+threshold against the new values, plus a slice per list that actually fired.
+Alerts that never come close are never looked at.
+
+Values come from the screener universe the same job has just rebuilt.
+Created/deleted alerts reach the worker through `updated_at` (polled each cycle).
+"""
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+
+import numpy as np
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from ..database import db
+from .notifications import build_sink
+
+ALERTS_COLLECTION = "alerts"
+
+# kind -> (universe column, fires when the value is at or above the threshold)
+ALERT_KINDS = {
+    "price_above": ("price", True),
+    "price_below": ("price", False),
+    "change_above": ("change_percent", True),
+    "change_below": ("change_percent", False),
+    "volume_spike": ("relative_volume", True),
+}
+_DESCRIPTIONS = {
+    "price_above": "price {value:,.2f} is at or above {threshold:,.2f}",
+    "price_below": "price {value:,.2f} is at or below {threshold:,.2f}",
+    "change_above": "moved {value:+.2f}% today (alert at {threshold:+.2f}%)",
+    "change_below": "moved {value:+.2f}% today (alert at {threshold:+.2f}%)",
+    "volume_spike": "volume at {value:.1f}x its 20-day average (alert at {threshold:.1f}x)",
+}
+# Re-read alerts updated slightly before the last sync, in case API and worker clocks disagree
+SYNC_OVERLAP = timedelta(seconds=30)
+
+
+class ThresholdList:
+    """Alert ids sorted by threshold (two parallel lists)."""
+    __slots__ = ("thresholds", "ids")
+
+    def __init__(self):
+        self.thresholds = []
+        self.ids = []
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, threshold: float, alert_id):
+        i = bisect_right(self.thresholds, threshold)
+        self.thresholds.insert(i, threshold)
+        self.ids.insert(i, alert_id)
+
+    def remove(self, threshold: float, alert_id) -> bool:
+        i = bisect_left(self.thresholds, threshold)
+        while i < len(self.ids) and self.thresholds[i] == threshold:
+            if self.ids[i] == alert_id:
+                del self.thresholds[i], self.ids[i]
+                return True
+            i += 1
+        return False
+
+    def pop_through(self, value: float, above: bool) -> list:
+        """Removes and returns (threshold, id) for every alert `value` satisfies."""
+        if above:
+            k = bisect_right(self.thresholds, value)
+            fired = list(zip(self.thresholds[:k], self.ids[:k]))
+            del self.thresholds[:k], self.ids[:k]
+        else:
+            k = bisect_left(self.thresholds, value)
+            fired = list(zip(self.thresholds[k:], self.ids[k:]))
+            del self.thresholds[k:], self.ids[k:]
+        return fired
+
+
+class _Side:
+    """All lists for one (metric, direction), with each list's nearest threshold kept for vector checks."""
+    def __init__(self, metric: str, above: bool):
+        self.metric = metric
+        self.above = above
+        self.tickers = []
+        self.slots = {}
+        self.lists = []
+        self.bounds = []  # lowest threshold of "above" lists, highest of "below" ones; +/-inf when empty
+        self._rows = None
+        self._rows_tickers = None
+
+    def _empty_bound(self) -> float:
+        return np.inf if self.above else -np.inf
+
+    def _update_bound(self, slot: int):
+        thresholds = self.lists[slot].thresholds
+        if not thresholds:
+            self.bounds[slot] = self._empty_bound()
+        else:
+            self.bounds[slot] = thresholds[0] if self.above else thresholds[-1]
+
+    def add(self, ticker: str, threshold: float, alert_id):
+        slot = self.slots.get(ticker)
+        if slot is None:
+            slot = self.slots[ticker] = len(self.tickers)
+            self.tickers.append(ticker)
+            self.lists.append(ThresholdList())
+            self.bounds.append(self._empty_bound())
+            self._rows = None
+        self.lists[slot].add(threshold, alert_id)
+        self._update_bound(slot)
+
+    def remove(self, ticker: str, threshold: float, alert_id):
+        slot = self.slots.get(ticker)
+        if slot is not None and self.lists[slot].remove(threshold, alert_id):
+            self._update_bound(slot)
+
+    def _rows_for(self, universe) -> np.ndarray:
+        # The universe is rebuilt every cycle but its tickers rarely change; a list compare is cheap
+        if self._rows is None or self._rows_tickers != universe.tickers:
+            positions = {ticker: i for i, ticker in enumerate(universe.tickers)}
+            self._rows = np.array([positions.get(t, -1) for t in self.tickers], dtype=np.int64)
+            self._rows_tickers = universe.tickers
+        return self._rows
+
+    def fire(self, universe) -> list:
+        """(ticker, threshold, alert_id, value) for every alert the universe's values satisfy."""
+        if not self.tickers or not len(universe):
+            return []
+        rows = self._rows_for(universe)
+        values = universe.columns[self.metric][rows]
+        values[rows < 0] = np.nan
+        bounds = np.array(self.bounds)
+        # NaN (no quote / unknown ticker) compares false either way
+        hits = np.flatnonzero(values >= bounds if self.above else values <= bounds)
+        fired = []
+        for slot in hits.tolist():
+            value = float(values[slot])
+            for threshold, alert_id in self.lists[slot].pop_through(value, self.above):
+                fired.append((self.tickers[slot], threshold, alert_id, value))
+            self._update_bound(slot)
+        return fired
+
+
+class AlertIndex:
+    """Sorted-threshold index over active alerts, one `_Side` per kind."""
+    def __init__(self):
+        self.sides = {kind: _Side(metric, above) for kind, (metric, above) in ALERT_KINDS.items()}
+        self.entries = {}  # alert_id -> (kind, ticker, threshold)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, alert_id, kind: str, ticker: str, threshold: float):
+        if alert_id in self.entries:
+            return
+        self.sides[kind].add(ticker, threshold, alert_id)
+        self.entries[alert_id] = (kind, ticker, threshold)
+
+    def remove(self, alert_id):
+        entry = self.entries.pop(alert_id, None)
+        if entry is not None:
+            kind, ticker, threshold = entry
+            self.sides[kind].remove(ticker, threshold, alert_id)
+
+    def evaluate(self, universe) -> list:
+        """Removes and returns the alerts triggered by `universe` as (alert_id, kind, ticker, threshold, value)."""
+        triggered = []
+        for kind, side in self.sides.items():
+            for ticker, threshold, alert_id, value in side.fire(universe):
+                self.entries.pop(alert_id, None)
+                triggered.append((alert_id, kind, ticker, threshold, value))
+        return triggered
+
+
+def describe(kind: str, ticker: str, threshold: float, value: float) -> str:
+    return f"{ticker}: " + _DESCRIPTIONS[kind].format(threshold=threshold, value=value)
+
+
+def _user_channels(user_ids) -> dict:
+    """{user_id: channels} from the users' notification preferences."""
+    object_ids = [ObjectId(u) for u in user_ids if ObjectId.is_valid(u)]
+    channels = {}
+    for user in db.users.find({"_id": {"$in": object_ids}}, {"email_notifs": 1, "push_notifs": 1}):
+        selected = ["in_app"]
+        if user.get("email_notifs", True):
+            selected.append("email")
+        if user.get("push_notifs", False):
+            selected.append("push")
+        channels[str(user["_id"])] = selected
+    return channels
+
+
+class AlertEngine:
+    """Worker-side index of active alerts, synced from `db.alerts` and evaluated each refresh."""
+    def __init__(self, sink=None):
+        self.index = None
+        self.synced_at = None
+        self.sink = sink
+
+    def sync(self):
+        """Loads all active alerts on first use, then applies alerts created/updated since the last sync."""
+        now = datetime.utcnow()
+        if self.index is None:
+            self.index = AlertIndex()
+            query = {"status": "active"}
+        else:
+            query = {"updated_at": {"$gt": self.synced_at - SYNC_OVERLAP}}
+        projection = {"kind": 1, "ticker": 1, "threshold": 1, "status": 1}
+        for alert in db[ALERTS_COLLECTION].find(query, projection):
+            if alert["status"] == "active":
+                self.index.add(alert["_id"], alert["kind"], alert["ticker"], alert["threshold"])
+            else:
+                self.index.remove(alert["_id"])
+        self.synced_at = now
+
+    def run(self, universe) -> list:
+        """Evaluates alerts against `universe`; returns the queued notifications."""
+        self.sync()
+        triggered = self.index.evaluate(universe)
+        if not triggered:
+            return []
+        now = datetime.utcnow()
+        cycle = ObjectId()
+        db[ALERTS_COLLECTION].bulk_write([
+            UpdateOne({"_id": alert_id, "status": "active"}, {"$set": {
+                "status": "triggered", "triggered_at": now, "triggered_value": value, "updated_at": now,
+                "triggered_cycle": cycle,
+            }})
+            for alert_id, _, _, _, value in triggered
+        ], ordered=False)
+
+        # Only alerts this cycle actually transitioned (one deleted since the last sync is not notified)
+        owners = {a["_id"]: a["user_id"] for a in db[ALERTS_COLLECTION].find(
+            {"_id": {"$in": [t[0] for t in triggered]}, "triggered_cycle": cycle}, {"user_id": 1})}
+        channels = _user_channels(set(owners.values()))
+        notifications = [
+            {
+                "user_id": owners[alert_id],
+                "alert_id": alert_id,
+                "ticker": ticker,
+                "kind": kind,
+                "threshold": threshold,
+                "value": value,
+                "message": describe(kind, ticker, threshold, value),
+                "channels": channels.get(owners[alert_id], ["in_app"]),
+                "created_at": now,
+                "read": False,
+            }
+            for alert_id, kind, ticker, threshold, value in triggered
+            if alert_id in owners
+        ]
+        if self.sink is None:
+            self.sink = build_sink()
+        self.sink.send(notifications)
+        return notifications
+
+
+alert_engine = AlertEngine()
+
+
+def evaluate_alerts(universe):
+    """Called by the live price job with the freshly built screener universe."""
+    try:
+        notifications = alert_engine.run(universe)
+        if notifications:
+            print(f"INFO: {len(notifications)} alerts triggered")
+    except Exception as e:
+        # Rebuild the index from the database next time rather than trust a half-applied cycle
+        alert_engine.index = None
+        print(f"WARN: Alert evaluation failed: {e}")
+
+
+def ensure_alert_indexes():
+    try:
+        db[ALERTS_COLLECTION].create_index([("status", 1), ("updated_at", 1)])
+        db[ALERTS_COLLECTION].create_index([("user_id", 1), ("created_at", -1)])
+    except Exception as e:
+        print(f"WARN: Could not create alert indexes: {e}")
@@ -0,0 +1,98 @@
+"""
+Analytical queries over the Parquet snapshots (see parquet_export.ensure_snapshots),
+executed by DuckDB. Only named, parameterized queries are exposed; DuckDB is an
+optional dependency (`pip install duckdb`).
+"""
+from .parquet_export import ensure_snapshots
+
+# name -> (description, SQL). Views `companies` and `prices` are bound to the snapshots;
+# `$sector` (NULL = all sectors) and `$limit` are always bound.
+QUERIES = {
+    "sector_summary": (
+        "Companies, total/median market cap, revenue, profit and average daily move per sector",
+        """
+        SELECT industry AS sector,
+               count(*) AS companies,
+               sum(market_cap) AS total_market_cap,
+               median(market_cap) AS median_market_cap,
+               sum(revenue) AS total_revenue,
+               sum(net_profit) AS total_net_profit,
+               round(avg(change_percent), 3) AS avg_change_percent
+        FROM companies
+        WHERE $sector IS NULL OR industry = $sector
+        GROUP BY industry
+        ORDER BY total_market_cap DESC NULLS LAST
+        LIMIT $limit
+        """,
+    ),
+    "valuation": (
+        "Per-company P/E, P/S and net margin, cheapest P/E first",
+        """
+        SELECT ticker, name, industry AS sector, market_cap,
+               round(market_cap / nullif(net_profit, 0), 2) AS pe,
+               round(market_cap / nullif(revenue, 0), 2) AS ps,
+               round(100.0 * net_profit / nullif(revenue, 0), 2) AS net_margin_pct
+        FROM companies
+        WHERE market_cap IS NOT NULL AND ($sector IS NULL OR industry = $sector)
+        ORDER BY pe ASC NULLS LAST
+        LIMIT $limit
+        """,
+    ),
+    "sector_valuation": (
+        "Median P/E, P/S and net margin per sector",
+        """
+        SELECT industry AS sector,
+               count(*) AS companies,
+               round(median(market_cap / nullif(net_profit, 0)), 2) AS median_pe,
+               round(median(market_cap / nullif(revenue, 0)), 2) AS median_ps,
+               round(median(100.0 * net_profit / nullif(revenue, 0)), 2) AS median_net_margin_pct
+        FROM companies
+        WHERE $sector IS NULL OR industry = $sector
+        GROUP BY industry
+        ORDER BY median_pe ASC NULLS LAST
+        LIMIT $limit
+        """,
+    ),
+    "price_returns": (
+        "First/last close and return per ticker over the snapshot window (90 days)",
+        """
+        SELECT p.ticker, c.industry AS sector,
+               arg_min(p.close, coalesce(p.observed_at, p.ts)) AS first_close,
+               arg_max(p.close, coalesce(p.observed_at, p.ts)) AS last_close,
+               round(100.0 * (arg_max(p.close, coalesce(p.observed_at, p.ts))
+                              / nullif(arg_min(p.close, coalesce(p.observed_at, p.ts)), 0) - 1), 2) AS return_pct,
+               count(*) AS observations
+        FROM prices p LEFT JOIN companies c ON c.ticker = p.ticker
+        WHERE $sector IS NULL OR c.industry = $sector
+        GROUP BY p.ticker, c.industry
+        ORDER BY return_pct DESC NULLS LAST
+        LIMIT $limit
+        """,
+    ),
+}
+
+
+class AnalyticsUnavailable(Exception):
+    pass
+
+
+def run_query(name: str, sector: str = None, limit: int = 100) -> dict:
+    """Runs the named query against fresh-enough snapshots. Raises KeyError for unknown names."""
+    _, sql = QUERIES[name]
+    try:
+        import duckdb
+    except ImportError:
+        raise AnalyticsUnavailable("DuckDB is not installed on this server (pip install duckdb)")
+
+    paths = ensure_snapshots()
+    con = duckdb.connect()
+    try:
+        for view, path in paths.items():
+            quoted = path.replace("'", "''")
+            con.execute(f"CREATE VIEW {view} AS SELECT * FROM read_parquet('{quoted}')")
+        cursor = con.execute(sql, {"sector": sector, "limit": limit})
+        columns = [d[0] for d in cursor.description]
+        rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    finally:
+        con.close()
+    return {"query": name, "columns": columns, "rows": rows}
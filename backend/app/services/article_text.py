@@ -0,0 +1,137 @@
+"""
+Plain-text snippets, thumbnails and reading time for news articles, computed
+once when the aggregator inserts an article.
+
+Feed summaries are HTML (often with embedded images, tracking pixels and
+"Continue reading" links). The raw HTML stays in `summary`; list endpoints
+serve `summary_text` (capped at SUMMARY_TEXT_MAX characters), `thumbnail` and
+`reading_time_minutes` instead. The HTML-to-text pass is a handful of
+precompiled regexes rather than a full parser: feed snippets are small and
+only need to read well, not round-trip.
+"""
+import html
+import math
+import re
+
+from pymongo import UpdateOne
+
+from ..database import db
+
+SUMMARY_TEXT_MAX = 280
+WORDS_PER_MINUTE = 200
+
+# Fields `/news` (and the dashboard) return; the HTML summary is only served by /news/{id}
+ARTICLE_LIST_PROJECTION = {
+    "title": 1, "link": 1, "published": 1, "published_date": 1, "source": 1,
+    "summary_text": 1, "thumbnail": 1, "reading_time_minutes": 1,
+    "cluster_id": 1, "cluster_size": 1, "cluster_sources": 1, "tickers": 1, "sectors": 1,
+    "sentiment": 1, "sentiment_label": 1,
+}
+
+# An unterminated block or comment (a truncated snippet) runs to the end of the fragment
+_DROP_BLOCKS = re.compile(
+    r"<(script|style|noscript|iframe|svg)\b.*?(?:</\1\s*>|\Z)|<!--.*?(?:-->|\Z)", re.I | re.S,
+)
+_BREAKS = re.compile(r"<(?:br|/p|/div|/li|/h[1-6]|/tr|/blockquote)\b[^>]*>", re.I)
+# A tag starts with a name, `/`, `!` or `?`, so a bare "<" in text ("KSE-100 < 120,000") is kept;
+# a tag left open at the end of a truncated snippet is dropped
+_TAGS = re.compile(r"<[A-Za-z/!?][^<>]*(?:>|\Z)")
+_IMG = re.compile(r"<img\b[^>]*?\bsrc\s*=\s*(['\"])(.*?)\1", re.I | re.S)
+_WIDTH = re.compile(r"\bwidth\s*=\s*['\"]?(\d+)", re.I)
+# Trailing boilerplate some feeds append ("The post X appeared first on Y.", "Continue reading...")
+_BOILERPLATE = {
+    "The post ": re.compile(r"The post .{0,300}? appeared first on [^\n]{0,100}?\.\s*", re.S),
+    "Continue reading": re.compile(r"Continue reading\W*"),
+    "Read more": re.compile(r"Read more\W*"),
+}
+
+
+def html_to_text(markup: str) -> str:
+    """Visible text of an HTML fragment, paragraphs separated by newlines."""
+    if not markup:
+        return ""
+    text = _DROP_BLOCKS.sub(" ", markup)
+    text = _BREAKS.sub("\n", text)
+    text = html.unescape(_TAGS.sub(" ", text))
+    text = "\n".join(" ".join(line.split()) for line in text.split("\n") if not line.isspace() and line)
+    for marker, pattern in _BOILERPLATE.items():
+        start = text.rfind(marker)
+        if start >= 0 and pattern.fullmatch(text, start):
+            return text[:start].rstrip()
+    return text
+
+
+def truncate(text: str, limit: int = SUMMARY_TEXT_MAX) -> str:
+    """`text` cut at a word boundary to at most `limit` characters (with an ellipsis)."""
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    cut = text[:limit - 1]
+    space = cut.rfind(" ")
+    if space > limit // 2:
+        cut = cut[:space]
+    return cut.rstrip(" ,;:.-") + "…"
+
+
+def first_image(markup: str):
+    """`src` of the first image in `markup` that is not a 1x1 tracking pixel."""
+    for match in _IMG.finditer(markup or ""):
+        src = html.unescape(match.group(2).strip())
+        width = _WIDTH.search(match.group(0))
+        if src.startswith(("http://", "https://")) and not (width and int(width.group(1)) <= 1):
+            return src
+    return None
+
+
+def _entry_thumbnail(entry):
+    """Thumbnail from the feed's media elements (media:thumbnail, media:content, image enclosures)."""
+    for thumbnail in getattr(entry, "media_thumbnail", None) or []:
+        if thumbnail.get("url"):
+            return thumbnail["url"]
+    for media in getattr(entry, "media_content", None) or []:
+        if media.get("url") and (media.get("medium") == "image" or (media.get("type") or "").startswith("image/")):
+            return media["url"]
+    for link in getattr(entry, "links", None) or []:
+        if link.get("rel") == "enclosure" and (link.get("type") or "").startswith("image/") and link.get("href"):
+            return link["href"]
+    return None
+
+
+def reading_time_minutes(text: str) -> int:
+    return max(1, math.ceil(len(text.split()) / WORDS_PER_MINUTE))
+
+
+def summarize(summary_html: str, content_html: str = None, thumbnail: str = None) -> dict:
+    """
+    Derived fields for an article: the plain-text snippet, a thumbnail URL (or
+    None) and the reading time of the full content when the feed carries it,
+    else of the summary.
+    """
+    text = html_to_text(summary_html)
+    body = html_to_text(content_html) if content_html else text
+    return {
+        "summary_text": truncate(text),
+        "thumbnail": thumbnail or first_image(summary_html) or (first_image(content_html) if content_html else None),
+        "reading_time_minutes": reading_time_minutes(body),
+    }
+
+
+def summarize_entry(entry) -> dict:
+    """`summarize` for a feedparser entry."""
+    content = getattr(entry, "content", None) or []
+    content_html = " ".join(part.get("value", "") for part in content) or None
+    return summarize(getattr(entry, "summary", "") or "", content_html, _entry_thumbnail(entry))
+
+
+def backfill_article_text(batch_size: int = 500) -> int:
+    """Adds the derived fields to articles stored before they existed; returns how many were updated."""
+    updated, batch = 0, []
+    cursor = db.articles.find({"summary_text": {"$exists": False}}, {"summary": 1})
+    for doc in cursor:
+        batch.append(UpdateOne({"_id": doc["_id"]}, {"$set": summarize(doc.get("summary") or "")}))
+        if len(batch) >= batch_size:
+            updated += db.articles.bulk_write(batch, ordered=False).modified_count
+            batch = []
+    if batch:
+        updated += db.articles.bulk_write(batch, ordered=False).modified_count
+    return updated
@@ -0,0 +1,136 @@
+import hashlib
+import threading
+import time
+from bson import ObjectId
+from ..config import settings
+from ..database import db
+from ..models.company import Company, QUOTE_FIELDS, encode_companies
+from ..utils.http_cache import make_etag
+
+PROFILE_FIELDS = tuple(f for f in Company.__struct_fields__ if f not in QUOTE_FIELDS and f != "id")
+
+
+class Fragment:
+    """
+    One cached piece of a company document, kept as pre-encoded JSON members
+    (`"name":"...","ceo":...` without braces or `id`), so a cached company costs
+    a couple of bytes objects instead of a dict of Python objects.
+    """
+    __slots__ = ("members", "etag", "generation", "expires_at")
+
+    def __init__(self, kind: str, company_id: str, values: dict, generation: int, ttl: int):
+        self.members = encode_companies(values)[1:-1]
+        self.etag = make_etag(kind, company_id, hashlib.sha1(self.members).hexdigest())
+        self.generation = generation
+        self.expires_at = time.monotonic() + ttl
+
+
+def fragment_body(company_id: str, *fragments: Fragment) -> bytes:
+    """JSON object with `id` followed by the members of each fragment."""
+    return b'{"id":' + encode_companies(company_id) + b"".join(b"," + f.members for f in fragments) + b"}"
+
+
+class CacheGenerations:
+    """
+    Cross-process invalidation counters stored in `db.cache_state`.
+
+    The sync jobs may run in another process (the worker), so they bump a counter
+    in Mongo instead of touching our memory. Readers poll the counters at most
+    every `CACHE_GENERATION_POLL_SECONDS`, so cache hits stay free of DB queries.
+    """
+    def __init__(self, key: str, poll_seconds: int):
+        self.key = key
+        self.poll_seconds = poll_seconds
+        self._values = {}
+        self._polled_at = None
+        self._lock = threading.Lock()
+
+    def _poll(self):
+        doc = db.cache_state.find_one({"_id": self.key}) or {}
+        self._values = {k: v for k, v in doc.items() if k != "_id"}
+        self._polled_at = time.monotonic()
+
+    def get(self, kind: str) -> int:
+        with self._lock:
+            if self._polled_at is None or time.monotonic() - self._polled_at > self.poll_seconds:
+                try:
+                    self._poll()
+                except Exception as e:
+                    print(f"WARN: Could not poll cache generations: {e}")
+                    self._polled_at = time.monotonic()
+            return self._values.get(kind, 0)
+
+    def bump(self, kind: str):
+        db.cache_state.update_one({"_id": self.key}, {"$inc": {kind: 1}}, upsert=True)
+        with self._lock:
+            self._values[kind] = self._values.get(kind, 0) + 1
+
+
+class CompanyCache:
+    """
+    Per-company cache for `GET /companies/{id}`, split into two fragments:
+
+    - **profile**: static fields, long TTL, invalidated by the daily/full sync jobs.
+    - **quote**: price fields, short TTL, invalidated by the live price job.
+
+    Each fragment carries a strong ETag derived from its content version, so clients
+    can revalidate with `If-None-Match` and get a bodyless 304.
+    """
+    def __init__(self):
+        self.generations = CacheGenerations("companies", settings.CACHE_GENERATION_POLL_SECONDS)
+        self._profiles = {}
+        self._quotes = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _fresh(fragment, generation: int) -> bool:
+        return fragment is not None and fragment.generation == generation and time.monotonic() < fragment.expires_at
+
+    def get(self, company_id: str):
+        """
+        Returns (profile_fragment, quote_fragment), or None if the company does not exist.
+        Loads the document with a single `find_one` only when a fragment is stale.
+        """
+        profile_gen = self.generations.get("profile")
+        quote_gen = self.generations.get("quote")
+
+        profile = self._profiles.get(company_id)
+        quote = self._quotes.get(company_id)
+        if self._fresh(profile, profile_gen) and self._fresh(quote, quote_gen):
+            self.hits += 1
+            return profile, quote
+
+        self.misses += 1
+        doc = db.companies.find_one({"_id": ObjectId(company_id)})
+        if not doc:
+            return None
+        company = Company.from_document(doc)
+
+        with self._lock:
+            if not self._fresh(profile, profile_gen):
+                values = {field: getattr(company, field) for field in PROFILE_FIELDS}
+                profile = Fragment("profile", company_id, values, profile_gen, settings.COMPANY_PROFILE_TTL)
+                self._profiles[company_id] = profile
+            values = {field: getattr(company, field) for field in QUOTE_FIELDS}
+            quote = Fragment("quote", company_id, values, quote_gen, settings.COMPANY_QUOTE_TTL)
+            self._quotes[company_id] = quote
+        return profile, quote
+
+    def invalidate_profiles(self):
+        """Called by the sync jobs after company metadata changed."""
+        try:
+            self.generations.bump("profile")
+            self.generations.bump("quote")
+        except Exception as e:
+            print(f"WARN: Could not invalidate company profile cache: {e}")
+
+    def invalidate_quotes(self):
+        """Called by the live price job after prices changed."""
+        try:
+            self.generations.bump("quote")
+        except Exception as e:
+            print(f"WARN: Could not invalidate company quote cache: {e}")
+
+company_cache = CompanyCache()
@@ -0,0 +1,220 @@
+"""
+Idempotent bulk loading of company reference data into `db.companies`.
+
+Sources are JSON files in either of the two shapes we ship:
+- `companies_enriched.json`: a list of records (`psx_symbol`, `sector`, `founded`...)
+- `app/data/company_data.json`: `{sector: {ticker: {...}}}`
+
+Records are streamed (ijson, so large files never sit in memory), normalized to
+the canonical Company schema and upserted by ticker in `bulk_write` batches.
+By default the load is built in a shadow collection (a copy of the live one, so
+`_id`s and live prices survive) and swapped in with an atomic `renameCollection`:
+readers see either the old universe or the new one, never an empty or partial one.
+"""
+import json
+import time
+from dataclasses import dataclass, field
+
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+
+from ..models.company import Company, normalize_document, pe_ratio
+from .company_cache import company_cache
+
+
+@dataclass
+class LoadStats:
+    read: int = 0
+    skipped: int = 0
+    upserted: int = 0
+    modified: int = 0
+    duplicates_removed: int = 0
+    seconds: float = 0.0
+    sources: list = field(default_factory=list)
+
+    @property
+    def records_per_sec(self) -> float:
+        return round(self.read / self.seconds, 1) if self.seconds else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "read": self.read,
+            "skipped": self.skipped,
+            "upserted": self.upserted,
+            "modified": self.modified,
+            "duplicates_removed": self.duplicates_removed,
+            "seconds": round(self.seconds, 3),
+            "records_per_sec": self.records_per_sec,
+            "sources": self.sources,
+        }
+
+
+def _first_char(f) -> bytes:
+    while True:
+        ch = f.read(1)
+        if not ch or not ch.isspace():
+            f.seek(0)
+            return ch
+
+
+def iter_json_records(path: str):
+    """Yields raw company dicts from either supported file shape, streaming when ijson is installed."""
+    try:
+        import ijson
+    except ImportError:
+        ijson = None
+
+    with open(path, "rb") as f:
+        shape = _first_char(f)
+        if shape == b"[":
+            items = ijson.items(f, "item", use_float=True) if ijson else json.load(f)
+            yield from items
+        elif shape == b"{":
+            # {sector: {ticker: {...}}}; one sector at a time is small
+            sectors = ijson.kvitems(f, "", use_float=True) if ijson else json.load(f).items()
+            for sector, companies in sectors:
+                for ticker, data in companies.items():
+                    yield {**data, "ticker": ticker, "industry": sector}
+        else:
+            raise ValueError(f"{path}: expected a JSON list or object")
+
+
+# Derived fields a record can invalidate (normalized to None) without carrying a replacement
+CLEARABLE_FIELDS = ("revenue_fiscal_year", "pe_ratio")
+
+
+def normalize_record(raw: dict):
+    """Raw record -> canonical update (`$set`, plus `$unset` for invalidated derived fields), or None without a ticker."""
+    data = normalize_document(raw)
+    doc = Company.from_document(data).to_document()
+    if not doc.get("ticker"):
+        return None
+    doc["ticker"] = doc["ticker"].upper()
+    # growth_tags is curated in the DB, not in the source files
+    doc.pop("growth_tags", None)
+    update = {"$set": doc}
+    unset = [field for field in CLEARABLE_FIELDS if field in data and data[field] is None]
+    if unset:
+        update["$unset"] = {field: "" for field in unset}
+    return update
+
+
+def dedupe_by_ticker(collection) -> int:
+    """Removes duplicate documents per ticker (keeps the oldest `_id`). Returns how many were deleted."""
+    pipeline = [
+        {"$match": {"ticker": {"$type": "string"}}},
+        {"$group": {"_id": "$ticker", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    extra_ids = []
+    for group in collection.aggregate(pipeline):
+        extra_ids.extend(sorted(group["ids"])[1:])
+    if extra_ids:
+        collection.delete_many({"_id": {"$in": extra_ids}})
+    return len(extra_ids)
+
+
+def upsert_records(collection, records, stats: LoadStats, batch_size: int = 1000):
+    """Upserts normalized records keyed by ticker, in unordered bulk batches."""
+    ops = []
+
+    def flush():
+        if not ops:
+            return
+        result = collection.bulk_write(ops, ordered=False)
+        stats.upserted += result.upserted_count
+        stats.modified += result.modified_count
+        ops.clear()
+
+    for raw in records:
+        stats.read += 1
+        update = normalize_record(raw)
+        if update is None:
+            stats.skipped += 1
+            continue
+        ops.append(UpdateOne({"ticker": update["$set"]["ticker"]}, update, upsert=True))
+        if len(ops) >= batch_size:
+            flush()
+    flush()
+
+
+def refresh_pe_ratios(collection, batch_size: int = 1000) -> int:
+    """
+    Recomputes `pe_ratio` from each document's stored market cap and net profit.
+    Needed after loads where the two inputs come from different source files.
+    """
+    ops, changed = [], 0
+    for doc in collection.find({}, {"market_cap": 1, "net_profit": 1, "pe_ratio": 1}):
+        pe = pe_ratio(doc.get("market_cap"), doc.get("net_profit"))
+        if pe == doc.get("pe_ratio"):
+            continue
+        update = {"$set": {"pe_ratio": pe}} if pe is not None else {"$unset": {"pe_ratio": ""}}
+        ops.append(UpdateOne({"_id": doc["_id"]}, update))
+        changed += 1
+        if len(ops) >= batch_size:
+            collection.bulk_write(ops, ordered=False)
+            ops = []
+    if ops:
+        collection.bulk_write(ops, ordered=False)
+    return changed
+
+
+def copy_indexes(source, dest):
+    """Recreates `source`'s secondary indexes on `dest` ($out and fresh collections don't carry them)."""
+    for name, info in source.index_information().items():
+        if name == "_id_":
+            continue
+        options = {k: v for k, v in info.items() if k not in ("key", "v", "ns")}
+        dest.create_index(info["key"], name=name, **options)
+
+
+# Screening (/companies/screen): equality on sector first, then the range/sort metric
+SCREEN_METRICS = ("revenue", "market_cap", "pe_ratio", "net_profit", "employees_min")
+
+
+def ensure_company_indexes(collection):
+    """Unique ticker index plus the compound (industry, metric) and single-metric screening indexes."""
+    collection.create_index([("ticker", ASCENDING)], name="ticker_unique", unique=True,
+                            partialFilterExpression={"ticker": {"$type": "string"}})
+    for metric in SCREEN_METRICS:
+        collection.create_index([("industry", ASCENDING), (metric, DESCENDING)], name=f"industry_{metric}")
+        collection.create_index([(metric, DESCENDING)], name=metric)
+
+
+def swap_collection(db, shadow: str, target: str):
+    """Atomically replaces `target` with `shadow` (renameCollection with dropTarget)."""
+    db[shadow].rename(target, dropTarget=True)
+
+
+def load_companies(db, paths: list, target: str = "companies", shadow: bool = True,
+                   batch_size: int = 1000) -> LoadStats:
+    """
+    Loads `paths` (later files win on conflicting fields) into `db[target]`.
+    Safe to rerun: documents are upserted by ticker and duplicate tickers are collapsed.
+    """
+    stats = LoadStats(sources=list(paths))
+    started = time.perf_counter()
+
+    if shadow:
+        work_name = f"{target}_shadow"
+        db[work_name].drop()
+        if target in db.list_collection_names():
+            # Start from the live documents so _ids (used in URLs) and live prices are kept.
+            # A price refresh landing between this copy and the swap is lost until the next one (<= 5 min).
+            db[target].aggregate([{"$match": {}}, {"$out": work_name}])
+            copy_indexes(db[target], db[work_name])
+    else:
+        work_name = target
+    work = db[work_name]
+
+    stats.duplicates_removed = dedupe_by_ticker(work)
+    ensure_company_indexes(work)
+    for path in paths:
+        upsert_records(work, iter_json_records(path), stats, batch_size)
+    refresh_pe_ratios(work, batch_size)
+
+    if shadow:
+        swap_collection(db, work_name, target)
+    if target == "companies":
+        company_cache.invalidate_profiles()
+    stats.seconds = time.perf_counter() - started
+    return stats
@@ -0,0 +1,296 @@
+"""
+Nightly return correlations across the PSX universe and betas versus KSE-100.
+
+`compute_correlations` (worker, nightly) builds a days x tickers matrix of daily
+returns from `db.price_history`, computes the pairwise-complete Pearson
+correlation of every pair with four matrix products, and stores the strict upper
+triangle as float32 (N(N-1)/2 values) in `db.correlation_state`, together with
+per-ticker betas, per-sector betas and the sector x sector co-movement matrix.
+
+API processes materialize the triangle once per version as an `.npy` file under
+ANALYTICS_SNAPSHOT_DIR and memory-map it, so a request for a few tickers reads
+only the pages holding their pairs, with no parsing or copying of the whole matrix.
+"""
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from pymongo import ReturnDocument
+
+from ..config import settings
+from ..database import db
+from .job_telemetry import instrumented_job, record_items, upstream_call
+from .price_history import daily_bars
+from .upstream import upstream
+
+STATE_ID = "latest"
+KSE100_SYMBOL = "^KSE"
+MAX_SLICE_TICKERS = 100
+
+
+# ---- computation -----------------------------------------------------------------------------
+
+def close_matrix(series: dict, lookback: int):
+    """(days, tickers, closes) with closes a days x tickers float64 array (NaN where missing)."""
+    days = sorted({day for days, _, _ in series.values() for day in days})[-(lookback + 1):]
+    row = {day: i for i, day in enumerate(days)}
+    tickers = sorted(series)
+    closes = np.full((len(days), len(tickers)), np.nan)
+    for j, ticker in enumerate(tickers):
+        ticker_days, ticker_closes, _ = series[ticker]
+        for day, close in zip(ticker_days, ticker_closes):
+            if day in row and close:
+                closes[row[day], j] = close
+    return days, tickers, closes
+
+
+def daily_returns(closes: np.ndarray) -> np.ndarray:
+    """Simple returns between consecutive days; NaN when either close is missing."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return closes[1:] / closes[:-1] - 1
+
+
+def pairwise_correlation(x: np.ndarray, y: np.ndarray = None, min_overlap: int = 20) -> np.ndarray:
+    """
+    Pearson correlation between the columns of `x` (and `y`, default `x`) over the
+    rows where both are present (pandas `DataFrame.corr` semantics), vectorized:
+    the per-pair counts, sums and cross products are each one matrix product.
+    Pairs with fewer than `min_overlap` common rows are NaN.
+    """
+    y = x if y is None else y
+    mx, my = ~np.isnan(x), ~np.isnan(y)
+    x0, y0 = np.where(mx, x, 0.0), np.where(my, y, 0.0)
+    fx, fy = mx.astype(np.float64), my.astype(np.float64)
+    n = fx.T @ fy
+    sx = x0.T @ fy          # sum of x over the rows shared with each y column
+    sy = fx.T @ y0
+    sxx = (x0 * x0).T @ fy
+    syy = fx.T @ (y0 * y0)
+    sxy = x0.T @ y0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = n * sxy - sx * sy
+        corr = cov / np.sqrt((n * sxx - sx * sx) * (n * syy - sy * sy))
+    corr[n < min_overlap] = np.nan
+    return np.clip(corr, -1.0, 1.0, out=corr)
+
+
+def pairwise_beta(returns: np.ndarray, benchmark: np.ndarray, min_overlap: int = 20) -> np.ndarray:
+    """Beta of each column of `returns` against `benchmark` over their common rows."""
+    b = benchmark[:, None]
+    both = ~np.isnan(returns) & ~np.isnan(b)
+    n = both.sum(axis=0)
+    r0, b0 = np.where(both, returns, 0.0), np.where(both, b, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = (r0 * b0).sum(axis=0) / n - r0.sum(axis=0) / n * b0.sum(axis=0) / n
+        var = (b0 * b0).sum(axis=0) / n - (b0.sum(axis=0) / n) ** 2
+        beta = cov / var
+    beta[n < min_overlap] = np.nan
+    return beta
+
+
+def upper_triangle(matrix: np.ndarray) -> np.ndarray:
+    """Strict upper triangle, row by row, as float32."""
+    return matrix[np.triu_indices(len(matrix), k=1)].astype(np.float32)
+
+
+def pair_positions(i: np.ndarray, j: np.ndarray, n: int) -> np.ndarray:
+    """Position of pair (i, j), i < j, in the row-major strict upper triangle of an n x n matrix."""
+    return i * n - i * (i + 1) // 2 + (j - i - 1)
+
+
+def square_slice(upper: np.ndarray, indices: np.ndarray, n: int) -> np.ndarray:
+    """k x k symmetric matrix for `indices`, gathered from the triangle (diagonal = 1)."""
+    i, j = np.meshgrid(indices, indices, indexing="ij")
+    low, high = np.minimum(i, j), np.maximum(i, j)
+    off_diagonal = low != high
+    result = np.ones(i.shape, dtype=np.float32)
+    result[off_diagonal] = upper[pair_positions(low[off_diagonal], high[off_diagonal], n)]
+    return result
+
+
+def _benchmark_returns(days: list, returns: np.ndarray, tickers: list):
+    """KSE-100 daily returns aligned to `days`; falls back to a market-cap weighted universe index."""
+    try:
+        with upstream_call():
+            history = upstream.ticker_history(KSE100_SYMBOL, "1y", timeout=15)
+        by_day = {ts.strftime("%Y-%m-%d"): float(close) for ts, close in history["Close"].items() if close == close}
+        closes = np.array([by_day.get(day, np.nan) for day in days])
+        benchmark = daily_returns(closes[:, None])[:, 0]
+        if np.count_nonzero(~np.isnan(benchmark)) >= settings.CORRELATION_MIN_OVERLAP:
+            return benchmark, "KSE-100"
+    except Exception as e:
+        print(f"WARN: KSE-100 history unavailable ({e}); using a market-cap weighted index")
+    caps = {d["ticker"]: d.get("market_cap") or 0 for d in db.companies.find({}, {"ticker": 1, "market_cap": 1})}
+    weights = np.array([caps.get(t, 0) for t in tickers], dtype=np.float64)
+    present = ~np.isnan(returns)
+    with np.errstate(invalid="ignore"):
+        benchmark = np.where(present, returns, 0.0) @ weights / (present @ weights)
+    return benchmark, "market_cap_weighted"
+
+
+def _sector_returns(returns: np.ndarray, tickers: list):
+    """(sectors, days x sectors equal-weighted returns)."""
+    industry = {d["ticker"]: d.get("industry") or "Other" for d in db.companies.find({}, {"ticker": 1, "industry": 1})}
+    labels = [industry.get(t, "Other") for t in tickers]
+    sectors = sorted(set(labels))
+    columns = []
+    for sector in sectors:
+        members = returns[:, [j for j, label in enumerate(labels) if label == sector]]
+        present = ~np.isnan(members)
+        with np.errstate(invalid="ignore"):
+            columns.append(np.where(present, members, 0.0).sum(axis=1) / present.sum(axis=1))
+    return sectors, np.column_stack(columns) if columns else np.empty((len(returns), 0))
+
+
+@instrumented_job("compute_correlations")
+def compute_correlations():
+    """Nightly: recomputes and stores the correlation triangle, betas and sector co-movement."""
+    lookback = settings.CORRELATION_LOOKBACK_DAYS
+    min_overlap = settings.CORRELATION_MIN_OVERLAP
+    # Calendar window wide enough for `lookback` trading days
+    series = daily_bars(datetime.utcnow() - timedelta(days=lookback * 2))
+    days, tickers, closes = close_matrix(series, lookback)
+    if len(days) < 2 or not tickers:
+        print("WARN: Not enough price history for correlations yet")
+        return None
+    returns = daily_returns(closes)
+    days = days[1:]
+    record_items(processed=len(tickers))
+
+    started = time.perf_counter()
+    correlation = pairwise_correlation(returns, min_overlap=min_overlap)
+    benchmark, benchmark_name = _benchmark_returns(days, returns, tickers)
+    betas = pairwise_beta(returns, benchmark, min_overlap)
+    sectors, sector_returns = _sector_returns(returns, tickers)
+    sector_correlation = pairwise_correlation(sector_returns, min_overlap=min_overlap)
+    sector_betas = pairwise_beta(sector_returns, benchmark, min_overlap)
+    seconds = time.perf_counter() - started
+
+    doc = db.correlation_state.find_one_and_update(
+        {"_id": STATE_ID},
+        {
+            "$inc": {"version": 1},
+            "$set": {
+                "as_of": datetime.utcnow(),
+                "first_day": days[0],
+                "last_day": days[-1],
+                "days": len(days),
+                "benchmark": benchmark_name,
+                "tickers": tickers,
+                "upper": upper_triangle(correlation).tobytes(),
+                "betas": betas.astype(np.float32).tobytes(),
+                "sectors": sectors,
+                "sector_correlation": sector_correlation.astype(np.float32).tobytes(),
+                "sector_betas": sector_betas.astype(np.float32).tobytes(),
+                "compute_seconds": round(seconds, 3),
+            },
+        },
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    record_items(updated=len(tickers))
+    print(f"INFO: Correlations v{doc['version']} for {len(tickers)} tickers over {len(days)} days in {seconds:.2f}s")
+    return doc["version"]
+
+
+# ---- serving ---------------------------------------------------------------------------------
+
+def _float_or_none(value) -> float:
+    value = float(value)
+    return None if value != value else round(value, 4)
+
+
+class CorrelationSnapshot:
+    """One stored version: metadata in memory, the triangle memory-mapped from disk."""
+
+    def __init__(self, doc: dict, upper: np.ndarray):
+        self.version = doc["version"]
+        self.as_of = doc["as_of"]
+        self.first_day = doc["first_day"]
+        self.last_day = doc["last_day"]
+        self.days = doc["days"]
+        self.benchmark = doc["benchmark"]
+        self.tickers = doc["tickers"]
+        self.positions = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self.upper = upper
+        self.betas = np.frombuffer(doc["betas"], dtype=np.float32)
+        self.sectors = doc["sectors"]
+        size = len(self.sectors)
+        self.sector_correlation = np.frombuffer(doc["sector_correlation"], dtype=np.float32).reshape(size, size)
+        self.sector_betas = np.frombuffer(doc["sector_betas"], dtype=np.float32)
+
+    def _meta(self) -> dict:
+        return {
+            "as_of": self.as_of,
+            "window": {"from": self.first_day, "to": self.last_day, "days": self.days},
+            "benchmark": self.benchmark,
+        }
+
+    def tickers_slice(self, tickers: list) -> dict:
+        found = [t for t in dict.fromkeys(tickers) if t in self.positions]
+        indices = np.array([self.positions[t] for t in found], dtype=np.int64)
+        matrix = square_slice(self.upper, indices, len(self.tickers)) if len(found) else np.empty((0, 0))
+        return {
+            **self._meta(),
+            "tickers": found,
+            "missing": [t for t in tickers if t not in self.positions],
+            "matrix": [[_float_or_none(v) for v in row] for row in matrix],
+            "betas": {t: _float_or_none(self.betas[i]) for t, i in zip(found, indices.tolist())},
+        }
+
+    def sector_summary(self) -> dict:
+        return {
+            **self._meta(),
+            "sectors": self.sectors,
+            "matrix": [[_float_or_none(v) for v in row] for row in self.sector_correlation],
+            "betas": {s: _float_or_none(b) for s, b in zip(self.sectors, self.sector_betas)},
+        }
+
+
+class CorrelationStore:
+    """API-side access to the latest snapshot; polls the stored version at most every `poll_seconds`."""
+
+    def __init__(self, directory: str, poll_seconds: int):
+        self.directory = directory
+        self.poll_seconds = poll_seconds
+        self._snapshot = None
+        self._polled_at = None
+        self._lock = threading.Lock()
+
+    def _materialize(self, doc: dict) -> np.ndarray:
+        """Writes the triangle to `correlations-v<version>.npy` (once) and memory-maps it."""
+        path = os.path.join(self.directory, f"correlations-v{doc['version']}.npy")
+        if not os.path.exists(path):
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".npy.tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    np.save(f, np.frombuffer(doc["upper"], dtype=np.float32))
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+            for name in os.listdir(self.directory):
+                if name.startswith("correlations-v") and name.endswith(".npy") and name != os.path.basename(path):
+                    try:
+                        os.unlink(os.path.join(self.directory, name))
+                    except OSError:
+                        pass  # still mapped by another process on some platforms
+        return np.load(path, mmap_mode="r")
+
+    def get(self):
+        """The latest snapshot, or None if the nightly job has not run yet."""
+        with self._lock:
+            if self._polled_at is None or time.monotonic() - self._polled_at > self.poll_seconds:
+                state = db.correlation_state.find_one({"_id": STATE_ID}, {"version": 1})
+                if state is not None and (self._snapshot is None or state["version"] != self._snapshot.version):
+                    doc = db.correlation_state.find_one({"_id": STATE_ID})
+                    self._snapshot = CorrelationSnapshot(doc, self._materialize(doc))
+                self._polled_at = time.monotonic()
+            return self._snapshot
+
+
+correlation_store = CorrelationStore(settings.ANALYTICS_SNAPSHOT_DIR, settings.CACHE_GENERATION_POLL_SECONDS)
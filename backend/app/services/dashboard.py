@@ -0,0 +1,154 @@
+"""
+First-paint data for the dashboard (`GET /dashboard`) and the short-lived caches
+behind it, shared with the individual endpoints (`/market/live`, `/ai/market-pulse`,
+`/news`, `/news/stats`).
+
+Every section is a `CachedSection`: a value kept in process memory for a TTL
+(and, for market data, until the price job bumps the quote generation).
+The dashboard fetches the requested sections concurrently in the threadpool,
+so a cold load costs the slowest section, not the sum of four requests.
+"""
+import asyncio
+import threading
+import time
+from datetime import datetime
+
+from fastapi.concurrency import run_in_threadpool
+
+from ..config import settings
+from ..database import db
+from ..utils.json_response import with_id
+from .article_text import ARTICLE_LIST_PROJECTION
+from .company_cache import company_cache
+from .data_engine import DataEngine
+
+# Static fallback until a currency feed exists (same value as before in /market/live)
+USD_PKR_QUOTE = {"pair": "USD/PKR", "rate": 278.50, "change": 1.2, "change_percent": 0.45}
+PULSE_TTL = 60
+NEWS_LIMIT = 10
+
+
+class CachedSection:
+    """
+    A lazily loaded value, reused for `ttl` seconds. If `generation` is given (a
+    callable returning a counter), a change in its value also expires the entry.
+    Concurrent misses load once; the others wait for that load.
+    """
+    def __init__(self, loader, ttl: int, generation=None):
+        self.loader = loader
+        self.ttl = ttl
+        self.generation = generation
+        self._value = None
+        self._loaded_at = None
+        self._loaded_generation = None
+        self._lock = threading.Lock()
+
+    def _fresh(self, generation) -> bool:
+        return (self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+                and generation == self._loaded_generation)
+
+    def get(self):
+        generation = self.generation() if self.generation else None
+        if self._fresh(generation):
+            return self._value
+        with self._lock:
+            if not self._fresh(generation):
+                self._value = self.loader()
+                self._loaded_at = time.monotonic()
+                self._loaded_generation = generation
+            return self._value
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+
+def load_market() -> dict:
+    return {**DataEngine.live_market_snapshot(), "currency": USD_PKR_QUOTE}
+
+
+def load_pulse():
+    """The last stored Market Pulse, or None (generating one is left to /ai/market-pulse)."""
+    cached = db.ai_insights.find_one({"_id": "latest_pulse"}, {"summary": 1, "timestamp": 1})
+    if cached and cached.get("summary"):
+        return {"summary": cached["summary"], "timestamp": cached.get("timestamp")}
+    return None
+
+
+def load_news() -> list:
+    """Same documents as `/news` with its default parameters (latest first)."""
+    articles = db.articles.find({}, ARTICLE_LIST_PROJECTION).sort("published_date", -1).limit(NEWS_LIMIT)
+    return [with_id(article) for article in articles]
+
+
+def load_news_stats() -> dict:
+    counts = db.articles.aggregate([{"$group": {"_id": "$source", "count": {"$sum": 1}}}])
+    source_counts = {c["_id"]: c["count"] for c in counts if c["_id"] is not None}
+    return {
+        "total_sources": len(source_counts),
+        "total_articles": db.articles.estimated_document_count(),
+        "source_counts": source_counts,
+    }
+
+
+SECTIONS = {
+    "market": CachedSection(load_market, settings.COMPANY_QUOTE_TTL,
+                            generation=lambda: company_cache.generations.get("quote")),
+    "pulse": CachedSection(load_pulse, PULSE_TTL),
+    "news": CachedSection(load_news, settings.NEWS_CACHE_TTL),
+    "news_stats": CachedSection(load_news_stats, settings.NEWS_STATS_CACHE_TTL),
+}
+
+
+class FieldMaskError(ValueError):
+    pass
+
+
+def parse_field_mask(fields: str) -> dict:
+    """
+    "market.top_gainers.ticker,news.title" -> nested dict of the paths to keep
+    ({} = keep the whole value). Lists are masked element by element.
+    """
+    mask = {}
+    for path in fields.split(","):
+        parts = [p.strip() for p in path.split(".") if p.strip()]
+        if not parts:
+            continue
+        if parts[0] not in SECTIONS:
+            raise FieldMaskError(f"Unknown section '{parts[0]}' (expected one of {', '.join(SECTIONS)})")
+        node = mask
+        for i, part in enumerate(parts):
+            if part in node and not node[part]:
+                break  # a shorter path already keeps everything below
+            node = node.setdefault(part, {})
+            if i == len(parts) - 1:
+                node.clear()
+    return mask
+
+
+def apply_field_mask(value, mask: dict):
+    """Copy of `value` restricted to `mask`; the cached original is never modified."""
+    if not mask:
+        return value
+    if isinstance(value, dict):
+        return {key: apply_field_mask(value[key], sub) for key, sub in mask.items() if key in value}
+    if isinstance(value, list):
+        return [apply_field_mask(item, mask) for item in value]
+    return value
+
+
+async def build_dashboard(mask: dict = None) -> dict:
+    """Requested sections (all by default) gathered concurrently; a failing section is null and listed in `errors`."""
+    names = list(mask) if mask else list(SECTIONS)
+    results = await asyncio.gather(*(run_in_threadpool(SECTIONS[name].get) for name in names), return_exceptions=True)
+    dashboard, errors = {}, []
+    for name, result in zip(names, results):
+        if isinstance(result, Exception):
+            print(f"WARN: Dashboard section '{name}' failed: {result}")
+            errors.append(name)
+            result = None
+        dashboard[name] = apply_field_mask(result, mask.get(name)) if mask else result
+    dashboard["generated_at"] = datetime.utcnow()
+    if errors:
+        dashboard["errors"] = errors
+    return dashboard
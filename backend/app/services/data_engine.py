@@ -1,10 +1,17 @@
 import json
 import os
-import yfinance as yf
 import pandas as pd
 import time
 from datetime import datetime
 from ..database import db
+from ..models.company import normalize_document
+from .company_cache import company_cache
+from .price_history import bar_timestamp, record_prices
+from .indicators import update_indicators
+from .alerts import evaluate_alerts
+from .screener import refresh_screener
+from .upstream import upstream
+from .job_telemetry import instrumented_job, record_failure, record_items, record_outcome, upstream_call
 
 # Load static data from JSON
 DATA_FILE = os.path.join(os.path.dirname(__file__), "../data/company_data.json")
@@ -45,8 +52,8 @@ class DataEngine:
         """
         try:
             print(f"DEBUG: Fetching data for {ticker_symbol}...")
-            stock = yf.Ticker(ticker_symbol)
-            info = stock.info
+            with upstream_call():
+                info = upstream.ticker_info(ticker_symbol)
 
             # Get static fallback data
             static_data = DataEngine.get_static_data(ticker_symbol)
@@ -83,14 +90,14 @@ class DataEngine:
                 print(f"WARN: No name found for {ticker_symbol}")
                 return None
 
-            return company_data
+            return normalize_document(company_data)
         except Exception as e:
             print(f"ERROR: Failed to fetch data for {ticker_symbol}: {e}")
             # Emergency fallback: If access to yfinance fails (e.g. rate limit), return static only
             static_data = DataEngine.get_static_data(ticker_symbol)
             if static_data:
                 print(f"WARN: Using PURE STATIC data for {ticker_symbol}")
-                return {
+                return normalize_document({
                     "name": static_data.get("name"),
                     "ticker": ticker_symbol,
                     "industry": static_data.get("industry"),
@@ -104,11 +111,16 @@ class DataEngine:
                     "net_profit": static_data.get("net_profit"),
                     "market_cap": static_data.get("market_cap"),
                     "last_updated": datetime.utcnow()
-                }
+                })
             return None
 
     @staticmethod
     async def fetch_live_market_data():
+        """Async entry point of `live_market_snapshot` (kept for the AI paths)."""
+        return DataEngine.live_market_snapshot()
+
+    @staticmethod
+    def live_market_snapshot():
         """
         Aggregates data for Dashboard and AI Service.
         Returns:
@@ -174,17 +186,26 @@ class DataEngine:
         return data
 
     @staticmethod
+    @instrumented_job("update_all_tracked_companies")
     def update_all_tracked_companies():
         """
         Finds all companies with a 'ticker' field in DB and updates them.
         """
         tickers = db.companies.distinct("ticker")
         print(f"INFO: Starting daily update for {len(tickers)} companies...")
+        processed = failed = 0
         for ticker in tickers:
             if ticker:
-                DataEngine.update_company(ticker)
+                updated = DataEngine.update_company(ticker)
+                processed += 1
+                failed += 0 if updated else 1
+                record_items(processed=1, updated=1 if updated else 0, failed=0 if updated else 1)
+        record_outcome(failed, processed)
+        company_cache.invalidate_profiles()
+        refresh_screener()
 
     @staticmethod
+    @instrumented_job("update_live_prices")
     def update_live_prices():
         """
         FAST UPDATE: Fetches only Price/Volume for all tickers in chunks.
@@ -196,17 +217,20 @@ class DataEngine:
              if not valid_tickers: return
              
              print(f"INFO: Fetching live prices for {len(valid_tickers)} companies...")
+             record_items(processed=len(valid_tickers))
              updated_count = 0
+             observations = []
+             last_error = None
              
              # Chunking to avoid API limits and massive inputs
              chunk_size = 10 
              for i in range(0, len(valid_tickers), chunk_size):
                  chunk = valid_tickers[i:i + chunk_size]
                  try:
-                     # threads=False to avoid SQLite 'database is locked' errors in production
                      # Small sleep to be gentle on Yahoo API from shared IP
                      time.sleep(4.5)
-                     data = yf.download(chunk, period="1d", group_by='ticker', threads=False, progress=False)
+                     with upstream_call():
+                         data = upstream.download(chunk, period="1d")
                      
                      if data.empty: continue
 
@@ -244,16 +268,39 @@ class DataEngine:
                                      "last_updated": datetime.utcnow()
                                  }}
                              )
+                             observations.append({
+                                 "ticker": ticker,
+                                 # The bar's own date, not the fetch time (weekend/pre-open fetches return the last session)
+                                 "ts": bar_timestamp(last_row.name),
+                                 "open": open_price,
+                                 "high": float(last_row['High']),
+                                 "low": float(last_row['Low']),
+                                 "close": current_price,
+                                 "volume": int(last_row['Volume']) if not pd.isna(last_row['Volume']) else 0,
+                             })
                              updated_count += 1
-                         except Exception:
+                         except Exception as e:
+                             last_error = e
                              continue
                  except Exception as chunk_e:
                      # Suppress noisy logs for expected network/rate-limit glitches
                      # print(f"WARN: Chunk failed: {chunk_e}")
+                     last_error = chunk_e
                      continue
                      
+             record_items(updated=updated_count, failed=len(valid_tickers) - updated_count)
+             # Every ticker failing (e.g. Yahoo rate-limited the whole run) marks the run failed
+             record_outcome(len(valid_tickers) - updated_count, len(valid_tickers), last_error)
+             if record_prices(observations):
+                 update_indicators()
+             if updated_count:
+                 company_cache.invalidate_quotes()
+                 universe = refresh_screener()
+                 if universe is not None:
+                     evaluate_alerts(universe)
              print(f"SUCCESS: Batch update finished. Updated {updated_count} stocks.")
         except Exception as e:
              print(f"ERROR: Batch update failed: {e}")
+             record_failure(e)
 
 data_engine = DataEngine()
@@ -0,0 +1,93 @@
+"""
+Text embedders for semantic search (services/semantic_search.py).
+
+`get_embedder()` returns a sentence-embedding model when EMBEDDING_MODEL is set
+and `sentence-transformers` is installed (e.g. all-MiniLM-L6-v2, 384
+dimensions, CPU), and otherwise the built-in `HashingEmbedder`. The built-in
+embedder hashes stemmed words and word pairs into a signed vector. It captures
+word overlap, not synonyms: "circular debt power sector" finds articles that
+talk about circular debt and power, but not ones that only say "arrears" and
+"electricity". Vectors are L2-normalized float32, so a dot product is the
+cosine similarity. Each index records the name of the embedder that built it.
+"""
+import re
+import zlib
+
+import numpy as np
+
+from ..config import settings
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or over says said than that the "
+    "their this to was were will with about news after amid new".split()
+)
+
+
+def _stem(token: str) -> str:
+    """Plural folding only ("companies" -> "company", "prices" -> "price"); enough to match queries to text."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+class HashingEmbedder:
+    """Signed feature hashing of stemmed words (weight 1) and adjacent word pairs (BIGRAM_WEIGHT)."""
+    BIGRAM_WEIGHT = 0.7
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _features(self, text: str):
+        words = [_stem(t) for t in _TOKEN.findall((text or "").lower()) if t not in STOPWORDS]
+        for word in words:
+            yield zlib.crc32(word.encode()), 1.0
+        for a, b in zip(words, words[1:]):
+            yield zlib.crc32(f"{a} {b}".encode()), self.BIGRAM_WEIGHT
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        rows, hashes, weights = [], [], []
+        for row, text in enumerate(texts):
+            for h, w in self._features(text):
+                rows.append(row)
+                hashes.append(h)
+                weights.append(w)
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        if hashes:
+            hashes = np.array(hashes, dtype=np.uint32)
+            # Low bits pick the dimension, the top bit the sign (spreads collisions around zero)
+            signs = np.where(hashes >> 31, -1.0, 1.0).astype(np.float32)
+            np.add.at(vectors, (np.array(rows), hashes % self.dim), signs * np.array(weights, dtype=np.float32))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+class SentenceTransformerEmbedder:
+    """A `sentence-transformers` model on CPU (optional dependency)."""
+    BATCH_SIZE = 64
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = model_name
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        vectors = self.model.encode(list(texts), batch_size=self.BATCH_SIZE, normalize_embeddings=True,
+                                    convert_to_numpy=True, show_progress_bar=False)
+        return vectors.astype(np.float32)
+
+
+def get_embedder():
+    if settings.EMBEDDING_MODEL:
+        try:
+            return SentenceTransformerEmbedder(settings.EMBEDDING_MODEL)
+        except ImportError:
+            print("WARN: EMBEDDING_MODEL is set but sentence-transformers is not installed; using hashing embeddings.")
+        except Exception as e:
+            print(f"WARN: Could not load embedding model {settings.EMBEDDING_MODEL}: {e}; using hashing embeddings.")
+    return HashingEmbedder()
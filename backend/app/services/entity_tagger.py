@@ -0,0 +1,266 @@
+"""
+Tags news articles with the companies (tickers) and sectors they mention.
+
+Patterns come from `db.companies` (name, ticker, optional `aliases`), plus
+`companies_enriched.json` for listed companies not loaded yet:
+
+- the full name and the name without legal suffixes ("Lucky Cement Limited" ->
+  "lucky cement"; "Shell Pakistan Limited" -> "shell pakistan", "shell"),
+  case-insensitive
+- the ticker without its exchange suffix ("OGDC"), and all-caps acronyms from
+  names ("TRG Pakistan" -> "TRG"), matched only when written in capitals
+- explicit `aliases` on the company document, case-insensitive
+
+A derived alias claimed by more than one company is dropped as ambiguous. All
+patterns go into one Aho-Corasick automaton, so tagging is a single pass over
+the article text regardless of how many companies there are. Patterns are
+matched on word boundaries.
+
+The automaton tracks the company profile generation (bumped by the sync jobs).
+When it changes, the new pattern set is diffed against the current one, only
+the changed patterns are added to or removed from the trie, and the failure
+links are recomputed.
+"""
+import json
+import os
+import string
+import threading
+from collections import deque
+
+from pymongo import UpdateOne
+
+from ..database import db
+from .company_cache import company_cache
+
+ENRICHED_COMPANIES_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "..", "companies_enriched.json")
+LEGAL_SUFFIXES = frozenset({"limited", "ltd", "plc", "inc", "pvt", "private", "company", "co", "corporation", "corp"})
+# Single words that are company names but also everyday words in business news
+GENERIC_WORDS = frozenset({
+    "packages", "systems", "unity", "pace", "century", "pioneer", "national", "united", "international",
+    "allied", "standard", "premier", "crescent", "pakistan", "bank", "cement", "energy", "power",
+})
+# Tickers that are also common abbreviations in Pakistani business news ("POL products")
+AMBIGUOUS_TICKERS = frozenset({"pol"})
+MIN_WORD_ALIAS = 5
+MIN_TICKER = 3
+
+# Punctuation -> space, ASCII upper -> lower; both keep the text's length, so match
+# positions in the folded text are valid in the original
+_PUNCTUATION = str.maketrans({c: " " for c in string.punctuation})
+_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def _words(text: str) -> list[str]:
+    return text.translate(_PUNCTUATION).split()
+
+
+class Automaton:
+    """
+    Aho-Corasick automaton over characters. Each pattern maps to a set of values;
+    `search` yields (end position, pattern length, value) for every occurrence.
+    """
+    def __init__(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.values = [set()]      # values of the pattern ending at this node
+        self.outputs = [()]        # (length, value) for every pattern ending here, incl. via failure links
+        self.depth = [0]
+
+    def add(self, pattern: str, value):
+        node = 0
+        for char in pattern:
+            nxt = self.goto[node].get(char)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[node][char] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.values.append(set())
+                self.outputs.append(())
+                self.depth.append(self.depth[node] + 1)
+            node = nxt
+        self.values[node].add(value)
+
+    def remove(self, pattern: str, value):
+        node = 0
+        for char in pattern:
+            node = self.goto[node].get(char)
+            if node is None:
+                return
+        self.values[node].discard(value)
+
+    def build(self):
+        """Recomputes failure links and outputs (breadth-first); call after add/remove."""
+        queue = deque()
+        for child in self.goto[0].values():
+            self.fail[child] = 0
+            queue.append(child)
+        self.outputs[0] = ()
+        while queue:
+            node = queue.popleft()
+            own = tuple((self.depth[node], value) for value in self.values[node])
+            self.outputs[node] = own + self.outputs[self.fail[node]]
+            for char, child in self.goto[node].items():
+                state = self.fail[node]
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[child] = self.goto[state].get(char, 0)
+                queue.append(child)
+
+    def search(self, text: str):
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        node = 0
+        for i, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for length, value in outputs[node]:
+                yield i, length, value
+
+
+def _distinctive(words: list[str]) -> bool:
+    return len(words) > 1 or (len(words) == 1 and len(words[0]) >= MIN_WORD_ALIAS and words[0] not in GENERIC_WORDS)
+
+
+def company_patterns(name: str, ticker: str, aliases=()) -> dict:
+    """
+    {(pattern, case_sensitive): derived} for one company. Derived patterns
+    (shortened names, acronyms) are dropped by `build_patterns` when another
+    company derives the same one; names, tickers and explicit aliases are kept.
+    """
+    patterns = {}
+    words = _words(name or "")
+    lowered = [w.lower() for w in words]
+    if words:
+        patterns[(" ".join(lowered), False)] = False
+        core = list(lowered)
+        while core and core[0] == "the":
+            core.pop(0)
+        while len(core) > 1 and core[-1] in LEGAL_SUFFIXES:
+            core.pop()
+        if _distinctive(core):
+            patterns.setdefault((" ".join(core), False), True)
+        if len(core) > 1 and core[-1] == "pakistan" and _distinctive(core[:-1]):
+            patterns.setdefault((" ".join(core[:-1]), False), True)
+        for word in words:
+            if word.isupper() and word.isalpha() and len(word) >= MIN_TICKER:
+                patterns.setdefault((word.lower(), True), True)
+    symbol = (ticker or "").split(".")[0]
+    if len(symbol) >= MIN_TICKER and symbol.isalnum() and symbol.lower() not in AMBIGUOUS_TICKERS:
+        patterns[(symbol.lower(), True)] = False
+    for alias in aliases or ():
+        alias = " ".join(_words(alias)).lower()
+        if alias:
+            patterns[(alias, False)] = False
+    return patterns
+
+
+def load_companies() -> list[dict]:
+    """Companies to tag: `db.companies`, plus enriched records whose ticker is not in the database."""
+    companies = list(db.companies.find({}, {"name": 1, "ticker": 1, "industry": 1, "aliases": 1}))
+    known = {c.get("ticker") for c in companies if c.get("ticker")}
+    try:
+        with open(ENRICHED_COMPANIES_PATH, encoding="utf-8") as f:
+            enriched = json.load(f)
+    except (OSError, ValueError):
+        enriched = []
+    for record in enriched:
+        ticker = record.get("psx_symbol") or record.get("ticker")
+        if ticker and ticker not in known:
+            known.add(ticker)
+            companies.append({"name": record.get("name"), "ticker": ticker,
+                              "industry": record.get("sector") or record.get("industry"),
+                              "aliases": record.get("aliases") or []})
+    return companies
+
+
+def build_patterns(companies: list[dict]) -> tuple[dict, dict]:
+    """({(pattern, case_sensitive): {tickers}}, {ticker: sector}); ambiguous derived aliases removed."""
+    owners, explicit, sectors = {}, set(), {}
+    for company in companies:
+        ticker = company.get("ticker")
+        if not ticker:
+            continue
+        sectors[ticker] = company.get("industry")
+        for key, derived in company_patterns(company.get("name"), ticker, company.get("aliases")).items():
+            owners.setdefault(key, set()).add(ticker)
+            if not derived:
+                explicit.add(key)
+    patterns = {key: tickers for key, tickers in owners.items() if len(tickers) == 1 or key in explicit}
+    return patterns, sectors
+
+
+class EntityTagger:
+    def __init__(self):
+        self.automaton = Automaton()
+        self.patterns = {}
+        self.sectors = {}
+        self.generation = None
+        self._lock = threading.Lock()
+
+    def refresh(self, companies: list[dict] = None, generation=None):
+        """Applies the difference between the current and the new pattern set, then relinks the automaton."""
+        patterns, sectors = build_patterns(load_companies() if companies is None else companies)
+        for key, tickers in self.patterns.items():
+            for ticker in tickers - patterns.get(key, set()):
+                self.automaton.remove(" " + key[0] + " ", (ticker, key[1]))
+        for key, tickers in patterns.items():
+            for ticker in tickers - self.patterns.get(key, set()):
+                self.automaton.add(" " + key[0] + " ", (ticker, key[1]))
+        self.automaton.build()
+        self.patterns, self.sectors = patterns, sectors
+        self.generation = generation
+
+    def _ensure_current(self):
+        generation = company_cache.generations.get("profile")
+        if generation != self.generation:
+            with self._lock:
+                if generation != self.generation:
+                    self.refresh(generation=generation)
+
+    def tag(self, *texts: str) -> dict:
+        """{"tickers": [...], "sectors": [...]} mentioned in `texts` (one pass over their concatenation)."""
+        self._ensure_current()
+        original = " " + " ".join(" ".join(_words(text or "")) for text in texts) + " "
+        folded = original.translate(_LOWER)
+        spans = []
+        for end, length, (ticker, case_sensitive) in self.automaton.search(folded):
+            # Patterns are padded with spaces: the match covers the word boundaries
+            if case_sensitive and not original[end - length + 2:end].isupper():
+                continue
+            spans.append((end - length + 1, -length, ticker))
+        # Leftmost-longest: "Engro Fertilizers" is EFERT, not also "Engro" (ENGRO)
+        tickers, covered = set(), 0
+        for start, negative_length, ticker in sorted(spans):
+            if start + 1 >= covered:  # adjacent matches share their boundary space
+                tickers.add(ticker)
+                covered = start - negative_length
+            elif start - negative_length == covered:
+                tickers.add(ticker)  # same span, another company with the same explicit name
+        sectors = {self.sectors[t] for t in tickers if self.sectors.get(t)}
+        return {"tickers": sorted(tickers), "sectors": sorted(sectors)}
+
+
+entity_tagger = EntityTagger()
+
+
+def ensure_tag_indexes():
+    try:
+        db.articles.create_index([("tickers", 1), ("published_date", -1)])
+        db.articles.create_index([("sectors", 1), ("published_date", -1)])
+    except Exception as e:
+        print(f"WARN: Could not create article tag indexes: {e}")
+
+
+def tag_backfill(batch_size: int = 500, retag: bool = False) -> int:
+    """Tags stored articles (all of them with `retag`, e.g. after adding aliases); returns how many were updated."""
+    query = {} if retag else {"tickers": {"$exists": False}}
+    updated, batch = 0, []
+    for doc in db.articles.find(query, {"title": 1, "summary_text": 1}):
+        batch.append(UpdateOne({"_id": doc["_id"]}, {"$set": entity_tagger.tag(doc.get("title"), doc.get("summary_text"))}))
+        if len(batch) >= batch_size:
+            updated += db.articles.bulk_write(batch, ordered=False).modified_count
+            batch = []
+    if batch:
+        updated += db.articles.bulk_write(batch, ordered=False).modified_count
+    return updated
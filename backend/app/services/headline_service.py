@@ -0,0 +1,106 @@
+import bisect
+import threading
+from datetime import datetime
+from pymongo import DESCENDING
+from ..config import settings
+from ..database import db
+from .company_cache import CacheGenerations
+
+
+def ensure_headline_indexes():
+    """Indexes the headline load and the ingest's link check read (created at worker startup)."""
+    db.articles.create_index([("published_date", DESCENDING)])
+    db.articles.create_index("link")
+
+
+class HeadlineService:
+    """
+    In-memory buffer of the most recent news headlines, shared by the AI paths.
+
+    Why this exists:
+    - The AI pulse used to read `db.news`, but the aggregator writes to `db.articles`,
+      so the pulse never saw any news (and still paid for a sorted query each run).
+    - Headlines change only when the ingestion pipeline inserts articles, so reading
+      them from memory makes the AI paths free of news DB queries.
+
+    How it stays fresh:
+    - `aggregator.fetch_news` calls `push()` for every inserted article, then `published()`
+      once per fetch, which bumps the `headlines` generation in `db.cache_state`.
+    - The buffer is loaded from `db.articles` (indexed on `published_date`) on first use and
+      reloaded only when the generation changed elsewhere, i.e. another process ingested.
+      The generation is polled like the company cache's (CacheGenerations), so a read
+      costs at most one small query per poll interval and none in between.
+    """
+    def __init__(self, capacity: int = 50, generations: CacheGenerations = None):
+        self.capacity = capacity
+        self.generations = generations or CacheGenerations("articles", settings.CACHE_GENERATION_POLL_SECONDS)
+        self._items = []  # sorted oldest -> newest by (published_date, link)
+        self._links = set()
+        self._lock = threading.Lock()
+        self._generation = None  # generation the buffer reflects (None = not loaded)
+
+    def _key(self, article: dict):
+        return (article.get("published_date") or datetime.min, article.get("link") or "")
+
+    def _insert(self, article: dict):
+        link = article.get("link")
+        if link in self._links:
+            return
+        entry = {
+            "title": article.get("title", ""),
+            "link": link,
+            "source": article.get("source"),
+            "published_date": article.get("published_date"),
+        }
+        key = self._key(entry)
+        if len(self._items) >= self.capacity and key <= self._key(self._items[0]):
+            return  # Older than everything we keep
+        bisect.insort(self._items, entry, key=self._key)
+        self._links.add(link)
+        if len(self._items) > self.capacity:
+            dropped = self._items.pop(0)
+            self._links.discard(dropped.get("link"))
+
+    def load(self, generation: int = None):
+        """(Re)loads the buffer from the article store."""
+        # One headline per story: syndicated copies (news_clusters) are skipped
+        cursor = db.articles.find(
+            {"duplicate": {"$ne": True}}, {"title": 1, "link": 1, "source": 1, "published_date": 1}
+        ).sort("published_date", DESCENDING).limit(self.capacity)
+        with self._lock:
+            self._items = []
+            self._links = set()
+            for article in cursor:
+                self._insert(article)
+            self._generation = self.generations.get("headlines") if generation is None else generation
+
+    def push(self, article: dict):
+        """Called by the ingestion pipeline after an article is inserted."""
+        if article.get("duplicate"):
+            return
+        with self._lock:
+            self._insert(article)
+
+    def published(self):
+        """Called once per fetch that inserted articles: tells the other processes to reload."""
+        in_sync = self._generation is not None and self._generation == self.generations.get("headlines")
+        self.generations.bump("headlines")
+        if in_sync:
+            # Our buffer already has the pushed articles
+            self._generation = self.generations.get("headlines")
+
+    def latest(self, n: int = 5) -> list[dict]:
+        """Newest `n` headlines as dicts (title, link, source, published_date)."""
+        generation = self.generations.get("headlines")
+        if generation != self._generation:
+            try:
+                self.load(generation)
+            except Exception as e:
+                print(f"WARN: Could not load headlines: {e}")
+        with self._lock:
+            return list(reversed(self._items[-n:])) if n > 0 else []
+
+    def latest_titles(self, n: int = 5) -> list[str]:
+        return [h["title"] for h in self.latest(n)]
+
+headline_service = HeadlineService()
@@ -0,0 +1,323 @@
+"""
+Technical indicators (SMA, EMA, RSI, ATR, VWAP) maintained incrementally from `db.price_history`.
+
+Each price observation is the day's bar so far (open/high/low/close/volume since
+the open). The last observation of a day is that day's final daily candle; when
+the first observation of a new day arrives, the previous candle is folded into
+the rolling state in O(1) per ticker (running sums over fixed windows, recursive
+EMA/Wilder averages). Values for the day in progress are derived from the state
+and the forming candle without mutating it.
+
+Days are the bars' own dates (an observation's `ts` is its bar's timestamp, see
+price_history), so a previous session's bar fetched again before the open stays
+on its own day instead of opening (and polluting the VWAP of) the next one.
+
+State is checkpointed per ticker in `db.indicator_state` along with the
+(ts, observed_at) of the last observation applied. Each update reads only the
+observations after every ticker's own checkpoint, so a restarted worker
+continues from there instead of rescanning the history.
+"""
+from collections import deque
+from datetime import datetime
+
+from pymongo import ReplaceOne
+
+from ..database import db
+from .price_history import PRICE_HISTORY_COLLECTION, bar_day
+
+STATE_COLLECTION = "indicator_state"
+SMA_PERIODS = (20, 50)
+EMA_PERIODS = (12, 26)
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+
+
+class RollingMean:
+    """Mean of the last `period` values (None until the window is full)."""
+    __slots__ = ("period", "window", "total", "pushes")
+
+    def __init__(self, period: int, window=(), total: float = None, pushes: int = 0):
+        self.period = period
+        self.window = deque(window, maxlen=period)
+        self.total = sum(self.window) if total is None else total
+        self.pushes = pushes
+
+    def push(self, value: float):
+        if len(self.window) == self.period:
+            self.total -= self.window[0]
+        self.window.append(value)
+        self.total += value
+        self.pushes += 1
+        if self.pushes % self.period == 0:
+            # Resum once per window length so floating-point drift can't accumulate (amortized O(1))
+            self.total = sum(self.window)
+
+    def peek(self, value: float):
+        """Mean if `value` were pushed next."""
+        if len(self.window) + 1 < self.period:
+            return None
+        dropped = self.window[0] if len(self.window) == self.period else 0.0
+        return (self.total - dropped + value) / self.period
+
+    @property
+    def value(self):
+        return self.total / self.period if len(self.window) == self.period else None
+
+    def to_document(self) -> dict:
+        return {"window": list(self.window), "total": self.total, "pushes": self.pushes}
+
+    @classmethod
+    def from_document(cls, period: int, doc: dict) -> "RollingMean":
+        return cls(period, doc["window"], doc["total"], doc["pushes"])
+
+
+class ExponentialMean:
+    """
+    Recursive exponential average seeded with the first value
+    (pandas `ewm(alpha=..., adjust=False, min_periods=period)`).
+    """
+    __slots__ = ("alpha", "period", "current", "count")
+
+    def __init__(self, alpha: float, period: int, current: float = None, count: int = 0):
+        self.alpha = alpha
+        self.period = period
+        self.current = current
+        self.count = count
+
+    @classmethod
+    def ema(cls, span: int) -> "ExponentialMean":
+        return cls(2 / (span + 1), span)
+
+    @classmethod
+    def wilder(cls, period: int) -> "ExponentialMean":
+        return cls(1 / period, period)
+
+    def _next(self, value: float) -> float:
+        return value if self.current is None else self.current + self.alpha * (value - self.current)
+
+    def push(self, value: float):
+        self.current = self._next(value)
+        self.count += 1
+
+    def peek(self, value: float):
+        return self._next(value) if self.count + 1 >= self.period else None
+
+    @property
+    def value(self):
+        return self.current if self.count >= self.period else None
+
+    def to_document(self) -> dict:
+        return {"current": self.current, "count": self.count}
+
+    def load(self, doc: dict) -> "ExponentialMean":
+        self.current, self.count = doc["current"], doc["count"]
+        return self
+
+
+def _rsi(avg_gain, avg_loss):
+    if avg_gain is None or avg_loss is None or (avg_gain == 0 and avg_loss == 0):
+        return None
+    if avg_loss == 0:
+        return 100.0
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def _true_range(candle: dict, previous_close) -> float:
+    high, low = candle["high"], candle["low"]
+    if previous_close is None:
+        return high - low
+    return max(high - low, abs(high - previous_close), abs(low - previous_close))
+
+
+def _position(row: dict) -> tuple:
+    """Sort key of an observation: bar timestamp, then fetch time (absent on rows recorded before it existed)."""
+    return row["ts"], row.get("observed_at") or datetime.min
+
+
+class TickerIndicators:
+    """Rolling indicator state for one ticker: finalized daily candles plus the forming one."""
+
+    def __init__(self, ticker: str):
+        self.ticker = ticker
+        self.sma = {period: RollingMean(period) for period in SMA_PERIODS}
+        self.ema = {period: ExponentialMean.ema(period) for period in EMA_PERIODS}
+        self.avg_gain = ExponentialMean.wilder(RSI_PERIOD)
+        self.avg_loss = ExponentialMean.wilder(RSI_PERIOD)
+        self.atr = ExponentialMean.wilder(ATR_PERIOD)
+        self.previous_close = None  # close of the last finalized candle
+        self.candles = 0
+        # Day in progress
+        self.day = None
+        self.forming = None
+        self.vwap_pv = 0.0
+        self.vwap_volume = 0.0
+        self.last_volume = 0
+        self.last_ts = None
+        self.last_observed_at = None
+
+    def _finalize(self, candle: dict):
+        close = candle["close"]
+        for average in (*self.sma.values(), *self.ema.values()):
+            average.push(close)
+        if self.previous_close is not None:
+            change = close - self.previous_close
+            self.avg_gain.push(max(change, 0.0))
+            self.avg_loss.push(max(-change, 0.0))
+        self.atr.push(_true_range(candle, self.previous_close))
+        self.previous_close = close
+        self.candles += 1
+
+    def observe(self, row: dict):
+        """Applies one price observation (ticker, ts, observed_at, open, high, low, close, volume). O(1)."""
+        day = bar_day(row["ts"])
+        if day != self.day:
+            if self.forming is not None:
+                self._finalize(self.forming)
+            self.day = day
+            self.vwap_pv = self.vwap_volume = 0.0
+            self.last_volume = 0
+        volume = row.get("volume") or 0
+        # Observations carry the day's cumulative volume; VWAP weights each price by the volume traded since the last one
+        traded = volume - self.last_volume if volume >= self.last_volume else volume
+        if traded > 0:
+            self.vwap_pv += row["close"] * traded
+            self.vwap_volume += traded
+        self.last_volume = volume
+        self.forming = {k: row[k] for k in ("open", "high", "low", "close")}
+        self.forming["volume"] = volume
+        self.last_ts = row["ts"]
+        self.last_observed_at = row.get("observed_at")
+
+    def is_applied(self, row: dict) -> bool:
+        """True if `row` is at or before the last observation applied."""
+        if self.last_ts is None:
+            return False
+        return _position(row) <= (self.last_ts, self.last_observed_at or datetime.min)
+
+    def pending_query(self) -> dict:
+        """Filter for this ticker's observations after the checkpoint."""
+        if self.last_ts is None:
+            return {"ticker": self.ticker}
+        after = [{"ts": {"$gt": self.last_ts}}]
+        if self.last_observed_at is not None:
+            after.append({"ts": self.last_ts, "observed_at": {"$gt": self.last_observed_at}})
+        return {"ticker": self.ticker, "$or": after}
+
+    def values(self) -> dict:
+        """Indicator values as of the last observation (the forming candle counts as the latest day)."""
+        if self.forming is None:
+            return {}
+        close = self.forming["close"]
+        values = {"close": close, "day": self.day, "candles": self.candles + 1, "as_of": self.last_ts}
+        for period, average in self.sma.items():
+            values[f"sma_{period}"] = average.peek(close)
+        for period, average in self.ema.items():
+            values[f"ema_{period}"] = average.peek(close)
+        if self.previous_close is None:
+            values[f"rsi_{RSI_PERIOD}"] = None
+        else:
+            change = close - self.previous_close
+            values[f"rsi_{RSI_PERIOD}"] = _rsi(self.avg_gain.peek(max(change, 0.0)), self.avg_loss.peek(max(-change, 0.0)))
+        values[f"atr_{ATR_PERIOD}"] = self.atr.peek(_true_range(self.forming, self.previous_close))
+        values["vwap"] = self.vwap_pv / self.vwap_volume if self.vwap_volume else None
+        return values
+
+    def to_document(self) -> dict:
+        return {
+            "_id": self.ticker,
+            "sma": {str(p): a.to_document() for p, a in self.sma.items()},
+            "ema": {str(p): a.to_document() for p, a in self.ema.items()},
+            "avg_gain": self.avg_gain.to_document(),
+            "avg_loss": self.avg_loss.to_document(),
+            "atr": self.atr.to_document(),
+            "previous_close": self.previous_close,
+            "candles": self.candles,
+            "day": self.day,
+            "forming": self.forming,
+            "vwap_pv": self.vwap_pv,
+            "vwap_volume": self.vwap_volume,
+            "last_volume": self.last_volume,
+            "last_ts": self.last_ts,
+            "last_observed_at": self.last_observed_at,
+            "updated_at": datetime.utcnow(),
+        }
+
+    @classmethod
+    def from_document(cls, doc: dict) -> "TickerIndicators":
+        state = cls(doc["_id"])
+        # Periods added since the checkpoint start empty; removed ones are dropped
+        for period in SMA_PERIODS:
+            if str(period) in doc["sma"]:
+                state.sma[period] = RollingMean.from_document(period, doc["sma"][str(period)])
+        for period in EMA_PERIODS:
+            if str(period) in doc["ema"]:
+                state.ema[period].load(doc["ema"][str(period)])
+        state.avg_gain.load(doc["avg_gain"])
+        state.avg_loss.load(doc["avg_loss"])
+        state.atr.load(doc["atr"])
+        for field in ("previous_close", "candles", "day", "forming", "vwap_pv", "vwap_volume", "last_volume", "last_ts"):
+            setattr(state, field, doc[field])
+        state.last_observed_at = doc.get("last_observed_at")
+        return state
+
+
+class IndicatorEngine:
+    """
+    Worker-side owner of every ticker's state. `update()` applies the observations
+    recorded since the last checkpoint and writes the touched states back.
+    """
+    def __init__(self):
+        self.states = None
+
+    def _load(self):
+        self.states = {doc["_id"]: TickerIndicators.from_document(doc) for doc in db[STATE_COLLECTION].find({})}
+
+    def update(self) -> int:
+        """Applies new price observations; returns how many were applied."""
+        if self.states is None:
+            self._load()
+        query = {}
+        if self.states:
+            # One window per ticker after its own checkpoint (a stale ticker must not drag the others back);
+            # new tickers have no checkpoint and start from the retained history
+            query = {"$or": [{"ticker": {"$nin": list(self.states)}},
+                             *(state.pending_query() for state in self.states.values())]}
+        touched, applied = {}, 0
+        cursor = db[PRICE_HISTORY_COLLECTION].find(query, {"_id": 0}).sort([("ts", 1), ("observed_at", 1)])
+        for row in cursor:
+            state = self.states.get(row["ticker"])
+            if state is None:
+                state = self.states[row["ticker"]] = TickerIndicators(row["ticker"])
+            elif state.is_applied(row):
+                continue
+            state.observe(row)
+            touched[row["ticker"]] = state
+            applied += 1
+        if touched:
+            db[STATE_COLLECTION].bulk_write(
+                [ReplaceOne({"_id": ticker}, state.to_document(), upsert=True) for ticker, state in touched.items()],
+                ordered=False,
+            )
+        return applied
+
+
+indicator_engine = IndicatorEngine()
+
+
+def update_indicators():
+    """Called by the live price job after it records observations."""
+    try:
+        applied = indicator_engine.update()
+        print(f"INFO: Indicators updated from {applied} price observations")
+    except Exception as e:
+        # Reload the checkpoints next time rather than continue from a half-applied state
+        indicator_engine.states = None
+        print(f"WARN: Indicator update failed: {e}")
+
+
+def get_indicators(ticker: str):
+    """Current indicator values for `ticker` from its checkpoint, or None if it has no observations yet."""
+    doc = db[STATE_COLLECTION].find_one({"_id": ticker})
+    if doc is None:
+        return None
+    return {"ticker": ticker, **TickerIndicators.from_document(doc).values()}
@@ -0,0 +1,235 @@
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from ..database import db
+from ..utils.metrics import REGISTRY
+
+JOB_RUNS_COLLECTION = "job_runs"
+JOB_RUNS_CAP_BYTES = 5 * 1024 * 1024
+
+JOB_RUNS = REGISTRY.counter("job_runs", "Scheduled job runs by final status.", ("job", "status"))
+JOB_DURATION = REGISTRY.histogram("job_duration_seconds", "Wall time of scheduled job runs.", ("job",))
+JOB_ITEMS = REGISTRY.counter("job_items", "Items handled by scheduled jobs (processed/updated/failed...).", ("job", "kind"))
+JOB_UPSTREAM_LATENCY = REGISTRY.histogram(
+    "job_upstream_latency_seconds", "Latency of upstream calls (Yahoo, Gemini) made by jobs.", ("job",)
+)
+JOB_ERRORS = REGISTRY.counter("job_errors", "Scheduled job runs that raised or reported a failure.", ("job",))
+JOB_OVERLAPS = REGISTRY.counter("job_overlaps", "Runs that started while a previous run of the same job was still active.", ("job",))
+JOB_MISSED = REGISTRY.counter("job_missed", "Runs the scheduler skipped (misfire or max_instances reached).", ("job", "reason"))
+JOB_LAST_SUCCESS = REGISTRY.gauge("job_last_success_timestamp_seconds", "Unix time of the last successful run.", ("job",))
+JOB_IN_PROGRESS = REGISTRY.gauge("job_in_progress", "Runs of the job currently executing.", ("job",))
+
+_current_run = contextvars.ContextVar("current_job_run", default=None)
+_running = {}
+_running_lock = threading.Lock()
+
+
+class JobRun:
+    """
+    Mutable record of one job execution, persisted to `db.job_runs` when it ends.
+
+    Jobs that catch their own exceptions report the outcome with `fail()` or
+    `partial()` (via `record_failure` / `record_outcome`); otherwise a run that
+    returns is a success and one that raises is an error.
+    """
+    __slots__ = ("job", "started_at", "start", "items", "upstream_calls", "upstream_seconds", "overlapped",
+                 "status", "error")
+
+    def __init__(self, job: str, overlapped: bool):
+        self.job = job
+        self.started_at = datetime.utcnow()
+        self.start = time.perf_counter()
+        self.items = {}
+        self.upstream_calls = 0
+        self.upstream_seconds = 0.0
+        self.overlapped = overlapped
+        self.status = "success"
+        self.error = None
+
+    def fail(self, error):
+        """Marks the run as failed (error status, JOB_ERRORS, no JOB_LAST_SUCCESS) without raising."""
+        self.status, self.error = "error", str(error)
+
+    def partial(self, failed: int, processed: int, error=None):
+        """Failed when every processed item failed, "partial" when only some did."""
+        if processed and failed >= processed:
+            self.fail(error or f"All {processed} items failed")
+        elif failed and self.status == "success":
+            self.status = "partial"
+            if error:
+                self.error = str(error)
+
+
+def ensure_job_runs_collection():
+    """Creates the capped `job_runs` collection (oldest runs roll off automatically)."""
+    try:
+        if JOB_RUNS_COLLECTION not in db.list_collection_names():
+            db.create_collection(JOB_RUNS_COLLECTION, capped=True, size=JOB_RUNS_CAP_BYTES)
+    except Exception as e:
+        print(f"WARN: Could not create capped {JOB_RUNS_COLLECTION} collection: {e}")
+
+
+def _store_run(doc: dict):
+    try:
+        db[JOB_RUNS_COLLECTION].insert_one(doc)
+    except Exception as e:
+        print(f"WARN: Could not store job run for {doc.get('job')}: {e}")
+
+
+def record_items(**counts):
+    """Adds item counts (e.g. `updated=10, failed=2`) to the current job run, if any."""
+    run = _current_run.get()
+    if run is None:
+        return
+    for kind, amount in counts.items():
+        if amount:
+            run.items[kind] = run.items.get(kind, 0) + amount
+            JOB_ITEMS.labels(run.job, kind).inc(amount)
+
+
+def record_failure(error):
+    """Marks the current job run as failed, for jobs that handle their own exceptions."""
+    run = _current_run.get()
+    if run is not None:
+        run.fail(error)
+
+
+def record_outcome(failed: int, processed: int, error=None):
+    """Reports how many of the processed items failed: the run fails if all of them did, else is partial."""
+    run = _current_run.get()
+    if run is not None:
+        run.partial(failed, processed, error)
+
+
+@contextmanager
+def upstream_call():
+    """Times an upstream call (yfinance, Gemini...) made by the current job."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        run = _current_run.get()
+        if run is not None:
+            elapsed = time.perf_counter() - start
+            run.upstream_calls += 1
+            run.upstream_seconds += elapsed
+            JOB_UPSTREAM_LATENCY.labels(run.job).observe(elapsed)
+
+
+def instrumented_job(name: str):
+    """
+    Decorator for scheduled jobs. Records duration, status, item counts and upstream
+    latency of every run, detects overlapping runs, and persists a run document.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _running_lock:
+                overlapped = _running.get(name, 0) > 0
+                _running[name] = _running.get(name, 0) + 1
+            if overlapped:
+                JOB_OVERLAPS.labels(name).inc()
+                print(f"WARN: Job {name} started while a previous run is still active.")
+
+            run = JobRun(name, overlapped)
+            token = _current_run.set(run)
+            JOB_IN_PROGRESS.labels(name).inc()
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                run.fail(e)
+                raise
+            finally:
+                _current_run.reset(token)
+                JOB_IN_PROGRESS.labels(name).dec()
+                with _running_lock:
+                    _running[name] -= 1
+
+                duration = time.perf_counter() - run.start
+                JOB_RUNS.labels(name, run.status).inc()
+                JOB_DURATION.labels(name).observe(duration)
+                if run.status == "error":
+                    JOB_ERRORS.labels(name).inc()
+                else:
+                    JOB_LAST_SUCCESS.labels(name).set(time.time())
+                _store_run({
+                    "job": name,
+                    "status": run.status,
+                    "error": run.error,
+                    "started_at": run.started_at,
+                    "finished_at": datetime.utcnow(),
+                    "duration_s": round(duration, 3),
+                    "items": run.items,
+                    "upstream_calls": run.upstream_calls,
+                    "upstream_s": round(run.upstream_seconds, 3),
+                    "overlapped": run.overlapped,
+                })
+        return wrapper
+    return decorator
+
+
+def record_missed_run(job: str, reason: str, scheduled_at=None):
+    """Called by the scheduler listener for misfired runs or runs dropped by `max_instances`."""
+    JOB_MISSED.labels(job, reason).inc()
+    print(f"WARN: Job {job} run missed ({reason}).")
+    _store_run({
+        "job": job,
+        "status": reason,
+        "error": None,
+        "started_at": scheduled_at or datetime.utcnow(),
+        "finished_at": None,
+        "duration_s": None,
+        "items": {},
+        "upstream_calls": 0,
+        "upstream_s": 0.0,
+        "overlapped": reason == "max_instances",
+    })
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def get_job_report(limit: int = 50, window: int = 200) -> dict:
+    """
+    Recent runs plus a per-job summary over the last `window` runs:
+    run/error/partial/missed/overlap counts, p50/p95 duration and seconds since the last run.
+    """
+    now = datetime.utcnow()
+    recent = list(db[JOB_RUNS_COLLECTION].find({}, {"_id": 0}).sort("started_at", -1).limit(window))
+
+    jobs = {}
+    for run in recent:
+        summary = jobs.setdefault(run["job"], {
+            "runs": 0, "errors": 0, "partial": 0, "missed": 0, "overlaps": 0, "durations": [],
+            "last_run_at": None, "last_status": None,
+        })
+        if run.get("duration_s") is None:
+            summary["missed"] += 1
+            continue
+        summary["runs"] += 1
+        summary["durations"].append(run["duration_s"])
+        if run.get("status") == "error":
+            summary["errors"] += 1
+        elif run.get("status") == "partial":
+            summary["partial"] += 1
+        if run.get("overlapped"):
+            summary["overlaps"] += 1
+        if summary["last_run_at"] is None:
+            summary["last_run_at"] = run["started_at"]
+            summary["last_status"] = run["status"]
+
+    for summary in jobs.values():
+        durations = sorted(summary.pop("durations"))
+        summary["p50_duration_s"] = _percentile(durations, 50)
+        summary["p95_duration_s"] = _percentile(durations, 95)
+        last = summary["last_run_at"]
+        summary["seconds_since_last_run"] = round((now - last).total_seconds()) if last else None
+
+    return {"jobs": jobs, "recent_runs": recent[:limit]}
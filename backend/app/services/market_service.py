@@ -1,6 +1,6 @@
-import yfinance as yf
 from typing import Dict, List, Any
 from ..database import db
+from .upstream import upstream
 from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError
 from datetime import datetime, timedelta
 
@@ -39,10 +39,8 @@ class MarketService:
             return None
             
         try:
-            stock = yf.Ticker(ticker)
-            
             # Get current price from info
-            info = stock.info
+            info = upstream.ticker_info(ticker)
             if not info or 'regularMarketPrice' not in info:
                 return None
                 
@@ -59,7 +57,7 @@ class MarketService:
                     import warnings
                     with warnings.catch_warnings():
                         warnings.simplefilter("ignore")
-                        hist = stock.history(period="2d", timeout=2) # Short timeout
+                        hist = upstream.ticker_history(ticker, period="2d", timeout=2) # Short timeout
                     if len(hist) >= 2:
                         prev_close = hist['Close'].iloc[-2]
                     elif len(hist) == 1:
@@ -160,8 +158,7 @@ class MarketService:
             # Fetch USD/PKR exchange rate (Critical for Pakistan context)
             currency_data = {}
             try:
-                pkr = yf.Ticker("PKR=X")
-                pkr_info = pkr.info
+                pkr_info = upstream.ticker_info("PKR=X")
                 if pkr_info and 'regularMarketPrice' in pkr_info:
                     current_rate = pkr_info.get('regularMarketPrice', 0)
                     prev_rate = pkr_info.get('previousClose', current_rate)
@@ -169,7 +166,7 @@ class MarketService:
                     if not prev_rate or prev_rate == current_rate:
                         try:
                              # Fallback history fetch
-                            hist = pkr.history(period="2d", timeout=2)
+                            hist = upstream.ticker_history("PKR=X", period="2d", timeout=2)
                             if len(hist) >= 2:
                                 prev_rate = hist['Close'].iloc[-2]
                         except:
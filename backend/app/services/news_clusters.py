@@ -0,0 +1,275 @@
+"""
+Near-duplicate clustering of news articles (the same story syndicated by several sources).
+
+Each article's normalized title + summary is reduced to word-pair shingles and
+a MinHash signature (NUM_PERM hashes; two signatures agree on a position with
+probability equal to the shingle sets' Jaccard similarity). The signature is
+split into BANDS bands of ROWS values; articles sharing any band are
+candidates (locality-sensitive hashing), and a candidate whose estimated
+similarity reaches SIMILARITY_THRESHOLD is the same story.
+
+Band keys are stored on the article (`lsh_bands`, multikey-indexed with
+`published_date`), so a lookup is BANDS index probes bounded to the
+CLUSTER_WINDOW_DAYS before the article, however large the archive grows.
+Candidates published after the article are never considered: a story's first
+article stays the one `/news?collapse=true` shows even when older articles are
+clustered after newer ones (`cluster_backfill` against a live store). Stored per
+article:
+
+- `cluster_id`: the `_id` of the story's first article
+- `duplicate`: False for that first article (the one `/news?collapse=true` shows)
+- on the first article, `cluster_size` and `cluster_sources`
+
+The ingest clusters a whole fetch at once (`assign_batch`): one candidate query
+for the batch, then assignment in memory, so copies within the batch cluster
+together before anything is written.
+"""
+import bisect
+import re
+import unicodedata
+import zlib
+from datetime import datetime, timedelta
+
+import numpy as np
+from bson import Binary, ObjectId
+from pymongo import UpdateOne
+
+from ..database import db
+
+NUM_PERM = 60
+BANDS = 20
+ROWS = NUM_PERM // BANDS
+SIMILARITY_THRESHOLD = 0.5
+CLUSTER_WINDOW_DAYS = 3
+MAX_CANDIDATES = 50
+SUMMARY_WORDS = 40  # leading summary words used; the rest adds noise more than signal
+
+_PRIME = np.uint64(4294967311)  # smallest prime above 2**32
+_rng = np.random.default_rng(20240601)
+_A = _rng.integers(1, 2**32, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 2**32, NUM_PERM, dtype=np.uint64)
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or over says said than that the "
+    "their this to was were will with after amid per up down new".split()
+)
+
+
+def tokens(text: str) -> list[str]:
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode().lower()
+    return [t for t in _NON_WORD.split(text) if len(t) > 1 and t not in STOPWORDS]
+
+
+def shingles(title: str, summary: str = "") -> set[str]:
+    words = tokens(title) + tokens(summary)[:SUMMARY_WORDS]
+    if len(words) < 2:
+        return set(words)
+    return {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def signature(features: set[str]) -> np.ndarray:
+    """MinHash signature (NUM_PERM uint32 values) of a feature set (all-max for an empty set)."""
+    if not features:
+        return np.full(NUM_PERM, 2**32 - 1, dtype=np.uint32)
+    x = np.fromiter((zlib.crc32(f.encode()) for f in features), dtype=np.uint64, count=len(features))
+    return ((_A[:, None] * x[None, :] + _B[:, None]) % _PRIME).min(axis=1).astype(np.uint32)
+
+
+def band_keys(sig: np.ndarray) -> list[int]:
+    """One int64 key per band: the band number in the high bits, a hash of its rows in the low ones."""
+    rows = sig.reshape(BANDS, ROWS)
+    return [(band << 32) | zlib.crc32(rows[band].tobytes()) for band in range(BANDS)]
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+class MongoBandStore:
+    """Candidates from `db.articles` via the `lsh_bands` index."""
+    def __init__(self):
+        self._indexed = False
+
+    def ensure_indexes(self):
+        if not self._indexed:
+            db.articles.create_index([("lsh_bands", 1), ("published_date", -1)])
+            db.articles.create_index([("duplicate", 1), ("published_date", -1)])
+            self._indexed = True
+
+    def candidates(self, keys: list[int], since: datetime, until: datetime):
+        """The MAX_CANDIDATES most recent articles published in [since, until] sharing a band."""
+        self.ensure_indexes()
+        cursor = db.articles.find(
+            {"lsh_bands": {"$in": keys}, "published_date": {"$gte": since, "$lte": until}},
+            {"minhash": 1, "cluster_id": 1},
+        ).sort("published_date", -1).limit(MAX_CANDIDATES)
+        for doc in cursor:
+            if doc.get("minhash") is not None:
+                yield doc.get("cluster_id") or doc["_id"], np.frombuffer(doc["minhash"], dtype=np.uint32)
+
+    def add(self, article: dict, keys: list[int], sig: np.ndarray):
+        pass  # the fields are stored with the article itself
+
+    def joined(self, cluster_id, source: str):
+        db.articles.update_one(
+            {"_id": cluster_id}, {"$inc": {"cluster_size": 1}, "$addToSet": {"cluster_sources": source}}
+        )
+
+    def preload(self, keys: list[int], since: datetime, until: datetime, limit: int) -> "MemoryBandStore":
+        """The `limit` most recent stored articles in [since, until] sharing any of `keys`, as a memory store."""
+        self.ensure_indexes()
+        store = MemoryBandStore()
+        if not keys:
+            return store
+        cursor = db.articles.find(
+            {"lsh_bands": {"$in": keys}, "published_date": {"$gte": since, "$lte": until}},
+            {"minhash": 1, "cluster_id": 1, "lsh_bands": 1, "published_date": 1},
+        ).sort("published_date", -1).limit(limit)
+        for doc in cursor:
+            if doc.get("minhash") is not None:
+                doc.setdefault("cluster_id", doc["_id"])
+                store.add(doc, doc["lsh_bands"], np.frombuffer(doc["minhash"], dtype=np.uint32))
+        return store
+
+
+class MemoryBandStore:
+    """
+    In-process band index (benchmarks, tests and the ingest's per-batch store):
+    band key -> [(published_date, cluster_id, signature)] sorted by date.
+    """
+    def __init__(self):
+        self.bands = {}
+        self.sizes = {}
+
+    def candidates(self, keys: list[int], since: datetime, until: datetime):
+        seen = 0
+        for key in keys:
+            for published, cluster_id, sig in reversed(self.bands.get(key, ())):
+                if published > until:
+                    continue
+                if published < since:
+                    break
+                yield cluster_id, sig
+                seen += 1
+                if seen >= MAX_CANDIDATES:
+                    return
+
+    def add(self, article: dict, keys: list[int], sig: np.ndarray):
+        entry = (article["published_date"], article["cluster_id"], sig)
+        for key in keys:
+            # Usually an append: articles arrive in roughly chronological order
+            bisect.insort(self.bands.setdefault(key, []), entry, key=_published)
+
+    def joined(self, cluster_id, source: str):
+        self.sizes[cluster_id] = self.sizes.get(cluster_id, 1) + 1
+
+    def preload(self, keys: list[int], since: datetime, until: datetime, limit: int) -> "MemoryBandStore":
+        return self
+
+
+def _published(entry: tuple) -> datetime:
+    return entry[0]
+
+
+class NewsClusterer:
+    def __init__(self, store=None):
+        self.store = store or MongoBandStore()
+
+    @staticmethod
+    def _prepare(article: dict) -> tuple:
+        """(signature, band keys) of `article`; sets its `_id` if missing."""
+        article.setdefault("_id", ObjectId())
+        features = shingles(article.get("title", ""), article.get("summary_text", ""))
+        sig = signature(features)
+        # Nothing to compare on (empty title and summary): a story of its own
+        return sig, band_keys(sig) if features else []
+
+    @staticmethod
+    def _assign(article: dict, sig: np.ndarray, keys: list[int], store):
+        """Sets the cluster fields on `article` against `store`; returns the cluster joined (None for a new story)."""
+        published = article.get("published_date") or datetime.utcnow()
+        since = published - timedelta(days=CLUSTER_WINDOW_DAYS)
+
+        best_cluster, best_score = None, SIMILARITY_THRESHOLD
+        for cluster_id, candidate in store.candidates(keys, since, published):
+            score = similarity(sig, candidate)
+            if score >= best_score:
+                best_cluster, best_score = cluster_id, score
+
+        article["minhash"] = Binary(sig.tobytes())
+        article["lsh_bands"] = keys
+        if best_cluster is None:
+            article.update(cluster_id=article["_id"], duplicate=False, cluster_size=1,
+                           cluster_sources=[article.get("source")])
+        else:
+            article.update(cluster_id=best_cluster, duplicate=True)
+            store.joined(best_cluster, article.get("source"))
+        store.add(article, keys, sig)
+        return best_cluster
+
+    def assign(self, article: dict) -> dict:
+        """
+        Sets `_id` (if missing), `cluster_id`, `duplicate` and the LSH fields on
+        `article` before it is inserted. Articles are expected in roughly
+        chronological order.
+        """
+        sig, keys = self._prepare(article)
+        self._assign(article, sig, keys, self.store)
+        return article
+
+    def assign_batch(self, articles: list[dict]) -> list:
+        """
+        `assign` for a fetch's new articles, oldest first, with one candidate
+        query for the whole batch. Cluster sizes and sources of stories started
+        within the batch are set on their first article; returns the updates
+        for stored stories the batch joined, to be written with the inserts.
+        """
+        if not articles:
+            return []
+        prepared = [(article, *self._prepare(article)) for article in articles]
+        prepared.sort(key=lambda p: p[0].get("published_date") or datetime.utcnow())
+        dates = [article.get("published_date") or datetime.utcnow() for article, _, _ in prepared]
+        keys = sorted({key for _, _, article_keys in prepared for key in article_keys})
+        store = self.store.preload(keys, min(dates) - timedelta(days=CLUSTER_WINDOW_DAYS), max(dates),
+                                   MAX_CANDIDATES * len(articles))
+
+        batch = {article["_id"]: article for article in articles}
+        joins = {}
+        for article, sig, article_keys in prepared:
+            cluster_id = self._assign(article, sig, article_keys, store)
+            if cluster_id is None:
+                continue
+            head = batch.get(cluster_id)
+            if head is not None:
+                head["cluster_size"] += 1
+                if article.get("source") not in head["cluster_sources"]:
+                    head["cluster_sources"].append(article.get("source"))
+            else:
+                joins.setdefault(cluster_id, []).append(article.get("source"))
+        return [
+            UpdateOne({"_id": cluster_id}, {"$inc": {"cluster_size": len(sources)},
+                                            "$addToSet": {"cluster_sources": {"$each": sources}}})
+            for cluster_id, sources in joins.items()
+        ]
+
+
+news_clusterer = NewsClusterer()
+
+
+def cluster_backfill(batch_size: int = 500) -> int:
+    """Clusters stored articles that predate clustering, oldest first; returns how many were assigned."""
+    assigned = 0
+    while True:
+        batch = list(db.articles.find(
+            {"lsh_bands": {"$exists": False}}, {"title": 1, "summary_text": 1, "source": 1, "published_date": 1}
+        ).sort("published_date", 1).limit(batch_size))
+        if not batch:
+            return assigned
+        for article in batch:
+            fields = news_clusterer.assign(article)
+            db.articles.update_one({"_id": article["_id"]}, {"$set": {
+                k: fields[k] for k in ("minhash", "lsh_bands", "cluster_id", "duplicate", "cluster_size", "cluster_sources")
+                if k in fields
+            }})
+            assigned += 1
@@ -0,0 +1,238 @@
+"""
+Headline sentiment scored locally at ingest, and rolling mood per ticker and sector.
+
+Scoring is a finance lexicon (PSX / Pakistan business-news vocabulary: "rally",
+"circular debt", "rate cut", "default"...) with VADER-style rules: a negator
+flips and damps the next few words, boosters strengthen the next sentiment
+word, the headline counts twice as much as the snippet, and the raw sum is
+squashed into [-1, 1]. No model, no network: tens of microseconds per article
+on one core, so every article gets a score and the AI pulse no longer needs the
+raw headlines to judge the mood.
+
+Aggregates are hourly buckets in `db.news_sentiment`, one per (scope, key, hour)
+with scope "market", "sector" or "ticker". Each ingest batch adds its articles
+with one `$inc` per bucket, so a window (1h / 24h / 7d) is a sum over at most
+168 buckets per key, whatever the number of articles. Syndicated copies
+(`duplicate`, see news_clusters) are scored but not counted twice. Buckets
+expire after SENTIMENT_RETENTION_DAYS (TTL index).
+"""
+import math
+import re
+from datetime import datetime, timedelta
+from functools import partial
+
+from pymongo import UpdateOne
+
+from ..config import settings
+from ..database import db
+from .dashboard import CachedSection
+
+SENTIMENT_COLLECTION = "news_sentiment"
+WINDOWS = {"1h": 1, "24h": 24, "7d": 168}
+NEUTRAL_BAND = 0.05
+TITLE_WEIGHT = 2.0
+NEGATION_SPAN = 3
+NEGATION_FACTOR = -0.75
+BOOST_FACTOR = 1.5
+ALPHA = 15  # squashing constant: raw / sqrt(raw^2 + ALPHA)
+
+
+def _lexicon(groups: dict) -> dict:
+    return {word: weight for words, weight in groups.items() for word in words.split()}
+
+
+LEXICON = _lexicon({
+    # Positive
+    "rally rallies rallied rallying surge surges surged surging soar soars soared soaring jump jumps jumped "
+    "skyrocket skyrockets skyrocketed boom booms booming breakout": 2.0,
+    "gain gains gained gaining rise rises rose rising climb climbs climbed climbing rebound rebounds rebounded "
+    "recover recovers recovered recovery bullish upbeat optimism optimistic upgrade upgrades upgraded "
+    "outperform outperforms outperformed growth grow grows grew expand expands expanded expansion "
+    "profit profits profitable dividend dividends bonus payout strong stronger strength robust "
+    "beat beats exceed exceeds exceeded surplus inflow inflows invest investment investments approve approves "
+    "approved approval boost boosts boosted improve improves improved improvement win wins won award awarded "
+    "stable stability stabilise stabilize stabilised stabilized relief eases eased easing agreement deal "
+    "discovery discovers discovered tranche disbursement disbursed upturn positive highest": 1.0,
+    # Negative
+    "crash crashes crashed plunge plunges plunged plummet plummets plummeted collapse collapses collapsed "
+    "default defaults defaulted bankrupt bankruptcy meltdown rout tumble tumbles tumbled": -2.0,
+    "fall falls fell falling drop drops dropped dropping decline declines declined declining slump slumps "
+    "slumped slide slides slid dip dips dipped loss losses lose loses lost bearish pessimism downgrade "
+    "downgrades downgraded underperform weak weaker weakness deficit outflow outflows selloff sell-off "
+    "pressure pressures concern concerns worry worries fear fears risk risks uncertainty volatile volatility "
+    "inflation shortage shortages halt halts halted suspend suspends suspended shutdown closure strike "
+    "protest protests fined penalty probe lawsuit fraud scam debt debts arrears delay delays delayed "
+    "slowdown recession contraction cut cuts hike hikes hiked devaluation depreciation depreciates "
+    "depreciated negative lowest miss misses missed fail fails failed failure crisis turmoil": -1.0,
+})
+# Two-word phrases that mean something different from their words
+PHRASES = {
+    "circular debt": -1.5, "rate cut": 1.0, "rate cuts": 1.0, "rate hike": -1.0, "rate hikes": -1.0,
+    "load shedding": -1.0, "all time": 1.0, "profit taking": -0.5, "cost cutting": 0.5, "tax cut": 1.0,
+    "price hike": -1.0, "price cut": 0.5, "no change": 0.0, "record high": 2.0, "record low": -2.0,
+}
+NEGATORS = frozenset("not no never without neither nor cannot isn't wasn't aren't won't doesn't didn't".split())
+BOOSTERS = frozenset("record sharply steeply significantly massive massively sharp steep huge heavily strongly big major".split())
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:['-][a-z0-9]+)*")
+
+
+def raw_score(text: str) -> float:
+    """Unnormalized lexicon score of one piece of text."""
+    tokens = _TOKEN.findall((text or "").lower())
+    total, negate_until, boost = 0.0, -1, 1.0
+    i, n = 0, len(tokens)
+    while i < n:
+        token = tokens[i]
+        weight = PHRASES.get(f"{token} {tokens[i + 1]}") if i + 1 < n else None
+        step = 2 if weight is not None else 1
+        if weight is None:
+            weight = LEXICON.get(token)
+        if weight is None:
+            if token in NEGATORS:
+                negate_until = i + NEGATION_SPAN
+            elif token in BOOSTERS:
+                boost = BOOST_FACTOR
+            i += 1
+            continue
+        if i <= negate_until:
+            weight *= NEGATION_FACTOR
+        total += weight * boost
+        boost = 1.0
+        i += step
+    return total
+
+
+def label(score: float) -> str:
+    if score >= NEUTRAL_BAND:
+        return "positive"
+    if score <= -NEUTRAL_BAND:
+        return "negative"
+    return "neutral"
+
+
+def score_article(title: str, summary: str = "") -> dict:
+    """`sentiment` in [-1, 1] and its `sentiment_label` for an article."""
+    raw = TITLE_WEIGHT * raw_score(title) + raw_score(summary)
+    score = raw / math.sqrt(raw * raw + ALPHA)
+    return {"sentiment": round(score, 3), "sentiment_label": label(score)}
+
+
+def _bucket(published) -> datetime:
+    return (published or datetime.utcnow()).replace(minute=0, second=0, microsecond=0)
+
+
+def ensure_sentiment_indexes():
+    try:
+        collection = db[SENTIMENT_COLLECTION]
+        collection.create_index([("scope", 1), ("bucket", -1)])
+        collection.create_index("bucket", expireAfterSeconds=settings.SENTIMENT_RETENTION_DAYS * 86400)
+    except Exception as e:
+        print(f"WARN: Could not create sentiment indexes: {e}")
+
+
+def record_sentiment(articles: list[dict]) -> int:
+    """
+    Adds scored articles to the hourly buckets (one `$inc` per touched bucket).
+    Returns the number of buckets written.
+    """
+    totals = {}
+    for article in articles:
+        if article.get("duplicate") or article.get("sentiment") is None:
+            continue
+        bucket = _bucket(article.get("published_date"))
+        keys = [("market", "all")]
+        keys += [("sector", s) for s in article.get("sectors") or ()]
+        keys += [("ticker", t) for t in article.get("tickers") or ()]
+        for scope, key in keys:
+            entry = totals.setdefault((scope, key, bucket), [0, 0.0, 0, 0])
+            entry[0] += 1
+            entry[1] += article["sentiment"]
+            entry[2] += article["sentiment_label"] == "positive"
+            entry[3] += article["sentiment_label"] == "negative"
+    if not totals:
+        return 0
+    requests = [
+        UpdateOne(
+            {"_id": f"{scope}|{key}|{bucket:%Y%m%d%H}"},
+            {"$inc": {"count": count, "sum": total, "positive": positive, "negative": negative},
+             "$setOnInsert": {"scope": scope, "key": key, "bucket": bucket}},
+            upsert=True,
+        )
+        for (scope, key, bucket), (count, total, positive, negative) in totals.items()
+    ]
+    db[SENTIMENT_COLLECTION].bulk_write(requests, ordered=False)
+    return len(requests)
+
+
+def window_sentiment(window: str = "24h", now: datetime = None) -> dict:
+    """Mood per scope over the last `window` (hours are whole buckets, the current one included)."""
+    since = _bucket(now) - timedelta(hours=WINDOWS[window] - 1)
+    pipeline = [
+        {"$match": {"bucket": {"$gte": since}}},
+        {"$group": {"_id": {"scope": "$scope", "key": "$key"}, "count": {"$sum": "$count"}, "sum": {"$sum": "$sum"},
+                    "positive": {"$sum": "$positive"}, "negative": {"$sum": "$negative"}}},
+    ]
+    result = {"window": window, "since": since, "market": None, "sectors": [], "tickers": []}
+    for row in db[SENTIMENT_COLLECTION].aggregate(pipeline):
+        count = row["count"]
+        if not count:
+            continue
+        entry = {"score": round(row["sum"] / count, 3), "articles": count,
+                 "positive": row["positive"], "negative": row["negative"]}
+        scope, key = row["_id"]["scope"], row["_id"]["key"]
+        if scope == "market":
+            result["market"] = entry
+        else:
+            result[f"{scope}s"].append({scope: key, **entry})
+    for scope in ("sectors", "tickers"):
+        result[scope].sort(key=lambda e: (-e["articles"], e[scope[:-1]]))
+    return result
+
+
+# `/news/sentiment` responses, per window
+SENTIMENT_SECTIONS = {
+    window: CachedSection(partial(window_sentiment, window), settings.SENTIMENT_CACHE_TTL) for window in WINDOWS
+}
+
+
+def pulse_sentiment(top_tickers: int = 5) -> dict:
+    """Compact 24h mood for the AI pulse prompt (and its materiality check)."""
+    mood = SENTIMENT_SECTIONS["24h"].get()
+    market = mood["market"] or {"score": 0.0, "articles": 0}
+    return {
+        "market": [round(market["score"], 2), market["articles"]],
+        "sectors": {s["sector"]: round(s["score"], 2) for s in mood["sectors"]},
+        "tickers": [[t["ticker"], round(t["score"], 2), t["articles"]] for t in mood["tickers"][:top_tickers]],
+    }
+
+
+def sentiment_backfill(batch_size: int = 500, rescore: bool = False) -> int:
+    """
+    Scores stored articles (all of them with `rescore`, e.g. after a lexicon
+    change) and rebuilds the buckets still inside the retention window.
+    Returns how many articles were scored.
+    """
+    query = {} if rescore else {"sentiment": {"$exists": False}}
+    scored, batch = 0, []
+    for doc in db.articles.find(query, {"title": 1, "summary_text": 1}):
+        batch.append(UpdateOne({"_id": doc["_id"]}, {"$set": score_article(doc.get("title"), doc.get("summary_text"))}))
+        if len(batch) >= batch_size:
+            scored += len(batch)
+            db.articles.bulk_write(batch, ordered=False)
+            batch = []
+    if batch:
+        scored += len(batch)
+        db.articles.bulk_write(batch, ordered=False)
+
+    since = _bucket(datetime.utcnow()) - timedelta(days=settings.SENTIMENT_RETENTION_DAYS)
+    db[SENTIMENT_COLLECTION].delete_many({})
+    fields = {"published_date": 1, "sentiment": 1, "sentiment_label": 1, "duplicate": 1, "tickers": 1, "sectors": 1}
+    chunk = []
+    for doc in db.articles.find({"published_date": {"$gte": since}}, fields):
+        chunk.append(doc)
+        if len(chunk) >= batch_size:
+            record_sentiment(chunk)
+            chunk = []
+    record_sentiment(chunk)
+    return scored
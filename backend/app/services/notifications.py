@@ -0,0 +1,51 @@
+"""
+Notification sinks. Triggered alerts are handed to the sink selected by
+`ALERT_SINK`; delivery (email / push) is the sink's business, not the alert engine's.
+
+- "outbox": appends to `db.notifications`, read by `/alerts/notifications` and by
+  whatever delivers email/push (each notification lists its `channels`).
+- "log": prints them (local development).
+- "memory": keeps them in a list (tests and benchmarks).
+"""
+from ..config import settings
+from ..database import db
+
+NOTIFICATIONS_COLLECTION = "notifications"
+
+
+class OutboxSink:
+    def send(self, notifications: list):
+        if notifications:
+            db[NOTIFICATIONS_COLLECTION].insert_many(notifications, ordered=False)
+
+
+class LogSink:
+    def send(self, notifications: list):
+        for notification in notifications:
+            print(f"NOTIFY {notification['user_id']} via {','.join(notification['channels'])}: {notification['message']}")
+
+
+class MemorySink:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, notifications: list):
+        self.sent.extend(notifications)
+
+
+def build_sink():
+    sink = settings.ALERT_SINK.lower()
+    if sink == "outbox":
+        return OutboxSink()
+    if sink == "log":
+        return LogSink()
+    if sink == "memory":
+        return MemorySink()
+    raise ValueError(f"Unknown ALERT_SINK: {settings.ALERT_SINK}")
+
+
+def ensure_notification_indexes():
+    try:
+        db[NOTIFICATIONS_COLLECTION].create_index([("user_id", 1), ("created_at", -1)])
+    except Exception as e:
+        print(f"WARN: Could not create notification indexes: {e}")
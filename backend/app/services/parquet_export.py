@@ -0,0 +1,180 @@
+"""
+Columnar (Parquet) export of the company universe and price history.
+
+Documents are read from a Mongo cursor in batches of `row_group_size`, converted
+to one Arrow record batch each and written as a Parquet row group; the bytes are
+handed to the caller as soon as each row group is written. Memory stays bounded
+by one row group regardless of how many rows are exported.
+"""
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+import msgspec
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ..config import settings
+from ..database import db
+from ..models.company import Company
+from .price_history import PRICE_HISTORY_COLLECTION
+
+ROW_GROUP_SIZE = 5000
+
+COMPANY_SCHEMA = pa.schema([
+    ("id", pa.string()),
+    ("name", pa.string()),
+    ("ticker", pa.string()),
+    ("industry", pa.string()),
+    ("description", pa.string()),
+    ("website", pa.string()),
+    ("founded_year", pa.int32()),
+    ("location", pa.string()),
+    ("employees_count", pa.int64()),
+    ("revenue", pa.int64()),
+    ("net_profit", pa.int64()),
+    ("market_cap", pa.int64()),
+    ("ceo", pa.string()),
+    ("growth_tags", pa.list_(pa.string())),
+    ("revenue_fiscal_year", pa.int32()),
+    ("employees_min", pa.int64()),
+    ("employees_max", pa.int64()),
+    ("pe_ratio", pa.float64()),
+    ("price", pa.float64()),
+    ("change", pa.float64()),
+    ("change_percent", pa.float64()),
+    ("volume", pa.int64()),
+    ("previous_close", pa.float64()),
+    ("last_updated", pa.timestamp("ms")),
+])
+
+PRICE_SCHEMA = pa.schema([
+    ("ticker", pa.string()),
+    ("ts", pa.timestamp("ms")),
+    ("observed_at", pa.timestamp("ms")),
+    ("open", pa.float64()),
+    ("high", pa.float64()),
+    ("low", pa.float64()),
+    ("close", pa.float64()),
+    ("volume", pa.int64()),
+])
+
+
+class _ChunkSink:
+    """Write-only file object that buffers what the Parquet writer emits until drained."""
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_parquet(rows, schema: pa.Schema, row_group_size: int = ROW_GROUP_SIZE):
+    """Yields Parquet file bytes for `rows` (an iterable of dicts), one row group at a time."""
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    batch = []
+    try:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= row_group_size:
+                writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+                batch = []
+                yield sink.drain()
+        if batch:
+            writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def company_rows(batch_size: int = ROW_GROUP_SIZE):
+    cursor = db.companies.find({}).batch_size(batch_size)
+    for doc in cursor:
+        yield msgspec.structs.asdict(Company.from_document(doc))
+
+
+def price_rows(start: datetime = None, end: datetime = None, ticker: str = None, batch_size: int = ROW_GROUP_SIZE):
+    query = {}
+    if start or end:
+        query["ts"] = {}
+        if start:
+            query["ts"]["$gte"] = start
+        if end:
+            query["ts"]["$lt"] = end
+    if ticker:
+        query["ticker"] = ticker
+    cursor = db[PRICE_HISTORY_COLLECTION].find(query, {"_id": 0}).sort([("ts", 1), ("observed_at", 1)]).batch_size(batch_size)
+    yield from cursor
+
+
+def export_companies():
+    return iter_parquet(company_rows(), COMPANY_SCHEMA)
+
+
+def export_prices(start: datetime = None, end: datetime = None, ticker: str = None):
+    return iter_parquet(price_rows(start, end, ticker), PRICE_SCHEMA)
+
+
+# ---- snapshots for the analytics endpoint ---------------------------------------------------
+
+SNAPSHOT_PRICE_DAYS = 90
+SNAPSHOTS = {
+    "companies": export_companies,
+    "prices": lambda: export_prices(start=datetime.utcnow() - timedelta(days=SNAPSHOT_PRICE_DAYS)),
+}
+_snapshot_lock = threading.Lock()
+
+
+def _write_atomic(path: str, chunks):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".parquet.tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def snapshot_path(name: str) -> str:
+    return os.path.join(settings.ANALYTICS_SNAPSHOT_DIR, f"{name}.parquet")
+
+
+def ensure_snapshots(max_age: int = None) -> dict:
+    """
+    Returns {name: path} of the Parquet snapshots, rewriting any that are missing or
+    older than `max_age` seconds. Analytical queries read these files instead of Mongo.
+    """
+    max_age = settings.ANALYTICS_SNAPSHOT_MAX_AGE if max_age is None else max_age
+    paths = {}
+    with _snapshot_lock:
+        for name, export in SNAPSHOTS.items():
+            path = snapshot_path(name)
+            if not os.path.exists(path) or time.time() - os.path.getmtime(path) > max_age:
+                _write_atomic(path, export())
+            paths[name] = path
+    return paths
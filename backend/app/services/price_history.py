@@ -0,0 +1,139 @@
+"""
+Append-only price observations, one row per ticker per live price refresh that
+changed the ticker's daily bar.
+
+Each row is the day's bar so far: `ts` is the bar's own timestamp (the yfinance
+index label, i.e. the session date at 00:00 for daily bars) and `observed_at`
+the time it was fetched, so rows sort by (ts, observed_at). A refresh that
+returns the same bar again (same date and cumulative volume: weekends, before
+the open, holidays) is not recorded, so no phantom days appear downstream.
+
+Stored in a MongoDB time-series collection (`price_history`, metaField `ticker`)
+when the server supports it, otherwise a plain collection indexed on
+(ticker, ts). Old observations expire after `PRICE_HISTORY_RETENTION_DAYS`.
+Read by the Parquet export, the analytics snapshots, the screener/indicator
+jobs and the nightly correlations (`daily_bars`).
+"""
+from datetime import datetime, timedelta
+from pymongo import ASCENDING
+from ..config import settings
+from ..database import db
+
+PRICE_HISTORY_COLLECTION = "price_history"
+# How far back the last recorded bar of each ticker is looked up (longer than any market closure)
+LAST_BAR_LOOKBACK_DAYS = 14
+
+# {ticker: (day, volume)} of the last bar recorded by this process; loaded from the collection on first use
+_last_bars = None
+
+
+def ensure_price_history_collection():
+    retention = settings.PRICE_HISTORY_RETENTION_DAYS * 86400
+    try:
+        if PRICE_HISTORY_COLLECTION in db.list_collection_names():
+            return
+        try:
+            db.create_collection(
+                PRICE_HISTORY_COLLECTION,
+                timeseries={"timeField": "ts", "metaField": "ticker", "granularity": "minutes"},
+                expireAfterSeconds=retention,
+            )
+        except Exception as e:
+            print(f"WARN: Time-series collections unavailable ({e}); using a plain {PRICE_HISTORY_COLLECTION} collection")
+            db[PRICE_HISTORY_COLLECTION].create_index("ts", expireAfterSeconds=retention)
+        db[PRICE_HISTORY_COLLECTION].create_index([("ticker", ASCENDING), ("ts", ASCENDING)])
+    except Exception as e:
+        print(f"WARN: Could not prepare {PRICE_HISTORY_COLLECTION}: {e}")
+
+
+def bar_timestamp(label) -> datetime:
+    """
+    A bar's index label (pandas Timestamp or datetime) -> naive datetime in the
+    exchange's wall time. Daily bars are labelled with their session date, so
+    this is that date at 00:00 whatever the label's timezone.
+    """
+    value = label.to_pydatetime() if hasattr(label, "to_pydatetime") else label
+    return value.replace(tzinfo=None)
+
+
+def bar_day(ts: datetime) -> str:
+    return ts.strftime("%Y-%m-%d")
+
+
+def _recorded_bars() -> dict:
+    global _last_bars
+    if _last_bars is None:
+        pipeline = [
+            {"$match": {"ts": {"$gte": datetime.utcnow() - timedelta(days=LAST_BAR_LOOKBACK_DAYS)}}},
+            {"$sort": {"ts": 1, "observed_at": 1}},
+            {"$group": {"_id": "$ticker", "ts": {"$last": "$ts"}, "volume": {"$last": "$volume"}}},
+        ]
+        _last_bars = {
+            doc["_id"]: (bar_day(doc["ts"]), doc["volume"])
+            for doc in db[PRICE_HISTORY_COLLECTION].aggregate(pipeline, allowDiskUse=True)
+        }
+    return _last_bars
+
+
+def record_prices(rows: list) -> int:
+    """
+    Appends observations: dicts with ticker, ts (the bar's timestamp, see
+    `bar_timestamp`; defaults to now), open, high, low, close and volume.
+    Bars whose date and cumulative volume equal the ticker's last recorded bar
+    are skipped. Returns how many rows were recorded.
+    """
+    global _last_bars
+    if not rows:
+        return 0
+    now = datetime.utcnow()
+    try:
+        recorded = _recorded_bars()
+    except Exception as e:
+        print(f"WARN: Could not read the last recorded bars: {e}")
+        recorded = {}
+    fresh = []
+    for row in rows:
+        row.setdefault("ts", now)
+        row["observed_at"] = now
+        if recorded.get(row["ticker"]) != (bar_day(row["ts"]), row.get("volume")):
+            fresh.append(row)
+    if not fresh:
+        return 0
+    try:
+        db[PRICE_HISTORY_COLLECTION].insert_many(fresh, ordered=False)
+    except Exception as e:
+        print(f"WARN: Could not record price history: {e}")
+        # Some rows may have been written; re-read the last bars next time
+        _last_bars = None
+        return 0
+    for row in fresh:
+        recorded[row["ticker"]] = (bar_day(row["ts"]), row.get("volume"))
+    return len(fresh)
+
+
+def daily_bars(since: datetime) -> dict:
+    """
+    {ticker: (days, closes, volumes)}, oldest first: the last observation of each
+    session date (the bar's date) since `since`, i.e. that day's closing price and
+    total volume so far. Days without a bar (weekends, holidays) are absent.
+    """
+    pipeline = [
+        {"$match": {"ts": {"$gte": since}}},
+        {"$sort": {"ts": 1, "observed_at": 1}},
+        {"$group": {
+            "_id": {"ticker": "$ticker", "day": {"$dateToString": {"format": "%Y-%m-%d", "date": "$ts"}}},
+            "close": {"$last": "$close"},
+            "volume": {"$last": "$volume"},
+        }},
+        {"$sort": {"_id.day": 1}},
+        {"$group": {
+            "_id": "$_id.ticker",
+            "days": {"$push": "$_id.day"},
+            "closes": {"$push": "$close"},
+            "volumes": {"$push": "$volume"},
+        }},
+    ]
+    return {
+        doc["_id"]: (doc["days"], doc["closes"], doc["volumes"])
+        for doc in db[PRICE_HISTORY_COLLECTION].aggregate(pipeline, allowDiskUse=True)
+    }
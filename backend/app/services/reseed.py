@@ -0,0 +1,180 @@
+"""
+Blue/green reseed of `db.companies`.
+
+The live collection is never emptied: every tracked ticker is fetched in parallel
+into `companies_staging`, the row count is validated against the live collection,
+and only then is staging swapped in with an atomic `renameCollection`. Readers see
+the old universe until the swap and the complete new one after it.
+
+A live row that is not refetched (its fetch failed, or it is not a tracked
+ticker, e.g. added with `POST /companies`) is copied into staging unchanged, so
+a transient upstream error leaves a stale row, never a missing one. The run is
+abandoned if fewer than RESEED_MIN_RATIO of the tracked tickers could be fetched.
+
+Progress is stored in `db.reseed_jobs` (one document per run) and exposed at
+`GET /companies/admin/seed/{job_id}`. A lease (`reseed` in `db.scheduler_leases`)
+ensures only one reseed runs at a time across processes.
+"""
+import math
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from pymongo import InsertOne
+
+from ..config import settings
+from ..database import db
+from .company_cache import company_cache
+from .company_loader import copy_indexes, ensure_company_indexes, swap_collection
+from .data_engine import DataEngine
+from .job_telemetry import instrumented_job, record_failure, record_items, record_outcome
+from .scheduler_lease import SchedulerLease
+
+STAGING_COLLECTION = "companies_staging"
+RESEED_LEASE_TTL = 300
+# Fields curated in the DB rather than fetched; carried over from the live document
+CARRIED_FIELDS = ("growth_tags", "is_listed", "sources", "market_share", "products", "export_markets", "certifications")
+PROGRESS_EVERY = 10
+
+
+class ReseedInProgress(Exception):
+    def __init__(self, job_id):
+        super().__init__(f"Reseed {job_id} is already running")
+        self.job_id = job_id
+
+
+def _lease(job_id: str) -> SchedulerLease:
+    return SchedulerLease(db.scheduler_leases, name="reseed", owner=job_id, ttl_seconds=RESEED_LEASE_TTL)
+
+
+def create_reseed_job() -> str:
+    """Registers a new reseed run and takes the reseed lease. Raises ReseedInProgress if one is running."""
+    job_id = uuid.uuid4().hex
+    lease = _lease(job_id)
+    if not lease.try_acquire():
+        holder = lease.current_holder() or {}
+        raise ReseedInProgress(holder.get("owner"))
+    db.reseed_jobs.insert_one({
+        "_id": job_id,
+        "status": "queued",
+        "phase": "queued",
+        "total": 0,
+        "fetched": 0,
+        "failed": 0,
+        "kept": 0,
+        "previous_count": None,
+        "new_count": None,
+        "error": None,
+        "created_at": datetime.utcnow(),
+        "started_at": None,
+        "finished_at": None,
+    })
+    return job_id
+
+
+def get_reseed_job(job_id: str = None):
+    """One reseed run by id, or the most recent one."""
+    if job_id:
+        return db.reseed_jobs.find_one({"_id": job_id})
+    return next(iter(db.reseed_jobs.find().sort("created_at", -1).limit(1)), None)
+
+
+def _update(job_id: str, **fields):
+    db.reseed_jobs.update_one({"_id": job_id}, {"$set": fields})
+
+
+def _fetch_into_staging(job_id: str, lease: SchedulerLease, tickers: list, live: dict) -> tuple[set, int]:
+    """Fetches `tickers` into staging; returns the tickers written and how many failed."""
+    staging = db[STAGING_COLLECTION]
+    fetched, failed = set(), 0
+    ops = []
+    with ThreadPoolExecutor(max_workers=settings.RESEED_WORKERS) as pool:
+        futures = {pool.submit(DataEngine.fetch_company_data, ticker): ticker for ticker in tickers}
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                data = future.result()
+            except Exception as e:
+                print(f"ERROR: Reseed fetch failed for {ticker}: {e}")
+                data = None
+            if not data:
+                failed += 1
+                continue
+
+            previous = live.get(ticker, {})
+            # Keep the live _id so /companies/{id} links survive the swap
+            doc = {"_id": previous["_id"]} if "_id" in previous else {}
+            doc.update({field: previous[field] for field in CARRIED_FIELDS if field in previous})
+            doc.update(data)
+            ops.append(InsertOne(doc))
+            fetched.add(ticker)
+
+            if len(ops) >= PROGRESS_EVERY:
+                staging.bulk_write(ops, ordered=False)
+                ops = []
+                _update(job_id, fetched=len(fetched), failed=failed)
+                lease.try_acquire()
+    if ops:
+        staging.bulk_write(ops, ordered=False)
+    _update(job_id, fetched=len(fetched), failed=failed)
+    return fetched, failed
+
+
+def _keep_unfetched(live_docs: list, fetched: set) -> int:
+    """Copies the live rows that were not refetched into staging as they are; returns how many."""
+    ops = [InsertOne(doc) for doc in live_docs if doc.get("ticker") not in fetched]
+    for start in range(0, len(ops), 1000):
+        db[STAGING_COLLECTION].bulk_write(ops[start:start + 1000], ordered=False)
+    return len(ops)
+
+
+@instrumented_job("reseed_companies")
+def run_reseed(job_id: str):
+    """Fetches every tracked ticker into staging, validates it and swaps it in. Never empties `companies`."""
+    lease = _lease(job_id)
+    lease.try_acquire()
+    staging = db[STAGING_COLLECTION]
+    try:
+        tickers = DataEngine.get_all_tickers()
+        # Whole documents: rows that are not refetched are kept as they are
+        live_docs = list(db.companies.find({}))
+        live = {doc["ticker"]: doc for doc in live_docs if isinstance(doc.get("ticker"), str)}
+        previous_count = len(live_docs)
+        _update(job_id, status="running", phase="fetching", total=len(tickers),
+                previous_count=previous_count, started_at=datetime.utcnow())
+
+        staging.drop()
+        copy_indexes(db.companies, staging)
+        ensure_company_indexes(staging)
+        fetched, failed = _fetch_into_staging(job_id, lease, tickers, live)
+        record_items(processed=len(tickers), updated=len(fetched), failed=failed)
+
+        _update(job_id, phase="validating")
+        kept = _keep_unfetched(live_docs, fetched)
+        new_count = staging.count_documents({})
+        required = max(1, math.ceil(previous_count * settings.RESEED_MIN_RATIO))
+        required_fetched = math.ceil(len(tickers) * settings.RESEED_MIN_RATIO)
+        error = None
+        if len(fetched) < required_fetched:
+            error = f"Fetched {len(fetched)} of {len(tickers)} tickers, need at least {required_fetched}; kept live data"
+        elif new_count < required:
+            error = f"Staging has {new_count} companies, need at least {required} (live has {previous_count}); kept live data"
+        if error:
+            staging.drop()
+            _update(job_id, status="failed", phase="validation", new_count=new_count, finished_at=datetime.utcnow(),
+                    error=error)
+            record_failure(error)
+            return
+
+        _update(job_id, phase="swapping", new_count=new_count, kept=kept)
+        swap_collection(db, STAGING_COLLECTION, "companies")
+        company_cache.invalidate_profiles()
+        _update(job_id, status="succeeded", phase="done", finished_at=datetime.utcnow())
+        record_outcome(failed, len(tickers))
+        print(f"SUCCESS: Reseed {job_id} swapped in {new_count} companies (was {previous_count}, {kept} kept unchanged).")
+    except Exception as e:
+        staging.drop()
+        _update(job_id, status="failed", error=str(e), finished_at=datetime.utcnow())
+        raise
+    finally:
+        lease.release()
@@ -0,0 +1,72 @@
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+class SchedulerLease:
+    """
+    Mongo-backed lease that elects exactly one active scheduler across processes/nodes.
+
+    Document shape (one per lease name):
+        {"_id": "scheduler", "owner": "<host>:<pid>:<uuid>", "expires_at": datetime, "renewed_at": datetime}
+
+    How it works:
+    - `try_acquire()` atomically takes the lease if it is free, expired, or already ours,
+      and pushes `expires_at` forward by `ttl_seconds`. Call it every `ttl_seconds / 3`.
+    - If another owner holds a live lease, the upsert collides on `_id` (DuplicateKeyError)
+      and we stay passive.
+    - If the holder dies, its lease expires and the next `try_acquire()` on another node
+      takes over (failover within at most one TTL + one renew interval).
+
+    `collection` and `clock` are injectable so the behaviour can be tested against a
+    local Mongo stand-in (e.g. mongomock) with a fake clock.
+    """
+    def __init__(self, collection, name: str = "scheduler", owner: str = None, ttl_seconds: int = 60, clock=datetime.utcnow):
+        self.collection = collection
+        self.name = name
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.clock = clock
+        # Local view of our lease expiry; used to keep running through brief DB outages
+        self.held_until = None
+
+    @property
+    def renew_interval(self) -> float:
+        return max(1.0, self.ttl.total_seconds() / 3)
+
+    def try_acquire(self) -> bool:
+        """Acquires or renews the lease. Returns True if we hold it afterwards."""
+        now = self.clock()
+        try:
+            doc = self.collection.find_one_and_update(
+                {"_id": self.name, "$or": [{"owner": self.owner}, {"expires_at": {"$lte": now}}]},
+                {"$set": {"owner": self.owner, "expires_at": now + self.ttl, "renewed_at": now}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            # Held by someone else and not expired
+            self.held_until = None
+            return False
+
+        if doc and doc.get("owner") == self.owner:
+            self.held_until = now + self.ttl
+            return True
+        self.held_until = None
+        return False
+
+    def still_valid(self) -> bool:
+        """True while our last successful acquire/renew has not expired."""
+        return self.held_until is not None and self.clock() < self.held_until
+
+    def release(self):
+        """Gives up the lease immediately so a standby can take over without waiting for expiry."""
+        try:
+            self.collection.delete_one({"_id": self.name, "owner": self.owner})
+        finally:
+            self.held_until = None
+
+    def current_holder(self):
+        return self.collection.find_one({"_id": self.name})
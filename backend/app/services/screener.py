@@ -0,0 +1,706 @@
+"""
+Vectorized stock screener (`/screener`).
+
+The universe is held as one NumPy column per field: the latest quote, the
+normalized fundamentals and a few indicators derived from `db.price_history`.
+The live price job rebuilds it after every refresh (`refresh_screener`) and
+stores it in `db.screener_state`; API processes reload it when its version
+changes, so a request never touches `db.companies`.
+
+Screens are small expressions, e.g.
+
+    sector == "Cement" and change_percent > 2 and volume > avg_volume_20d
+
+parsed once into a tree and evaluated as NumPy masks over the whole universe
+(a few vector operations, no per-row Python). Saved screens are re-evaluated
+after each refresh on the rows whose referenced columns changed only.
+"""
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+from ..config import settings
+from ..database import db
+from .price_history import daily_bars
+
+STATE_ID = "universe"
+INDICATOR_DAYS = 20
+
+# Numeric columns: name -> (source document field or None if derived, description)
+NUMERIC_COLUMNS = {
+    "price": ("price", "Last price (PKR)"),
+    "change": ("change", "Change since the open (PKR)"),
+    "change_percent": ("change_percent", "Change since the open (%)"),
+    "volume": ("volume", "Volume traded today"),
+    "market_cap": ("market_cap", "Market capitalization (PKR)"),
+    "revenue": ("revenue", "Annual revenue (PKR)"),
+    "net_profit": ("net_profit", "Annual net profit (PKR)"),
+    "pe_ratio": ("pe_ratio", "Trailing P/E"),
+    "employees": ("employees_min", "Employee count (lower bound)"),
+    "avg_volume_20d": (None, f"Average daily volume over the previous {INDICATOR_DAYS} trading days"),
+    "relative_volume": (None, "Today's volume / avg_volume_20d"),
+    "sma_20": (None, f"Simple moving average of the last {INDICATOR_DAYS} daily closes"),
+    "return_20d": (None, f"Price change over the last {INDICATOR_DAYS} trading days (%)"),
+}
+# Categorical columns are stored as integer codes into `Universe.categories[name]`
+CATEGORY_COLUMNS = {
+    "sector": ("industry", "Sector (string, compared case-insensitively)"),
+}
+COLUMNS = {**NUMERIC_COLUMNS, **CATEGORY_COLUMNS}
+DEFAULT_SORT = "-market_cap"
+RESULT_FIELDS = ("price", "change_percent", "volume", "market_cap")
+
+
+class ScreenError(ValueError):
+    """Invalid screen expression or sort (reported to clients as a 400)."""
+
+
+class Universe:
+    """Column-oriented snapshot of the screenable universe."""
+    __slots__ = ("version", "built_at", "tickers", "names", "columns", "categories", "_positions")
+
+    def __init__(self, tickers: list, names: list, columns: dict, categories: dict,
+                 version: int = 0, built_at: datetime = None):
+        self.version = version
+        self.built_at = built_at
+        self.tickers = tickers
+        self.names = names
+        self.columns = columns
+        self.categories = categories
+        self._positions = None
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def positions(self, tickers) -> np.ndarray:
+        """Row indices of `tickers` (unknown tickers are skipped)."""
+        if self._positions is None:
+            self._positions = {ticker: i for i, ticker in enumerate(self.tickers)}
+        return np.array([self._positions[t] for t in tickers if t in self._positions], dtype=np.int64)
+
+    def category_code(self, column: str, value: str) -> int:
+        """Code of `value` in a categorical column, -1 if no row has it."""
+        lowered = value.strip().lower()
+        for code, label in enumerate(self.categories[column]):
+            if label.lower() == lowered:
+                return code
+        return -1
+
+    def rows(self, indices, fields=()) -> list:
+        """JSON-able result rows for `indices`, with the default fields plus `fields`."""
+        sector_labels = self.categories["sector"]
+        extra = [f for f in dict.fromkeys((*RESULT_FIELDS, *fields)) if f in NUMERIC_COLUMNS]
+        columns = {f: self.columns[f][indices].tolist() for f in extra}
+        sectors = self.columns["sector"][indices].tolist()
+        results = []
+        for n, i in enumerate(indices.tolist()):
+            row = {"ticker": self.tickers[i], "name": self.names[i], "sector": sector_labels[sectors[n]]}
+            for f in extra:
+                value = columns[f][n]
+                row[f] = None if value != value else value
+            results.append(row)
+        return results
+
+
+# ---- building / storing the universe ---------------------------------------------------------
+
+def _float_column(values) -> np.ndarray:
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+def build_universe() -> Universe:
+    """Reads `db.companies` and the recent price history into columns."""
+    projection = {"_id": 0, "ticker": 1, "name": 1, "industry": 1,
+                  **{source: 1 for source, _ in NUMERIC_COLUMNS.values() if source}}
+    docs = sorted(db.companies.find({"ticker": {"$type": "string"}}, projection), key=lambda d: d["ticker"])
+    tickers = [d["ticker"] for d in docs]
+    names = [d.get("name") or d["ticker"] for d in docs]
+
+    columns = {}
+    for name, (source, _) in NUMERIC_COLUMNS.items():
+        if source:
+            columns[name] = _float_column(d.get(source) for d in docs)
+
+    # Calendar-day window wide enough for INDICATOR_DAYS trading days plus weekends/holidays
+    now = datetime.utcnow()
+    today = now.strftime("%Y-%m-%d")
+    series = daily_bars(now - timedelta(days=INDICATOR_DAYS * 2))
+    avg_volume, sma, ret = (np.full(len(docs), np.nan) for _ in range(3))
+    for i, ticker in enumerate(tickers):
+        days, closes, volumes = series.get(ticker, ((), (), ()))
+        closes = [c for c in closes[-INDICATOR_DAYS:] if c]
+        # Today's volume is still accumulating, so the average covers completed days only
+        previous_volumes = [v for day, v in zip(days, volumes) if day < today and v is not None][-INDICATOR_DAYS:]
+        if previous_volumes:
+            avg_volume[i] = sum(previous_volumes) / len(previous_volumes)
+        if closes:
+            sma[i] = sum(closes) / len(closes)
+        if len(closes) >= 2:
+            ret[i] = (closes[-1] / closes[0] - 1) * 100
+    columns["avg_volume_20d"] = avg_volume
+    columns["sma_20"] = sma
+    columns["return_20d"] = ret
+    with np.errstate(divide="ignore", invalid="ignore"):
+        relative = columns["volume"] / avg_volume
+    relative[~np.isfinite(relative)] = np.nan
+    columns["relative_volume"] = relative
+
+    categories = {}
+    for name, (source, _) in CATEGORY_COLUMNS.items():
+        labels = sorted({d.get(source) or "Other" for d in docs})
+        codes = {label: code for code, label in enumerate(labels)}
+        columns[name] = np.array([codes[d.get(source) or "Other"] for d in docs], dtype=np.int32)
+        categories[name] = labels
+
+    return Universe(tickers, names, columns, categories, built_at=now)
+
+
+def store_universe(universe: Universe) -> int:
+    """Saves `universe` to `db.screener_state` and returns its new version."""
+    doc = db.screener_state.find_one_and_update(
+        {"_id": STATE_ID},
+        {
+            "$inc": {"version": 1},
+            "$set": {
+                "built_at": universe.built_at,
+                "tickers": universe.tickers,
+                "names": universe.names,
+                "categories": universe.categories,
+                "columns": {name: column.tobytes() for name, column in universe.columns.items()},
+            },
+        },
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    universe.version = doc["version"]
+    return universe.version
+
+
+def load_universe(doc: dict) -> Universe:
+    columns = {}
+    for name, data in doc["columns"].items():
+        dtype = np.int32 if name in CATEGORY_COLUMNS else np.float64
+        columns[name] = np.frombuffer(data, dtype=dtype)
+    return Universe(doc["tickers"], doc["names"], columns, doc["categories"],
+                    version=doc["version"], built_at=doc.get("built_at"))
+
+
+class UniverseCache:
+    """
+    The API processes' copy of the universe. The stored version is polled at most
+    every `poll_seconds`; the columns are only reloaded when it changed.
+    """
+    def __init__(self, poll_seconds: int):
+        self.poll_seconds = poll_seconds
+        self._universe = None
+        self._polled_at = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Universe:
+        with self._lock:
+            if self._polled_at is not None and time.monotonic() - self._polled_at <= self.poll_seconds:
+                return self._universe
+            try:
+                state = db.screener_state.find_one({"_id": STATE_ID}, {"version": 1})
+                if state is None:
+                    # No price job has run since the screener was added: build it once ourselves
+                    universe = build_universe()
+                    store_universe(universe)
+                    self._universe = universe
+                elif self._universe is None or state["version"] != self._universe.version:
+                    self._universe = load_universe(db.screener_state.find_one({"_id": STATE_ID}))
+            except Exception as e:
+                if self._universe is None:
+                    raise
+                print(f"WARN: Could not refresh screener universe: {e}")
+            self._polled_at = time.monotonic()
+            return self._universe
+
+
+universe_cache = UniverseCache(settings.CACHE_GENERATION_POLL_SECONDS)
+
+
+# ---- expression language ---------------------------------------------------------------------
+#
+#   expr       := and_expr ("or" and_expr)*
+#   and_expr   := not_expr ("and" not_expr)*
+#   not_expr   := "not" not_expr | comparison
+#   comparison := sum (("<" | "<=" | ">" | ">=" | "==" | "!=") sum)?
+#               | column ["not"] "in" "(" literal ("," literal)* ")"
+#   sum        := product (("+" | "-") product)*
+#   product    := unary (("*" | "/") unary)*
+#   unary      := "-" unary | number | string | column | "(" expr ")"
+#
+# Numbers accept k/m/b/t suffixes ("market_cap > 50b"). Comparisons with a missing
+# value (NaN) are false. Parentheses, "not" and unary "-" nest at most MAX_NESTING
+# levels deep (the parser is recursive).
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+      (?P<number>\d+(?:\.\d+)?(?:[eE][-+]?\d+)?[kKmMbBtT]?\b)
+    | (?P<string>"[^"]*"|'[^']*')
+    | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+    | (?P<op><=|>=|==|!=|<|>|\+|-|\*|/|\(|\)|,)
+    )""", re.VERBOSE)
+_SUFFIXES = {"k": 1e3, "m": 1e6, "b": 1e9, "t": 1e12}
+_KEYWORDS = {"and", "or", "not", "in"}
+_COMPARISONS = {"<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal,
+                "==": np.equal, "!=": np.not_equal}
+_ARITHMETIC = {"+": np.add, "-": np.subtract, "*": np.multiply, "/": np.divide}
+_CONDITIONS = ("compare", "and", "or", "not", "in")
+MAX_EXPRESSION_LENGTH = 1000
+MAX_NESTING = 32
+
+
+def _tokenize(text: str) -> list:
+    tokens, position = [], 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if not match:
+            raise ScreenError(f"Unexpected character at position {position}: {text[position:position + 10]!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "number":
+            multiplier = _SUFFIXES.get(value[-1].lower(), 1)
+            value = float(value[:-1] if multiplier != 1 else value) * multiplier
+        elif kind == "string":
+            value = value[1:-1]
+        elif kind == "name" and value.lower() in _KEYWORDS:
+            kind, value = "op", value.lower()
+        tokens.append((kind, value))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.position = 0
+        self.fields = set()
+        self.depth = 0
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def accept(self, op: str) -> bool:
+        if self.peek() == ("op", op):
+            self.position += 1
+            return True
+        return False
+
+    def nested(self, parse):
+        """Runs `parse` one nesting level deeper."""
+        self.depth += 1
+        if self.depth > MAX_NESTING:
+            raise ScreenError(f"Expression nested more than {MAX_NESTING} levels deep")
+        node = parse()
+        self.depth -= 1
+        return node
+
+    def expect(self, op: str):
+        if not self.accept(op):
+            raise ScreenError(f"Expected {op!r} but found {self.peek()[1]!r}")
+
+    def parse(self):
+        if not self.tokens:
+            raise ScreenError("Empty expression")
+        node = self.expr()
+        if self.position != len(self.tokens):
+            raise ScreenError(f"Unexpected {self.peek()[1]!r}")
+        return node
+
+    def expr(self):
+        node = self.and_expr()
+        while self.accept("or"):
+            node = ("or", node, self.and_expr())
+        return node
+
+    def and_expr(self):
+        node = self.not_expr()
+        while self.accept("and"):
+            node = ("and", node, self.not_expr())
+        return node
+
+    def not_expr(self):
+        if self.accept("not"):
+            return ("not", self.nested(self.not_expr))
+        return self.comparison()
+
+    def comparison(self):
+        left = self.sum()
+        kind, op = self.peek()
+        negate = kind == "op" and op == "not" and self.tokens[self.position + 1:self.position + 2] == [("op", "in")]
+        if negate:
+            self.position += 1
+            kind, op = self.peek()
+        if kind == "op" and op == "in":
+            self.position += 1
+            if left[0] != "column":
+                raise ScreenError("'in' needs a column on the left")
+            self.expect("(")
+            values = [self.literal()]
+            while self.accept(","):
+                values.append(self.literal())
+            self.expect(")")
+            if left[1] in CATEGORY_COLUMNS:
+                values = [str(v) for v in values]
+            elif any(isinstance(v, str) for v in values):
+                raise ScreenError(f"'in' on {left[1]} needs numbers")
+            node = ("in", left, values)
+            return ("not", node) if negate else node
+        if kind == "op" and op in _COMPARISONS:
+            self.position += 1
+            right = self.sum()
+            self._check_operands(op, left, right)
+            return ("compare", op, left, right)
+        if left[0] not in _CONDITIONS:
+            # A bare value is not a filter
+            raise ScreenError("Expected a comparison (e.g. change_percent > 2)")
+        return left
+
+    def literal(self):
+        kind, value = self.peek()
+        if kind not in ("number", "string"):
+            raise ScreenError(f"Expected a number or string but found {value!r}")
+        self.position += 1
+        return value
+
+    def sum(self):
+        node = self.product()
+        while True:
+            kind, op = self.peek()
+            if kind == "op" and op in ("+", "-"):
+                self.position += 1
+                node = self._arithmetic(op, node, self.product())
+            else:
+                return node
+
+    def product(self):
+        node = self.unary()
+        while True:
+            kind, op = self.peek()
+            if kind == "op" and op in ("*", "/"):
+                self.position += 1
+                node = self._arithmetic(op, node, self.unary())
+            else:
+                return node
+
+    def unary(self):
+        kind, value = self.peek()
+        if kind is None:
+            raise ScreenError("Unexpected end of expression")
+        self.position += 1
+        if kind == "op" and value == "-":
+            operand = self.nested(self.unary)
+            return self._arithmetic("-", ("number", 0.0), operand)
+        if kind == "op" and value == "(":
+            node = self.nested(self.expr)
+            self.expect(")")
+            return node
+        if kind == "number":
+            return ("number", value)
+        if kind == "string":
+            return ("string", value)
+        if kind == "name":
+            if value not in COLUMNS:
+                raise ScreenError(f"Unknown field {value!r}")
+            self.fields.add(value)
+            return ("column", value)
+        raise ScreenError(f"Unexpected {value!r}")
+
+    @staticmethod
+    def _is_category(node) -> bool:
+        return node[0] == "column" and node[1] in CATEGORY_COLUMNS
+
+    def _arithmetic(self, op, left, right):
+        for node in (left, right):
+            if node[0] == "string" or self._is_category(node) or node[0] in _CONDITIONS:
+                raise ScreenError(f"{op!r} needs numeric operands")
+        return ("arith", op, left, right)
+
+    def _check_operands(self, op, left, right):
+        categorical = [n for n in (left, right) if n[0] == "string" or self._is_category(n)]
+        if not categorical:
+            if any(n[0] in _CONDITIONS for n in (left, right)):
+                raise ScreenError(f"{op!r} cannot compare a condition")
+            return
+        if op not in ("==", "!=") or len(categorical) != 2 or not any(self._is_category(n) for n in (left, right)):
+            raise ScreenError(f"{op!r}: strings can only be compared with == or != to a text field like sector")
+
+
+class Expression:
+    """A compiled screen expression. `fields` are the columns it reads."""
+    __slots__ = ("text", "tree", "fields")
+
+    def __init__(self, text: str):
+        if len(text) > MAX_EXPRESSION_LENGTH:
+            raise ScreenError(f"Expression longer than {MAX_EXPRESSION_LENGTH} characters")
+        parser = _Parser(text)
+        self.text = text
+        self.tree = parser.parse()
+        self.fields = frozenset(parser.fields)
+
+    def evaluate(self, universe: Universe, rows: np.ndarray = None) -> np.ndarray:
+        """Boolean mask over the universe, or over `rows` (indices) only."""
+        if rows is None:
+            columns = universe.columns
+        else:
+            columns = {name: universe.columns[name][rows] for name in self.fields}
+        size = len(universe) if rows is None else len(rows)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result = _evaluate(self.tree, columns, universe)
+        if np.ndim(result) == 0:
+            return np.full(size, bool(result))
+        return result
+
+
+def _evaluate(node, columns: dict, universe: Universe):
+    kind = node[0]
+    if kind == "and":
+        return np.logical_and(_evaluate(node[1], columns, universe), _evaluate(node[2], columns, universe))
+    if kind == "or":
+        return np.logical_or(_evaluate(node[1], columns, universe), _evaluate(node[2], columns, universe))
+    if kind == "not":
+        return np.logical_not(_evaluate(node[1], columns, universe))
+    if kind == "compare":
+        _, op, left, right = node
+        if left[0] == "string" or right[0] == "string":
+            column, label = (left, right) if left[0] == "column" else (right, left)
+            code = universe.category_code(column[1], label[1])
+            return _COMPARISONS[op](columns[column[1]], code)
+        return _COMPARISONS[op](_evaluate(left, columns, universe), _evaluate(right, columns, universe))
+    if kind == "in":
+        _, (_, name), values = node
+        if name in CATEGORY_COLUMNS:
+            values = [universe.category_code(name, v) for v in values]
+        return np.isin(columns[name], values)
+    if kind == "arith":
+        _, op, left, right = node
+        return _ARITHMETIC[op](_evaluate(left, columns, universe), _evaluate(right, columns, universe))
+    if kind == "column":
+        return columns[node[1]]
+    return node[1]
+
+
+_compiled = {}
+
+
+def compile_expression(text: str) -> Expression:
+    """Parses `text` (cached per expression string)."""
+    expression = _compiled.get(text)
+    if expression is None:
+        expression = Expression(text)
+        if len(_compiled) > 1000:
+            _compiled.clear()
+        _compiled[text] = expression
+    return expression
+
+
+def parse_sort(sort: str) -> tuple:
+    """"-market_cap" -> ("market_cap", descending=True)."""
+    sort = (sort or DEFAULT_SORT).strip()
+    descending = sort.startswith("-")
+    field = sort.lstrip("+-")
+    if field not in NUMERIC_COLUMNS:
+        raise ScreenError(f"Unknown sort field {field!r}")
+    return field, descending
+
+
+def order(universe: Universe, indices: np.ndarray, sort: str) -> np.ndarray:
+    """Sorts row `indices` by a column; rows missing the value go last."""
+    field, descending = parse_sort(sort)
+    values = universe.columns[field][indices]
+    keys = -values if descending else values
+    # argsort puts NaN last in both directions since the key itself is negated
+    return indices[np.argsort(keys, kind="stable")]
+
+
+def run_screen(expression: str, sort: str = DEFAULT_SORT, limit: int = 50, universe: Universe = None) -> dict:
+    universe = universe or universe_cache.get()
+    compiled = compile_expression(expression)
+    field, _ = parse_sort(sort)
+    matches = np.flatnonzero(compiled.evaluate(universe))
+    ordered = order(universe, matches, sort)[:limit]
+    return {
+        "expression": expression,
+        "sort": sort,
+        "total": int(len(matches)),
+        "universe_size": len(universe),
+        "as_of": universe.built_at,
+        "results": universe.rows(ordered, (*sorted(compiled.fields - CATEGORY_COLUMNS.keys()), field)),
+    }
+
+
+# ---- saved screens (db.saved_screens) --------------------------------------------------------
+
+class ColumnChanges:
+    """
+    Rows that changed between two consecutive universes, per column. Computed
+    lazily and once per refresh, then shared by every saved screen reading the column.
+    """
+    def __init__(self, previous: Universe, current: Universe):
+        self.previous = previous
+        self.current = current
+        # Row-level reuse needs the same rows in the same order (and the same category codes)
+        self.comparable = (previous is not None and previous.tickers == current.tickers
+                           and previous.categories == current.categories)
+        self._dirty = {}
+
+    def _column(self, name: str) -> np.ndarray:
+        dirty = self._dirty.get(name)
+        if dirty is None:
+            old, new = self.previous.columns[name], self.current.columns[name]
+            if name in CATEGORY_COLUMNS:
+                dirty = old != new
+            else:
+                dirty = ~((old == new) | (np.isnan(old) & np.isnan(new)))
+            self._dirty[name] = dirty
+        return dirty
+
+    def rows(self, fields) -> np.ndarray:
+        """Indices of rows where any of `fields` changed."""
+        dirty = np.zeros(len(self.current), dtype=bool)
+        for name in fields:
+            dirty |= self._column(name)
+        return np.flatnonzero(dirty)
+
+
+# Above this fraction of changed rows, evaluating the whole universe is cheaper than gathering rows
+INCREMENTAL_MAX_FRACTION = 0.25
+
+
+class SavedScreenEvaluator:
+    """
+    Keeps each saved screen's match mask (worker memory) between refreshes. After a
+    refresh a screen is re-evaluated on the rows whose referenced columns changed
+    only, and skipped entirely (no evaluation, no write) when none did. A restart
+    or a change in the set of tickers falls back to a full evaluation.
+    """
+    def __init__(self):
+        self.universe = None
+        self._masks = {}
+
+    def evaluate(self, universe: Universe, screen: dict, changes: ColumnChanges = None) -> tuple:
+        """(mask, changed) for `screen` against `universe`."""
+        expression = compile_expression(screen["expression"])
+        key = (screen["_id"], screen["expression"])
+        mask = self._masks.get(key)
+        changes = changes or ColumnChanges(self.universe, universe)
+        if mask is None or not changes.comparable:
+            mask = expression.evaluate(universe)
+        else:
+            rows = changes.rows(expression.fields)
+            if not len(rows):
+                return mask, False
+            if len(rows) > INCREMENTAL_MAX_FRACTION * len(universe):
+                mask = expression.evaluate(universe)
+            else:
+                mask = mask.copy()
+                mask[rows] = expression.evaluate(universe, rows)
+        self._masks[key] = mask
+        return mask, True
+
+    def refresh(self, universe: Universe) -> int:
+        """Re-evaluates every saved screen against `universe`; returns how many match sets changed."""
+        changes = ColumnChanges(self.universe, universe)
+        changed, seen = 0, set()
+        for screen in db.saved_screens.find({}, {"expression": 1, "matches": 1}):
+            seen.add((screen["_id"], screen["expression"]))
+            try:
+                mask, evaluated = self.evaluate(universe, screen, changes)
+            except ScreenError as e:
+                print(f"WARN: Saved screen {screen['_id']} no longer compiles: {e}")
+                continue
+            if not evaluated:
+                continue
+            matches = [universe.tickers[i] for i in np.flatnonzero(mask)]
+            previous = screen.get("matches") or []
+            if matches == previous:
+                continue
+            previous_set, current_set = set(previous), set(matches)
+            db.saved_screens.update_one({"_id": screen["_id"]}, {"$set": {
+                "matches": matches,
+                "added": sorted(current_set - previous_set),
+                "removed": sorted(previous_set - current_set),
+                "evaluated_at": universe.built_at,
+                "universe_version": universe.version,
+            }})
+            changed += 1
+        self._masks = {key: mask for key, mask in self._masks.items() if key in seen}
+        self.universe = universe
+        return changed
+
+
+saved_screen_evaluator = SavedScreenEvaluator()
+
+
+def create_saved_screen(user_id: str, name: str, expression: str, sort: str = DEFAULT_SORT) -> dict:
+    """Validates and stores a screen with its current matches."""
+    compiled = compile_expression(expression)
+    parse_sort(sort)
+    universe = universe_cache.get()
+    matches = [universe.tickers[i] for i in np.flatnonzero(compiled.evaluate(universe))]
+    doc = {
+        "user_id": user_id,
+        "name": name,
+        "expression": expression,
+        "sort": sort,
+        "matches": matches,
+        "added": [],
+        "removed": [],
+        "created_at": datetime.utcnow(),
+        "evaluated_at": universe.built_at,
+        "universe_version": universe.version,
+    }
+    doc["_id"] = db.saved_screens.insert_one(doc).inserted_id
+    return doc
+
+
+def saved_screen_results(screen: dict, limit: int = 50) -> dict:
+    """A saved screen with its matches (as of the last refresh) sorted by the screen's sort."""
+    universe = universe_cache.get()
+    indices = order(universe, universe.positions(screen.get("matches") or []), screen.get("sort"))[:limit]
+    field, _ = parse_sort(screen.get("sort"))
+    fields = compile_expression(screen["expression"]).fields - CATEGORY_COLUMNS.keys()
+    return {
+        "id": str(screen["_id"]),
+        "name": screen["name"],
+        "expression": screen["expression"],
+        "sort": screen.get("sort") or DEFAULT_SORT,
+        "total": len(screen.get("matches") or []),
+        "added": screen.get("added", []),
+        "removed": screen.get("removed", []),
+        "evaluated_at": screen.get("evaluated_at"),
+        "results": universe.rows(indices, (*sorted(fields), field)),
+    }
+
+
+def find_saved_screen(user_id: str, screen_id: str):
+    if not ObjectId.is_valid(screen_id):
+        return None
+    return db.saved_screens.find_one({"_id": ObjectId(screen_id), "user_id": user_id})
+
+
+def refresh_screener():
+    """
+    Rebuilds and stores the universe, then re-evaluates saved screens. Called by the price jobs.
+    Returns the new universe (None if the rebuild failed).
+    """
+    try:
+        universe = build_universe()
+        store_universe(universe)
+    except Exception as e:
+        print(f"WARN: Screener refresh failed: {e}")
+        return None
+    try:
+        changed = saved_screen_evaluator.refresh(universe)
+        print(f"INFO: Screener universe v{universe.version} ({len(universe)} tickers), {changed} saved screens changed")
+    except Exception as e:
+        print(f"WARN: Saved screen evaluation failed: {e}")
+    return universe
@@ -0,0 +1,204 @@
+"""
+Semantic search over news articles and company profiles (`GET /search/semantic`).
+
+Articles are embedded in batches as they are ingested (title + plain-text
+snippet; syndicated duplicates are skipped) and appended to a float16
+memory-mapped IVF index under SEMANTIC_INDEX_DIR (services/vector_index.py).
+Company profiles (name, sector, description) are few and change with the sync
+jobs, so they live in an in-memory index that is rebuilt when the company
+profile generation changes, the same way as the entity tagger.
+
+Each embedded article is stamped with `embedded_with` (the embedder and the
+index epoch, see `SemanticSearch.marker`), so an article ingested before the
+index existed, or an index wiped with its disk (a redeploy) or rebuilt for
+another model, shows up as not embedded. `semantic_backfill` embeds every such
+article; the API process runs it on startup (`start_semantic_backfill`).
+
+A query is embedded once and scored against both indexes; hits are then
+loaded from Mongo by `_id` (a hit whose document is gone is dropped).
+"""
+import contextlib
+import os
+import threading
+
+from bson import ObjectId
+
+from ..config import settings
+from ..database import db
+from ..utils.json_response import with_id
+from .article_text import ARTICLE_LIST_PROJECTION
+from .company_cache import company_cache
+from .embeddings import get_embedder
+from .vector_index import VectorIndex
+
+try:
+    import fcntl
+except ImportError:  # Windows: single process
+    fcntl = None
+
+EMBED_BATCH = 256
+DESCRIPTION_CHARS = 1000
+MIN_SCORE = 0.05
+COMPANY_PROJECTION = {"name": 1, "ticker": 1, "industry": 1, "price": 1, "change_percent": 1, "market_cap": 1}
+
+
+def article_text(article: dict) -> str:
+    return f"{article.get('title') or ''}. {article.get('summary_text') or ''}"
+
+
+def company_text(company: dict) -> str:
+    return f"{company.get('name') or ''}. {company.get('industry') or ''}. {(company.get('description') or '')[:DESCRIPTION_CHARS]}"
+
+
+class SemanticSearch:
+    def __init__(self, directory: str = None, embedder=None):
+        self.directory = directory
+        self._embedder = embedder
+        self._articles = None
+        self._companies = None
+        self._company_generation = None
+        self._lock = threading.RLock()
+
+    @property
+    def embedder(self):
+        # Loading a sentence-transformers model takes seconds: only on first use
+        if self._embedder is None:
+            with self._lock:
+                if self._embedder is None:
+                    self._embedder = get_embedder()
+        return self._embedder
+
+    @property
+    def articles(self) -> VectorIndex:
+        if self._articles is None:
+            embedder = self.embedder
+            with self._lock:
+                if self._articles is None:
+                    self._articles = VectorIndex(embedder.dim, embedder.name, self.directory, "articles",
+                                                 nprobe=settings.SEMANTIC_NPROBE)
+        return self._articles
+
+    @property
+    def marker(self) -> str:
+        """`embedded_with` value of the articles in the current index (changes when the index is reset or lost)."""
+        index = self.articles
+        index.refresh()
+        return f"{self.embedder.name}@{index.epoch}"
+
+    def index_articles(self, articles: list[dict]) -> int:
+        """Embeds and appends inserted articles (the caller's batch); returns how many were indexed."""
+        articles = [a for a in articles if a.get("_id") is not None and not a.get("duplicate")]
+        for start in range(0, len(articles), EMBED_BATCH):
+            batch = articles[start:start + EMBED_BATCH]
+            self.articles.add([str(a["_id"]) for a in batch], self.embedder.embed([article_text(a) for a in batch]))
+            db.articles.update_many({"_id": {"$in": [a["_id"] for a in batch]}},
+                                    {"$set": {"embedded_with": self.marker}})
+        return len(articles)
+
+    def companies(self) -> VectorIndex:
+        """The company index, rebuilt from `db.companies` when the profile generation changes."""
+        generation = company_cache.generations.get("profile")
+        if self._companies is None or generation != self._company_generation:
+            with self._lock:
+                if self._companies is None or generation != self._company_generation:
+                    embedder = self.embedder
+                    index = VectorIndex(embedder.dim, embedder.name)
+                    companies = list(db.companies.find({}, {"name": 1, "industry": 1, "description": 1}))
+                    for start in range(0, len(companies), EMBED_BATCH):
+                        batch = companies[start:start + EMBED_BATCH]
+                        index.add([str(c["_id"]) for c in batch], embedder.embed([company_text(c) for c in batch]))
+                    self._companies, self._company_generation = index, generation
+        return self._companies
+
+    @staticmethod
+    def _load(collection, hits: list, projection: dict) -> list:
+        # An article embedded twice (a failed `embedded_with` stamp, or ingest racing the backfill) has two rows
+        seen, unique = set(), []
+        for i, score in hits:
+            if score >= MIN_SCORE and i not in seen:
+                seen.add(i)
+                unique.append((i, score))
+        hits = unique
+        if not hits:
+            return []
+        docs = {doc["_id"]: doc for doc in collection.find({"_id": {"$in": [ObjectId(i) for i, _ in hits]}}, projection)}
+        return [
+            {**with_id(docs[ObjectId(i)]), "score": round(score, 4)}
+            for i, score in hits if ObjectId(i) in docs
+        ]
+
+    def search(self, query: str, k: int = 10, kinds=("articles", "companies")) -> dict:
+        vector = self.embedder.embed([query])[0]
+        result = {}
+        if "articles" in kinds:
+            result["articles"] = self._load(db.articles, self.articles.search(vector, k), ARTICLE_LIST_PROJECTION)
+        if "companies" in kinds:
+            result["companies"] = self._load(db.companies, self.companies().search(vector, k), COMPANY_PROJECTION)
+        return result
+
+
+semantic_search = SemanticSearch(settings.SEMANTIC_INDEX_DIR)
+
+
+def semantic_backfill(batch_size: int = 2000, reindex: bool = False) -> int:
+    """
+    Embeds every stored article not yet in the current index (its
+    `embedded_with` is missing or names another index), oldest first. `reindex`
+    clears the index first, e.g. after changing EMBEDDING_MODEL, so every
+    article is re-embedded. Returns how many were indexed.
+    """
+    if reindex:
+        semantic_search.articles.reset()
+    query = {"duplicate": {"$ne": True}, "embedded_with": {"$ne": semantic_search.marker}}
+    indexed = 0
+    # One short query per page (by _id) rather than a cursor held open while embedding, which
+    # could outlive the server's idle cursor timeout on a large archive
+    while True:
+        batch = list(db.articles.find(query, {"title": 1, "summary_text": 1}).sort("_id", 1).limit(batch_size))
+        if not batch:
+            return indexed
+        indexed += semantic_search.index_articles(batch)
+        query["_id"] = {"$gt": batch[-1]["_id"]}
+
+
+@contextlib.contextmanager
+def _backfill_lock():
+    """Non-blocking lock on the index directory: yields False while another process is backfilling."""
+    directory = semantic_search.directory
+    if not directory or fcntl is None:
+        yield True
+        return
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, "articles.backfill.lock"), "a") as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _startup_backfill():
+    try:
+        with _backfill_lock() as acquired:
+            if not acquired:
+                return
+            count = semantic_backfill()
+            if count:
+                print(f"INFO: Embedded {count} articles for semantic search")
+    except Exception as e:
+        print(f"WARN: Semantic search backfill failed: {e}")
+
+
+def start_semantic_backfill() -> threading.Thread:
+    """
+    Embeds the articles missing from the index in a daemon thread (API startup):
+    rebuilds an index lost with the local disk and catches up on articles the
+    ingest did not index. One API process does the work; the others skip.
+    """
+    thread = threading.Thread(target=_startup_backfill, name="semantic-backfill", daemon=True)
+    thread.start()
+    return thread
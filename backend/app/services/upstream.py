@@ -0,0 +1,260 @@
+"""
+Single entry point for every upstream call the app makes (Yahoo Finance, RSS).
+
+Modes (setting `UPSTREAM_MODE`):
+- **live** (default): call yfinance / feedparser directly.
+- **record**: call them and store every response in the fixture store (`UPSTREAM_FIXTURE_DIR`).
+- **replay**: never touch the network; serve recorded responses with configurable
+  latency and injected failures (429s, timeouts) so ingest jobs can be load-tested
+  deterministically. Unknown tickers are mapped onto recorded ones, so a universe
+  10x larger than what was recorded can be replayed.
+
+Record fixtures with:  python record_fixtures.py
+"""
+import random
+import threading
+import time
+
+import pandas as pd
+
+from ..config import settings
+from ..utils.fixture_store import FixtureStore, request_key
+
+
+class UpstreamRateLimited(Exception):
+    """Injected in replay mode to emulate Yahoo's '429 Too Many Requests'."""
+    def __init__(self, what: str):
+        super().__init__(f"429 Too Many Requests (replayed) for {what}")
+
+
+class UpstreamTimeout(TimeoutError):
+    """Injected in replay mode to emulate a network timeout."""
+
+
+# ---- (de)serialization of upstream responses -------------------------------------------------
+
+def frame_to_payload(df: pd.DataFrame) -> dict:
+    columns = [list(c) if isinstance(c, tuple) else c for c in df.columns]
+    return {
+        "index": [ts.isoformat() for ts in pd.DatetimeIndex(df.index)],
+        "columns": columns,
+        "multi": isinstance(df.columns, pd.MultiIndex),
+        "data": df.to_numpy(dtype=object).tolist(),
+    }
+
+
+def payload_to_frame(payload: dict) -> pd.DataFrame:
+    columns = payload["columns"]
+    if payload.get("multi"):
+        columns = pd.MultiIndex.from_tuples([tuple(c) for c in columns])
+    df = pd.DataFrame(payload["data"], index=pd.DatetimeIndex(pd.to_datetime(payload["index"]), name="Date"), columns=columns)
+    return df.apply(pd.to_numeric, errors="coerce")
+
+
+def feed_to_payload(feed) -> dict:
+    entries = []
+    for entry in feed.entries:
+        parsed = getattr(entry, "published_parsed", None)
+        entries.append({
+            "title": entry.get("title"),
+            "link": entry.get("link"),
+            "published": entry.get("published"),
+            "published_parsed": list(parsed) if parsed else None,
+            "summary": entry.get("summary"),
+            # Used for thumbnails and reading time (services/article_text.py)
+            "content": entry.get("content"),
+            "media_thumbnail": entry.get("media_thumbnail"),
+            "media_content": entry.get("media_content"),
+            "links": entry.get("links"),
+        })
+    return {"feed": {"title": feed.feed.get("title", "")}, "entries": entries}
+
+
+def payload_to_feed(payload: dict):
+    from feedparser import FeedParserDict
+
+    entries = []
+    for e in payload["entries"]:
+        entry = FeedParserDict({k: v for k, v in e.items() if v is not None})
+        if e.get("published_parsed"):
+            entry["published_parsed"] = time.struct_time(tuple(e["published_parsed"]))
+        entries.append(entry)
+    return FeedParserDict(feed=FeedParserDict(payload["feed"]), entries=entries)
+
+
+# ---- backends ---------------------------------------------------------------------------------
+
+class LiveBackend:
+    """Talks to the real services."""
+    def ticker_info(self, symbol: str) -> dict:
+        import yfinance as yf
+        return yf.Ticker(symbol).info
+
+    def ticker_history(self, symbol: str, period: str, timeout=None) -> pd.DataFrame:
+        import yfinance as yf
+        return yf.Ticker(symbol).history(period=period, timeout=timeout)
+
+    def download(self, tickers: list, period: str) -> pd.DataFrame:
+        import yfinance as yf
+        # threads=False to avoid SQLite 'database is locked' errors in production
+        return yf.download(tickers, period=period, group_by='ticker', threads=False, progress=False)
+
+    def parse_feed(self, url: str):
+        import feedparser
+        return feedparser.parse(url)
+
+
+class RecordingBackend:
+    """Live calls, with every response written to the fixture store."""
+    def __init__(self, store: FixtureStore, live: LiveBackend = None):
+        self.store = store
+        self.live = live or LiveBackend()
+
+    def ticker_info(self, symbol):
+        info = self.live.ticker_info(symbol)
+        self.store.put(request_key("info", symbol), info)
+        self.store.add_to_catalog("info", symbol)
+        return info
+
+    def ticker_history(self, symbol, period, timeout=None):
+        hist = self.live.ticker_history(symbol, period, timeout)
+        self.store.put(request_key("history", symbol, period), frame_to_payload(hist))
+        self.store.add_to_catalog(f"history-{period}", symbol)
+        return hist
+
+    def download(self, tickers, period):
+        data = self.live.download(tickers, period)
+        # Stored per ticker, so replay can assemble any chunk (including larger synthetic universes)
+        for ticker in tickers:
+            if len(tickers) == 1:
+                frame = data
+            elif isinstance(data.columns, pd.MultiIndex) and ticker in data.columns.levels[0]:
+                frame = data[ticker]
+            else:
+                continue
+            self.store.put(request_key("download", ticker, period), frame_to_payload(frame))
+            self.store.add_to_catalog(f"download-{period}", ticker)
+        return data
+
+    def parse_feed(self, url):
+        feed = self.live.parse_feed(url)
+        self.store.put(request_key("feed", url), feed_to_payload(feed))
+        return feed
+
+
+class ReplayBackend:
+    """
+    Serves recorded responses only.
+
+    - `latency_ms` (+/- `jitter_ms`) is slept before every call.
+    - `rate_limit_rate` / `timeout_rate` are probabilities of raising `UpstreamRateLimited`
+      / `UpstreamTimeout` instead of answering (seeded, so runs are reproducible).
+    - Tickers that were never recorded are mapped onto a recorded one (stable hash),
+      so ingest jobs can run against a bigger universe than was recorded.
+    """
+    def __init__(self, store: FixtureStore, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 rate_limit_rate: float = 0.0, timeout_rate: float = 0.0, seed: int = 0):
+        self.store = store
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit_rate = rate_limit_rate
+        self.timeout_rate = timeout_rate
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.calls = 0
+        self.injected_errors = 0
+
+    def _before_call(self, what: str):
+        with self._rng_lock:
+            self.calls += 1
+            roll = self._rng.random()
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        delay = max(0.0, self.latency_ms + jitter) / 1000
+        if delay:
+            time.sleep(delay)
+        if roll < self.rate_limit_rate:
+            self.injected_errors += 1
+            raise UpstreamRateLimited(what)
+        if roll < self.rate_limit_rate + self.timeout_rate:
+            self.injected_errors += 1
+            raise UpstreamTimeout(f"Timed out (replayed) for {what}")
+
+    def _resolve(self, kind: str, name: str, *args):
+        key = request_key(kind, name, *args)
+        if key in self.store:
+            return self.store.get(key)
+        recorded = self.store.catalog(kind if not args else f"{kind}-{args[0]}")
+        if not recorded:
+            raise KeyError(f"No fixture recorded for {kind} {name}")
+        stand_in = recorded[int(request_key(name)[:8], 16) % len(recorded)]
+        return self.store.get(request_key(kind, stand_in, *args))
+
+    def ticker_info(self, symbol):
+        self._before_call(f"info {symbol}")
+        return self._resolve("info", symbol)
+
+    def ticker_history(self, symbol, period, timeout=None):
+        self._before_call(f"history {symbol}")
+        return payload_to_frame(self._resolve("history", symbol, period))
+
+    def download(self, tickers, period):
+        self._before_call(f"download {len(tickers)} tickers")
+        frames = {t: payload_to_frame(self._resolve("download", t, period)) for t in tickers}
+        if len(tickers) == 1:
+            return frames[tickers[0]]
+        return pd.concat(frames, axis=1)
+
+    def parse_feed(self, url):
+        self._before_call(f"feed {url}")
+        return payload_to_feed(self.store.get(request_key("feed", url)))
+
+
+def build_backend():
+    mode = settings.UPSTREAM_MODE.lower()
+    if mode == "live":
+        return LiveBackend()
+    store = FixtureStore(settings.UPSTREAM_FIXTURE_DIR)
+    if mode == "record":
+        print(f"INFO: Upstream RECORD mode, writing fixtures to {settings.UPSTREAM_FIXTURE_DIR}")
+        return RecordingBackend(store)
+    if mode == "replay":
+        print(f"INFO: Upstream REPLAY mode, serving fixtures from {settings.UPSTREAM_FIXTURE_DIR}")
+        return ReplayBackend(
+            store,
+            latency_ms=settings.UPSTREAM_REPLAY_LATENCY_MS,
+            jitter_ms=settings.UPSTREAM_REPLAY_JITTER_MS,
+            rate_limit_rate=settings.UPSTREAM_REPLAY_429_RATE,
+            timeout_rate=settings.UPSTREAM_REPLAY_TIMEOUT_RATE,
+            seed=settings.UPSTREAM_REPLAY_SEED,
+        )
+    raise ValueError(f"Unknown UPSTREAM_MODE: {settings.UPSTREAM_MODE}")
+
+
+class Upstream:
+    """Facade used by the services; delegates to the backend selected by `UPSTREAM_MODE`."""
+    def __init__(self, backend=None):
+        self._backend = backend
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = build_backend()
+        return self._backend
+
+    @backend.setter
+    def backend(self, value):
+        self._backend = value
+
+    def ticker_info(self, symbol: str) -> dict:
+        return self.backend.ticker_info(symbol)
+
+    def ticker_history(self, symbol: str, period: str = "2d", timeout=None) -> pd.DataFrame:
+        return self.backend.ticker_history(symbol, period, timeout)
+
+    def download(self, tickers: list, period: str = "1d") -> pd.DataFrame:
+        return self.backend.download(list(tickers), period)
+
+    def parse_feed(self, url: str):
+        return self.backend.parse_feed(url)
+
+upstream = Upstream()
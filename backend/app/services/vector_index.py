@@ -0,0 +1,327 @@
+"""
+Float16 vector store with an IVF (inverted file) approximate nearest-neighbour index.
+
+Vectors are L2-normalized, so the score is the dot product (cosine). Storage,
+under `directory` (or in memory when `directory` is None):
+
+- `<name>.f16`: count x dim float16 matrix, memory-mapped (2 bytes per value:
+  1M x 384 vectors is 768 MB on disk, and only the probed rows are paged in)
+- `<name>.ids`: fixed 24-byte ids (ObjectId hex), one per row
+- `<name>.lists`: the inverted list (nearest centroid) of each row, int32
+- `<name>.centroids-v<version>.npy`: the trained centroids
+- `<name>.meta.json`: count, dimensions, embedder and centroid version. It is
+  written last (atomic replace), so readers never see rows that are not
+  complete, and its mtime tells other processes to pick up new rows.
+
+Below IVF_MIN_VECTORS, search scans every vector exactly. Above that, the index
+trains NLIST ~ sqrt(N) centroids with spherical k-means on a sample. A query
+scores only the rows in the `nprobe` lists whose centroids are nearest.
+
+New vectors are assigned to their nearest centroid and appended to that list,
+so updates are incremental. Centroids are retrained, and all rows reassigned,
+once the index has grown RETRAIN_GROWTH times since the last training.
+
+Writers take an exclusive lock on `<name>.lock` (where `fcntl` exists), so the
+API process and migrations can both append.
+"""
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import uuid
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: run a single writer
+    fcntl = None
+
+IVF_MIN_VECTORS = 20_000
+RETRAIN_GROWTH = 2
+KMEANS_ITERATIONS = 6
+KMEANS_SAMPLE_PER_LIST = 32
+INITIAL_CAPACITY = 1024
+ID_BYTES = 24
+CHUNK = 65536
+
+
+def nlist_for(count: int) -> int:
+    return int(np.clip(4 * np.sqrt(count), 64, 4096))
+
+
+def assign_lists(vectors, centroids: np.ndarray) -> np.ndarray:
+    """Index of the nearest centroid for every row (chunked, float16 rows upcast per chunk)."""
+    out = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), CHUNK):
+        chunk = np.asarray(vectors[start:start + CHUNK], dtype=np.float32)
+        out[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+    return out
+
+
+def spherical_kmeans(sample: np.ndarray, nlist: int, iterations: int, rng: np.random.Generator) -> np.ndarray:
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assign = assign_lists(sample, centroids)
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=nlist)
+        present = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[present]
+        sums = np.empty_like(centroids)
+        sums[present] = np.add.reduceat(sample[order], starts, axis=0)
+        empty = counts == 0
+        if empty.any():  # restart empty clusters on random points
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()), replace=False)]
+        centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+    return centroids.astype(np.float32)
+
+
+class VectorIndex:
+    def __init__(self, dim: int, embedder: str, directory: str = None, name: str = "index", nprobe: int = 8):
+        self.dim = dim
+        self.embedder = embedder
+        self.directory = directory
+        self.name = name
+        self.nprobe = nprobe
+        self._lock = threading.RLock()
+        self._empty()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._load()
+
+    # ---- storage -----------------------------------------------------------------------------
+
+    def _empty(self):
+        self.count = 0
+        self.capacity = 0
+        self.vectors = np.zeros((0, self.dim), dtype=np.float16)
+        self.ids = np.zeros(0, dtype=f"S{ID_BYTES}")
+        self.lists = np.zeros(0, dtype=np.int32)
+        self.centroids = None
+        self.version = 0
+        self.trained_count = 0
+        self.epoch = uuid.uuid4().hex  # changes when the files are recreated (reset)
+        self.members = []
+        self._meta_mtime = None
+
+    def _path(self, suffix: str) -> str:
+        return os.path.join(self.directory, f"{self.name}.{suffix}")
+
+    def _map(self, capacity: int):
+        """(Re)maps the row files with room for `capacity` rows, growing them if needed."""
+        arrays = {}
+        for suffix, dtype, shape in (("f16", np.float16, (capacity, self.dim)), ("ids", f"S{ID_BYTES}", (capacity,)),
+                                     ("lists", np.int32, (capacity,))):
+            if self.directory:
+                path = self._path(suffix)
+                size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+                with open(path, "ab") as f:
+                    if f.tell() < size:
+                        f.truncate(size)
+                arrays[suffix] = np.memmap(path, dtype=dtype, mode="r+", shape=shape) if capacity else np.zeros(shape, dtype)
+            else:
+                grown = np.zeros(shape, dtype=dtype)
+                old = {"f16": self.vectors, "ids": self.ids, "lists": self.lists}[suffix]
+                grown[:self.count] = old[:self.count]
+                arrays[suffix] = grown
+        self.vectors, self.ids, self.lists = arrays["f16"], arrays["ids"], arrays["lists"]
+        self.capacity = capacity
+
+    def _file_capacity(self) -> int:
+        try:
+            return os.path.getsize(self._path("f16")) // (self.dim * 2)
+        except OSError:
+            return 0
+
+    def _centroids_path(self, version: int) -> str:
+        return self._path(f"centroids-v{version}.npy")
+
+    def _load(self):
+        """Full (re)load from disk; an index built with other dimensions or another embedder starts empty."""
+        try:
+            meta_mtime = os.stat(self._path("meta.json")).st_mtime_ns
+            with open(self._path("meta.json")) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = None
+        if meta and (meta.get("dim") != self.dim or meta.get("embedder") != self.embedder):
+            print(f"WARN: Vector index {self.name} was built with {meta.get('embedder')} ({meta.get('dim')} dims); "
+                  "starting empty. Re-embed with `python migrate_articles.py --reindex`.")
+            meta = None
+        self._empty()
+        if not meta:
+            return
+        self._map(max(self._file_capacity(), meta["count"]))
+        self.count = meta["count"]
+        self.version = meta.get("version", 0)
+        self.trained_count = meta.get("trained_count", 0)
+        self.epoch = meta.get("epoch")
+        if self.version:
+            self.centroids = np.load(self._centroids_path(self.version))
+        self._rebuild_members()
+        self._meta_mtime = meta_mtime
+
+    def _write_meta(self):
+        if not self.directory:
+            return
+        for array in (self.vectors, self.ids, self.lists):
+            if isinstance(array, np.memmap):
+                array.flush()
+        meta = {"count": self.count, "dim": self.dim, "embedder": self.embedder,
+                "version": self.version, "trained_count": self.trained_count, "epoch": self.epoch}
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".meta.tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._path("meta.json"))
+        self._meta_mtime = os.stat(self._path("meta.json")).st_mtime_ns
+
+    @contextlib.contextmanager
+    def _write_lock(self):
+        if not self.directory or fcntl is None:
+            yield
+            return
+        with open(self._path("lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def refresh(self):
+        """Picks up rows (or a retrain) written by another process since the last look."""
+        if not self.directory:
+            return
+        try:
+            mtime = os.stat(self._path("meta.json")).st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._meta_mtime:
+            return
+        with self._lock:
+            try:
+                with open(self._path("meta.json")) as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                return
+            if (meta.get("epoch") != self.epoch or meta.get("version", 0) != self.version
+                    or meta["count"] < self.count or meta.get("dim") != self.dim):
+                self._load()
+                return
+            if meta["count"] > self.capacity:
+                self._map(max(self._file_capacity(), meta["count"]))
+            start, self.count = self.count, meta["count"]
+            self._extend_members(start)
+            self._meta_mtime = mtime
+
+    # ---- inverted lists ----------------------------------------------------------------------
+
+    def _rebuild_members(self):
+        if self.centroids is None:
+            self.members = []
+            return
+        lists = np.asarray(self.lists[:self.count])
+        order = np.argsort(lists, kind="stable")
+        counts = np.bincount(lists, minlength=len(self.centroids))
+        self.members = np.split(order.astype(np.int64), np.cumsum(counts)[:-1])
+
+    def _extend_members(self, start: int):
+        """Appends rows `start:count` to their lists (the incremental update)."""
+        if self.centroids is None or start >= self.count:
+            return
+        rows = np.arange(start, self.count, dtype=np.int64)
+        lists = np.asarray(self.lists[start:self.count])
+        order = np.argsort(lists, kind="stable")
+        touched, first = np.unique(lists[order], return_index=True)
+        for lst, group in zip(touched, np.split(rows[order], first[1:])):
+            self.members[lst] = np.concatenate((self.members[lst], group))
+
+    def train(self, seed: int = 0):
+        """(Re)trains the centroids on a sample and reassigns every row."""
+        with self._lock:
+            rng = np.random.default_rng(seed)
+            nlist = nlist_for(self.count)
+            size = min(self.count, nlist * KMEANS_SAMPLE_PER_LIST)
+            sample_rows = np.sort(rng.choice(self.count, size, replace=False))
+            sample = np.asarray(self.vectors[sample_rows], dtype=np.float32)
+            centroids = spherical_kmeans(sample, nlist, KMEANS_ITERATIONS, rng)
+            self.lists[:self.count] = assign_lists(self.vectors[:self.count], centroids)
+            previous = self.version
+            self.version += 1
+            if self.directory:
+                fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".npy.tmp")
+                with os.fdopen(fd, "wb") as f:
+                    np.save(f, centroids)
+                os.replace(tmp, self._centroids_path(self.version))
+            self.centroids = centroids
+            self.trained_count = self.count
+            self._rebuild_members()
+            self._write_meta()
+            if self.directory and previous:
+                with contextlib.suppress(OSError):
+                    os.unlink(self._centroids_path(previous))
+
+    # ---- updates / queries -------------------------------------------------------------------
+
+    def add(self, ids: list[str], vectors: np.ndarray):
+        """Appends vectors (n x dim, normalized) for `ids`; trains or retrains the lists when due."""
+        if not len(ids):
+            return
+        with self._lock, self._write_lock():
+            self.refresh()  # rows appended by another writer go first
+            n = len(ids)
+            if self.count + n > self.capacity:
+                self._map(max(self.capacity * 2, self.count + n, INITIAL_CAPACITY))
+            start, end = self.count, self.count + n
+            self.vectors[start:end] = vectors
+            self.ids[start:end] = [i.encode() for i in ids]
+            if self.centroids is not None:
+                self.lists[start:end] = assign_lists(vectors, self.centroids)
+            self.count = end
+            self._extend_members(start)
+            if (self.centroids is None and self.count >= IVF_MIN_VECTORS) or \
+                    (self.centroids is not None and self.count >= RETRAIN_GROWTH * self.trained_count):
+                self.train()
+            else:
+                self._write_meta()
+
+    def reset(self):
+        """Drops every vector (the files are truncated on the next add)."""
+        with self._lock, self._write_lock():
+            if self.directory:
+                for suffix in ("f16", "ids", "lists"):
+                    with contextlib.suppress(OSError):
+                        os.unlink(self._path(suffix))
+                if self.version:
+                    with contextlib.suppress(OSError):
+                        os.unlink(self._centroids_path(self.version))
+            self._empty()
+            self._write_meta()
+
+    def search(self, query: np.ndarray, k: int, nprobe: int = None) -> list[tuple[str, float]]:
+        """Top `k` (id, score) by cosine similarity, best first."""
+        self.refresh()
+        with self._lock:
+            count, vectors, ids, centroids, members = self.count, self.vectors, self.ids, self.centroids, self.members
+        if not count or k <= 0:
+            return []
+        query = np.asarray(query, dtype=np.float32)
+        if centroids is None:
+            rows = None
+            scores = np.concatenate([
+                np.asarray(vectors[start:min(start + CHUNK, count)], dtype=np.float32) @ query
+                for start in range(0, count, CHUNK)
+            ])
+        else:
+            nprobe = min(nprobe or self.nprobe, len(centroids))
+            probe = np.argpartition(centroids @ query, -nprobe)[-nprobe:]
+            rows = np.sort(np.concatenate([members[p] for p in probe]))
+            rows = rows[rows < count]
+            scores = np.asarray(vectors[rows], dtype=np.float32) @ query
+        k = min(k, len(scores))
+        if not k:
+            return []
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(-scores[top])]
+        hit_rows = top if rows is None else rows[top]
+        return [(i.decode(), float(s)) for i, s in zip(ids[hit_rows], scores[top])]
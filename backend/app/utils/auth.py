@@ -1,10 +1,23 @@
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import hmac
+import threading
+from fastapi import Header, HTTPException, status
 from jose import JWTError, jwt
 from ..config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Pinning min/max rounds to the configured cost makes `needs_update()` flag any
+# hash created with a different cost, so it gets rehashed on the next login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.PASSWORD_HASH_ROUNDS,
+    bcrypt__min_rounds=settings.PASSWORD_HASH_ROUNDS,
+    bcrypt__max_rounds=settings.PASSWORD_HASH_ROUNDS,
+)
 
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
@@ -12,6 +25,85 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+def verify_and_update_password(plain_password, hashed_password):
+    """
+    Returns (is_valid, new_hash). `new_hash` is set only when the stored hash
+    was created with outdated cost parameters and should be replaced.
+    """
+    if not hashed_password:
+        return False, None
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing pool already has `max_pending` jobs queued."""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt off the event loop in a small dedicated thread pool.
+
+    Why this exists:
+    - bcrypt costs 100-300 ms of CPU per call. Running it inside an `async def`
+      handler blocks the event loop, so every other request stalls during a login burst.
+    - The `bcrypt` C extension releases the GIL, so a thread pool gives real parallelism
+      without the pickling overhead of a process pool.
+
+    Backpressure:
+    - At most `max_pending` jobs (running + queued) are accepted. Beyond that,
+      `PasswordHasherBusy` is raised and the routes answer 503 with `Retry-After`,
+      instead of letting the queue (and login latency) grow without bound.
+    """
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = max(1, workers)
+        self.max_pending = max(self.workers, max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pwd-hash")
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self.rejected = 0
+
+    async def run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise PasswordHasherBusy()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+def _busy_exception():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication service is busy, please retry shortly.",
+        headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER)},
+    )
+
+async def hash_password_async(password: str) -> str:
+    """Async wrapper around `get_password_hash`. Raises 503 when the pool is saturated."""
+    try:
+        return await password_hasher.run(get_password_hash, password)
+    except PasswordHasherBusy:
+        raise _busy_exception()
+
+async def verify_password_async(plain_password: str, hashed_password: str):
+    """
+    Async wrapper around `verify_and_update_password`.
+    Returns (is_valid, new_hash). Raises 503 when the pool is saturated.
+    """
+    try:
+        return await password_hasher.run(verify_and_update_password, plain_password, hashed_password)
+    except PasswordHasherBusy:
+        raise _busy_exception()
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -21,3 +113,10 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)):
+    """Guards admin endpoints: the `X-Admin-Token` header must match `ADMIN_TOKEN`. Fails closed when it is unset."""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin endpoints are disabled (ADMIN_TOKEN not set)")
+    if not hmac.compare_digest(x_admin_token or "", settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin token required")
@@ -0,0 +1,72 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+
+
+def request_key(kind: str, *args) -> str:
+    """Stable key for an upstream request, e.g. request_key("info", "HBL.KA")."""
+    canonical = json.dumps([kind, *args], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class FixtureStore:
+    """
+    Compressed, content-addressed store for recorded upstream responses.
+
+    Layout under `root`:
+        objects/ab/abcdef....json.gz   gzip'd JSON payload, named by the SHA-256 of its content
+        index/12/1234....              request key -> object hash (one tiny file per request)
+
+    Identical responses (e.g. the same RSS feed recorded twice) are stored once.
+    Writes go through a temp file + rename, so concurrent recorders never leave
+    half-written fixtures behind.
+    """
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, section: str, digest: str, suffix: str = "") -> str:
+        return os.path.join(self.root, section, digest[:2], digest + suffix)
+
+    @staticmethod
+    def _atomic_write(path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def put(self, key: str, payload) -> str:
+        body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        obj_path = self._path("objects", digest, ".json.gz")
+        if not os.path.exists(obj_path):
+            self._atomic_write(obj_path, gzip.compress(body, mtime=0))
+        self._atomic_write(self._path("index", key), digest.encode("ascii"))
+        return digest
+
+    def get(self, key: str):
+        """Returns the recorded payload, or raises KeyError if nothing was recorded for `key`."""
+        try:
+            with open(self._path("index", key), "rb") as f:
+                digest = f.read().decode("ascii").strip()
+            with gzip.open(self._path("objects", digest, ".json.gz"), "rb") as f:
+                return json.loads(f.read())
+        except FileNotFoundError:
+            raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self._path("index", key))
+
+    def add_to_catalog(self, kind: str, name: str):
+        """Remembers that `name` (e.g. a ticker) was recorded for `kind`, for replay fallbacks."""
+        path = os.path.join(self.root, "catalog", kind, name)
+        if not os.path.exists(path):
+            self._atomic_write(path, b"")
+
+    def catalog(self, kind: str) -> list[str]:
+        try:
+            return sorted(os.listdir(os.path.join(self.root, "catalog", kind)))
+        except FileNotFoundError:
+            return []
@@ -0,0 +1,198 @@
+"""
+Local verification of Google Sign-In ID tokens.
+
+`id_token.verify_oauth2_token(..., google_requests.Request(), ...)` builds a new
+HTTP transport and downloads Google's certificates on every login. This module
+keeps the signing keys (JWKS) in memory for as long as Google's `Cache-Control:
+max-age` allows, reuses one pooled HTTP session, and checks signatures locally.
+
+The key source is pluggable: production uses `HttpJwksSource`, while tests can
+pass a `StaticJwksSource` holding keys generated for a local fake issuer.
+"""
+import re
+import threading
+import time
+from collections import deque
+from typing import Optional, Protocol, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from jose import jwt, JWTError
+from .metrics import REGISTRY
+
+GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+VERIFY_LATENCY = REGISTRY.histogram(
+    "google_token_verify_seconds", "Google ID-token verification latency.", ("result",),
+    (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+
+
+class TokenVerificationError(Exception):
+    """Raised when an ID token is malformed, expired, or signed by an unknown key."""
+
+
+class JwksSource(Protocol):
+    def fetch(self) -> Tuple[dict, int]:
+        """Returns (jwks_document, max_age_seconds)."""
+        ...
+
+
+class HttpJwksSource:
+    """Fetches a JWKS document over one shared, connection-pooled session."""
+    def __init__(self, url: str = GOOGLE_JWKS_URL, timeout: float = 5.0, default_max_age: int = 3600):
+        self.url = url
+        self.timeout = timeout
+        self.default_max_age = default_max_age
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
+    def fetch(self) -> Tuple[dict, int]:
+        response = self.session.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        match = _MAX_AGE_RE.search(response.headers.get("Cache-Control", ""))
+        max_age = int(match.group(1)) if match else self.default_max_age
+        return response.json(), max_age
+
+
+class StaticJwksSource:
+    """In-memory key source, e.g. for a local fake issuer in tests."""
+    def __init__(self, jwks: dict, max_age: int = 3600):
+        self.jwks = jwks
+        self.max_age = max_age
+        self.fetch_count = 0
+
+    def fetch(self) -> Tuple[dict, int]:
+        self.fetch_count += 1
+        return self.jwks, self.max_age
+
+
+class GoogleTokenVerifier:
+    """
+    Verifies Google ID tokens against cached JWKS keys.
+
+    Cache rules:
+    - Keys are reused until `max-age` from the last fetch has elapsed.
+    - A token with an unknown `kid` triggers one early refresh (Google rotated keys),
+      but at most once every `min_refresh_interval` seconds so garbage tokens
+      cannot be used to hammer the certs endpoint.
+
+    Latency of the last `latency_window` verifications is kept for `stats()`.
+    """
+    def __init__(
+        self,
+        client_id: str,
+        source: Optional[JwksSource] = None,
+        issuers=GOOGLE_ISSUERS,
+        min_refresh_interval: float = 60.0,
+        clock=time.time,
+        latency_window: int = 500,
+    ):
+        self.client_id = client_id
+        self.source = source or HttpJwksSource()
+        self.issuers = issuers
+        self.min_refresh_interval = min_refresh_interval
+        self.clock = clock
+        self._keys = {}
+        self._expires_at = 0.0
+        self._last_refresh = float("-inf")
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=latency_window)
+        self.verified = 0
+        self.failed = 0
+        self.key_fetches = 0
+
+    def _refresh(self, force: bool = False):
+        with self._lock:
+            now = self.clock()
+            if not force and now < self._expires_at:
+                return
+            if force and now - self._last_refresh < self.min_refresh_interval:
+                return
+            jwks, max_age = self.source.fetch()
+            self._keys = {k["kid"]: k for k in jwks.get("keys", []) if "kid" in k}
+            self._expires_at = now + max_age
+            self._last_refresh = now
+            self.key_fetches += 1
+
+    def _get_key(self, kid: str) -> dict:
+        self._refresh()
+        key = self._keys.get(kid)
+        if key is None:
+            self._refresh(force=True)
+            key = self._keys.get(kid)
+        if key is None:
+            raise TokenVerificationError(f"Unknown signing key id: {kid}")
+        return key
+
+    def verify(self, token: str) -> dict:
+        """
+        Returns the token claims (email, name, picture, ...) if the token is valid
+        for `client_id`. Raises `TokenVerificationError` otherwise.
+        """
+        start = time.perf_counter()
+        result = "invalid"
+        try:
+            try:
+                header = jwt.get_unverified_header(token)
+            except JWTError as e:
+                raise TokenVerificationError(f"Malformed token: {e}")
+
+            key = self._get_key(header.get("kid"))
+            try:
+                claims = jwt.decode(
+                    token,
+                    key,
+                    algorithms=[key.get("alg", "RS256")],
+                    audience=self.client_id,
+                    issuer=self.issuers,
+                    # Google ID tokens carry at_hash only when issued with an access token
+                    options={"verify_at_hash": False},
+                )
+            except JWTError as e:
+                raise TokenVerificationError(str(e))
+
+            self.verified += 1
+            result = "valid"
+            return claims
+        except TokenVerificationError:
+            self.failed += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self._latencies.append(elapsed)
+            VERIFY_LATENCY.labels(result).observe(elapsed)
+
+    def stats(self) -> dict:
+        """Verification counters and latency percentiles (milliseconds)."""
+        ordered = sorted(self._latencies)
+
+        def pct(p):
+            if not ordered:
+                return 0.0
+            return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000, 3)
+
+        return {
+            "verified": self.verified,
+            "failed": self.failed,
+            "key_fetches": self.key_fetches,
+            "cached_keys": len(self._keys),
+            "keys_expire_in_s": max(0, round(self._expires_at - self.clock())),
+            "latency_p50_ms": pct(50),
+            "latency_p95_ms": pct(95),
+            "latency_max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        }
+
+
+_verifier: Optional[GoogleTokenVerifier] = None
+
+def get_google_verifier() -> GoogleTokenVerifier:
+    """Process-wide verifier, created lazily so the client id is read from settings."""
+    global _verifier
+    if _verifier is None:
+        from ..config import settings
+        _verifier = GoogleTokenVerifier(settings.GOOGLE_CLIENT_ID)
+    return _verifier
@@ -0,0 +1,46 @@
+import hashlib
+import json
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+def make_etag(*parts: str) -> str:
+    """Strong ETag (quoted) derived from one or more version strings."""
+    digest = hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:20]
+    return f'"{digest}"'
+
+def content_version(payload) -> str:
+    """Version string for a JSON-able payload (changes iff the content changes)."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    True if the request's `If-None-Match` header matches `etag`.
+    Handles lists (`"a", "b"`), the `*` wildcard, and weak validators (`W/"a"`),
+    which per RFC 9110 compare weakly for If-None-Match.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+def conditional_response(request: Request, payload, etag: str, cache_control: str) -> Response:
+    """
+    Returns `304 Not Modified` (no body) when the client already has `etag`,
+    otherwise a JSON response carrying the `ETag` and `Cache-Control` headers.
+    `payload` may be already-encoded JSON (bytes).
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    if isinstance(payload, bytes):
+        return Response(content=payload, media_type="application/json", headers=headers)
+    return JSONResponse(content=payload, headers=headers)
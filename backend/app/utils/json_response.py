@@ -0,0 +1,91 @@
+"""
+Fast JSON responses (orjson).
+
+- `FastJSONResponse`: `JSONResponse` rendered by orjson, which also encodes
+  ObjectId (as its hex string), Decimal, sets and NumPy values, so Mongo
+  documents can be returned as they are. Datetimes are written natively (same ISO format as before).
+- `FastJSONRoute`: route class for every router. For endpoints without a
+  response model it wraps the returned value in a `FastJSONResponse` directly,
+  skipping FastAPI's `jsonable_encoder` pass (a recursive Python copy of the
+  whole payload, usually the bulk of the encoding time). Endpoints with a
+  `response_model`, their own `response_class` or that return a `Response`
+  are left to FastAPI. Headers set on an injected `response: Response`
+  parameter are not carried over by the fast path; such endpoints should
+  return their own `Response`.
+"""
+import asyncio
+import functools
+import inspect
+from decimal import Decimal
+
+import orjson
+from bson import ObjectId
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.routing import APIRoute
+from starlette.responses import JSONResponse, Response
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj):
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, "item"):  # NumPy scalars not covered by OPT_SERIALIZE_NUMPY
+        return obj.item()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content) -> bytes:
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def with_id(doc: dict) -> dict:
+    """Mongo document -> API shape: `_id` exposed as `id` (encoded as a string by `FastJSONResponse`)."""
+    if "_id" in doc:
+        doc["id"] = doc.pop("_id")
+    return doc
+
+
+class FastJSONRoute(APIRoute):
+    def __init__(self, path, endpoint, **kwargs):
+        response_model = kwargs.get("response_model")
+        response_class = kwargs.get("response_class")
+        explicit_model = response_model is not None and not isinstance(response_model, DefaultPlaceholder)
+        annotated = endpoint.__annotations__.get("return") not in (None, type(None))
+        default_class = response_class is None or isinstance(response_class, DefaultPlaceholder)
+        streaming = inspect.isgeneratorfunction(endpoint) or inspect.isasyncgenfunction(endpoint)
+        # include_router() builds the route again from the already wrapped endpoint
+        wrapped = getattr(endpoint, "_fast_json", False)
+        if not explicit_model and not annotated and default_class and not streaming and not wrapped:
+            endpoint = _fast_endpoint(endpoint, kwargs.get("status_code"))
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _fast_endpoint(endpoint, status_code):
+    status_code = status_code or 200
+
+    def respond(content):
+        if isinstance(content, Response):
+            return content
+        return FastJSONResponse(content, status_code=status_code)
+
+    # Keep the endpoint's kind: FastAPI runs sync endpoints in the threadpool
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            return respond(await endpoint(*args, **kwargs))
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            return respond(endpoint(*args, **kwargs))
+    wrapper._fast_json = True
+    return wrapper
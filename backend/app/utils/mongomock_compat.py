@@ -0,0 +1,58 @@
+"""
+Compatibility shim for the in-process Mongo stand-in (MONGODB_URI=mongomock://).
+
+mongomock 4.3 implements `bulk_write` by handing each pymongo operation its own
+bulk builder, and pymongo >= 4.11 operations pass a `sort` argument that the
+builder does not accept, so every `bulk_write([UpdateOne/ReplaceOne ...])`
+raises TypeError. `install()` replaces mongomock's `bulk_write` with one that
+applies the operations one document at a time through the regular collection
+methods and returns a pymongo `BulkWriteResult`. Only used with mongomock; real
+servers keep pymongo's bulk path.
+"""
+from pymongo import DeleteMany, DeleteOne, InsertOne, ReplaceOne, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+from pymongo.results import BulkWriteResult
+
+
+def _apply(collection, op, result: dict, index: int):
+    if isinstance(op, InsertOne):
+        collection.insert_one(op._doc)
+        result["nInserted"] += 1
+        return
+    if isinstance(op, (DeleteOne, DeleteMany)):
+        delete = collection.delete_one if isinstance(op, DeleteOne) else collection.delete_many
+        result["nRemoved"] += delete(op._filter).deleted_count
+        return
+    if isinstance(op, ReplaceOne):
+        outcome = collection.replace_one(op._filter, op._doc, upsert=op._upsert)
+    elif isinstance(op, (UpdateOne, UpdateMany)):
+        update = collection.update_one if isinstance(op, UpdateOne) else collection.update_many
+        outcome = update(op._filter, op._doc, upsert=op._upsert, array_filters=op._array_filters)
+    else:
+        raise TypeError(f"Unsupported bulk operation: {op!r}")
+    if outcome.upserted_id is not None:
+        result["nUpserted"] += 1
+        result["upserted"].append({"index": index, "_id": outcome.upserted_id})
+    else:
+        result["nMatched"] += outcome.matched_count
+        result["nModified"] += outcome.modified_count
+
+
+def bulk_write(self, requests, ordered=True, bypass_document_validation=False, session=None, **kwargs):
+    result = {"writeErrors": [], "writeConcernErrors": [], "nInserted": 0, "nUpserted": 0,
+              "nMatched": 0, "nModified": 0, "nRemoved": 0, "upserted": []}
+    for index, op in enumerate(requests):
+        try:
+            _apply(self, op, result, index)
+        except PyMongoError as e:
+            result["writeErrors"].append({"index": index, "code": getattr(e, "code", None), "errmsg": str(e), "op": op})
+            if ordered:
+                break
+    if result["writeErrors"]:
+        raise BulkWriteError(result)
+    return BulkWriteResult(result, True)
+
+
+def install():
+    import mongomock.collection
+    mongomock.collection.Collection.bulk_write = bulk_write
@@ -0,0 +1,143 @@
+"""
+Request-level latency instrumentation.
+
+- `RequestMetricsMiddleware`: pure ASGI middleware recording per-route latency,
+  in-flight requests, status codes and response sizes.
+- `MongoCommandListener`: PyMongo command listener that times every DB command and
+  attributes it to the route that issued it (via a context variable that follows the
+  request into the threadpool used for sync endpoints).
+- Requests slower than `SLOW_REQUEST_MS` are logged with their top DB commands.
+
+Routes are labelled by their template (`/companies/{company_id}`), never the raw
+path, so label cardinality stays bounded.
+"""
+import contextvars
+import threading
+import time
+from pymongo import monitoring
+from .metrics import REGISTRY
+
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_LOG_TOP_COMMANDS = 5
+MAX_TRACKED_COMMANDS = 50
+
+HTTP_LATENCY = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route"), LATENCY_BUCKETS
+)
+HTTP_REQUESTS = REGISTRY.counter("http_requests", "HTTP requests by route template and status.", ("method", "route", "status"))
+HTTP_IN_FLIGHT = REGISTRY.gauge("http_requests_in_flight", "HTTP requests currently being served.")
+HTTP_RESPONSE_SIZE = REGISTRY.histogram(
+    "http_response_size_bytes", "HTTP response body size by route template.", ("method", "route"), SIZE_BUCKETS
+)
+MONGO_LATENCY = REGISTRY.histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency, attributed to the issuing route.", ("route", "command"), LATENCY_BUCKETS
+)
+MONGO_FAILURES = REGISTRY.counter("mongo_command_failures", "Failed MongoDB commands.", ("route", "command"))
+
+_current_request = contextvars.ContextVar("current_request_state", default=None)
+
+
+class _RequestState:
+    __slots__ = ("scope", "status", "size", "db_seconds", "db_count", "db_commands")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.status = 500
+        self.size = 0
+        self.db_seconds = 0.0
+        self.db_count = 0
+        self.db_commands = None  # allocated on first DB command only
+
+    def route(self) -> str:
+        route = self.scope.get("route")
+        return route.path if route is not None else "unmatched"
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Times every Mongo command and attributes it to the current request (or 'background')."""
+    def __init__(self):
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        state = _current_request.get()
+        collection = event.command.get(event.command_name)
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = (
+                state, collection if isinstance(collection, str) else None
+            )
+
+    def _finish(self, event, failed: bool):
+        with self._lock:
+            state, collection = self._pending.pop((event.connection_id, event.request_id), (None, None))
+        seconds = event.duration_micros / 1_000_000
+        route = state.route() if state is not None else "background"
+        MONGO_LATENCY.labels(route, event.command_name).observe(seconds)
+        if failed:
+            MONGO_FAILURES.labels(route, event.command_name).inc()
+        if state is not None:
+            state.db_seconds += seconds
+            state.db_count += 1
+            if state.db_commands is None:
+                state.db_commands = []
+            if len(state.db_commands) < MAX_TRACKED_COMMANDS:
+                state.db_commands.append((seconds, event.command_name, collection))
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+
+mongo_listener = MongoCommandListener()
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, app, slow_request_ms: int = 1000):
+        self.app = app
+        self.slow_seconds = slow_request_ms / 1000
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = _RequestState(scope)
+        token = _current_request.set(state)
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                state.status = message["status"]
+            elif message["type"] == "http.response.body":
+                state.size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_IN_FLIGHT.dec()
+            _current_request.reset(token)
+
+            method, route = scope["method"], state.route()
+            HTTP_LATENCY.labels(method, route).observe(elapsed)
+            HTTP_RESPONSE_SIZE.labels(method, route).observe(state.size)
+            HTTP_REQUESTS.labels(method, route, state.status).inc()
+            if elapsed >= self.slow_seconds:
+                self._log_slow(method, scope.get("path", route), elapsed, state)
+
+    @staticmethod
+    def _log_slow(method, path, elapsed, state):
+        top = sorted(state.db_commands or [], key=lambda c: c[0], reverse=True)[:SLOW_LOG_TOP_COMMANDS]
+        top_str = ", ".join(
+            f"{cmd}{' ' + coll if coll else ''} {secs * 1000:.0f}ms" for secs, cmd, coll in top
+        )
+        print(
+            f"SLOW: {method} {path} -> {state.status} in {elapsed * 1000:.0f}ms "
+            f"(db {state.db_seconds * 1000:.0f}ms in {state.db_count} cmds)"
+            + (f" top: {top_str}" if top_str else "")
+        )
@@ -1,22 +1,16 @@
-from ..services.data_engine import DataEngine
-from ..database import db
+from ..services.reseed import create_reseed_job, run_reseed, get_reseed_job
 
 def seed_initial_tickers():
     """
-    Seeds the top 15 Pakistani companies into the database 
-    by triggering an initial fetch for each.
-    """
-    # Dynamically get all tickers from the static JSON database
-    # This ensures seed script is always in sync with our enriched data
-    initial_tickers = DataEngine.get_all_tickers()
-    
-    # Optional: Add any extra manual tickers here if needed, but best to keep it in JSON
-    # initial_tickers.extend(["EXTRA.KA"])
+    Reseeds every Pakistani company tracked in the static JSON database
+    (blocking; the API runs the same job in the background).
 
+    Blue/green: data is fetched into a staging collection and swapped in
+    atomically, so the live `companies` collection is never empty.
+    """
     print("--- STARTING SEED PROCESS ---")
-    print("INFO: Clearing existing company data...")
-    db.companies.delete_many({}) # WIPE ALL DATA
-    
-    for ticker in initial_tickers:
-        DataEngine.update_company(ticker)
-    print("--- SEED PROCESS COMPLETE ---")
+    job_id = create_reseed_job()
+    run_reseed(job_id)
+    job = get_reseed_job(job_id)
+    print(f"--- SEED PROCESS {job['status'].upper()} ({job.get('new_count')} companies) ---")
+    return job
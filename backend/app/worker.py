@@ -0,0 +1,156 @@
+"""
+Standalone background worker that owns all scheduled jobs.
+
+Run (from the backend directory):
+    python -m app.worker
+
+API processes no longer start a scheduler. Start one or more workers instead;
+a Mongo lease (see `SchedulerLease`) guarantees that exactly one of them runs
+the jobs at any time, and another takes over if the active one dies.
+"""
+import signal
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.events import EVENT_JOB_MISSED, EVENT_JOB_MAX_INSTANCES
+from .config import settings
+from .database import db
+from .services.data_engine import DataEngine
+from .services.ai_service import ai_service
+from .services.correlations import compute_correlations
+from .services.scheduler_lease import SchedulerLease
+from .services.price_history import ensure_price_history_collection
+from .services.company_loader import ensure_company_indexes
+from .services.alerts import ensure_alert_indexes
+from .services.notifications import ensure_notification_indexes
+from .services.entity_tagger import ensure_tag_indexes
+from .services.headline_service import ensure_headline_indexes
+from .services.news_sentiment import ensure_sentiment_indexes
+from .services.job_telemetry import ensure_job_runs_collection, record_missed_run
+from .utils.metrics import REGISTRY
+
+# One run at a time per job; a backlog of missed runs collapses into a single run.
+JOB_DEFAULTS = {"max_instances": 1, "coalesce": True, "misfire_grace_time": 60}
+
+
+def _on_job_skipped(event):
+    reason = "misfire" if event.code == EVENT_JOB_MISSED else "max_instances"
+    record_missed_run(event.job_id, reason, getattr(event, "scheduled_run_time", None))
+
+
+def build_scheduler() -> BackgroundScheduler:
+    scheduler = BackgroundScheduler(job_defaults=JOB_DEFAULTS)
+    scheduler.add_listener(_on_job_skipped, EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES)
+
+    # Schedule daily data refresh at midnight (Full Sync - Metadata)
+    scheduler.add_job(DataEngine.update_all_tracked_companies, 'cron', hour=0, id="update_all_tracked_companies")
+
+    # Schedule fast price updates every 300s (5 min) to prevent Yahoo Rate Limits/Bans
+    scheduler.add_job(DataEngine.update_live_prices, 'interval', seconds=300, id="update_live_prices")
+
+    # Nightly correlation matrix / betas, after the daily sync
+    scheduler.add_job(compute_correlations, 'cron', hour=1, id="compute_correlations")
+
+    # Schedule AI Analyst every 15 minutes to respect Free Tier Limits
+    scheduler.add_job(ai_service.analyze_and_store_pulse, 'interval', seconds=900, id="analyze_and_store_pulse")
+
+    return scheduler
+
+
+def run_worker(stop_event: threading.Event = None, lease: SchedulerLease = None):
+    """
+    Lease loop: renew the lease every `ttl / 3`, run the scheduler only while we hold it.
+    Returns when `stop_event` is set.
+    """
+    stop_event = stop_event or threading.Event()
+    lease = lease or SchedulerLease(db.scheduler_leases, ttl_seconds=settings.SCHEDULER_LEASE_TTL)
+    scheduler = None
+    print(f"INFO: Worker {lease.owner} started, waiting for scheduler lease...")
+    ensure_job_runs_collection()
+    ensure_price_history_collection()
+    ensure_alert_indexes()
+    ensure_notification_indexes()
+    ensure_tag_indexes()
+    ensure_headline_indexes()
+    ensure_sentiment_indexes()
+    try:
+        ensure_company_indexes(db.companies)
+    except Exception as e:
+        print(f"WARN: Could not ensure company indexes: {e}")
+
+    try:
+        while not stop_event.is_set():
+            try:
+                is_leader = lease.try_acquire()
+            except Exception as e:
+                # DB unreachable: keep running until our lease would have expired anyway
+                print(f"WARN: Lease renewal failed: {e}")
+                is_leader = lease.still_valid()
+
+            if is_leader and scheduler is None:
+                scheduler = build_scheduler()
+                scheduler.start()
+                print("INFO: Lease acquired. Market Data Scheduler Started (Daily + Live 5m + AI 15m)")
+            elif not is_leader and scheduler is not None:
+                scheduler.shutdown(wait=False)
+                scheduler = None
+                print("WARN: Lease lost. Scheduler stopped, standing by.")
+
+            stop_event.wait(lease.renew_interval)
+    finally:
+        if scheduler is not None:
+            scheduler.shutdown(wait=False)
+            try:
+                lease.release()
+            except Exception as e:
+                print(f"WARN: Could not release lease: {e}")
+        print("INFO: Worker stopped.")
+
+
+def start_embedded_worker() -> threading.Event:
+    """Runs the worker loop in a daemon thread of the current process (EMBEDDED_WORKER=true)."""
+    stop_event = threading.Event()
+    threading.Thread(target=run_worker, args=(stop_event,), name="embedded-worker", daemon=True).start()
+    return stop_event
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Don't log every scrape
+
+
+def start_metrics_server(port: int) -> ThreadingHTTPServer:
+    """Exposes the worker's job metrics on http://0.0.0.0:<port>/metrics for Prometheus."""
+    server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="worker-metrics", daemon=True).start()
+    print(f"INFO: Worker metrics available on :{port}/metrics")
+    return server
+
+
+def main():
+    stop_event = threading.Event()
+    if settings.WORKER_METRICS_PORT:
+        start_metrics_server(settings.WORKER_METRICS_PORT)
+
+    def _stop(signum, frame):
+        print(f"INFO: Received signal {signum}, shutting down worker...")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, _stop)
+    signal.signal(signal.SIGTERM, _stop)
+    run_worker(stop_event)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark for the price alert index: 1M alerts over a 10k-ticker universe.
+
+Builds the sorted-threshold index directly (no database), then runs refresh
+cycles where every quote moves a little and measures `AlertIndex.evaluate`,
+which is the per-cycle cost inside the price job (budget: 100 ms).
+
+Usage (from the backend directory):
+    python -m benchmarks.alerts
+    python -m benchmarks.alerts --alerts 200000 --cycles 50
+"""
+import os
+
+# Must be set before the app (and its DB client) is imported
+os.environ["MONGODB_URI"] = "mongomock://"
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+BUDGET_MS = 100.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alerts", type=int, default=1_000_000)
+    parser.add_argument("--tickers", type=int, default=10_000)
+    parser.add_argument("--cycles", type=int, default=20)
+    args = parser.parse_args()
+
+    from app.services.alerts import ALERT_KINDS, AlertIndex
+    from .screener import make_universe
+
+    rng = np.random.default_rng(3)
+    universe = make_universe(args.tickers)
+    price = universe.columns["price"]
+    kinds = list(ALERT_KINDS)
+
+    started = time.perf_counter()
+    index = AlertIndex()
+    rows = rng.integers(0, args.tickers, args.alerts)
+    kind_ids = rng.integers(0, len(kinds), args.alerts)
+    # Thresholds spread around the current values, like real users set them
+    offsets = rng.normal(0, 0.05, args.alerts)
+    for alert_id, (row, k, offset) in enumerate(zip(rows.tolist(), kind_ids.tolist(), offsets.tolist())):
+        kind = kinds[k]
+        if kind.startswith("price"):
+            threshold = price[row] * (1 + (abs(offset) if kind == "price_above" else -abs(offset)))
+        elif kind == "change_above":
+            threshold = 2 + abs(offset) * 40
+        elif kind == "change_below":
+            threshold = -2 - abs(offset) * 40
+        else:
+            threshold = 2 + abs(offset) * 20
+        index.add(alert_id, kind, universe.tickers[row], threshold)
+    print(f"{len(index)} alerts over {args.tickers} tickers indexed in {time.perf_counter() - started:.1f} s")
+
+    timings, fired = [], []
+    for _ in range(args.cycles):
+        moved = make_universe(args.tickers)
+        drift = 1 + rng.normal(0, 0.01, args.tickers)
+        price = price * drift
+        moved.columns["price"] = price
+        moved.columns["change_percent"] = (drift - 1) * 100
+        start = time.perf_counter()
+        fired.append(len(index.evaluate(moved)))
+        timings.append(time.perf_counter() - start)
+
+    # The first cycle also fires every alert that was already satisfied when "created"
+    print(f"first cycle: {timings[0] * 1000:.2f} ms, {fired[0]} alerts fired")
+    p50 = statistics.median(timings[1:]) * 1000
+    flag = "" if p50 <= BUDGET_MS else "  OVER BUDGET"
+    print(f"next {args.cycles - 1} cycles: p50 {p50:.2f} ms, max {max(timings[1:]) * 1000:.2f} ms, "
+          f"median {int(statistics.median(fired[1:]))} alerts fired per cycle, {len(index)} still active{flag}")
+    return bool(flag)
+
+
+if __name__ == "__main__":
+    raise SystemExit(1 if main() else 0)
@@ -0,0 +1,131 @@
+"""
+Concurrency benchmark: mixed login + market traffic.
+
+Measures how much a burst of bcrypt-heavy logins slows down cheap read
+endpoints (`/market/live`) on a running API instance.
+
+Run (from the backend directory, with the API already running):
+    python -m benchmarks.auth_concurrency --base-url http://localhost:8000
+
+Phases:
+    1. market only        -> baseline latency for /market/live
+    2. market + logins    -> same market load while `--logins` concurrent logins hammer /auth/login
+
+If hashing blocks the event loop, phase 2 market latency explodes (every
+market request waits behind a 100-300 ms bcrypt call). With the hashing
+pool, it should stay close to the baseline, and excess logins get 503s.
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BENCH_EMAIL = "bench.user@example.com"
+BENCH_PASSWORD = "Bench#Passw0rd"
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(latencies, statuses):
+    return {
+        "requests": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "max_ms": round(max(latencies) * 1000, 1) if latencies else 0.0,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 1) if latencies else 0.0,
+        "statuses": {str(code): statuses.count(code) for code in sorted(set(statuses))},
+    }
+
+
+def hammer(session, method, url, count, stop_event=None, **kwargs):
+    latencies, statuses = [], []
+    for _ in range(count):
+        if stop_event is not None and stop_event.is_set():
+            break
+        start = time.perf_counter()
+        try:
+            response = session.request(method, url, timeout=30, **kwargs)
+            statuses.append(response.status_code)
+        except requests.RequestException:
+            statuses.append(0)
+        latencies.append(time.perf_counter() - start)
+    return latencies, statuses
+
+
+def run_parallel(workers, fn):
+    latencies, statuses = [], []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for lat, st in pool.map(lambda _: fn(), range(workers)):
+            latencies.extend(lat)
+            statuses.extend(st)
+    return latencies, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--market-clients", type=int, default=8)
+    parser.add_argument("--market-requests", type=int, default=25, help="requests per market client")
+    parser.add_argument("--logins", type=int, default=32, help="concurrent login clients")
+    parser.add_argument("--login-requests", type=int, default=5, help="requests per login client")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    base = args.base_url.rstrip("/")
+    market_url = f"{base}/market/live"
+    login_url = f"{base}/auth/login"
+
+    # Make sure the benchmark user exists (400 = already registered, which is fine)
+    requests.post(f"{base}/auth/register", json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD}, timeout=30)
+
+    def market_client():
+        with requests.Session() as session:
+            return hammer(session, "GET", market_url, args.market_requests)
+
+    print("Phase 1: market only...")
+    baseline = summarize(*run_parallel(args.market_clients, market_client))
+
+    print("Phase 2: market + login burst...")
+    stop = threading.Event()
+    login_result = {}
+
+    def login_client():
+        with requests.Session() as session:
+            return hammer(
+                session, "POST", login_url, args.login_requests, stop,
+                json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD},
+            )
+
+    def login_burst():
+        login_result["summary"] = summarize(*run_parallel(args.logins, login_client))
+
+    burst = threading.Thread(target=login_burst)
+    burst.start()
+    mixed = summarize(*run_parallel(args.market_clients, market_client))
+    stop.set()
+    burst.join()
+
+    report = {
+        "market_only": baseline,
+        "market_during_logins": mixed,
+        "logins": login_result.get("summary", {}),
+        "market_p95_slowdown": round(mixed["p95_ms"] / baseline["p95_ms"], 2) if baseline["p95_ms"] else None,
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark cases: one entry per endpoint or job on the hot path."""
+import json
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass
+class Case:
+    name: str
+    fn: Callable[[], object]
+    cost: int = 1  # relative cost; expensive cases run iterations // cost times (at least once)
+    items: Optional[Callable[[object], int]] = None  # items handled per call, for items/s
+
+
+def build_cases(db) -> list[Case]:
+    from fastapi.testclient import TestClient
+    from fastapi.encoders import jsonable_encoder
+    from app.main import app
+    from app.models.company import companies_from_documents, encode_companies
+    from app.services.aggregator import fetch_news, RSS_FEEDS
+    from app.services.company_cache import company_cache
+    from app.services.data_engine import DataEngine
+
+    client = TestClient(app)
+    company_id = str(db.companies.find_one({}, {"_id": 1})["_id"])
+
+    def get(path, **kwargs):
+        def call():
+            response = client.get(path, **kwargs)
+            assert response.status_code in (200, 304), f"{path} -> {response.status_code}"
+            return response
+        return call
+
+    def company_detail_cold():
+        company_cache._profiles.clear()
+        company_cache._quotes.clear()
+        return get(f"/companies/{company_id}")()
+
+    etag = client.get(f"/companies/{company_id}").headers.get("etag", "")
+    company_docs = list(db.companies.find({}))
+
+    def serialize_companies_dicts():
+        # The pre-model path: per-document dict fix-ups + jsonable_encoder + json.dumps
+        out = []
+        for doc in company_docs:
+            doc = dict(doc)
+            doc["id"] = str(doc.pop("_id"))
+            out.append(jsonable_encoder(doc))
+        return json.dumps(out).encode()
+
+    def serialize_companies_model():
+        return encode_companies(companies_from_documents(company_docs))
+
+    return [
+        Case("list_companies", get("/companies")),
+        Case("list_companies_by_industry", get("/companies", params={"industry": "Cement"})),
+        Case("search_companies", get("/companies/search", params={"q": "Synthetic Company 1"})),
+        Case("company_detail_cold", company_detail_cold),
+        Case("company_detail_cached", get(f"/companies/{company_id}")),
+        Case("company_detail_304", get(f"/companies/{company_id}", headers={"If-None-Match": etag})),
+        Case("serialize_companies_dicts", serialize_companies_dicts),
+        Case("serialize_companies_model", serialize_companies_model),
+        Case("market_live", get("/market/live")),
+        Case("market_pulse", get("/ai/market-pulse")),
+        Case("news_latest", get("/news", params={"limit": 20})),
+        Case("news_stats", get("/news/stats"), cost=5),
+        Case("dashboard", get("/dashboard")),
+        # Jobs mutate the data set, so they run once per scale
+        Case("job_fetch_news", fetch_news, cost=10**6, items=lambda db: len(RSS_FEEDS) * 50),
+        Case("job_update_live_prices", DataEngine.update_live_prices, cost=10**6,
+             items=lambda db: len(db.companies.distinct("ticker"))),
+    ]
@@ -0,0 +1,79 @@
+"""
+Benchmark for the nightly correlation computation and the sliced reads behind
+/analytics/correlations, on a synthetic 600-ticker universe.
+
+Daily returns follow a one-factor model (market + sector + noise) with ~5% of
+the observations missing. Reports the time to compute the full pairwise-complete
+correlation matrix and betas, checks it against pandas `DataFrame.corr` on a
+sample, and times 20-ticker slices read from the memory-mapped float32 triangle.
+
+Usage (from the backend directory):
+    python -m benchmarks.correlations
+    python -m benchmarks.correlations --tickers 2000 --days 250
+"""
+import os
+
+# Must be set before the app (and its DB client) is imported
+os.environ["MONGODB_URI"] = "mongomock://"
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def make_returns(tickers: int, days: int, sectors: int = 12, seed: int = 11):
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0, 0.01, days)
+    sector_of = rng.integers(0, sectors, tickers)
+    sector_moves = rng.normal(0, 0.008, (days, sectors))
+    betas = rng.uniform(0.4, 1.6, tickers)
+    returns = market[:, None] * betas + sector_moves[:, sector_of] + rng.normal(0, 0.012, (days, tickers))
+    returns[rng.random((days, tickers)) < 0.05] = np.nan
+    return returns, market
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=600)
+    parser.add_argument("--days", type=int, default=120)
+    parser.add_argument("--slices", type=int, default=200)
+    args = parser.parse_args()
+
+    from app.services.correlations import pairwise_beta, pairwise_correlation, square_slice, upper_triangle
+    from .run import measure
+
+    returns, market = make_returns(args.tickers, args.days)
+    started = time.perf_counter()
+    correlation = pairwise_correlation(returns)
+    betas = pairwise_beta(returns, market)
+    upper = upper_triangle(correlation)
+    compute_ms = (time.perf_counter() - started) * 1000
+    print(f"{args.tickers} tickers x {args.days} days: correlations + betas in {compute_ms:.1f} ms, "
+          f"triangle {upper.nbytes / 1024:.0f} KiB float32 (full float64 matrix: {correlation.nbytes / 1024:.0f} KiB)")
+
+    sample = np.random.default_rng(0).choice(args.tickers, 50, replace=False)
+    expected = pd.DataFrame(returns[:, sample]).corr(min_periods=20).to_numpy()
+    error = np.nanmax(np.abs(correlation[np.ix_(sample, sample)] - expected))
+    print(f"max |difference| vs pandas DataFrame.corr on 50 tickers: {error:.2e}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "correlations.npy")
+        np.save(path, upper)
+        mapped = np.load(path, mmap_mode="r")
+        load = measure(lambda: np.load(path, mmap_mode="r"), 50)
+        rng = np.random.default_rng(1)
+        picks = [np.sort(rng.choice(args.tickers, 20, replace=False)) for _ in range(args.slices)]
+        it = iter(picks * 2)
+        result = measure(lambda: square_slice(mapped, next(it), args.tickers), args.slices - 1)
+        check = square_slice(mapped, picks[0], args.tickers)
+        slice_error = np.nanmax(np.abs(check - correlation[np.ix_(picks[0], picks[0])]))
+        print(f"mmap open p50 {load['p50_ms']:.3f} ms; 20-ticker slice p50 {result['p50_ms']:.3f} ms "
+              f"(float32 rounding vs full matrix {slice_error:.1e})")
+    return 1 if error > 1e-9 else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,99 @@
+"""
+Load test for the dashboard's first paint: the four calls the frontend used to
+make (`/market/live`, `/ai/market-pulse`, `/news`, `/news/stats`, fired in
+parallel like a browser would) against one `GET /dashboard`.
+
+Each simulated page load is timed end to end, with the section caches cleared
+before every load ("cold") and left alone ("warm"), from several concurrent
+clients. Bytes on the wire are reported with and without `Accept-Encoding`.
+
+Usage (from the backend directory):
+    python -m benchmarks.dashboard                     # in-process app, mongomock, scale 1
+    python -m benchmarks.dashboard --loads 200 --clients 8
+    python -m benchmarks.dashboard --base-url http://localhost:8000   # a running server (warm only)
+"""
+import os
+
+# Must be set before the app (and its DB client) is imported
+os.environ["MONGODB_URI"] = "mongomock://"
+os.environ.setdefault("SLOW_REQUEST_MS", "600000")
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .run import percentile
+
+SEPARATE = ["/market/live", "/ai/market-pulse", "/news", "/news/stats"]
+COMPOSITE = ["/dashboard"]
+
+
+def page_load(client, paths, headers, pool) -> tuple[float, int]:
+    """(seconds, bytes received) for one first paint."""
+    start = time.perf_counter()
+    responses = list(pool.map(lambda path: client.get(path, headers=headers), paths))
+    elapsed = time.perf_counter() - start
+    for response in responses:
+        assert response.status_code == 200, f"{response.request.url} -> {response.status_code}"
+    return elapsed, sum(r.num_bytes_downloaded for r in responses)
+
+
+def run_loads(client, paths, loads: int, clients: int, cold: bool, headers: dict) -> dict:
+    from app.services.dashboard import SECTIONS
+
+    def one(_):
+        if cold:
+            for section in SECTIONS.values():
+                section.invalidate()
+        with ThreadPoolExecutor(max_workers=len(paths)) as pool:
+            return page_load(client, paths, headers, pool)
+
+    with ThreadPoolExecutor(max_workers=clients) as users:
+        results = list(users.map(one, range(loads)))
+    timings = [t for t, _ in results]
+    return {
+        "p50_ms": percentile(timings, 50) * 1000,
+        "p95_ms": percentile(timings, 95) * 1000,
+        "mean_ms": statistics.fmean(timings) * 1000,
+        "bytes": results[0][1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--loads", type=int, default=100)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--base-url", default=None)
+    args = parser.parse_args()
+
+    if args.base_url:
+        import httpx
+        client = httpx.Client(base_url=args.base_url, timeout=30)
+        modes = [("warm", False)]
+    else:
+        from fastapi.testclient import TestClient
+        from app.database import db
+        from app.main import app
+        from .fixtures import install
+        from .synthetic import seed_database
+
+        install()
+        companies, articles = seed_database(db, args.scale)
+        print(f"Seeded {companies} companies, {articles} articles")
+        client = TestClient(app)
+        modes = [("cold", True), ("warm", False)]
+
+    encodings = {"identity": {"Accept-Encoding": "identity"}, "gzip, br": {"Accept-Encoding": "gzip, br"}}
+    print(f"{args.loads} page loads from {args.clients} concurrent clients")
+    print(f"{'variant':<22}{'mode':<6}{'encoding':<10}{'p50 ms':>9}{'p95 ms':>9}{'bytes':>10}")
+    for label, paths in (("4 separate calls", SEPARATE), ("GET /dashboard", COMPOSITE)):
+        for mode, cold in modes:
+            for encoding, headers in encodings.items():
+                result = run_loads(client, paths, args.loads, args.clients, cold, headers)
+                print(f"{label:<22}{mode:<6}{encoding:<10}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}{result['bytes']:>10,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+JSON encoding and bytes on the wire for the major endpoints.
+
+For each payload, compares the previous encoding path (`jsonable_encoder` +
+stdlib `json.dumps`, what FastAPI's default `JSONResponse` does) with
+`FastJSONResponse` (orjson), then requests the endpoint through the full app
+to report the response size uncompressed, gzip and (if installed) brotli.
+`/companies` is encoded by msgspec (`encode_companies`) rather than either of
+these; its row times the raw documents for comparison only.
+
+Usage (from the backend directory):
+    python -m benchmarks.encoding
+    python -m benchmarks.encoding --scale 10 --iterations 50
+"""
+import os
+
+# Must be set before the app (and its DB client) is imported
+os.environ["MONGODB_URI"] = "mongomock://"
+os.environ.setdefault("SLOW_REQUEST_MS", "600000")
+
+import argparse
+import asyncio
+import json
+
+from .run import measure
+
+
+def stdlib_encode(payload) -> bytes:
+    from bson import ObjectId
+    from fastapi.encoders import jsonable_encoder
+
+    return json.dumps(
+        jsonable_encoder(payload, custom_encoder={ObjectId: str}),
+        ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def payloads(db) -> dict:
+    """endpoint -> (path, params, Python payload the endpoint returns)."""
+    from app.services.dashboard import SECTIONS, build_dashboard
+    from app.utils.json_response import with_id
+
+    news = [with_id(a) for a in db.articles.find({}).sort("published_date", -1).limit(50)]
+    watchlist = [with_id(c) for c in db.companies.find({}).limit(20)]
+    companies = [with_id(c) for c in db.companies.find({})]
+    return {
+        "/companies": ("/companies", {}, companies),
+        "/market/live": ("/market/live", {}, SECTIONS["market"].get()),
+        "/news?limit=50": ("/news", {"limit": 50}, news),
+        "/news/stats": ("/news/stats", {}, SECTIONS["news_stats"].get()),
+        "/dashboard": ("/dashboard", {}, asyncio.run(build_dashboard())),
+        "/watchlist (20 docs)": (None, {}, watchlist),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+    from app.database import db
+    from app.main import app
+    from app.utils.compression import brotli
+    from app.utils.json_response import dumps
+    from .fixtures import install
+    from .synthetic import seed_database
+
+    install()
+    seed_database(db, args.scale)
+    client = TestClient(app)
+    encodings = {"identity": "identity", "gzip": "gzip"}
+    if brotli is not None:
+        encodings["br"] = "br"
+
+    header = f"{'endpoint':<22}{'json ms':>9}{'orjson ms':>11}{'speedup':>9}" + "".join(f"{e:>10}" for e in encodings)
+    print(header)
+    for name, (path, params, payload) in payloads(db).items():
+        old = measure(lambda: stdlib_encode(payload), args.iterations)["p50_ms"]
+        new = measure(lambda: dumps(payload), args.iterations)["p50_ms"]
+        sizes = []
+        for encoding in encodings.values():
+            if path is None:
+                sizes.append("-")
+                continue
+            response = client.get(path, params=params, headers={"Accept-Encoding": encoding})
+            assert response.status_code == 200, f"{path} -> {response.status_code}"
+            sizes.append(f"{response.num_bytes_downloaded:,}")
+        speedup = old / new if new else float("inf")
+        print(f"{name:<22}{old:>9.3f}{new:>11.3f}{speedup:>8.1f}x" + "".join(f"{s:>10}" for s in sizes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark for ticker/sector tagging of news articles (services/entity_tagger.py).
+
+Generates a synthetic listing (invented company names with legal suffixes,
+tickers, sectors) and articles built from the shared market vocabulary that
+mention 0-3 companies by full name, short name or ticker. Reports:
+
+- automaton build time for the whole listing, and the incremental refresh
+  after 1% of the companies change (a new alias or a renamed company)
+- tagging throughput with the automaton vs. a per-pattern substring scan
+  (what a naive "for each company, `in` the text" tagger costs)
+- precision / recall of the tags against the mentions that were inserted
+
+Usage (from the backend directory):
+    python -m benchmarks.entity_tagger
+    python -m benchmarks.entity_tagger --companies 20000 --articles 20000
+"""
+import os
+
+# Must be set before the app (and its DB client) is imported
+os.environ["MONGODB_URI"] = "mongomock://"
+
+import argparse
+import random
+import time
+
+from .synthetic import SECTORS, WORDS
+
+SYLLABLES = ["ka", "ra", "zen", "tor", "vel", "mir", "qas", "lun", "dor", "bex", "sha", "nor", "pal", "tix", "gul", "van"]
+SUFFIXES = ["Limited", "Company Limited", "Pakistan Limited", "Corporation"]
+CATEGORIES = ["Cement", "Textiles", "Fertilizer", "Power", "Motors", "Foods", "Steel", "Pharma"]
+
+
+def make_listing(count: int, rng: random.Random) -> list[dict]:
+    companies, names = [], set()
+    while len(companies) < count:
+        stem = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+        base = f"{stem} {rng.choice(CATEGORIES)}"
+        if base in names:
+            continue
+        names.add(base)
+        ticker = f"{stem[:4].upper()}{len(companies) % 1000:03d}.KA"
+        companies.append({"name": f"{base} {rng.choice(SUFFIXES)}", "short": base, "ticker": ticker,
+                          "industry": SECTORS[len(companies) % len(SECTORS)], "aliases": []})
+    return companies
+
+
+def make_articles(count: int, companies: list[dict], rng: random.Random) -> list[tuple[str, set]]:
+    articles = []
+    for _ in range(count):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(40, 70))]
+        mentioned = set()
+        for company in rng.sample(companies, rng.choice((0, 1, 1, 2, 3))):
+            form = rng.choice((company["name"], company["short"], company["ticker"].split(".")[0]))
+            words.insert(rng.randrange(len(words)), form + rng.choice(("", ",", "'s", ".")))
+            mentioned.add(company["ticker"])
+        text = " ".join(words)
+        articles.append((text[0].upper() + text[1:], mentioned))
+    return articles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--companies", type=int, default=5000)
+    parser.add_argument("--articles", type=int, default=5000)
+    args = parser.parse_args()
+
+    from app.services.entity_tagger import EntityTagger, build_patterns
+    from app.services.company_cache import company_cache
+
+    rng = random.Random(11)
+    companies = make_listing(args.companies, rng)
+    articles = make_articles(args.articles, companies, rng)
+    generation = company_cache.generations.get("profile")
+
+    tagger = EntityTagger()
+    start = time.perf_counter()
+    tagger.refresh(companies, generation)
+    build = time.perf_counter() - start
+    print(f"build: {len(tagger.patterns):,} patterns for {len(companies):,} companies in {build * 1000:.0f} ms "
+          f"({len(tagger.automaton.goto):,} states)")
+
+    changed = [dict(c) for c in companies]
+    for company in rng.sample(changed, max(1, len(changed) // 100)):
+        company["aliases"] = [company["short"].split()[0] + " Group"]
+    start = time.perf_counter()
+    tagger.refresh(changed, generation)
+    print(f"incremental refresh (1% of companies changed): {(time.perf_counter() - start) * 1000:.0f} ms")
+    tagger.refresh(companies, generation)
+
+    start = time.perf_counter()
+    tags = [tagger.tag(text) for text, _ in articles]
+    elapsed = time.perf_counter() - start
+    print(f"automaton: {args.articles / elapsed:,.0f} articles/s, {elapsed / args.articles * 1e6:.0f} us/article")
+
+    # Naive baseline on a sample: one substring test per pattern
+    patterns, _ = build_patterns(companies)
+    sample = articles[:max(1, args.articles // 50)]
+    start = time.perf_counter()
+    for text, _ in sample:
+        padded = " " + " ".join(text.lower().replace(",", " ").replace(".", " ").replace("'", " ").split()) + " "
+        [tickers for (pattern, _), tickers in patterns.items() if " " + pattern + " " in padded]
+    naive = (time.perf_counter() - start) / len(sample)
+    print(f"per-pattern scan: {1 / naive:,.0f} articles/s, {naive * 1e6:.0f} us/article "
+          f"({naive / (elapsed / args.articles):.0f}x slower)")
+
+    found = sum(len(t["tickers"]) for t in tags)
+    correct = sum(len(set(t["tickers"]) & truth) for t, (_, truth) in zip(tags, articles))
+    expected = sum(len(truth) for _, truth in articles)
+    print(f"precision {correct / found if found else 1.0:.3f}, recall {correct / expected if expected else 1.0:.3f}")
+
+
+if __name__ == "__main__":
+    main()
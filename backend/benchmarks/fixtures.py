@@ -0,0 +1,133 @@
+"""
+Offline stand-ins for yfinance and feedparser used by the benchmark suite.
+
+Responses have the same shape as the real libraries (`Ticker.info`, `.history()`,
+`yf.download(..., group_by='ticker')`, `feedparser.parse()`), are fully
+deterministic, and never touch the network.
+"""
+import random
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pandas as pd
+
+
+class FakeTicker:
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self._rng = random.Random(symbol)
+
+    @property
+    def info(self) -> dict:
+        price = round(self._rng.uniform(5, 1500), 2)
+        return {
+            "longName": f"{self.symbol} Limited",
+            "industry": "Synthetic",
+            "longBusinessSummary": f"{self.symbol} is a synthetic benchmark company.",
+            "website": "https://example.pk",
+            "city": "Karachi",
+            "country": "Pakistan",
+            "fullTimeEmployees": self._rng.randint(100, 20000),
+            "totalRevenue": self._rng.randint(10**8, 10**12),
+            "netIncomeToCommon": self._rng.randint(10**7, 10**11),
+            "marketCap": self._rng.randint(10**9, 10**12),
+            "currentPrice": price,
+            "regularMarketPrice": price,
+            "regularMarketChange": round(price * 0.01, 2),
+            "regularMarketChangePercent": 1.0,
+            "volume": self._rng.randint(1_000, 5_000_000),
+            "previousClose": round(price * 0.99, 2),
+        }
+
+    def history(self, period: str = "2d", **kwargs) -> pd.DataFrame:
+        days = int(period.rstrip("d")) if period.endswith("d") else 5
+        return _candles(self._rng, days)
+
+
+def _candles(rng: random.Random, days: int) -> pd.DataFrame:
+    index = [datetime(2025, 1, 1) + timedelta(days=i) for i in range(days)]
+    opens = [rng.uniform(5, 1500) for _ in index]
+    closes = [o * (1 + rng.gauss(0, 0.02)) for o in opens]
+    return pd.DataFrame({
+        "Open": opens,
+        "High": [max(o, c) * 1.01 for o, c in zip(opens, closes)],
+        "Low": [min(o, c) * 0.99 for o, c in zip(opens, closes)],
+        "Close": closes,
+        "Volume": [rng.randint(1_000, 5_000_000) for _ in index],
+    }, index=pd.DatetimeIndex(index, name="Date"))
+
+
+class FakeYFinance:
+    """Drop-in for the `yfinance` module attributes used by the app."""
+    def __init__(self, latency_s: float = 0.0):
+        self.latency_s = latency_s
+        self.calls = 0
+
+    def Ticker(self, symbol: str) -> FakeTicker:
+        return FakeTicker(symbol)
+
+    def download(self, tickers, period: str = "1d", group_by: str = "column", **kwargs) -> pd.DataFrame:
+        self.calls += 1
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        frames = {t: _candles(random.Random(t), 1) for t in tickers}
+        if len(tickers) == 1:
+            return frames[tickers[0]]
+        return pd.concat(frames, axis=1)
+
+
+class FakeFeedparser:
+    """Drop-in for `feedparser.parse`: each call returns `entries_per_feed` fresh entries."""
+    def __init__(self, entries_per_feed: int = 50):
+        self.entries_per_feed = entries_per_feed
+        self.calls = 0
+
+    def parse(self, url: str):
+        self.calls += 1
+        now = datetime.utcnow()
+        entries = []
+        for i in range(self.entries_per_feed):
+            published = now - timedelta(minutes=i)
+            entries.append(SimpleNamespace(
+                title=f"Synthetic headline {self.calls}-{i} for {url}",
+                link=f"{url.rstrip('/')}/bench/{self.calls}/{i}",
+                published=published.strftime("%a, %d %b %Y %H:%M:%S +0000"),
+                published_parsed=published.timetuple(),
+                summary="<p>" + "Synthetic summary text. " * 40 + "</p>",
+            ))
+        return SimpleNamespace(feed=SimpleNamespace(title=f"Feed {url}"), entries=entries)
+
+
+class SyntheticBackend:
+    """`app.services.upstream` backend serving the fakes above."""
+    def __init__(self, latency_s: float = 0.0, entries_per_feed: int = 50):
+        self.yf = FakeYFinance(latency_s=latency_s)
+        self.feeds = FakeFeedparser(entries_per_feed)
+
+    def ticker_info(self, symbol):
+        return FakeTicker(symbol).info
+
+    def ticker_history(self, symbol, period, timeout=None):
+        return FakeTicker(symbol).history(period=period)
+
+    def download(self, tickers, period):
+        return self.yf.download(tickers, period=period, group_by="ticker")
+
+    def parse_feed(self, url):
+        return self.feeds.parse(url)
+
+
+def install(yf_latency_s: float = 0.0, backend=None):
+    """
+    Points the app's upstream facade at offline data: `backend` if given (e.g. a
+    ReplayBackend over recorded fixtures), otherwise the synthetic fakes. Returns the backend.
+    """
+    from app.services import data_engine
+    from app.services.upstream import upstream
+
+    upstream.backend = backend or SyntheticBackend(latency_s=yf_latency_s)
+    # The live price job sleeps 4.5 s per chunk to be gentle on Yahoo; irrelevant offline.
+    data_engine.time = SimpleNamespace(sleep=lambda s: None, time=time.time)
+    return upstream.backend
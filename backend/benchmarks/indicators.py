@@ -0,0 +1,67 @@
+"""
+Per-observation cost of the incremental indicator engine.
+
+Synthetic observations (several per day, each the day's bar so far, like the
+live price job records) are fed one at a time to `TickerIndicators`, reading
+the values after each one; the state is round-tripped through its Mongo
+checkpoint halfway, as a worker restart would.
+
+Correctness against a batch pandas reference is checked in
+tests/test_indicators.py.
+
+Usage (from the backend directory):
+    python -m benchmarks.indicators
+    python -m benchmarks.indicators --days 1000 --per-day 72
+"""
+import os
+
+# Must be set before the app (and its DB client) is imported
+os.environ["MONGODB_URI"] = "mongomock://"
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+
+def make_observations(days: int, per_day: int, ticker: str = "SYN.KA", seed: int = 7) -> list:
+    rng = np.random.default_rng(seed)
+    start = datetime(2024, 1, 1)
+    rows, close = [], 100.0
+    for day in range(days):
+        ts = start + timedelta(days=day)
+        open_ = high = low = close
+        volume = 0
+        for step in range(per_day):
+            close = max(1.0, close * (1 + rng.normal(0, 0.004)))
+            high, low = max(high, close), min(low, close)
+            volume += int(rng.integers(0, 50_000))
+            rows.append({"ticker": ticker, "ts": ts, "observed_at": ts + timedelta(hours=4, minutes=30 + 5 * step),
+                         "open": open_, "high": high, "low": low, "close": close, "volume": volume})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=400)
+    parser.add_argument("--per-day", type=int, default=12)
+    args = parser.parse_args()
+
+    from app.services.indicators import TickerIndicators
+
+    rows = make_observations(args.days, args.per_day)
+    state = TickerIndicators("SYN.KA")
+    started = time.perf_counter()
+    for i, row in enumerate(rows):
+        if i == len(rows) // 2:
+            state = TickerIndicators.from_document(state.to_document())
+        state.observe(row)
+        state.values()
+    elapsed = time.perf_counter() - started
+    print(f"{len(rows)} observations over {args.days} days: "
+          f"{elapsed / len(rows) * 1e6:.2f} us per observation (update + values)")
+
+
+if __name__ == "__main__":
+    main()
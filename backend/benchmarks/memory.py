@@ -0,0 +1,59 @@
+"""Memory footprint of the in-memory company representations, measured with tracemalloc."""
+import gc
+import tracemalloc
+
+import bson
+
+
+def _allocated(build) -> tuple[int, object]:
+    """Bytes still allocated by `build()` once it returns (its result kept alive, garbage freed)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    value = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, value
+
+
+def company_memory(db) -> dict:
+    """
+    Retained bytes per company (strings included) for: JSON-able dicts (what the
+    routes and cache held before the Company model), Company structs, and the
+    company cache's encoded fragments.
+    """
+    from fastapi.encoders import jsonable_encoder
+    from app.models.company import Company
+    from app.services.company_cache import company_cache
+
+    ids = [str(doc["_id"]) for doc in db.companies.find({}, {"_id": 1})]
+    n = len(ids)
+
+    def fetch():
+        # mongomock hands out shared str objects; a BSON round trip allocates them like pymongo does
+        return (bson.decode(bson.encode(doc)) for doc in db.companies.find({}))
+
+    def as_dicts():
+        out = []
+        for doc in fetch():
+            doc["id"] = str(doc.pop("_id"))
+            out.append(jsonable_encoder(doc))
+        return out
+
+    def warm_cache():
+        for company_id in ids:
+            company_cache.get(company_id)
+
+    company_cache._profiles.clear()
+    company_cache._quotes.clear()
+
+    dict_bytes, _ = _allocated(as_dicts)
+    struct_bytes, _ = _allocated(lambda: [Company.from_document(doc) for doc in fetch()])
+    cache_bytes, _ = _allocated(warm_cache)
+    return {
+        "companies": n,
+        "dict_bytes_per_company": dict_bytes // n,
+        "struct_bytes_per_company": struct_bytes // n,
+        "cache_bytes_per_company": cache_bytes // n,
+    }
@@ -0,0 +1,101 @@
+"""
+Benchmark for near-duplicate news clustering (services/news_clusters.py).
+
+Generates a synthetic archive of stories, each syndicated by 1-4 sources with
+source-specific edits (reworded headline prefix/suffix, trimmed or extended
+summary), about 2,000 articles a day. Distinct stories share the same small
+market vocabulary, so unrelated articles do look alike. Articles are then
+clustered in publication order with the in-process band store, which reports:
+
+- pairwise precision / recall of "same story" decisions against the ground truth
+- per-article assignment time per slice of the archive. With the time-windowed
+  band lookup, this time should stay flat as the archive grows.
+
+Usage (from the backend directory):
+    python -m benchmarks.news_clusters
+    python -m benchmarks.news_clusters --articles 1000000
+"""
+import os
+
+# Must be set before the app (and its DB client) is imported
+os.environ["MONGODB_URI"] = "mongomock://"
+
+import argparse
+import random
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+from .synthetic import SOURCES, WORDS
+
+ARTICLES_PER_DAY = 2000
+PREFIXES = ["", "", "PSX: ", "Breaking: ", "Markets: "]
+SUFFIXES = ["", "", " - report", " | Business", " (updated)"]
+
+
+def make_archive(count: int, seed: int = 13):
+    """[(article, story)] in publication order."""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    archive, story = [], 0
+    while len(archive) < count:
+        story += 1
+        title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(7, 12)))
+        summary = " ".join(rng.choice(WORDS) for _ in range(rng.randint(30, 60)))
+        published = start + timedelta(days=len(archive) / ARTICLES_PER_DAY)
+        for copy, source in enumerate(rng.sample(SOURCES, rng.choice((1, 1, 1, 2, 2, 3, 4)))):
+            words = summary.split()
+            if copy:
+                # Syndicated copy: trimmed or extended summary, a word or two changed
+                words = words[:rng.randint(len(words) * 2 // 3, len(words))] + [rng.choice(WORDS) for _ in range(rng.randint(0, 5))]
+                for _ in range(rng.randint(0, 2)):
+                    words[rng.randrange(len(words))] = rng.choice(WORDS)
+            archive.append(({
+                "title": rng.choice(PREFIXES) + title.capitalize() + rng.choice(SUFFIXES),
+                "summary_text": " ".join(words),
+                "source": source,
+                "published_date": published + timedelta(minutes=rng.randint(0, 240) * bool(copy)),
+            }, story))
+    return archive[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=200_000)
+    parser.add_argument("--slices", type=int, default=5)
+    args = parser.parse_args()
+
+    from app.services.news_clusters import MemoryBandStore, NewsClusterer
+
+    archive = make_archive(args.articles)
+    clusterer = NewsClusterer(MemoryBandStore())
+    slice_size = max(1, len(archive) // args.slices)
+    timings = []
+    start = time.perf_counter()
+    for i, (article, _) in enumerate(archive):
+        clusterer.assign(article)
+        if (i + 1) % slice_size == 0:
+            now = time.perf_counter()
+            timings.append((i + 1, (now - start) / slice_size * 1e6))
+            start = now
+
+    for done, us in timings:
+        print(f"articles {done:>9,}: {us:7.1f} us/article")
+
+    # Pairwise quality: pairs predicted in one cluster vs pairs truly from one story
+    predicted = Counter(a["cluster_id"] for a, _ in archive)
+    truth = Counter(story for _, story in archive)
+    both = Counter((a["cluster_id"], story) for a, story in archive)
+
+    def pairs(counter):
+        return sum(n * (n - 1) // 2 for n in counter.values())
+
+    true_positive = pairs(both)
+    precision = true_positive / pairs(predicted) if pairs(predicted) else 1.0
+    recall = true_positive / pairs(truth) if pairs(truth) else 1.0
+    print(f"stories {len(truth):,}, clusters {len(predicted):,}; pairwise precision {precision:.3f}, recall {recall:.3f}")
+    print(f"collapsed feed: {len(predicted) / len(archive):.0%} of articles")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark for article ingestion with derived summaries (services/article_text.py).
+
+- Extraction: `summarize_entry` throughput on feed-like HTML summaries
+  (images, tracking pixels, inline markup, "The post ... appeared first on" footers).
+- Ingest: `fetch_news` end to end against the offline feed fixture, with and
+  without the extraction pass, in articles per second.
+- Payload: average bytes per article in a `/news` page, lean projection vs the
+  full documents the endpoint used to return.
+
+Usage (from the backend directory):
+    python -m benchmarks.news_ingest
+    python -m benchmarks.news_ingest --entries 20000
+"""
+import os
+
+# Must be set before the app (and its DB client) is imported
+os.environ["MONGODB_URI"] = "mongomock://"
+
+import argparse
+import random
+import time
+from types import SimpleNamespace
+
+from .synthetic import WORDS
+
+PAGE = 50
+
+
+def feed_html(rng: random.Random, i: int) -> str:
+    paragraphs = "".join(
+        "<p>" + " ".join(rng.choice(WORDS) for _ in range(rng.randint(30, 90))).capitalize()
+        + ' <a href="https://example.pk/t">link</a> <strong>'
+        + rng.choice(WORDS) + "</strong>&nbsp;&amp; more.</p>"
+        for _ in range(rng.randint(2, 6))
+    )
+    return (
+        f'<figure><img width="1200" height="675" src="https://cdn.example.pk/{i}.jpg" '
+        'class="attachment-large wp-post-image" alt="" srcset="https://cdn.example.pk/a.jpg 300w, '
+        'https://cdn.example.pk/b.jpg 768w" /></figure>'
+        f"{paragraphs}"
+        '<img src="https://pixel.example.pk/t.gif" width="1" height="1" />'
+        "<p>The post Synthetic headline appeared first on Example News.</p>"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=5000)
+    args = parser.parse_args()
+
+    from app.database import db
+    from app.services import aggregator
+    from app.services.aggregator import fetch_news
+    from app.services.article_text import ARTICLE_LIST_PROJECTION, summarize_entry
+    from app.utils.json_response import dumps, with_id
+    from .fixtures import install
+
+    rng = random.Random(5)
+    entries = [SimpleNamespace(summary=feed_html(rng, i)) for i in range(args.entries)]
+    html_bytes = sum(len(e.summary) for e in entries)
+    start = time.perf_counter()
+    for entry in entries:
+        summarize_entry(entry)
+    elapsed = time.perf_counter() - start
+    print(f"extraction: {args.entries / elapsed:,.0f} entries/s, {elapsed / args.entries * 1e6:.1f} us/entry, "
+          f"{html_bytes / elapsed / 1e6:.1f} MB/s of HTML")
+
+    install()
+    for label, summarize in (("without extraction", lambda entry: {}), ("with extraction", summarize_entry)):
+        aggregator.summarize_entry = summarize
+        db.articles.delete_many({})
+        start = time.perf_counter()
+        fetch_news()
+        elapsed = time.perf_counter() - start
+        count = db.articles.count_documents({})
+        print(f"fetch_news {label}: {count} articles in {elapsed * 1000:.0f} ms ({count / elapsed:,.0f} articles/s)")
+    aggregator.summarize_entry = summarize_entry
+
+    # Page sizes with realistic HTML summaries
+    db.articles.delete_many({})
+    docs = []
+    for i, entry in enumerate(entries[:PAGE * 4]):
+        docs.append({"title": f"Headline {i}", "link": f"https://example.pk/{i}", "published": "",
+                     "source": "Example", "summary": entry.summary, **summarize_entry(entry)})
+    db.articles.insert_many(docs)
+    full = dumps([with_id(a) for a in db.articles.find({}).limit(PAGE)])
+    lean = dumps([with_id(a) for a in db.articles.find({}, ARTICLE_LIST_PROJECTION).limit(PAGE)])
+    print(f"/news page of {PAGE}: full {len(full) / PAGE:,.0f} B/article, lean {len(lean) / PAGE:,.0f} B/article "
+          f"({1 - len(lean) / len(full):.0%} smaller)")
+
+
+if __name__ == "__main__":
+    main()
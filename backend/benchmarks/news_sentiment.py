@@ -0,0 +1,94 @@
+"""
+Benchmark for local news sentiment (services/news_sentiment.py).
+
+- Scoring: `score_article` throughput on one core (title + 280-character
+  snippet, the fields scored at ingest), in articles per second.
+- Aggregation: `record_sentiment` per ingest batch (one `$inc` per touched
+  hourly bucket) and a `/news/sentiment` window read over the buckets.
+- Sanity: agreement of headline scores with the intended polarity of
+  templated headlines ("X surges on...", "X plunges as...", announcements).
+
+Usage (from the backend directory):
+    python -m benchmarks.news_sentiment
+    python -m benchmarks.news_sentiment --articles 200000
+"""
+import os
+
+# Must be set before the app (and its DB client) is imported
+os.environ["MONGODB_URI"] = "mongomock://"
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from .synthetic import SECTORS, WORDS, ticker_for
+
+# Topic words without a polarity of their own, for the templates
+TOPICS = ["psx", "cement", "imf", "budget", "rupee", "sbp", "urea", "textile", "refinery", "kse-100"]
+
+TEMPLATES = {
+    "positive": ["{t} surges on strong {w} outlook", "{t} posts record profit, announces dividend",
+                 "{t} shares rally after {w} deal", "SBP rate cut lifts {t}", "{t} earnings beat estimates"],
+    "negative": ["{t} plunges as {w} concerns mount", "{t} posts loss amid circular debt",
+                 "{t} shares fall on {w} downgrade", "{t} halts production after gas shortage",
+                 "{t} profit declines sharply"],
+    "neutral": ["{t} to hold board meeting on {w}", "{t} announces {w} schedule", "Cabinet meets on {w} budget"],
+}
+
+
+def make_articles(count: int, rng: random.Random) -> list[dict]:
+    now = datetime.utcnow()
+    articles = []
+    for _ in range(count):
+        polarity = rng.choice(list(TEMPLATES))
+        company = rng.randrange(200)
+        title = rng.choice(TEMPLATES[polarity]).format(t=f"Company {company}", w=rng.choice(TOPICS))
+        summary = " ".join(rng.choice(WORDS) for _ in range(45))[:280]
+        articles.append({
+            "title": title, "summary_text": summary, "polarity": polarity,
+            "published_date": now - timedelta(minutes=rng.randint(0, 7 * 24 * 60)),
+            "tickers": [ticker_for(company)], "sectors": [SECTORS[company % len(SECTORS)]],
+        })
+    return articles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=50_000)
+    parser.add_argument("--batch", type=int, default=350, help="articles per ingest batch (one fetch_news run)")
+    parser.add_argument("--batches", type=int, default=5)
+    args = parser.parse_args()
+
+    from app.database import db
+    from app.services.news_sentiment import SENTIMENT_COLLECTION, record_sentiment, score_article, window_sentiment
+
+    articles = make_articles(args.articles, random.Random(3))
+
+    start = time.perf_counter()
+    for article in articles:
+        article.update(score_article(article["title"], article["summary_text"]))
+    elapsed = time.perf_counter() - start
+    print(f"scoring: {args.articles / elapsed:,.0f} articles/s on one core, {elapsed / args.articles * 1e6:.1f} us/article")
+
+    # The random snippets are drawn from market vocabulary ("rally", "debt"...), so judge the headline alone
+    agree = sum(score_article(a["title"])["sentiment_label"] == a["polarity"] for a in articles[:5000])
+    print(f"headline polarity agreement: {agree / min(len(articles), 5000):.1%}")
+
+    db[SENTIMENT_COLLECTION].delete_many({})
+    batches = [articles[i:i + args.batch] for i in range(0, min(len(articles), args.batch * args.batches), args.batch)]
+    start = time.perf_counter()
+    buckets = sum(record_sentiment(batch) for batch in batches)
+    elapsed = time.perf_counter() - start
+    print(f"aggregation: {elapsed / len(batches) * 1000:.1f} ms per batch of {args.batch} "
+          f"({buckets / len(batches):.0f} bucket upserts per batch)")
+
+    for window in ("1h", "24h", "7d"):
+        start = time.perf_counter()
+        mood = window_sentiment(window)
+        print(f"window {window:>3}: {(time.perf_counter() - start) * 1000:.1f} ms, "
+              f"{len(mood['tickers'])} tickers, market {mood['market']}")
+
+
+if __name__ == "__main__":
+    main()
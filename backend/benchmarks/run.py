@@ -0,0 +1,160 @@
+"""
+Benchmark suite for the API's hot paths.
+
+Runs every endpoint/job case against an in-process Mongo stand-in (mongomock)
+seeded with synthetic data, with yfinance/feedparser replaced by offline
+fixtures (synthetic, or recorded ones via --replay), and writes a JSON report.
+
+Usage (from the backend directory):
+    pip install -r benchmarks/requirements.txt
+    python -m benchmarks.run                                  # scale 1 and 10
+    python -m benchmarks.run --scales 1,10,100 --output bench.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json   # exit 1 on regression
+    python -m benchmarks.run --replay fixtures/upstream --replay-latency-ms 300 --replay-429-rate 0.05
+
+Scales: 1 = today's universe (80 companies, 10k articles), 10 = 800 / 100k, 100 = 8k / 1M.
+Absolute numbers from mongomock are not production numbers (it has no indexes,
+so unindexed-scan costs are exaggerated); compare reports from the same machine
+and stand-in against each other. Scale 100 (1M articles) needs several GB of RAM.
+"""
+import os
+
+# Must be set before the app (and its DB client) is imported
+os.environ["MONGODB_URI"] = "mongomock://"
+os.environ.setdefault("SLOW_REQUEST_MS", "600000")
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from . import cases
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(fn, iterations: int, warmup: int = 1) -> dict:
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    total = sum(timings)
+    return {
+        "iterations": iterations,
+        "mean_ms": round(statistics.fmean(timings) * 1000, 3),
+        "p50_ms": round(percentile(timings, 50) * 1000, 3),
+        "p95_ms": round(percentile(timings, 95) * 1000, 3),
+        "max_ms": round(max(timings) * 1000, 3),
+        "ops_per_s": round(iterations / total, 2) if total else None,
+    }
+
+
+def run(scales, iterations: int, only=None, backend=None) -> dict:
+    from app.database import db
+    from .fixtures import install
+    from .memory import company_memory
+    from .synthetic import seed_database
+
+    install(backend=backend)
+    report = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "iterations": iterations,
+            "mongo": "mongomock",
+            "upstream": type(backend).__name__ if backend else "synthetic",
+        },
+        "results": {},
+        "memory": {},
+    }
+    for scale in scales:
+        print(f"Seeding scale {scale}x...")
+        n_companies, n_articles = seed_database(db, scale)
+        print(f"  {n_companies} companies, {n_articles} articles")
+        scale_results = {}
+        for case in cases.build_cases(db):
+            if only and case.name not in only:
+                continue
+            n = max(1, iterations // case.cost)
+            result = measure(case.fn, n, warmup=0 if case.cost > 1 else 1)
+            if case.items:
+                result["items_per_s"] = round(case.items(db) / (result["mean_ms"] / 1000), 1) if result["mean_ms"] else None
+            scale_results[case.name] = result
+            print(f"  {case.name:<28} p50 {result['p50_ms']:>9.3f} ms  p95 {result['p95_ms']:>9.3f} ms  {result['ops_per_s']} ops/s")
+        report["results"][str(scale)] = scale_results
+        report["memory"][str(scale)] = memory = company_memory(db)
+        print(f"  memory per company: dict {memory['dict_bytes_per_company']} B, "
+              f"struct {memory['struct_bytes_per_company']} B, cached {memory['cache_bytes_per_company']} B")
+    return report
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Cases whose p50 got slower than baseline by more than `tolerance` (e.g. 0.2 = 20%)."""
+    regressions = []
+    for scale, cases_ in report["results"].items():
+        for name, result in cases_.items():
+            base = baseline.get("results", {}).get(scale, {}).get(name)
+            if not base or not base.get("p50_ms"):
+                continue
+            ratio = result["p50_ms"] / base["p50_ms"]
+            result["vs_baseline"] = round(ratio, 3)
+            if ratio > 1 + tolerance:
+                regressions.append(f"{scale}x {name}: p50 {base['p50_ms']} -> {result['p50_ms']} ms ({ratio:.2f}x)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="1,10", help="comma-separated data scales (1, 10, 100)")
+    parser.add_argument("--iterations", type=int, default=30, help="iterations per cheap case")
+    parser.add_argument("--only", help="comma-separated case names to run")
+    parser.add_argument("--output", default="bench_report.json")
+    parser.add_argument("--baseline", help="report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p50 slowdown vs baseline")
+    parser.add_argument("--replay", help="serve upstream calls from fixtures recorded in this directory")
+    parser.add_argument("--replay-latency-ms", type=float, default=0.0)
+    parser.add_argument("--replay-429-rate", type=float, default=0.0)
+    parser.add_argument("--replay-timeout-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    backend = None
+    if args.replay:
+        from app.services.upstream import ReplayBackend
+        from app.utils.fixture_store import FixtureStore
+        backend = ReplayBackend(FixtureStore(args.replay), latency_ms=args.replay_latency_ms,
+                                rate_limit_rate=args.replay_429_rate, timeout_rate=args.replay_timeout_rate)
+
+    scales = [int(s) for s in args.scales.split(",") if s]
+    only = set(args.only.split(",")) if args.only else None
+    report = run(scales, args.iterations, only, backend)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        report["regressions"] = regressions
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}")
+
+    if regressions:
+        print("REGRESSIONS:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
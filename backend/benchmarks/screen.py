@@ -0,0 +1,66 @@
+"""
+Benchmark for GET /companies/screen over a synthetic universe (default 10k companies).
+
+mongomock has no indexes, so by default this only measures the endpoint's own
+overhead. Point it at a scratch MongoDB to measure the compound indexes; it then
+also prints the winning plan of each screen (expect IXSCAN on industry_<metric>).
+
+Usage (from the backend directory):
+    python -m benchmarks.screen
+    python -m benchmarks.screen --mongo-uri mongodb://localhost:27017/bench_screen --companies 10000
+"""
+import argparse
+import os
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--companies", type=int, default=10_000)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--mongo-uri", default="mongomock://",
+                        help="scratch database; its companies collection is replaced")
+    args = parser.parse_args()
+
+    # Must be set before the app (and its DB client) is imported
+    os.environ["MONGODB_URI"] = args.mongo_uri
+    os.environ.setdefault("SLOW_REQUEST_MS", "600000")
+
+    from fastapi.testclient import TestClient
+    from app.database import db
+    from app.main import app
+    from app.services.company_loader import ensure_company_indexes
+    from .run import measure
+    from .synthetic import SECTORS, make_companies
+
+    db.companies.drop()
+    companies = make_companies(1, count=args.companies)
+    for i in range(0, len(companies), 10_000):
+        db.companies.insert_many(companies[i:i + 10_000])
+    ensure_company_indexes(db.companies)
+    print(f"{len(companies)} companies seeded into {args.mongo_uri}")
+
+    client = TestClient(app)
+    screens = {
+        "sector_top_market_cap": {"sector": SECTORS[0]},
+        "sector_min_revenue": {"sector": SECTORS[1], "min_revenue": 5 * 10**11, "sort": "revenue"},
+        "sector_cheap_pe": {"sector": SECTORS[2], "max_pe": 10, "sort": "pe"},
+        "all_min_revenue_max_pe": {"min_revenue": 10**11, "max_pe": 15},
+        "all_cheapest_pe": {"sort": "pe", "limit": 100},
+    }
+    for name, params in screens.items():
+        def call(params=params):
+            response = client.get("/companies/screen", params=params)
+            assert response.status_code == 200, response.text
+        result = measure(call, args.iterations)
+        rows = len(client.get("/companies/screen", params=params).json())
+        print(f"  {name:<26} p50 {result['p50_ms']:>8.3f} ms  p95 {result['p95_ms']:>8.3f} ms  ({rows} rows)")
+
+        if not args.mongo_uri.startswith("mongomock"):
+            from app.routes.company_routes import build_screen_query
+            query, sort_field, direction = build_screen_query(**{k: v for k, v in params.items() if k != "limit"})
+            plan = db.companies.find(query).sort(sort_field, direction).limit(50).explain()["queryPlanner"]["winningPlan"]
+            print(f"    plan: {plan}")
+
+
+if __name__ == "__main__":
+    main()
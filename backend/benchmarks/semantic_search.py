@@ -0,0 +1,102 @@
+"""
+Benchmark for semantic search (services/embeddings.py, services/vector_index.py).
+
+- Embedding: texts per second for the configured embedder (built-in hashing
+  embeddings unless EMBEDDING_MODEL is set) on article-sized synthetic texts.
+- Indexing: vectors per second appended to a float16 memory-mapped index in
+  ingest-sized batches, including the IVF trainings the growth triggers.
+- Queries: latency (p50 / p95) and recall@k of the IVF search against an exact
+  scan, for several `nprobe` values.
+
+The vectors are drawn around a few thousand random topic directions, so
+neighbourhoods have structure, as real embeddings do, instead of being
+uniformly random.
+
+Usage (from the backend directory):
+    python -m benchmarks.semantic_search
+    python -m benchmarks.semantic_search --vectors 1000000
+"""
+import os
+
+# Must be set before the app (and its DB client) is imported
+os.environ["MONGODB_URI"] = "mongomock://"
+
+import argparse
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from .run import percentile
+from .synthetic import WORDS
+
+TOPICS = 5000
+NOISE = 0.8
+
+
+def clustered_vectors(count: int, dim: int, rng: np.random.Generator, centers: np.ndarray) -> np.ndarray:
+    vectors = centers[rng.integers(0, len(centers), count)] + rng.normal(0, NOISE / np.sqrt(dim), (count, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=5000, help="vectors per append")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--texts", type=int, default=5000)
+    args = parser.parse_args()
+
+    from app.services.embeddings import get_embedder
+    from app.services.vector_index import VectorIndex
+
+    embedder = get_embedder()
+    rng = random.Random(1)
+    texts = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 70))) for _ in range(args.texts)]
+    start = time.perf_counter()
+    for i in range(0, len(texts), 256):
+        embedder.embed(texts[i:i + 256])
+    elapsed = time.perf_counter() - start
+    print(f"embedding ({embedder.name}, {embedder.dim} dims): {len(texts) / elapsed:,.0f} texts/s")
+
+    nrng = np.random.default_rng(7)
+    centers = nrng.normal(size=(TOPICS, embedder.dim))
+    centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+    with tempfile.TemporaryDirectory() as directory:
+        index = VectorIndex(embedder.dim, embedder.name, directory, "bench")
+        start = time.perf_counter()
+        for offset in range(0, args.vectors, args.batch):
+            n = min(args.batch, args.vectors - offset)
+            index.add([f"{offset + i:024x}" for i in range(n)], clustered_vectors(n, embedder.dim, nrng, centers))
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(os.path.join(directory, "bench.f16"))
+        print(f"indexing: {args.vectors:,} vectors in {elapsed:.1f} s ({args.vectors / elapsed:,.0f} vectors/s), "
+              f"{len(index.centroids) if index.centroids is not None else 0} lists, {size / 2**20:,.0f} MB float16")
+
+        queries = clustered_vectors(args.queries, embedder.dim, nrng, centers)
+        # Exact top-k over the stored (float16) vectors
+        truth = []
+        scores = np.concatenate([np.asarray(index.vectors[s:min(s + 65536, index.count)], dtype=np.float32) @ queries.T
+                                 for s in range(0, index.count, 65536)])
+        for q in range(args.queries):
+            top = np.argpartition(scores[:, q], -args.k)[-args.k:]
+            truth.append({f"{row:024x}" for row in top.tolist()})
+        del scores
+
+        # A reader process opening the same files
+        reader = VectorIndex(embedder.dim, embedder.name, directory, "bench")
+        for nprobe in (4, 8, 16, 32, 64):
+            timings, hits = [], 0
+            for q, expected in zip(queries, truth):
+                start = time.perf_counter()
+                result = reader.search(q, args.k, nprobe=nprobe)
+                timings.append((time.perf_counter() - start) * 1000)
+                hits += len(expected & {i for i, _ in result})
+            print(f"nprobe {nprobe:>3}: p50 {percentile(timings, 50):6.2f} ms, p95 {percentile(timings, 95):6.2f} ms, "
+                  f"recall@{args.k} {hits / (args.k * args.queries):.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Deterministic synthetic data for the benchmark suite.
+
+Scale 1 mirrors today's universe (~80 companies, ~10k articles);
+scale 10 / 100 multiply both (800 / 8k companies, 100k / 1M articles).
+"""
+import random
+from datetime import datetime, timedelta
+
+BASE_COMPANIES = 80
+BASE_ARTICLES = 10_000
+
+SECTORS = [
+    "Banking & Financial Services", "Energy", "Cement", "Fertilizer", "Technology",
+    "Textile", "Automobile", "Pharmaceuticals", "Food & Consumer", "Power Generation",
+]
+SOURCES = ["Dawn News", "The Express Tribune", "Business Recorder", "Profit", "ProPakistani", "TechJuice", "Mettis Global"]
+WORDS = (
+    "psx index rally cement exports circular debt power tariff imf budget rupee sbp policy rate "
+    "fertilizer urea gas prices oil refinery textile bank profit dividend earnings outlook kse-100"
+).split()
+
+
+def ticker_for(i: int) -> str:
+    return f"SYN{i:05d}.KA"
+
+
+def make_companies(scale: int, seed: int = 42, count: int = None) -> list[dict]:
+    """`count` overrides the scale-derived number of companies."""
+    from app.models.company import normalize_document
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    companies = []
+    for i in range(count if count is not None else BASE_COMPANIES * scale):
+        price = round(rng.uniform(5, 1500), 2)
+        change_percent = round(rng.gauss(0, 2), 2)
+        companies.append(normalize_document({
+            "name": f"Synthetic Company {i} Limited",
+            "ticker": ticker_for(i),
+            "industry": SECTORS[i % len(SECTORS)],
+            "description": " ".join(rng.choice(WORDS) for _ in range(120)),
+            "website": f"https://synthetic{i}.example.pk",
+            "founded_year": rng.randint(1940, 2020),
+            "location": "Karachi, Pakistan",
+            "employees_count": rng.randint(100, 20000),
+            "revenue": rng.randint(10**8, 10**12),
+            "net_profit": rng.randint(10**7, 10**11),
+            "market_cap": rng.randint(10**9, 10**12),
+            "ceo": f"CEO {i}",
+            "growth_tags": [],
+            "price": price,
+            "change": round(price * change_percent / 100, 2),
+            "change_percent": change_percent,
+            "volume": rng.randint(1_000, 5_000_000),
+            "previous_close": price,
+            "last_updated": now,
+        }))
+    return companies
+
+
+def make_articles(scale: int, seed: int = 7) -> list[dict]:
+    from app.services.article_text import summarize
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    articles = []
+    for i in range(BASE_ARTICLES * scale):
+        published = now - timedelta(minutes=i * 3)
+        title = " ".join(rng.choice(WORDS) for _ in range(10)).capitalize()
+        summary = (
+            f'<p><img src="https://news.example.pk/images/{i}.jpg" width="640" /></p>'
+            "<p>" + " ".join(rng.choice(WORDS) for _ in range(80)) + "</p>"
+        )
+        articles.append({
+            "title": title,
+            "link": f"https://news.example.pk/article/{i}",
+            "published": published.strftime("%a, %d %b %Y %H:%M:%S +0000"),
+            "published_date": published,
+            "summary": summary,
+            **summarize(summary),
+            "source": SOURCES[i % len(SOURCES)],
+            "created_at": published,
+        })
+    return articles
+
+
+def seed_database(db, scale: int):
+    """Replaces companies/articles in `db` with the synthetic universe for `scale`."""
+    for name in ("companies", "articles", "ai_insights", "cache_state"):
+        db[name].delete_many({})
+    companies = make_companies(scale)
+    db.companies.insert_many(companies)
+    articles = make_articles(scale)
+    for i in range(0, len(articles), 10_000):
+        db.articles.insert_many(articles[i:i + 10_000])
+    db.ai_insights.insert_one({"_id": "latest_pulse", "summary": "Synthetic pulse.", "timestamp": datetime.utcnow()})
+    return len(companies), len(articles)
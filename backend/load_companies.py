@@ -0,0 +1,42 @@
+"""
+Loads company reference data into MongoDB (idempotent, zero-downtime).
+
+Usage (from the backend directory):
+    python load_companies.py                                   # ../companies_enriched.json, then app/data/company_data.json
+    python load_companies.py path/to/file.json [more.json ...]
+    python load_companies.py --in-place --batch-size 500 app/data/company_data.json
+
+Later files win on conflicting fields. See app/services/company_loader.py.
+"""
+import argparse
+import os
+
+from app.database import db
+from app.services.company_loader import load_companies
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SOURCES = [
+    os.path.join(BACKEND_DIR, "..", "companies_enriched.json"),
+    os.path.join(BACKEND_DIR, "app", "data", "company_data.json"),
+]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", help="JSON files to load (default: enriched + static company data)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--in-place", action="store_true",
+                        help="upsert straight into db.companies instead of building a shadow collection and swapping")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or [p for p in DEFAULT_SOURCES if os.path.exists(p)]
+    print(f"Loading {', '.join(paths)}...")
+    stats = load_companies(db, paths, shadow=not args.in_place, batch_size=args.batch_size)
+    print(f"✓ {stats.read} records read ({stats.skipped} skipped), {stats.upserted} inserted, "
+          f"{stats.modified} updated, {stats.duplicates_removed} duplicates removed")
+    print(f"✓ {stats.seconds:.2f}s, {stats.records_per_sec} records/sec")
+    return stats
+
+
+if __name__ == "__main__":
+    main()
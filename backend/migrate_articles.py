@@ -0,0 +1,44 @@
+"""
+Adds the plain-text snippet, thumbnail and reading time (app/services/article_text.py)
+to articles ingested before those fields were computed at insert time, then
+assigns near-duplicate clusters (app/services/news_clusters.py), oldest first,
+tags the companies and sectors each article mentions (app/services/entity_tagger.py)
+and scores its sentiment, rebuilding the rolling aggregates (app/services/news_sentiment.py).
+Finally, embeds the articles missing from the semantic search vector index
+(app/services/semantic_search.py).
+Safe to re-run: only articles missing the fields are touched (`--retag` re-tags
+every article, e.g. after adding company aliases; `--rescore` re-scores every
+article after a lexicon change; `--reindex` re-embeds every article after
+changing EMBEDDING_MODEL).
+
+Usage (from the backend directory):
+    python migrate_articles.py
+"""
+import argparse
+
+from app.services.article_text import backfill_article_text
+from app.services.entity_tagger import ensure_tag_indexes, tag_backfill
+from app.services.news_clusters import cluster_backfill
+from app.services.news_sentiment import ensure_sentiment_indexes, sentiment_backfill
+from app.services.semantic_search import semantic_backfill
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--retag", action="store_true", help="re-tag articles that already have tickers")
+    parser.add_argument("--rescore", action="store_true", help="re-score articles that already have a sentiment")
+    parser.add_argument("--reindex", action="store_true", help="rebuild the semantic search vector index")
+    args = parser.parse_args()
+    count = backfill_article_text(batch_size=args.batch_size)
+    print(f"Updated {count} article documents.")
+    count = cluster_backfill(batch_size=args.batch_size)
+    print(f"Clustered {count} article documents.")
+    ensure_tag_indexes()
+    count = tag_backfill(batch_size=args.batch_size, retag=args.retag)
+    print(f"Tagged {count} article documents.")
+    ensure_sentiment_indexes()
+    count = sentiment_backfill(batch_size=args.batch_size, rescore=args.rescore)
+    print(f"Scored {count} article documents.")
+    count = semantic_backfill(reindex=args.reindex)
+    print(f"Embedded {count} article documents.")
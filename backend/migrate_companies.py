@@ -0,0 +1,68 @@
+"""
+Normalizes every document in `db.companies` to the canonical Company schema
+(app/models/company.py): renames legacy fields (`founded`, `employees`,
+`psx_symbol`, `sector`, `headquarters`...), converts amounts ("PKR 342.13 Billion (FY24)",
+"$1B+") to PKR integers plus fiscal year, employee counts ("13,000+") to a range,
+derives P/E, and creates the screening indexes. Fields outside the schema are left untouched.
+
+Usage (from the backend directory):
+    python migrate_companies.py --dry-run
+    python migrate_companies.py
+"""
+import argparse
+
+from pymongo import UpdateOne
+
+from app.database import db
+from app.models.company import Company, LEGACY_FIELDS
+from app.services.company_cache import company_cache
+from app.services.company_loader import ensure_company_indexes
+
+
+def plan_update(doc: dict):
+    """Returns the `$set`/`$unset` update that makes `doc` canonical, or None if it already is."""
+    canonical = Company.normalized(doc).to_document()
+    changed = {k: v for k, v in canonical.items() if k not in doc or doc[k] != v}
+    # Legacy names, plus schema fields whose value could not be coerced (e.g. "" or "N/A")
+    unset = [field for field in LEGACY_FIELDS if field in doc]
+    unset += [field for field in Company.__struct_fields__
+              if field != "id" and field not in canonical and doc.get(field) is not None]
+    if not changed and not unset:
+        return None
+    update = {}
+    if changed:
+        update["$set"] = changed
+    if unset:
+        update["$unset"] = {field: "" for field in unset}
+    return update
+
+
+def migrate(dry_run: bool = False, batch_size: int = 500) -> int:
+    ops, migrated = [], 0
+    for doc in db.companies.find({}):
+        update = plan_update(doc)
+        if update is None:
+            continue
+        migrated += 1
+        if dry_run:
+            print(f"{doc.get('ticker') or doc['_id']}: {update}")
+            continue
+        ops.append(UpdateOne({"_id": doc["_id"]}, update))
+        if len(ops) >= batch_size:
+            db.companies.bulk_write(ops, ordered=False)
+            ops = []
+    if ops:
+        db.companies.bulk_write(ops, ordered=False)
+    if not dry_run:
+        ensure_company_indexes(db.companies)
+    if migrated and not dry_run:
+        company_cache.invalidate_profiles()
+    return migrated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="print the planned updates without writing")
+    args = parser.parse_args()
+    count = migrate(dry_run=args.dry_run)
+    print(f"{'Would migrate' if args.dry_run else 'Migrated'} {count} company documents.")
@@ -0,0 +1,65 @@
+"""
+Records real Yahoo Finance / RSS responses into the upstream fixture store,
+for offline replay (UPSTREAM_MODE=replay or `python -m benchmarks.run --replay DIR`).
+
+Usage (from the backend directory):
+    python record_fixtures.py                       # all JSON tickers + PKR=X + RSS feeds
+    python record_fixtures.py --tickers HBL.KA,OGDC.KA --no-feeds --out fixtures/upstream
+"""
+import argparse
+import time
+
+from app.config import settings
+from app.services.aggregator import RSS_FEEDS
+from app.services.data_engine import DataEngine
+from app.services.upstream import RecordingBackend
+from app.utils.fixture_store import FixtureStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default=settings.UPSTREAM_FIXTURE_DIR)
+    parser.add_argument("--tickers", help="comma-separated tickers (default: every ticker in company_data.json)")
+    parser.add_argument("--no-feeds", action="store_true")
+    parser.add_argument("--pause", type=float, default=1.0, help="seconds between Yahoo calls")
+    args = parser.parse_args()
+
+    recorder = RecordingBackend(FixtureStore(args.out))
+    tickers = args.tickers.split(",") if args.tickers else DataEngine.get_all_tickers()
+    print(f"Recording {len(tickers)} tickers into {args.out}...")
+
+    failures = 0
+    for i, ticker in enumerate(tickers + ["PKR=X"]):
+        try:
+            recorder.ticker_info(ticker)
+            recorder.ticker_history(ticker, "2d", timeout=10)
+            print(f"[{i+1}/{len(tickers) + 1}] {ticker}")
+        except Exception as e:
+            failures += 1
+            print(f"ERROR recording {ticker}: {e}")
+        time.sleep(args.pause)
+
+    # Same chunking as DataEngine.update_live_prices
+    for i in range(0, len(tickers), 10):
+        chunk = tickers[i:i + 10]
+        try:
+            recorder.download(chunk, "1d")
+        except Exception as e:
+            failures += 1
+            print(f"ERROR recording download chunk {chunk}: {e}")
+        time.sleep(args.pause)
+
+    if not args.no_feeds:
+        for url in RSS_FEEDS:
+            try:
+                feed = recorder.parse_feed(url)
+                print(f"Feed {url}: {len(feed.entries)} entries")
+            except Exception as e:
+                failures += 1
+                print(f"ERROR recording feed {url}: {e}")
+
+    print(f"Done ({failures} failures).")
+
+
+if __name__ == "__main__":
+    main()
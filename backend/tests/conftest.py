@@ -0,0 +1,4 @@
+import os
+
+# Tests run against the in-process Mongo stand-in; must be set before the app (and its DB client) is imported
+os.environ.setdefault("MONGODB_URI", "mongomock://")
@@ -0,0 +1,34 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.utils.auth import require_admin
+
+app = FastAPI()
+
+
+@app.get("/admin/ping", dependencies=[Depends(require_admin)])
+def ping():
+    return {"ok": True}
+
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def admin_token(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+    return "s3cret"
+
+
+def test_fails_closed_without_configured_token(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "")
+    assert client.get("/admin/ping").status_code == 403
+    assert client.get("/admin/ping", headers={"X-Admin-Token": ""}).status_code == 403
+
+
+def test_requires_matching_token(admin_token):
+    assert client.get("/admin/ping").status_code == 403
+    assert client.get("/admin/ping", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    assert client.get("/admin/ping", headers={"X-Admin-Token": admin_token}).status_code == 200
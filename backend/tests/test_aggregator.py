@@ -0,0 +1,79 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from app.database import db
+from app.services import aggregator
+from app.services.aggregator import fetch_news
+from app.services.embeddings import get_embedder
+from app.services.semantic_search import SemanticSearch
+
+STORY = ("Lucky Cement posts record quarterly profit on export growth",
+         "Lucky Cement Limited reported its highest ever quarterly profit as exports to Afghanistan "
+         "and East Africa rose sharply while local despatches held steady")
+OTHER = ("State Bank holds policy rate at 11 percent",
+         "The monetary policy committee kept the benchmark rate unchanged citing easing inflation")
+
+
+def entry(link: str, text: tuple, published: datetime) -> SimpleNamespace:
+    title, summary = text
+    return SimpleNamespace(title=title, link=link, summary=f"<p>{summary}</p>",
+                           published=published.isoformat(), published_parsed=published.timetuple())
+
+
+@pytest.fixture
+def feeds(tmp_path, monkeypatch):
+    db.articles.delete_many({})
+    served = {}
+    monkeypatch.setattr(aggregator, "RSS_FEEDS", ["https://dawn.example/feed", "https://brecorder.example/feed"])
+    monkeypatch.setattr(aggregator, "upstream", SimpleNamespace(
+        parse_feed=lambda url: SimpleNamespace(feed=SimpleNamespace(title=url), entries=served.get(url, []))))
+    monkeypatch.setattr(aggregator, "semantic_search", SemanticSearch(str(tmp_path), get_embedder()))
+    yield served
+    db.articles.delete_many({})
+
+
+def at(hour: int) -> datetime:
+    return datetime(2026, 10, 19, hour)
+
+
+def test_fetch_clusters_and_inserts_a_batch(feeds):
+    feeds["https://dawn.example/feed"] = [entry("https://dawn.example/1", STORY, at(9)),
+                                          entry("https://dawn.example/2", OTHER, at(10))]
+    # Business Recorder syndicates the story, and repeats one of its own links
+    feeds["https://brecorder.example/feed"] = [entry("https://brecorder.example/1", STORY, at(11)),
+                                               entry("https://brecorder.example/1", STORY, at(11))]
+    assert fetch_news() == {"message": "Fetched 3 new articles"}
+
+    first = db.articles.find_one({"link": "https://dawn.example/1"})
+    copy = db.articles.find_one({"link": "https://brecorder.example/1"})
+    assert (first["duplicate"], first["cluster_size"]) == (False, 2)
+    assert first["cluster_sources"] == ["Dawn News", "Business Recorder"]
+    assert (copy["duplicate"], copy["cluster_id"]) == (True, first["_id"])
+    assert db.articles.count_documents({}) == 3
+
+
+def test_next_fetch_skips_stored_links_and_joins_stored_stories(feeds):
+    feeds["https://dawn.example/feed"] = [entry("https://dawn.example/1", STORY, at(9))]
+    fetch_news()
+    feeds["https://brecorder.example/feed"] = [entry("https://brecorder.example/1", STORY, at(12))]
+    assert fetch_news() == {"message": "Fetched 1 new articles"}
+
+    first = db.articles.find_one({"link": "https://dawn.example/1"})
+    assert db.articles.count_documents({}) == 2
+    assert (first["duplicate"], first["cluster_size"]) == (False, 2)
+    assert sorted(first["cluster_sources"]) == ["Business Recorder", "Dawn News"]
+    assert db.articles.find_one({"link": "https://brecorder.example/1"})["cluster_id"] == first["_id"]
+
+
+def test_failing_feed_does_not_stop_the_others(feeds, monkeypatch):
+    feeds["https://brecorder.example/feed"] = [entry("https://brecorder.example/2", OTHER, at(9))]
+
+    def parse_feed(url):
+        if "dawn" in url:
+            raise ConnectionError("timed out")
+        return SimpleNamespace(feed=SimpleNamespace(title=url), entries=feeds[url])
+
+    monkeypatch.setattr(aggregator, "upstream", SimpleNamespace(parse_feed=parse_feed))
+    assert fetch_news() == {"message": "Fetched 1 new articles"}
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from bson import ObjectId
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.database import db
+from app.routes import alert_routes
+from app.routes.auth_routes import get_current_user
+from app.services.alerts import ALERTS_COLLECTION, AlertEngine
+from app.services.notifications import MemorySink
+from app.services.screener import Universe
+
+USER_ID = ObjectId()
+
+app = FastAPI()
+app.include_router(alert_routes.router)
+app.dependency_overrides[get_current_user] = lambda: {"_id": USER_ID, "email": "user@example.com"}
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def data():
+    db.companies.insert_one({"ticker": "OGDC.KA", "name": "OGDC"})
+    db.users.insert_one({"_id": USER_ID, "email": "user@example.com", "email_notifs": True})
+    yield
+    db.companies.delete_many({})
+    db.users.delete_many({})
+    db[ALERTS_COLLECTION].delete_many({})
+
+
+def universe(price: float, change_percent: float = 0.0) -> Universe:
+    columns = {
+        "price": np.array([price]),
+        "change_percent": np.array([change_percent]),
+        "relative_volume": np.array([1.0]),
+    }
+    return Universe(["OGDC.KA"], ["OGDC"], columns, {})
+
+
+def test_created_alert_triggers_once_and_notifies():
+    response = client.post("/alerts", json={"ticker": "ogdc.ka", "kind": "price_above", "threshold": 250})
+    assert response.status_code == 201
+    alert_id = response.json()["id"]
+
+    sink = MemorySink()
+    engine = AlertEngine(sink=sink)
+    assert engine.run(universe(240.0)) == []
+    assert sink.sent == []
+
+    engine.run(universe(251.5))
+    assert len(sink.sent) == 1
+    notification = sink.sent[0]
+    assert str(notification["alert_id"]) == alert_id
+    assert notification["user_id"] == str(USER_ID)
+    assert notification["channels"] == ["in_app", "email"]
+    stored = db[ALERTS_COLLECTION].find_one({"_id": ObjectId(alert_id)})
+    assert stored["status"] == "triggered" and stored["triggered_value"] == 251.5
+
+    # One-shot: the next cycle does not notify again
+    engine.run(universe(260.0))
+    assert len(sink.sent) == 1
+
+
+@pytest.mark.parametrize("threshold", ["nan", "NaN", "inf", "-inf", "Infinity"])
+def test_non_finite_threshold_is_rejected(threshold):
+    response = client.post("/alerts", json={"ticker": "OGDC.KA", "kind": "change_above", "threshold": threshold})
+    assert response.status_code == 422
+    assert db[ALERTS_COLLECTION].count_documents({}) == 0
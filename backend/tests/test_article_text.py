@@ -0,0 +1,96 @@
+import pytest
+
+from app.services.article_text import SUMMARY_TEXT_MAX, first_image, html_to_text, summarize, truncate
+
+
+@pytest.mark.parametrize("markup, expected", [
+    ("<p>Cement despatches rose <b>12%</b> in September.</p><p>Exports doubled.</p>",
+     "Cement despatches rose 12% in September.\nExports doubled."),
+    ("Line one<br/>Line two<BR>Line three", "Line one\nLine two\nLine three"),
+    ('<div class="x"><ul><li>LUCK</li><li>OGDC</li></ul></div>', "LUCK\nOGDC"),
+    ("", ""),
+    (None, ""),
+])
+def test_tags_become_text_and_line_breaks(markup, expected):
+    assert html_to_text(markup) == expected
+
+
+@pytest.mark.parametrize("markup", [
+    '<p>Profit up</p><script type="text/javascript">var a = "<p>ad</p>";</script><p>again</p>',
+    "<p>Profit up</p><STYLE>p { color: red }</STYLE ><p>again</p>",
+    "<p>Profit up</p><!-- tracking <img src='x'> --><noscript>Enable JS</noscript><p>again</p>",
+    '<p>Profit up</p><iframe src="https://ads.example/">fallback</iframe><svg><text>logo</text></svg><p>again</p>',
+])
+def test_script_style_and_comments_are_removed(markup):
+    assert html_to_text(markup) == "Profit up\nagain"
+
+
+def test_unterminated_script_drops_the_rest():
+    assert html_to_text("<p>Profit up</p><script>track('<p>view</p>')") == "Profit up"
+    assert html_to_text("Profit up <!-- truncated comment") == "Profit up"
+
+
+@pytest.mark.parametrize("markup, expected", [
+    ("Habib &amp; Co &#8211; Q3 &ldquo;beat&rdquo;", "Habib & Co – Q3 “beat”"),
+    ("Rs&nbsp;450&#x20;bn", "Rs 450 bn"),
+    # Escaped markup is text, not a tag to strip
+    ("Use &lt;b&gt;bold&lt;/b&gt;", "Use <b>bold</b>"),
+])
+def test_entities_are_decoded(markup, expected):
+    assert html_to_text(markup) == expected
+
+
+@pytest.mark.parametrize("markup, expected", [
+    ("<p>Profit up <b>12%", "Profit up 12%"),
+    ('Shares rallied <a href="https://example.pk/luck', "Shares rallied"),
+    ("<p>Profit up</p", "Profit up"),
+])
+def test_unclosed_tags(markup, expected):
+    assert html_to_text(markup) == expected
+
+
+@pytest.mark.parametrize("markup", [
+    "KSE-100 < 120,000 and > 110,000",
+    "Inflation fell to <5% while rates stayed >11%",
+    "1 <2 and 3>1",
+])
+def test_bare_angle_brackets_are_text(markup):
+    assert html_to_text(f"<p>{markup}</p>") == markup
+
+
+def test_trailing_boilerplate_is_removed():
+    assert html_to_text("<p>Rates held.</p><p>The post Rates held appeared first on Dawn.</p>") == "Rates held."
+    assert html_to_text('Rates held. <a href="/x">Continue reading &rarr;</a>') == "Rates held."
+    # Only at the end
+    assert html_to_text("Read more about the budget below") == "Read more about the budget below"
+
+
+def test_truncate_at_a_word_boundary():
+    assert truncate("  short   text ") == "short text"
+    text = "word " * 100
+    cut = truncate(text)
+    assert len(cut) <= SUMMARY_TEXT_MAX and cut.endswith("word…")
+    assert truncate("Profits rose sharply, analysts said", 24) == "Profits rose sharply…"
+    # A single long word is cut mid-word rather than losing most of the limit
+    assert truncate("a " + "x" * 50, 20) == "a " + "x" * 17 + "…"
+
+
+@pytest.mark.parametrize("markup, expected", [
+    ('<img src="https://cdn.example/luck.jpg" alt="">', "https://cdn.example/luck.jpg"),
+    ('<img width="1" height="1" src="https://t.example/p.gif"><IMG SRC=\'https://cdn.example/a.png\'>',
+     "https://cdn.example/a.png"),
+    ('<img src="/relative.jpg"><img src="https://cdn.example/b.jpg?w=1&amp;h=2">', "https://cdn.example/b.jpg?w=1&h=2"),
+    ('<p>No images</p>', None),
+    (None, None),
+])
+def test_first_image(markup, expected):
+    assert first_image(markup) == expected
+
+
+def test_summarize_prefers_feed_thumbnail_and_full_content():
+    summary = '<p>Short snippet</p><img src="https://cdn.example/s.jpg">'
+    content = "<p>" + "word " * 450 + "</p>"
+    fields = summarize(summary, content)
+    assert fields == {"summary_text": "Short snippet", "thumbnail": "https://cdn.example/s.jpg",
+                      "reading_time_minutes": 3}
+    assert summarize(summary, thumbnail="https://cdn.example/t.jpg")["thumbnail"] == "https://cdn.example/t.jpg"
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from app.database import db
+from app.services import company_loader
+from app.services.company_loader import load_companies
+
+TARGET = "test_companies"
+
+ENRICHED = [
+    {"psx_symbol": "luck.ka", "name": "Lucky Cement", "sector": "Cement", "revenue": "Rs 450 Bn (FY24)",
+     "market_cap": 300_000_000_000, "net_profit": 60_000_000_000},
+    {"psx_symbol": "OGDC.KA", "name": "Oil & Gas Development Company", "sector": "Oil & Gas",
+     "employees": "10,000-12,000"},
+    {"name": "No ticker, skipped"},
+]
+BY_SECTOR = {"Cement": {"LUCK.KA": {"name": "Lucky Cement", "ceo": "Muhammad Ali Tabba"}},
+             "Banking": {"HBL.KA": {"name": "Habib Bank"}}}
+
+
+@pytest.fixture
+def sources(tmp_path):
+    db[TARGET].drop()
+    db[f"{TARGET}_shadow"].drop()
+    enriched, by_sector = tmp_path / "companies_enriched.json", tmp_path / "company_data.json"
+    enriched.write_text(json.dumps(ENRICHED))
+    by_sector.write_text(json.dumps(BY_SECTOR))
+    yield [str(enriched), str(by_sector)]
+    db[TARGET].drop()
+    db[f"{TARGET}_shadow"].drop()
+
+
+def ids() -> dict:
+    return {doc["ticker"]: doc["_id"] for doc in db[TARGET].find({}, {"ticker": 1})}
+
+
+def test_both_file_shapes_are_merged_by_ticker(sources):
+    stats = load_companies(db, sources, target=TARGET)
+    assert (stats.read, stats.skipped, stats.upserted) == (5, 1, 3)
+    luck = db[TARGET].find_one({"ticker": "LUCK.KA"})
+    assert (luck["industry"], luck["ceo"], luck["revenue"], luck["revenue_fiscal_year"]) == \
+        ("Cement", "Muhammad Ali Tabba", 450_000_000_000, 2024)
+    assert luck["pe_ratio"] == 5.0
+    ogdc = db[TARGET].find_one({"ticker": "OGDC.KA"})
+    assert (ogdc["employees_min"], ogdc["employees_max"]) == (10_000, 12_000)
+
+
+def test_loading_twice_is_idempotent(sources):
+    load_companies(db, sources, target=TARGET)
+    first = ids()
+    stats = load_companies(db, sources, target=TARGET)
+    assert ids() == first
+    assert db[TARGET].count_documents({}) == 3
+    assert (stats.upserted, stats.modified) == (0, 0)
+
+
+def test_live_ids_and_prices_survive_a_load(sources):
+    db[TARGET].insert_many([
+        {"ticker": "LUCK.KA", "name": "Lucky", "price": 812.5},
+        {"ticker": "LUCK.KA", "name": "Lucky (duplicate row)"},
+    ])
+    original = db[TARGET].find_one({"ticker": "LUCK.KA"}, sort=[("_id", 1)])
+    stats = load_companies(db, sources, target=TARGET)
+    assert stats.duplicates_removed == 1
+    luck = db[TARGET].find_one({"ticker": "LUCK.KA"})
+    assert luck["_id"] == original["_id"]
+    assert (luck["price"], luck["name"]) == (812.5, "Lucky Cement")
+    assert db[TARGET].count_documents({}) == 3
+
+
+def test_readers_see_the_old_universe_until_the_swap(sources, monkeypatch):
+    db[TARGET].insert_one({"ticker": "LUCK.KA", "name": "Lucky", "price": 812.5})
+    seen_during_load = []
+    upsert = company_loader.upsert_records
+
+    def observing_upsert(collection, records, stats, batch_size=1000):
+        # What a reader of the live collection sees while the shadow is being built
+        seen_during_load.append((TARGET in db.list_collection_names(), db[TARGET].count_documents({})))
+        upsert(collection, records, stats, batch_size)
+
+    monkeypatch.setattr(company_loader, "upsert_records", observing_upsert)
+    load_companies(db, sources, target=TARGET)
+    assert seen_during_load == [(True, 1), (True, 1)]
+    assert db[TARGET].count_documents({}) == 3
+    assert f"{TARGET}_shadow" not in db.list_collection_names()
+    # The swapped-in collection keeps the unique ticker index
+    assert any(info.get("unique") for info in db[TARGET].index_information().values())
+
+
+def test_first_load_into_a_missing_collection(sources):
+    assert TARGET not in db.list_collection_names()
+    load_companies(db, sources, target=TARGET)
+    assert db[TARGET].count_documents({}) == 3
@@ -0,0 +1,89 @@
+import msgspec
+import pytest
+
+from app.models.company import USD_PKR, Company, parse_employee_range, parse_money, pe_ratio
+
+
+ENRICHED = {
+    "name": "Oil and Gas Development Company Limited", "sector": "Energy", "founded": "1961", "hq": "Pakistan",
+    "website": "https://www.ogdcl.com", "is_listed": True, "psx_symbol": "OGDC.KA", "market_cap": 567163420672,
+    "revenue": "PKR 463.70 Billion (FY24)", "employees": "10,303", "description": "",
+    "sources": ["https://finance.yahoo.com/quote/OGDC.KA"], "ceo": "Ahmed Hayat Lak",
+}
+
+
+def test_enriched_record_keeps_curated_fields():
+    company = Company.from_document(ENRICHED)
+    assert company.ticker == "OGDC.KA"
+    assert company.industry == "Energy"
+    assert company.revenue == 463_700_000_000 and company.revenue_fiscal_year == 2024
+    assert company.is_listed is True
+    assert company.sources == ["https://finance.yahoo.com/quote/OGDC.KA"]
+    encoded = msgspec.json.decode(msgspec.json.encode(company))
+    assert encoded["is_listed"] is True
+    assert encoded["sources"] == ENRICHED["sources"]
+
+
+def test_seed_record_list_fields():
+    company = Company.normalized({
+        "name": "Systems Limited", "stock_symbol": "SYS", "market_share": "15%",
+        "export_markets": ["USA", "Europe"], "certifications": "ISO 27001", "products": ["BPO Services"],
+    })
+    assert company.market_share == "15%"
+    assert company.export_markets == ["USA", "Europe"]
+    assert company.certifications == ["ISO 27001"]
+    assert company.products == ["BPO Services"]
+
+
+def test_absent_curated_fields_are_not_written():
+    doc = Company.normalized({"name": "X", "ticker": "X.KA"}).to_document()
+    for field in ("is_listed", "sources", "market_share", "products", "export_markets", "certifications"):
+        assert field not in doc
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("1.2B", (1_200_000_000, None)),
+    ("Rs 500 Mn", (500_000_000, None)),
+    ("PKR 342.13 Billion (FY24)", (342_130_000_000, 2024)),
+    ("Rs. 1,250 million FY2023", (1_250_000_000, 2023)),
+    ("FY'23 PKR 10bn", (10_000_000_000, 2023)),
+    ("12 crore", (120_000_000, None)),
+    ("3 lakh", (300_000, None)),
+    ("$80M", (int(80_000_000 * USD_PKR), None)),
+    ("USD 1.5 billion", (int(1_500_000_000 * USD_PKR), None)),
+    ("-5B", (-5_000_000_000, None)),
+    (2.5e9, (2_500_000_000, None)),
+    ("garbage", (None, None)),
+    ("N/A", (None, None)),
+    ("", (None, None)),
+    (None, (None, None)),
+])
+def test_parse_money(value, expected):
+    assert parse_money(value) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("13,000+", (13_000, None)),
+    ("1,000-5,000", (1_000, 5_000)),
+    ("10 to 50", (10, 50)),
+    ("1k-5k", (1_000, 5_000)),
+    ("6,061", (6_061, 6_061)),
+    (6061, (6_061, 6_061)),
+    ("5,000-1,000", (5_000, None)),  # reversed range: only the lower bound is trusted
+    ("unknown", (None, None)),
+    (None, (None, None)),
+    (True, (None, None)),
+])
+def test_parse_employee_range(value, expected):
+    assert parse_employee_range(value) == expected
+
+
+@pytest.mark.parametrize("market_cap, net_profit, expected", [
+    (300, 60, 5.0),
+    (1000, 3, 333.33),
+    (100, 0, None),
+    (100, -5, None),  # loss-maker
+    (None, 5, None),
+])
+def test_pe_ratio(market_cap, net_profit, expected):
+    assert pe_ratio(market_cap, net_profit) == expected
@@ -0,0 +1,53 @@
+import pytest
+
+from app.database import db
+from app.routes.company_routes import SCREEN_SORTS, build_screen_query
+
+
+def test_sort_metric_excludes_missing_values():
+    query, field, direction = build_screen_query(sort="pe")
+    assert (field, direction) == SCREEN_SORTS["pe"]
+    assert query == {field: {"$ne": None}}
+
+
+def test_bounds_and_sector():
+    query, field, _ = build_screen_query(sector="Cement", min_revenue=10**9, max_revenue=5 * 10**10,
+                                         min_pe=2.5, min_employees=1000, sort="market_cap")
+    assert query == {
+        "industry": "Cement",
+        "revenue": {"$gte": 10**9, "$lte": 5 * 10**10},
+        "pe_ratio": {"$gte": 2.5},
+        "employees_min": {"$gte": 1000},
+        "market_cap": {"$ne": None},
+    }
+
+
+def test_sort_exclusion_merges_with_bounds_on_the_same_field():
+    query, field, _ = build_screen_query(min_market_cap=0, max_market_cap=10**11, sort="market_cap")
+    assert field == "market_cap"
+    assert query["market_cap"] == {"$gte": 0, "$lte": 10**11, "$ne": None}
+
+
+def test_zero_bounds_are_kept():
+    query, _, _ = build_screen_query(min_pe=0, max_pe=0, sort="revenue")
+    assert query["pe_ratio"] == {"$gte": 0, "$lte": 0}
+
+
+def test_unknown_sort_raises_key_error():
+    with pytest.raises(KeyError):
+        build_screen_query(sort="dividend_yield")
+
+
+def test_companies_without_the_sort_metric_are_left_out():
+    collection = db.test_screen
+    collection.drop()
+    collection.insert_many([
+        {"ticker": "LUCK.KA", "industry": "Cement", "pe_ratio": 5.0},
+        {"ticker": "FCCL.KA", "industry": "Cement", "pe_ratio": None},  # loss-maker
+        {"ticker": "DGKC.KA", "industry": "Cement"},  # never computed
+        {"ticker": "MLCF.KA", "industry": "Cement", "pe_ratio": 8.2},
+    ])
+    query, field, direction = build_screen_query(sector="Cement", sort="pe")
+    tickers = [doc["ticker"] for doc in collection.find(query).sort(field, direction)]
+    collection.drop()
+    assert tickers == ["LUCK.KA", "MLCF.KA"]
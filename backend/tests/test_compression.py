@@ -0,0 +1,127 @@
+import gzip
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.utils import compression
+from app.utils.compression import CompressionMiddleware, choose_encoding
+
+PAYLOAD = {"tickers": [{"ticker": f"T{i}.KA", "price": 100 + i} for i in range(200)]}
+BODY = json.dumps(PAYLOAD).encode()
+ETAG = '"0123456789abcdef0123"'
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=1000)
+
+
+@app.get("/large")
+def large():
+    return Response(BODY, media_type="application/json", headers={"ETag": ETAG})
+
+
+@app.get("/small")
+def small():
+    return Response(b'{"ok":true}', media_type="application/json", headers={"ETag": ETAG})
+
+
+@app.get("/varies")
+def varies():
+    return Response(BODY, media_type="application/json", headers={"Vary": "Origin"})
+
+
+@app.get("/binary")
+def binary():
+    return Response(b"\0" * 5000, media_type="application/octet-stream")
+
+
+@app.get("/encoded")
+def encoded():
+    return Response(gzip.compress(BODY), media_type="application/json", headers={"Content-Encoding": "gzip"})
+
+
+@app.get("/stream")
+def stream():
+    return StreamingResponse(iter([BODY, BODY]), media_type="text/csv")
+
+
+@app.get("/not-modified")
+def not_modified():
+    return Response(status_code=304, headers={"ETag": ETAG})
+
+
+client = TestClient(app)
+
+
+def get(path: str, accept_encoding: str):
+    # Look at the bytes on the wire: httpx would otherwise decode gzip itself
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate", "gzip"),
+    ("deflate, GZIP;q=0.5", "gzip"),
+    ("*", "gzip"),
+    ("br", None),
+    ("gzip;q=0, identity", None),
+    ("gzip;q=bogus", None),
+    ("", None),
+])
+def test_choose_encoding_without_brotli(header, expected, monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert choose_encoding(header) == expected
+
+
+def test_brotli_is_preferred_when_installed_and_accepted(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", SimpleNamespace(compress=lambda body, quality: b"br:" + body))
+    assert choose_encoding("gzip, br") == "br"
+    assert choose_encoding("gzip, br;q=0") == "gzip"
+    response, raw = get("/large", "br")
+    assert response.headers["content-encoding"] == "br"
+    assert raw == b"br:" + BODY
+
+
+def test_large_json_is_gzipped_with_a_weak_etag_and_vary(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    response, raw = get("/large", "gzip, br")
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) == len(raw) < len(BODY)
+    assert gzip.decompress(raw) == BODY
+    assert response.headers["etag"] == f"W/{ETAG}"
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+def test_existing_vary_is_extended():
+    response, _ = get("/varies", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Origin, Accept-Encoding"
+
+
+@pytest.mark.parametrize("path, accept_encoding", [
+    ("/small", "gzip"),          # below minimum_size
+    ("/large", "identity"),      # client does not accept gzip
+    ("/binary", "gzip"),         # not a compressible type
+    ("/stream", "gzip"),         # streamed in several chunks
+])
+def test_passthrough_is_untouched(path, accept_encoding):
+    response, raw = get(path, accept_encoding)
+    assert "content-encoding" not in response.headers
+    assert "vary" not in response.headers
+    if path != "/stream":
+        assert response.headers["content-length"] == str(len(raw))
+    if path in ("/small", "/large"):
+        # The strong validator is kept when the bytes are the origin's
+        assert response.headers["etag"] == ETAG
+
+
+def test_already_encoded_and_not_modified_pass_through():
+    response, raw = get("/encoded", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(raw) == BODY  # not compressed twice
+    response, raw = get("/not-modified", "gzip")
+    assert response.status_code == 304 and raw == b""
+    assert response.headers["etag"] == ETAG
@@ -0,0 +1,108 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.config import settings
+from app.database import db
+from app.services import correlations
+from app.services.correlations import (
+    STATE_ID, CorrelationStore, compute_correlations, daily_returns, pair_positions, pairwise_correlation,
+    square_slice, upper_triangle,
+)
+
+TOLERANCE = 1e-6  # the stored triangle is float32
+MIN_OVERLAP = 20
+TICKERS = ["ENGRO.KA", "HBL.KA", "LUCK.KA", "MCB.KA", "OGDC.KA", "PPL.KA"]
+
+
+def make_closes(days: int = 80, seed: int = 11) -> pd.DataFrame:
+    """Correlated random walks with gaps: missing sessions, and one ticker listed late."""
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0, 0.01, days)
+    returns = np.column_stack([0.6 * market + rng.normal(0, 0.01, days) for _ in TICKERS])
+    closes = 100 * np.cumprod(1 + returns, axis=0)
+    closes[rng.random(closes.shape) < 0.1] = np.nan
+    closes[: days - 15, TICKERS.index("PPL.KA")] = np.nan  # fewer than MIN_OVERLAP returns
+    start = date(2026, 6, 1)
+    index = [(start + timedelta(days=i)).isoformat() for i in range(days)]
+    return pd.DataFrame(closes, index=index, columns=TICKERS)
+
+
+def reference(closes: pd.DataFrame) -> pd.DataFrame:
+    """pandas' pairwise-complete Pearson correlation of the same daily returns."""
+    return (closes / closes.shift() - 1).iloc[1:].corr(min_periods=MIN_OVERLAP)
+
+
+def assert_matches(actual: np.ndarray, expected: pd.DataFrame):
+    np.testing.assert_allclose(actual, expected.to_numpy(), rtol=0, atol=TOLERANCE, equal_nan=True)
+
+
+@pytest.fixture(autouse=True)
+def empty_state():
+    db.correlation_state.delete_many({})
+    db.companies.delete_many({})
+    yield
+    db.correlation_state.delete_many({})
+    db.companies.delete_many({})
+
+
+def test_pairwise_correlation_matches_pandas():
+    closes = make_closes()
+    returns = daily_returns(closes.to_numpy())
+    expected = reference(closes)
+    assert expected["PPL.KA"].drop("PPL.KA").isna().all()
+    assert_matches(pairwise_correlation(returns, min_overlap=MIN_OVERLAP), expected)
+
+
+def test_upper_triangle_round_trips_through_square_slice():
+    closes = make_closes()
+    expected = reference(closes)
+    n = len(TICKERS)
+    upper = upper_triangle(pairwise_correlation(daily_returns(closes.to_numpy()), min_overlap=MIN_OVERLAP))
+    assert upper.dtype == np.float32 and len(upper) == n * (n - 1) // 2
+    i, j = np.triu_indices(n, k=1)
+    assert pair_positions(i, j, n).tolist() == list(range(len(upper)))
+
+    # Any subset, in any order, is the matching block of the full matrix (diagonal 1)
+    picked = np.array([4, 0, 2])
+    block = expected.iloc[picked, picked].to_numpy().copy()
+    np.fill_diagonal(block, 1.0)
+    np.testing.assert_allclose(square_slice(upper, picked, n), block, rtol=0, atol=TOLERANCE, equal_nan=True)
+
+
+def test_stored_and_memory_mapped_snapshot_matches_pandas(tmp_path, monkeypatch):
+    closes = make_closes()
+    series = {ticker: ([day for day, close in column.items() if close == close], column.dropna().tolist(), [])
+              for ticker, column in closes.items()}
+    monkeypatch.setattr(correlations, "daily_bars", lambda since: series)
+    # No KSE-100 history: betas fall back to the universe index, which the correlations do not depend on
+    monkeypatch.setattr(correlations, "upstream", None)
+    monkeypatch.setattr(settings, "CORRELATION_LOOKBACK_DAYS", len(closes))
+    monkeypatch.setattr(settings, "CORRELATION_MIN_OVERLAP", MIN_OVERLAP)
+
+    assert compute_correlations() == 1
+    store = CorrelationStore(str(tmp_path), poll_seconds=60)
+    snapshot = store.get()
+    assert isinstance(snapshot.upper, np.memmap)
+    assert [p.name for p in tmp_path.iterdir()] == ["correlations-v1.npy"]
+    assert snapshot.tickers == TICKERS
+
+    expected = reference(closes)
+    full = square_slice(snapshot.upper, np.arange(len(TICKERS)), len(TICKERS))
+    reference_matrix = expected.to_numpy().copy()
+    np.fill_diagonal(reference_matrix, 1.0)
+    np.testing.assert_allclose(full, reference_matrix, rtol=0, atol=TOLERANCE, equal_nan=True)
+
+    result = snapshot.tickers_slice(["OGDC.KA", "LUCK.KA", "PPL.KA", "XYZ.KA"])
+    assert result["tickers"] == ["OGDC.KA", "LUCK.KA", "PPL.KA"]
+    assert result["missing"] == ["XYZ.KA"]
+    assert result["matrix"][0][1] == round(float(np.float32(expected.at["OGDC.KA", "LUCK.KA"])), 4)
+    assert result["matrix"][0][2] is None
+
+    # A new version is materialized next to (and replaces) the old file
+    db.correlation_state.update_one({"_id": STATE_ID}, {"$inc": {"version": 1}})
+    store._polled_at = None
+    assert store.get().version == 2
+    assert [p.name for p in tmp_path.iterdir()] == ["correlations-v2.npy"]
@@ -0,0 +1,106 @@
+import copy
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routes import dashboard_routes
+from app.services import dashboard
+from app.services.dashboard import CachedSection, FieldMaskError, apply_field_mask, parse_field_mask
+
+MARKET = {
+    "kse100": {"value": 118_250.4, "change": 512.3},
+    "top_gainers": [{"ticker": "LUCK.KA", "price": 812.5, "change_percent": 4.2},
+                    {"ticker": "OGDC.KA", "price": 201.1, "change_percent": 3.1}],
+    "currency": {"pair": "USD/PKR", "rate": 278.5},
+}
+NEWS = [{"_id": "a1", "title": "Cement despatches rise", "source": "Dawn News", "summary": "..."},
+        {"_id": "a2", "title": "Policy rate held", "source": "Business Recorder", "summary": "..."}]
+
+app = FastAPI()
+app.include_router(dashboard_routes.router)
+client = TestClient(app)
+
+
+@pytest.fixture
+def sections(monkeypatch):
+    """Fixed section values; `loads` counts the loader calls per section."""
+    loads = {}
+
+    def section(name, value):
+        def loader():
+            loads[name] = loads.get(name, 0) + 1
+            if isinstance(value, Exception):
+                raise value
+            return value
+        return CachedSection(loader, ttl=60)
+
+    market = copy.deepcopy(MARKET)
+    monkeypatch.setattr(dashboard, "SECTIONS", {
+        "market": section("market", market),
+        "pulse": section("pulse", {"summary": "Cement leads", "timestamp": "2026-10-19T09:00:00"}),
+        "news": section("news", copy.deepcopy(NEWS)),
+        "news_stats": section("news_stats", RuntimeError("aggregate failed")),
+    })
+    return loads, market
+
+
+def test_parse_field_mask():
+    assert parse_field_mask("market.top_gainers.ticker, market.kse100 ,news.title,,pulse") == {
+        "market": {"top_gainers": {"ticker": {}}, "kse100": {}},
+        "news": {"title": {}},
+        "pulse": {},
+    }
+    # A shorter path keeps everything below it, in either order
+    assert parse_field_mask("market.top_gainers.ticker,market.top_gainers") == {"market": {"top_gainers": {}}}
+    assert parse_field_mask("market.top_gainers,market.top_gainers.ticker") == {"market": {"top_gainers": {}}}
+
+
+def test_unknown_section_is_rejected():
+    with pytest.raises(FieldMaskError, match="Unknown section 'portfolio'"):
+        parse_field_mask("portfolio.value")
+
+
+def test_apply_field_mask_filters_dicts_and_list_elements():
+    mask = parse_field_mask("market.top_gainers.ticker,market.kse100.value,market.missing")["market"]
+    assert apply_field_mask(MARKET, mask) == {
+        "top_gainers": [{"ticker": "LUCK.KA"}, {"ticker": "OGDC.KA"}],
+        "kse100": {"value": 118_250.4},
+    }
+    assert apply_field_mask(MARKET, {}) is MARKET
+    assert apply_field_mask(None, {"title": {}}) is None
+
+
+def test_masked_dashboard_loads_only_the_named_sections(sections):
+    loads, market = sections
+    response = client.get("/dashboard", params={"fields": "market.top_gainers.ticker,news.title"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body.pop("generated_at")
+    assert body == {
+        "market": {"top_gainers": [{"ticker": "LUCK.KA"}, {"ticker": "OGDC.KA"}]},
+        "news": [{"title": "Cement despatches rise"}, {"title": "Policy rate held"}],
+    }
+    assert loads == {"market": 1, "news": 1}
+    # The cached value the other endpoints share is not modified by the mask
+    assert market == MARKET
+
+    client.get("/dashboard", params={"fields": "market"})
+    assert loads == {"market": 1, "news": 1}
+
+
+def test_full_dashboard_reports_failing_sections(sections):
+    body = client.get("/dashboard").json()
+    assert body["market"] == MARKET
+    assert body["news"] == NEWS
+    assert body["pulse"]["summary"] == "Cement leads"
+    assert body["news_stats"] is None
+    assert body["errors"] == ["news_stats"]
+
+
+def test_bad_field_mask_is_a_400(sections):
+    loads, _ = sections
+    response = client.get("/dashboard", params={"fields": "market,portfolio"})
+    assert response.status_code == 400
+    assert "Unknown section 'portfolio'" in response.json()["detail"]
+    assert loads == {}
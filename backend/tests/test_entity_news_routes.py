@@ -0,0 +1,54 @@
+import pytest
+from bson import ObjectId
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.database import db
+from app.routes import company_routes, news_routes
+
+app = FastAPI()
+app.include_router(company_routes.router)
+app.include_router(news_routes.router)
+client = TestClient(app)
+
+
+@pytest.fixture
+def companies():
+    listed = db.companies.insert_one({"name": "Lucky Cement", "ticker": "LUCK.KA", "industry": "Cement"}).inserted_id
+    unlisted = db.companies.insert_one({"name": "Private Mills", "industry": "Textiles"}).inserted_id
+    db.articles.insert_many([
+        {"title": "Lucky Cement expands", "tickers": ["LUCK.KA"], "sectors": ["Cement"], "published_date": 2},
+        {"title": "Rupee steady", "tickers": [], "sectors": [], "published_date": 1},
+        {"title": "Budget talks", "published_date": 3},
+    ])
+    yield str(listed), str(unlisted)
+    db.companies.delete_many({})
+    db.articles.delete_many({})
+
+
+def test_company_news_by_ticker(companies):
+    listed, _ = companies
+    response = client.get(f"/companies/{listed}/news")
+    assert [a["title"] for a in response.json()] == ["Lucky Cement expands"]
+
+
+def test_company_without_ticker_has_no_news(companies):
+    _, unlisted = companies
+    response = client.get(f"/companies/{unlisted}/news")
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_unknown_company(companies):
+    assert client.get(f"/companies/{ObjectId()}/news").status_code == 404
+
+
+@pytest.mark.parametrize("path", ["/companies/{id}/news", "/news/sectors/Cement"])
+@pytest.mark.parametrize("params", [{"limit": 0}, {"limit": 101}, {"skip": -1}])
+def test_paging_is_bounded(companies, path, params):
+    assert client.get(path.format(id=companies[0]), params=params).status_code == 422
+
+
+def test_sector_news(companies):
+    response = client.get("/news/sectors/Cement", params={"limit": 100})
+    assert [a["title"] for a in response.json()] == ["Lucky Cement expands"]
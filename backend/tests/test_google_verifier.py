@@ -0,0 +1,99 @@
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from app.utils.google_verifier import GOOGLE_ISSUERS, GoogleTokenVerifier, StaticJwksSource, TokenVerificationError
+
+CLIENT_ID = "test-client.apps.googleusercontent.com"
+NOW = 1_700_000_000
+
+
+def make_key(kid: str):
+    """A generated RSA key for the fake issuer: (private PEM, public JWK)."""
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = private.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public = jwk.construct(
+        private.public_key().public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo),
+        "RS256",
+    ).to_dict()
+    public = {k: v.decode() if isinstance(v, bytes) else v for k, v in public.items()}
+    return pem, {**public, "kid": kid, "use": "sig", "alg": "RS256"}
+
+
+@pytest.fixture(scope="module")
+def issuer():
+    return make_key("key-1")
+
+
+@pytest.fixture
+def clock():
+    return {"now": NOW}
+
+
+@pytest.fixture
+def verifier(issuer, clock):
+    _, public = issuer
+    return GoogleTokenVerifier(CLIENT_ID, source=StaticJwksSource({"keys": [public]}), clock=lambda: clock["now"])
+
+
+def sign(pem: str, kid: str = "key-1", **overrides) -> str:
+    claims = {
+        "iss": GOOGLE_ISSUERS[1], "aud": CLIENT_ID, "sub": "1234567890", "email": "user@example.com",
+        "name": "Test User", "iat": int(time.time()), "exp": int(time.time()) + 3600,
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, pem, algorithm="RS256", headers={"kid": kid})
+
+
+def test_valid_token(issuer, verifier):
+    claims = verifier.verify(sign(issuer[0]))
+    assert claims["email"] == "user@example.com"
+    assert verifier.verified == 1
+    # Keys are cached: a second verification does not fetch them again
+    verifier.verify(sign(issuer[0]))
+    assert verifier.source.fetch_count == 1
+
+
+def test_expired_token(issuer, verifier):
+    token = sign(issuer[0], iat=int(time.time()) - 7200, exp=int(time.time()) - 3600)
+    with pytest.raises(TokenVerificationError, match="expired"):
+        verifier.verify(token)
+    assert verifier.failed == 1
+
+
+def test_wrong_audience(issuer, verifier):
+    with pytest.raises(TokenVerificationError, match="audience"):
+        verifier.verify(sign(issuer[0], aud="someone-else.apps.googleusercontent.com"))
+
+
+def test_wrong_issuer(issuer, verifier):
+    with pytest.raises(TokenVerificationError, match="issuer"):
+        verifier.verify(sign(issuer[0], iss="https://evil.example.com"))
+
+
+def test_unknown_kid(issuer, verifier, clock):
+    other_pem, _ = make_key("key-2")
+    token = sign(other_pem, kid="key-2")
+    with pytest.raises(TokenVerificationError, match="Unknown signing key"):
+        verifier.verify(token)
+    assert verifier.source.fetch_count == 1
+    # Once the refresh interval has passed, an unknown kid forces one early refresh (key rotation)...
+    clock["now"] += verifier.min_refresh_interval + 1
+    with pytest.raises(TokenVerificationError, match="Unknown signing key"):
+        verifier.verify(token)
+    assert verifier.source.fetch_count == 2
+    # ...but not another one within the interval
+    with pytest.raises(TokenVerificationError, match="Unknown signing key"):
+        verifier.verify(token)
+    assert verifier.source.fetch_count == 2
+
+
+def test_signature_from_other_key_with_known_kid(issuer, verifier):
+    other_pem, _ = make_key("key-2")
+    with pytest.raises(TokenVerificationError):
+        verifier.verify(sign(other_pem, kid="key-1"))
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.database import db
+from app.services.company_cache import CacheGenerations
+from app.services.headline_service import HeadlineService
+
+T0 = datetime(2026, 10, 19, 9)
+
+
+@pytest.fixture(autouse=True)
+def empty_store():
+    db.articles.delete_many({})
+    db.cache_state.delete_one({"_id": "test_articles"})
+    yield
+    db.articles.delete_many({})
+    db.cache_state.delete_one({"_id": "test_articles"})
+
+
+def service(capacity: int = 50) -> HeadlineService:
+    # Poll the generation on every read so the tests see other "processes" at once
+    return HeadlineService(capacity, CacheGenerations("test_articles", poll_seconds=-1))
+
+
+def article(n: int, **fields) -> dict:
+    return {"title": f"Headline {n}", "link": f"https://example.pk/{n}", "source": "Test",
+            "published_date": T0 + timedelta(minutes=n), **fields}
+
+
+def count_loads(headlines: HeadlineService, monkeypatch) -> list:
+    loads = []
+    load = headlines.load
+    monkeypatch.setattr(headlines, "load", lambda generation=None: (loads.append(generation), load(generation)))
+    return loads
+
+
+def test_push_keeps_newest_first_and_skips_duplicates():
+    headlines = service()
+    assert headlines.latest() == []
+    for n in (2, 1, 3):
+        headlines.push(article(n))
+    headlines.push(article(2))  # same link again
+    headlines.push(article(9, duplicate=True))  # syndicated copy
+    assert headlines.latest_titles(5) == ["Headline 3", "Headline 2", "Headline 1"]
+    assert headlines.latest_titles(0) == []
+
+
+def test_capacity_evicts_the_oldest():
+    headlines = service(capacity=3)
+    headlines.latest()
+    for n in range(1, 6):
+        headlines.push(article(n))
+    assert headlines.latest_titles(10) == ["Headline 5", "Headline 4", "Headline 3"]
+    # Older than everything kept: ignored
+    headlines.push(article(0))
+    assert headlines.latest_titles(10) == ["Headline 5", "Headline 4", "Headline 3"]
+    # Evicted links are forgotten with their entries
+    assert "https://example.pk/1" not in headlines._links
+
+
+def test_reads_do_not_reload_until_another_process_publishes(monkeypatch):
+    db.articles.insert_many([article(1), article(2)])
+    reader, ingester = service(), service()
+    loads = count_loads(reader, monkeypatch)
+    assert reader.latest_titles(5) == ["Headline 2", "Headline 1"]
+    assert reader.latest_titles(5) == ["Headline 2", "Headline 1"]
+    assert len(loads) == 1
+
+    # The ingesting process inserts, pushes into its own buffer and publishes
+    ingester.latest()
+    new = article(3)
+    db.articles.insert_one(new)
+    ingester.push(new)
+    ingester.published()
+
+    assert reader.latest_titles(5) == ["Headline 3", "Headline 2", "Headline 1"]
+    assert len(loads) == 2
+    assert ingester.latest_titles(1) == ["Headline 3"]
+
+
+def test_publishing_does_not_reload_the_publisher(monkeypatch):
+    headlines = service()
+    headlines.latest()
+    loads = count_loads(headlines, monkeypatch)
+    new = article(1)
+    db.articles.insert_one(new)
+    headlines.push(new)
+    headlines.published()
+    assert headlines.latest_titles(5) == ["Headline 1"]
+    assert loads == []
@@ -0,0 +1,144 @@
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.database import db
+from app.services.indicators import (
+    ATR_PERIOD, EMA_PERIODS, RSI_PERIOD, SMA_PERIODS, STATE_COLLECTION, IndicatorEngine, TickerIndicators,
+)
+from app.services.price_history import PRICE_HISTORY_COLLECTION
+
+TOLERANCE = 1e-9
+
+
+def make_observations(days: int, per_day: int, seed: int = 7, ticker: str = "SYN.KA") -> list:
+    """Several observations per session, each the day's bar so far, as the live price job records them."""
+    rng = np.random.default_rng(seed)
+    start = datetime(2024, 1, 1)
+    rows, close = [], 100.0
+    for day in range(days):
+        ts = start + timedelta(days=day)
+        open_ = high = low = close
+        volume = 0
+        for step in range(per_day):
+            close = max(1.0, close * (1 + rng.normal(0, 0.004)))
+            high, low = max(high, close), min(low, close)
+            volume += int(rng.integers(0, 50_000))
+            rows.append({"ticker": ticker, "ts": ts, "observed_at": ts + timedelta(hours=4, minutes=30 + 5 * step),
+                         "open": open_, "high": high, "low": low, "close": close, "volume": volume})
+    return rows
+
+
+def reference(rows: list) -> pd.DataFrame:
+    """Batch implementation of the same definitions with pandas, one row per day."""
+    obs = pd.DataFrame(rows)
+    obs["day"] = obs["ts"].dt.strftime("%Y-%m-%d")
+    daily = obs.groupby("day").last()
+    close = daily["close"]
+    out = pd.DataFrame(index=daily.index)
+    for period in SMA_PERIODS:
+        out[f"sma_{period}"] = close.rolling(period).mean()
+    for period in EMA_PERIODS:
+        out[f"ema_{period}"] = close.ewm(span=period, adjust=False, min_periods=period).mean()
+    delta = close.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / RSI_PERIOD, adjust=False, min_periods=RSI_PERIOD).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / RSI_PERIOD, adjust=False, min_periods=RSI_PERIOD).mean()
+    out[f"rsi_{RSI_PERIOD}"] = 100 - 100 / (1 + gain / loss)
+    previous = close.shift()
+    true_range = pd.concat([daily["high"] - daily["low"], (daily["high"] - previous).abs(),
+                            (daily["low"] - previous).abs()], axis=1).max(axis=1)
+    out[f"atr_{ATR_PERIOD}"] = true_range.ewm(alpha=1 / ATR_PERIOD, adjust=False, min_periods=ATR_PERIOD).mean()
+    traded = obs.groupby("day")["volume"].diff().fillna(obs["volume"])
+    obs["pv"] = obs["close"] * traded
+    obs["traded"] = traded
+    sums = obs.groupby("day")[["pv", "traded"]].sum()
+    out["vwap"] = sums["pv"] / sums["traded"]
+    return out
+
+
+def same(a, b) -> bool:
+    if a is None or (isinstance(a, float) and math.isnan(a)):
+        return b is None or (isinstance(b, float) and math.isnan(b))
+    if b is None or math.isnan(b):
+        return False
+    return abs(a - b) <= TOLERANCE * max(1.0, abs(b))
+
+
+def mismatches(actual: dict, expected: pd.DataFrame) -> list:
+    return [
+        (day, column, values[column], expected.at[day, column])
+        for day, values in actual.items() for column in expected.columns
+        if not same(values[column], expected.at[day, column])
+    ]
+
+
+@pytest.fixture(autouse=True)
+def empty_collections():
+    db[PRICE_HISTORY_COLLECTION].delete_many({})
+    db[STATE_COLLECTION].delete_many({})
+    yield
+    db[PRICE_HISTORY_COLLECTION].delete_many({})
+    db[STATE_COLLECTION].delete_many({})
+
+
+def test_incremental_matches_pandas_reference():
+    rows = make_observations(200, 12)
+    expected = reference(rows)
+    state, actual = TickerIndicators("SYN.KA"), {}
+    for i, row in enumerate(rows):
+        if i == len(rows) // 2:
+            # Checkpoint round trip, as a worker restart would do
+            state = TickerIndicators.from_document(state.to_document())
+        state.observe(row)
+        if i + 1 == len(rows) or rows[i + 1]["ts"] != row["ts"]:
+            actual[state.day] = state.values()
+    assert len(actual) == 200
+    assert mismatches(actual, expected) == []
+
+
+def test_engine_matches_pandas_reference_across_updates():
+    rows = make_observations(60, 6)
+    expected = reference(rows)
+    engine, actual = IndicatorEngine(), {}
+    for day_start in range(0, len(rows), 6):
+        db[PRICE_HISTORY_COLLECTION].insert_many([dict(row) for row in rows[day_start:day_start + 6]])
+        if day_start == len(rows) // 2:
+            engine = IndicatorEngine()  # restart: continues from the checkpoints
+        assert engine.update() == 6
+        state = engine.states["SYN.KA"]
+        actual[state.day] = state.values()
+    assert mismatches(actual, expected) == []
+
+
+def test_previous_bar_before_the_open_does_not_touch_next_day_vwap():
+    day, next_day = datetime(2026, 10, 16), datetime(2026, 10, 19)
+    state = TickerIndicators("OGDC.KA")
+    bar = {"ticker": "OGDC.KA", "open": 100.0, "high": 100.0, "low": 100.0, "close": 100.0, "volume": 1_000_000}
+    state.observe({**bar, "ts": day, "observed_at": day + timedelta(hours=10)})
+    # Friday's bar fetched again on Monday before the open keeps Friday's date
+    state.observe({**bar, "ts": day, "observed_at": next_day + timedelta(hours=2)})
+    assert state.day == "2026-10-16" and state.values()["vwap"] == 100.0
+    state.observe({**bar, "ts": next_day, "observed_at": next_day + timedelta(hours=5),
+                   "open": 120.0, "high": 120.0, "low": 120.0, "close": 120.0, "volume": 5_000})
+    assert state.day == "2026-10-19"
+    assert state.values()["vwap"] == 120.0
+    assert state.candles == 1
+
+
+def test_update_reads_only_rows_after_each_ticker_checkpoint():
+    engine = IndicatorEngine()
+    stale = make_observations(3, 2, ticker="STALE.KA")
+    db[PRICE_HISTORY_COLLECTION].insert_many([dict(row) for row in stale])
+    live = make_observations(30, 2, ticker="LIVE.KA")
+    db[PRICE_HISTORY_COLLECTION].insert_many([dict(row) for row in live[:20]])
+    assert engine.update() == 26
+    # STALE.KA stops trading; LIVE.KA's next rows must be all that is read, not the history since STALE's checkpoint
+    db[PRICE_HISTORY_COLLECTION].insert_many([dict(row) for row in live[20:22]])
+    query = {"$or": [{"ticker": {"$nin": list(engine.states)}},
+                     *(state.pending_query() for state in engine.states.values())]}
+    assert db[PRICE_HISTORY_COLLECTION].count_documents(query) == 2
+    assert engine.update() == 2
+    assert engine.update() == 0
@@ -0,0 +1,70 @@
+import pytest
+
+from app.database import db
+from app.services.job_telemetry import (
+    JOB_RUNS_COLLECTION, get_job_report, instrumented_job, record_failure, record_items, record_outcome,
+)
+
+
+def last_run(job: str) -> dict:
+    return db[JOB_RUNS_COLLECTION].find_one({"job": job}, sort=[("started_at", -1), ("_id", -1)])
+
+
+def test_returning_job_is_a_success():
+    @instrumented_job("test_success")
+    def job():
+        record_items(processed=3, updated=3)
+        record_outcome(0, 3)
+
+    job()
+    run = last_run("test_success")
+    assert run["status"] == "success"
+    assert run["items"] == {"processed": 3, "updated": 3}
+
+
+def test_raising_job_is_an_error():
+    @instrumented_job("test_raises")
+    def job():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        job()
+    assert last_run("test_raises")["status"] == "error"
+    assert last_run("test_raises")["error"] == "boom"
+
+
+def test_all_items_failed_marks_run_failed():
+    @instrumented_job("test_all_failed")
+    def job():
+        try:
+            raise ConnectionError("rate limited")
+        except Exception as e:
+            record_outcome(10, 10, e)
+
+    job()
+    run = last_run("test_all_failed")
+    assert run["status"] == "error"
+    assert run["error"] == "rate limited"
+    assert get_job_report()["jobs"]["test_all_failed"]["errors"] == 1
+
+
+def test_some_items_failed_marks_run_partial():
+    @instrumented_job("test_partial")
+    def job():
+        record_outcome(2, 10)
+
+    job()
+    assert last_run("test_partial")["status"] == "partial"
+    assert get_job_report()["jobs"]["test_partial"]["partial"] == 1
+
+
+def test_caught_exception_marks_run_failed():
+    @instrumented_job("test_caught")
+    def job():
+        try:
+            raise ValueError("bad response")
+        except Exception as e:
+            record_failure(e)
+
+    job()
+    assert last_run("test_caught")["status"] == "error"
@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.database import db
+from app.services import news_clusters
+from app.services.news_clusters import (
+    BANDS, CLUSTER_WINDOW_DAYS, MemoryBandStore, MongoBandStore, NewsClusterer, band_keys, cluster_backfill,
+    shingles, signature, similarity, tokens,
+)
+
+T0 = datetime(2026, 10, 19, 9)
+STORY = ("Lucky Cement posts record quarterly profit on export growth",
+         "Lucky Cement Limited reported its highest ever quarterly profit as exports to Afghanistan "
+         "and East Africa rose sharply while local despatches held steady")
+SYNDICATED = ("Lucky Cement posts record quarterly profit on export growth",
+              "Lucky Cement Limited reported its highest-ever quarterly profit as exports to Afghanistan "
+              "and East Africa rose sharply, while local despatches held steady.")
+OTHER = ("State Bank holds policy rate at 11 percent",
+         "The monetary policy committee kept the benchmark rate unchanged citing easing inflation")
+
+
+def article(text: tuple, hours: float = 0, source: str = "Dawn") -> dict:
+    title, summary = text
+    return {"title": title, "summary_text": summary, "source": source,
+            "published_date": T0 + timedelta(hours=hours)}
+
+
+def test_tokens_normalize_and_drop_stopwords():
+    assert tokens("Café  prices RISE in the market!") == ["cafe", "prices", "rise", "market"]
+    assert tokens(None) == []
+
+
+def test_shingles_are_word_pairs():
+    assert shingles("Oil prices rise") == {"oil prices", "prices rise"}
+    assert shingles("Oil") == {"oil"}
+    assert shingles("", "") == set()
+
+
+def test_signatures_agree_with_jaccard_similarity():
+    story, syndicated, other = (signature(shingles(*text)) for text in (STORY, SYNDICATED, OTHER))
+    assert similarity(story, signature(shingles(*STORY))) == 1.0
+    assert similarity(story, syndicated) >= 0.9  # same text up to punctuation
+    assert similarity(story, other) < 0.2
+    assert len(band_keys(story)) == BANDS
+    assert set(band_keys(story)) & set(band_keys(syndicated))
+
+
+def test_syndicated_copy_joins_the_first_article():
+    store = MemoryBandStore()
+    clusterer = NewsClusterer(store)
+    first = clusterer.assign(article(STORY))
+    copy = clusterer.assign(article(SYNDICATED, hours=2, source="Business Recorder"))
+    unrelated = clusterer.assign(article(OTHER, hours=3))
+    assert (first["cluster_id"], first["duplicate"]) == (first["_id"], False)
+    assert (copy["cluster_id"], copy["duplicate"]) == (first["_id"], True)
+    assert (unrelated["cluster_id"], unrelated["duplicate"]) == (unrelated["_id"], False)
+    assert store.sizes[first["_id"]] == 2
+
+
+def test_copies_outside_the_window_start_a_new_story():
+    clusterer = NewsClusterer(MemoryBandStore())
+    first = clusterer.assign(article(STORY))
+    later = clusterer.assign(article(SYNDICATED, hours=24 * CLUSTER_WINDOW_DAYS + 1))
+    assert later["duplicate"] is False
+    assert later["cluster_id"] != first["cluster_id"]
+
+
+def test_empty_articles_are_their_own_story():
+    clusterer = NewsClusterer(MemoryBandStore())
+    a = clusterer.assign(article(("", "")))
+    b = clusterer.assign(article(("", ""), hours=1))
+    assert a["lsh_bands"] == b["lsh_bands"] == []
+    assert not a["duplicate"] and not b["duplicate"]
+
+
+def test_older_article_never_joins_a_newer_story():
+    clusterer = NewsClusterer(MemoryBandStore())
+    newer = clusterer.assign(article(STORY, hours=5))
+    older = clusterer.assign(article(SYNDICATED, hours=1))
+    assert newer["duplicate"] is False
+    assert (older["cluster_id"], older["duplicate"]) == (older["_id"], False)
+
+
+@pytest.fixture
+def articles():
+    db.articles.delete_many({})
+    yield db.articles
+    db.articles.delete_many({})
+
+
+def test_backfill_does_not_hide_originals_behind_live_articles(articles, monkeypatch):
+    monkeypatch.setattr(news_clusters, "news_clusterer", NewsClusterer(MongoBandStore()))
+    # Ingested live, after clustering shipped
+    live = news_clusters.news_clusterer.assign(article(SYNDICATED, hours=6, source="Business Recorder"))
+    articles.insert_one(live)
+    # Stored before clustering shipped: the original, and a copy of it an hour later
+    original, copy = article(STORY), article(SYNDICATED, hours=1, source="Express Tribune")
+    articles.insert_many([original, copy])
+
+    assert cluster_backfill() == 2
+    original = articles.find_one({"_id": original["_id"]})
+    copy = articles.find_one({"_id": copy["_id"]})
+    assert (original["cluster_id"], original["duplicate"]) == (original["_id"], False)
+    assert (copy["cluster_id"], copy["duplicate"]) == (original["_id"], True)
+    assert original["cluster_size"] == 2
+    assert sorted(original["cluster_sources"]) == ["Dawn", "Express Tribune"]
+
+
+def test_mongo_candidates_are_the_most_recent_before_the_article(articles, monkeypatch):
+    monkeypatch.setattr(news_clusters, "MAX_CANDIDATES", 2)
+    sig = signature(shingles(*OTHER))
+    keys = band_keys(sig)
+    articles.insert_many([
+        {"cluster_id": f"story-{hours}", "lsh_bands": keys, "minhash": sig.tobytes(),
+         "published_date": T0 + timedelta(hours=hours)}
+        for hours in range(4)
+    ])
+    candidates = MongoBandStore().candidates(keys, T0, T0 + timedelta(hours=2))
+    assert [cluster_id for cluster_id, _ in candidates] == ["story-2", "story-1"]
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+from passlib.hash import bcrypt
+
+from app.config import settings
+from app.utils import auth
+from app.utils.auth import PasswordHasher, PasswordHasherBusy, hash_password_async, verify_password_async
+
+
+@pytest.fixture
+def hasher(monkeypatch):
+    hasher = PasswordHasher(workers=1, max_pending=2)
+    monkeypatch.setattr(auth, "password_hasher", hasher)
+    yield hasher
+    hasher.shutdown()
+
+
+def test_saturated_pool_answers_503_with_retry_after(hasher):
+    release = threading.Event()
+
+    async def scenario():
+        # Fill both slots (one running, one queued) with jobs that wait for `release`
+        blocked = [asyncio.ensure_future(hasher.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as busy:
+            await hash_password_async("hunter2")
+        release.set()
+        await asyncio.gather(*blocked)
+        return busy.value
+
+    busy = asyncio.run(scenario())
+    assert busy.status_code == 503
+    assert busy.headers == {"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER)}
+    assert hasher.rejected == 1
+
+
+def test_slots_are_released_after_each_job(hasher):
+    async def scenario():
+        for _ in range(5):
+            assert await hasher.run(sum, [1, 2]) == 3
+        with pytest.raises(ZeroDivisionError):
+            await hasher.run(divmod, 1, 0)
+        return await hasher.run(max, 4, 7)
+
+    assert asyncio.run(scenario()) == 7
+    assert hasher.rejected == 0
+
+
+def test_busy_is_raised_without_running_the_job(hasher):
+    release, calls = threading.Event(), []
+
+    async def scenario():
+        blocked = [asyncio.ensure_future(hasher.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(PasswordHasherBusy):
+            await hasher.run(calls.append, "ran")
+        release.set()
+        await asyncio.gather(*blocked)
+
+    asyncio.run(scenario())
+    assert calls == []
+
+
+def test_verify_on_the_executor_and_rehash_outdated_cost(hasher):
+    outdated = bcrypt.using(rounds=4).hash("correct horse")
+
+    async def scenario():
+        valid, new_hash = await verify_password_async("correct horse", outdated)
+        wrong = await verify_password_async("battery staple", outdated)
+        missing = await verify_password_async("correct horse", None)
+        current = await verify_password_async("correct horse", new_hash)
+        return valid, new_hash, wrong, missing, current
+
+    valid, new_hash, wrong, missing, current = asyncio.run(scenario())
+    assert valid is True
+    assert new_hash and bcrypt.from_string(new_hash).rounds == settings.PASSWORD_HASH_ROUNDS
+    assert wrong == (False, None)
+    assert missing == (False, None)
+    # A hash at the configured cost is not rehashed
+    assert current == (True, None)
+
+
+def test_hash_password_async_round_trips(hasher):
+    hashed = asyncio.run(hash_password_async("s3cret"))
+    assert auth.verify_password("s3cret", hashed)
+    assert not auth.verify_password("S3cret", hashed)
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from app.database import db
+from app.services import price_history
+from app.services.price_history import PRICE_HISTORY_COLLECTION, bar_timestamp, daily_bars, record_prices
+
+
+@pytest.fixture(autouse=True)
+def empty_history():
+    db[PRICE_HISTORY_COLLECTION].delete_many({})
+    price_history._last_bars = None
+    yield
+    db[PRICE_HISTORY_COLLECTION].delete_many({})
+    price_history._last_bars = None
+
+
+def bar(ticker: str, day: str, close: float, volume: int) -> dict:
+    return {"ticker": ticker, "ts": bar_timestamp(pd.Timestamp(day)), "open": close, "high": close,
+            "low": close, "close": close, "volume": volume}
+
+
+def test_bar_timestamp_keeps_session_date():
+    assert bar_timestamp(pd.Timestamp("2026-10-16")) == datetime(2026, 10, 16)
+    # A tz-aware daily label keeps its local session date instead of moving to the previous UTC day
+    assert bar_timestamp(pd.Timestamp("2026-10-16", tz="Asia/Karachi")) == datetime(2026, 10, 16)
+
+
+def test_unchanged_bar_is_not_recorded_again():
+    # Friday's session, then the same bar fetched over the weekend and before Monday's open
+    assert record_prices([bar("OGDC.KA", "2026-10-16", 200.0, 1_000_000)]) == 1
+    assert record_prices([bar("OGDC.KA", "2026-10-16", 200.0, 1_000_000)]) == 0
+    assert record_prices([bar("OGDC.KA", "2026-10-16", 200.0, 1_000_000)]) == 0
+    assert db[PRICE_HISTORY_COLLECTION].count_documents({}) == 1
+    # Monday's bar
+    assert record_prices([bar("OGDC.KA", "2026-10-19", 205.0, 300_000)]) == 1
+
+
+def test_intraday_updates_of_a_bar_are_recorded():
+    assert record_prices([bar("OGDC.KA", "2026-10-19", 200.0, 100_000)]) == 1
+    assert record_prices([bar("OGDC.KA", "2026-10-19", 201.0, 250_000)]) == 1
+    assert db[PRICE_HISTORY_COLLECTION].count_documents({}) == 2
+
+
+def test_last_bars_are_loaded_from_the_collection():
+    record_prices([bar("OGDC.KA", "2026-10-16", 200.0, 1_000_000)])
+    price_history._last_bars = None  # e.g. a restarted worker
+    assert record_prices([bar("OGDC.KA", "2026-10-16", 200.0, 1_000_000)]) == 0
+
+
+def test_daily_bars_use_bar_dates():
+    record_prices([bar("OGDC.KA", "2026-10-15", 190.0, 800_000)])
+    record_prices([bar("OGDC.KA", "2026-10-16", 195.0, 400_000)])
+    record_prices([bar("OGDC.KA", "2026-10-16", 200.0, 1_000_000)])
+    record_prices([bar("OGDC.KA", "2026-10-16", 200.0, 1_000_000)])  # weekend refetch
+    record_prices([bar("OGDC.KA", "2026-10-19", 205.0, 300_000)])
+    days, closes, volumes = daily_bars(datetime(2026, 10, 1))["OGDC.KA"]
+    assert days == ["2026-10-15", "2026-10-16", "2026-10-19"]
+    assert closes == [190.0, 200.0, 205.0]
+    assert volumes == [800_000, 1_000_000, 300_000]
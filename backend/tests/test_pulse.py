@@ -0,0 +1,116 @@
+import copy
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import settings
+from app.database import db
+from app.services.ai_service import AiService, ai_service
+
+INPUTS = {
+    "top_movers": [["LUCK.KA", 4.2], ["OGDC.KA", 3.1]],
+    "sector_map": {"Cement": 1.5, "Oil & Gas": 0.8},
+    "news_sentiment": {"market": [0.12, 40], "sectors": {"Cement": 0.3}, "tickers": [["LUCK.KA", 0.4, 6]]},
+}
+
+
+def moved(path: str, delta: float) -> dict:
+    """INPUTS with one number moved by `delta` ("sector_map.Cement", "top_movers.0", "news_sentiment.market")."""
+    inputs = copy.deepcopy(INPUTS)
+    section, key = path.split(".")
+    if section == "top_movers":
+        inputs[section][int(key)][1] += delta
+    elif section == "news_sentiment":
+        inputs[section][key][0] += delta
+    else:
+        inputs[section][key] += delta
+    return inputs
+
+
+def test_digest_is_stable_across_key_order():
+    shuffled = {
+        "news_sentiment": {"tickers": [["LUCK.KA", 0.4, 6]], "sectors": {"Cement": 0.3}, "market": [0.12, 40]},
+        "sector_map": {"Oil & Gas": 0.8, "Cement": 1.5},
+        "top_movers": [["LUCK.KA", 4.2], ["OGDC.KA", 3.1]],
+    }
+    assert AiService.pulse_digest(shuffled) == AiService.pulse_digest(copy.deepcopy(INPUTS))
+    assert AiService.pulse_digest(moved("sector_map.Cement", 0.01)) != AiService.pulse_digest(INPUTS)
+
+
+@pytest.mark.parametrize("inputs", [
+    moved("sector_map.Cement", 0.05),
+    moved("top_movers.0", -0.09),
+    moved("news_sentiment.market", 0.05),
+])
+def test_moves_below_the_threshold_are_immaterial(inputs):
+    assert not AiService.is_material_change(INPUTS, inputs, threshold_pp=0.1)
+
+
+@pytest.mark.parametrize("inputs", [
+    moved("sector_map.Cement", 0.1),
+    moved("top_movers.1", -0.25),
+    moved("news_sentiment.market", 0.2),
+    {**INPUTS, "top_movers": list(reversed(INPUTS["top_movers"]))},
+    {**INPUTS, "sector_map": {**INPUTS["sector_map"], "Banks": 0.0}},
+    {**INPUTS, "news_sentiment": {**INPUTS["news_sentiment"], "tickers": [["OGDC.KA", 0.1, 3]]}},
+])
+def test_moves_at_or_above_the_threshold_are_material(inputs):
+    assert AiService.is_material_change(INPUTS, inputs, threshold_pp=0.1)
+
+
+def test_first_run_is_material():
+    assert AiService.is_material_change(None, INPUTS, threshold_pp=0.1)
+
+
+class FakeModel:
+    def __init__(self):
+        self.prompts = []
+
+    def generate_content(self, prompt):
+        self.prompts.append(prompt)
+        return SimpleNamespace(text=f"Pulse #{len(self.prompts)}")
+
+
+@pytest.fixture
+def pulse(monkeypatch):
+    db.ai_insights.delete_many({})
+    model = FakeModel()
+    current = {"inputs": INPUTS}
+    monkeypatch.setattr(ai_service, "model", model)
+    monkeypatch.setattr(AiService, "collect_pulse_inputs", staticmethod(lambda: copy.deepcopy(current["inputs"])))
+    monkeypatch.setattr(settings, "PULSE_MATERIALITY_PP", 0.1)
+    yield model, current
+    db.ai_insights.delete_many({})
+
+
+def stats() -> dict:
+    doc = db.ai_insights.find_one({"_id": f"pulse_stats_{datetime.utcnow():%Y-%m-%d}"}) or {}
+    return {k: v for k, v in doc.items() if k not in ("_id", "type", "date")}
+
+
+def test_llm_is_called_only_for_material_changes(pulse):
+    model, current = pulse
+    ai_service.analyze_and_store_pulse()
+    ai_service.analyze_and_store_pulse()  # unchanged digest
+    current["inputs"] = moved("sector_map.Cement", 0.04)
+    ai_service.analyze_and_store_pulse()  # below the threshold
+    current["inputs"] = moved("sector_map.Cement", 0.5)
+    ai_service.analyze_and_store_pulse()
+
+    assert len(model.prompts) == 2
+    assert stats() == {"generated": 2, "skipped_unchanged": 1, "skipped_immaterial": 1}
+    stored = db.ai_insights.find_one({"_id": "latest_pulse"})
+    assert stored["summary"] == "Pulse #2"
+    assert stored["input_digest"] == AiService.pulse_digest(moved("sector_map.Cement", 0.5))
+
+
+def test_skipped_runs_compare_against_the_last_generated_inputs(pulse):
+    # Small moves must not accumulate unnoticed: each run compares with the inputs the summary was written for
+    model, current = pulse
+    ai_service.analyze_and_store_pulse()
+    for step in (0.04, 0.08, 0.12):
+        current["inputs"] = moved("sector_map.Cement", step)
+        ai_service.analyze_and_store_pulse()
+    assert len(model.prompts) == 2
+    assert stats() == {"generated": 2, "skipped_immaterial": 2}
@@ -0,0 +1,69 @@
+import pytest
+
+from app.database import db
+from app.services.company_loader import ensure_company_indexes
+from app.services.data_engine import DataEngine
+from app.services.reseed import create_reseed_job, get_reseed_job, run_reseed
+
+TRACKED = [f"T{i:02d}.KA" for i in range(20)]
+
+
+@pytest.fixture(autouse=True)
+def live_universe(monkeypatch):
+    for name in ("companies", "companies_staging", "reseed_jobs", "scheduler_leases"):
+        db[name].drop()
+    ensure_company_indexes(db.companies)
+    db.companies.insert_many([
+        {"ticker": ticker, "name": f"Old {ticker}", "price": 10.0, "growth_tags": ["curated"]} for ticker in TRACKED
+    ])
+    # Added by hand (POST /companies), not in the tracked list
+    db.companies.insert_one({"ticker": "MANUAL.KA", "name": "Manual Co", "description": "curated by an admin"})
+    monkeypatch.setattr(DataEngine, "get_all_tickers", staticmethod(lambda: list(TRACKED)))
+    yield
+    for name in ("companies", "companies_staging", "reseed_jobs", "scheduler_leases"):
+        db[name].drop()
+
+
+def fetch_failing_for(*failing):
+    def fetch(ticker):
+        if ticker in failing:
+            raise ConnectionError("429 Too Many Requests")
+        return {"ticker": ticker, "name": f"New {ticker}", "price": 20.0}
+    return staticmethod(fetch)
+
+
+def snapshot() -> dict:
+    return {doc["ticker"]: doc for doc in db.companies.find({})}
+
+
+def test_partial_fetch_failure_keeps_every_row_and_id(monkeypatch):
+    before = snapshot()
+    monkeypatch.setattr(DataEngine, "fetch_company_data", fetch_failing_for("T03.KA", "T11.KA"))
+    job_id = create_reseed_job()
+    run_reseed(job_id)
+
+    job = get_reseed_job(job_id)
+    assert job["status"] == "succeeded"
+    assert (job["fetched"], job["failed"], job["kept"]) == (18, 2, 3)
+    after = snapshot()
+    assert after.keys() == before.keys()
+    assert {t: d["_id"] for t, d in after.items()} == {t: d["_id"] for t, d in before.items()}
+    # Refetched rows are updated and keep their curated fields
+    assert after["T00.KA"]["name"] == "New T00.KA"
+    assert after["T00.KA"]["growth_tags"] == ["curated"]
+    # Failed and untracked rows are kept whole
+    assert after["T03.KA"] == before["T03.KA"]
+    assert after["MANUAL.KA"] == before["MANUAL.KA"]
+    assert db.companies_staging.count_documents({}) == 0
+
+
+def test_mostly_failing_upstream_keeps_live_data(monkeypatch):
+    before = snapshot()
+    monkeypatch.setattr(DataEngine, "fetch_company_data", fetch_failing_for(*TRACKED[:5]))
+    job_id = create_reseed_job()
+    run_reseed(job_id)
+
+    job = get_reseed_job(job_id)
+    assert job["status"] == "failed"
+    assert "Fetched 15 of 20 tickers" in job["error"]
+    assert snapshot() == before
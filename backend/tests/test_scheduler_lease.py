@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+
+import mongomock
+import pytest
+
+from app.services.scheduler_lease import SchedulerLease
+
+TTL = 60
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = datetime(2026, 1, 1, 9, 0)
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += timedelta(seconds=seconds)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def collection():
+    return mongomock.MongoClient().db.scheduler_leases
+
+
+def lease(collection, clock, owner):
+    return SchedulerLease(collection, owner=owner, ttl_seconds=TTL, clock=clock)
+
+
+def test_acquire(collection, clock):
+    a, b = lease(collection, clock, "a"), lease(collection, clock, "b")
+    assert a.try_acquire()
+    assert a.still_valid()
+    assert not b.try_acquire()
+    assert not b.still_valid()
+    holder = a.current_holder()
+    assert holder["owner"] == "a"
+    assert holder["expires_at"] == clock.now + timedelta(seconds=TTL)
+
+
+def test_renew_extends_expiry(collection, clock):
+    a, b = lease(collection, clock, "a"), lease(collection, clock, "b")
+    assert a.try_acquire()
+    for _ in range(5):
+        clock.advance(a.renew_interval)
+        assert a.try_acquire()
+        assert not b.try_acquire()
+    # Well past the first TTL, but renewed all along
+    assert a.still_valid()
+    assert a.current_holder()["expires_at"] == clock.now + timedelta(seconds=TTL)
+
+
+def test_failover_after_expiry(collection, clock):
+    a, b = lease(collection, clock, "a"), lease(collection, clock, "b")
+    assert a.try_acquire()
+    # The holder stops renewing (crashed); the lease is still live just before expiry
+    clock.advance(TTL - 1)
+    assert not b.try_acquire()
+    clock.advance(1)
+    assert not a.still_valid()
+    assert b.try_acquire()
+    assert a.current_holder()["owner"] == "b"
+    # The old holder comes back and stays passive
+    assert not a.try_acquire()
+
+
+def test_release_hands_over_immediately(collection, clock):
+    a, b = lease(collection, clock, "a"), lease(collection, clock, "b")
+    assert a.try_acquire()
+    a.release()
+    assert not a.still_valid()
+    assert a.current_holder() is None
+    assert b.try_acquire()
+
+
+def test_release_by_non_holder_keeps_lease(collection, clock):
+    a, b = lease(collection, clock, "a"), lease(collection, clock, "b")
+    assert a.try_acquire()
+    b.release()
+    assert a.current_holder()["owner"] == "a"
+    assert a.try_acquire()
@@ -0,0 +1,114 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.database import db
+from app.services.screener import (
+    MAX_NESTING, Expression, SavedScreenEvaluator, ScreenError, Universe, compile_expression,
+)
+
+TICKERS = ["FCCL.KA", "LUCK.KA", "OGDC.KA", "PPL.KA"]
+
+
+def universe(price, change_percent, version=1) -> Universe:
+    columns = {
+        "price": np.array(price, dtype=np.float64),
+        "change_percent": np.array(change_percent, dtype=np.float64),
+        "volume": np.array([1e6, 2e6, 3e6, np.nan]),
+        "sector": np.array([0, 0, 1, 1], dtype=np.int32),
+    }
+    return Universe(TICKERS, TICKERS, columns, {"sector": ["Cement", "Oil & Gas"]},
+                    version=version, built_at=datetime(2026, 10, 19, 10))
+
+
+def matches(expression: str, data: Universe = None) -> list:
+    data = data or universe([20.0, 700.0, 120.0, 90.0], [1.0, -2.0, 3.5, 0.0])
+    return [data.tickers[i] for i in np.flatnonzero(Expression(expression).evaluate(data))]
+
+
+def test_and_binds_tighter_than_or():
+    expression = 'sector == "oil & gas" or price > 500 and change_percent > 0'
+    assert Expression(expression).tree[0] == "or"
+    assert matches(expression) == ["OGDC.KA", "PPL.KA"]
+    assert matches('(sector == "oil & gas" or price > 500) and change_percent > 0') == ["OGDC.KA"]
+
+
+def test_arithmetic_precedence_and_unary_minus():
+    # 2 + 3 * 10 = 32, not 50
+    assert matches("price < 2 + 3 * 10") == ["FCCL.KA"]
+    assert matches("change_percent < -1") == ["LUCK.KA"]
+    assert matches("-change_percent > 1") == ["LUCK.KA"]
+
+
+def test_missing_values_never_match():
+    assert matches("volume > 0") == ["FCCL.KA", "LUCK.KA", "OGDC.KA"]
+    assert matches("not volume > 0") == ["PPL.KA"]
+
+
+def test_in_list_and_suffixes():
+    assert matches('sector in ("cement")') == ["FCCL.KA", "LUCK.KA"]
+    assert matches("volume >= 2m") == ["LUCK.KA", "OGDC.KA"]
+
+
+@pytest.mark.parametrize("expression, message", [
+    ("dividend_yield > 3", "Unknown field 'dividend_yield'"),
+    ("price", "Expected a comparison"),
+    ('price > "Cement"', "strings can only be compared"),
+    ("price > 1 and", "Unexpected end of expression"),
+    ("", "Empty expression"),
+])
+def test_invalid_expressions(expression, message):
+    with pytest.raises(ScreenError, match=message):
+        Expression(expression)
+
+
+@pytest.mark.parametrize("expression", [
+    "(" * 450 + "price > 1" + ")" * 450,
+    "-" * 300 + "price > 1",
+    "not " * 200 + "price > 1",
+])
+def test_deep_nesting_is_a_screen_error(expression):
+    with pytest.raises(ScreenError, match="nested"):
+        Expression(expression)
+
+
+def test_nesting_up_to_the_limit_parses():
+    expression = "(" * (MAX_NESTING - 1) + "price > 100" + ")" * (MAX_NESTING - 1)
+    assert matches(expression) == ["LUCK.KA", "OGDC.KA"]
+
+
+@pytest.fixture
+def saved_screen():
+    db.saved_screens.delete_many({})
+    doc = {"user_id": "u1", "name": "Movers", "expression": "change_percent > 1", "matches": []}
+    doc["_id"] = db.saved_screens.insert_one(doc).inserted_id
+    yield doc
+    db.saved_screens.delete_many({})
+
+
+def test_saved_screen_is_reevaluated_on_changed_rows(saved_screen):
+    evaluator = SavedScreenEvaluator()
+    assert evaluator.refresh(universe([20.0, 700.0, 120.0, 90.0], [1.0, -2.0, 3.5, 0.0])) == 1
+    stored = db.saved_screens.find_one({"_id": saved_screen["_id"]})
+    assert stored["matches"] == ["OGDC.KA"]
+    assert stored["added"] == ["OGDC.KA"]
+
+    # Only the price moved: the screen does not read it, so nothing is evaluated or written
+    assert evaluator.refresh(universe([21.0, 705.0, 121.0, 91.0], [1.0, -2.0, 3.5, 0.0], version=2)) == 0
+
+    # FCCL crosses the threshold, OGDC falls back
+    assert evaluator.refresh(universe([21.0, 705.0, 121.0, 91.0], [1.5, -2.0, 0.5, 0.0], version=3)) == 1
+    stored = db.saved_screens.find_one({"_id": saved_screen["_id"]})
+    assert stored["matches"] == ["FCCL.KA"]
+    assert (stored["added"], stored["removed"]) == (["FCCL.KA"], ["OGDC.KA"])
+    assert stored["universe_version"] == 3
+
+
+def test_saved_screen_that_no_longer_compiles_is_skipped(saved_screen):
+    db.saved_screens.update_one({"_id": saved_screen["_id"]}, {"$set": {"expression": "dividend_yield > 3"}})
+    assert SavedScreenEvaluator().refresh(universe([20.0, 700.0, 120.0, 90.0], [1.0, -2.0, 3.5, 0.0])) == 0
+
+
+def test_compiled_expressions_are_cached():
+    assert compile_expression("price > 1") is compile_expression("price > 1")
@@ -0,0 +1,69 @@
+import pytest
+
+from app.database import db
+from app.services import semantic_search as module
+from app.services.embeddings import get_embedder
+from app.services.semantic_search import SemanticSearch, semantic_backfill, start_semantic_backfill
+
+
+@pytest.fixture(autouse=True)
+def search(tmp_path, monkeypatch):
+    db.articles.delete_many({})
+    search = SemanticSearch(str(tmp_path), get_embedder())
+    monkeypatch.setattr(module, "semantic_search", search)
+    yield search
+    db.articles.delete_many({})
+
+
+def insert(*titles, **fields) -> list[dict]:
+    articles = [{"title": title, "summary_text": f"{title} in detail", **fields} for title in titles]
+    db.articles.insert_many(articles)
+    return articles
+
+
+def test_articles_stored_before_the_first_vector_are_backfilled(search):
+    # Ingested while semantic search was off (or failing): never indexed
+    insert("Cement despatches rise", "Fertilizer offtake falls")
+    # A later fetch indexes its own batch...
+    search.index_articles(insert("Oil marketing margins revised"))
+    assert search.articles.count == 1
+    # ...and the backfill still embeds the older ones
+    assert semantic_backfill() == 2
+    assert search.articles.count == 3
+    assert db.articles.count_documents({"embedded_with": search.marker}) == 3
+    assert semantic_backfill() == 0
+
+
+def test_duplicates_are_not_embedded(search):
+    insert("Bank results season")
+    insert("Bank results season (syndicated)", duplicate=True)
+    assert semantic_backfill() == 1
+    assert db.articles.count_documents({"embedded_with": {"$exists": True}}) == 1
+
+
+def test_lost_index_is_rebuilt_on_startup(search, tmp_path):
+    insert("Cement despatches rise", "Fertilizer offtake falls")
+    assert semantic_backfill() == 2
+    # A redeploy: same articles in Mongo, a fresh (empty) index directory
+    fresh = SemanticSearch(str(tmp_path / "redeployed"), search.embedder)
+    module.semantic_search = fresh
+    assert fresh.articles.count == 0
+    start_semantic_backfill().join()
+    assert fresh.articles.count == 2
+    hits = fresh.search("cement despatches", k=1, kinds=("articles",))["articles"]
+    assert [a["title"] for a in hits] == ["Cement despatches rise"]
+
+
+def test_reindex_reembeds_every_article(search):
+    insert("Cement despatches rise", "Fertilizer offtake falls")
+    assert semantic_backfill() == 2
+    assert semantic_backfill(reindex=True) == 2
+    assert search.articles.count == 2
+
+
+def test_backfill_pages_through_the_archive(search):
+    insert(*(f"Market report {n}" for n in range(7)))
+    insert("Syndicated market report", duplicate=True)
+    assert semantic_backfill(batch_size=2) == 7
+    assert search.articles.count == 7
+    assert semantic_backfill(batch_size=2) == 0
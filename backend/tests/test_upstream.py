@@ -0,0 +1,129 @@
+import os
+import time
+
+import pandas as pd
+import pytest
+from feedparser import FeedParserDict
+
+from app.services.upstream import (
+    RecordingBackend, ReplayBackend, Upstream, UpstreamRateLimited, UpstreamTimeout,
+)
+from app.utils.fixture_store import FixtureStore, request_key
+
+DATES = pd.DatetimeIndex(["2026-10-15", "2026-10-16"], name="Date")
+
+
+def bars(close: float) -> pd.DataFrame:
+    return pd.DataFrame({"Open": [close - 1, close], "High": [close + 1, close + 2], "Low": [close - 2, close - 1],
+                         "Close": [close, close + 1], "Volume": [1000, 1500]}, index=DATES)
+
+
+class FakeLive:
+    """Stands in for yfinance / feedparser; counts calls."""
+    def __init__(self):
+        self.calls = 0
+
+    def ticker_info(self, symbol):
+        self.calls += 1
+        return {"symbol": symbol, "longName": f"{symbol} Limited", "marketCap": 1.5e11}
+
+    def ticker_history(self, symbol, period, timeout=None):
+        self.calls += 1
+        return bars(100.0)
+
+    def download(self, tickers, period):
+        self.calls += 1
+        return pd.concat({ticker: bars(100.0 + i) for i, ticker in enumerate(tickers)}, axis=1)
+
+    def parse_feed(self, url):
+        self.calls += 1
+        entry = FeedParserDict(title="Cement despatches rise", link="https://example.pk/1",
+                               published="Fri, 16 Oct 2026 09:00:00 +0000",
+                               published_parsed=time.struct_time((2026, 10, 16, 9, 0, 0, 4, 289, 0)),
+                               summary="<p>Despatches rose 12%</p>")
+        return FeedParserDict(feed=FeedParserDict(title="Example News"), entries=[entry])
+
+
+@pytest.fixture
+def recorded(tmp_path):
+    store = FixtureStore(str(tmp_path))
+    live = FakeLive()
+    recorder = Upstream(RecordingBackend(store, live))
+    responses = {
+        "info": recorder.ticker_info("LUCK.KA"),
+        "history": recorder.ticker_history("LUCK.KA", "5d"),
+        "download": recorder.download(["LUCK.KA", "OGDC.KA"], "1d"),
+        "feed": recorder.parse_feed("https://example.pk/feed"),
+    }
+    return store, live, responses
+
+
+def test_record_then_replay_round_trip(recorded):
+    store, live, responses = recorded
+    assert live.calls == 4
+    replay = Upstream(ReplayBackend(store))
+
+    assert replay.ticker_info("LUCK.KA") == responses["info"]
+    pd.testing.assert_frame_equal(replay.ticker_history("LUCK.KA", "5d"), responses["history"], check_dtype=False)
+    pd.testing.assert_frame_equal(replay.download(["LUCK.KA", "OGDC.KA"], "1d"), responses["download"],
+                                  check_dtype=False)
+    feed = replay.parse_feed("https://example.pk/feed")
+    assert feed.feed.title == "Example News"
+    [entry] = feed.entries
+    assert (entry.title, entry.link, entry.summary) == ("Cement despatches rise", "https://example.pk/1",
+                                                        "<p>Despatches rose 12%</p>")
+    assert entry.published_parsed == responses["feed"].entries[0].published_parsed
+    # Replay never calls the live services
+    assert live.calls == 4
+
+
+def test_unrecorded_ticker_is_served_by_a_recorded_stand_in(recorded):
+    store, _, responses = recorded
+    replay = ReplayBackend(store)
+    assert replay.ticker_info("HBL.KA") == responses["info"]
+    assert list(replay.download(["HBL.KA"], "1d").columns) == ["Open", "High", "Low", "Close", "Volume"]
+
+
+def test_replay_miss_raises_key_error(recorded):
+    store, _, _ = recorded
+    replay = ReplayBackend(store)
+    with pytest.raises(KeyError):
+        replay.parse_feed("https://example.pk/other-feed")
+    # Nothing at all recorded for this period: no stand-in either
+    with pytest.raises(KeyError, match="No fixture recorded"):
+        replay.ticker_history("LUCK.KA", "1y")
+
+
+def test_replay_injects_failures_deterministically(recorded):
+    store, _, _ = recorded
+    with pytest.raises(UpstreamRateLimited):
+        ReplayBackend(store, rate_limit_rate=1.0).ticker_info("LUCK.KA")
+    with pytest.raises(UpstreamTimeout):
+        ReplayBackend(store, timeout_rate=1.0).ticker_info("LUCK.KA")
+
+    def outcomes(seed):
+        backend = ReplayBackend(store, rate_limit_rate=0.3, seed=seed)
+        results = []
+        for _ in range(20):
+            try:
+                backend.ticker_info("LUCK.KA")
+                results.append("ok")
+            except UpstreamRateLimited:
+                results.append("429")
+        return results, backend.injected_errors
+
+    assert outcomes(7) == outcomes(7)
+    assert 0 < outcomes(7)[1] < 20
+
+
+def test_identical_payloads_are_stored_once(tmp_path):
+    store = FixtureStore(str(tmp_path))
+    first = store.put(request_key("feed", "https://a.example/feed"), {"entries": [1, 2]})
+    second = store.put(request_key("feed", "https://b.example/feed"), {"entries": [1, 2]})
+    assert first == second
+    objects = [f for _, _, files in os.walk(tmp_path / "objects") for f in files]
+    assert len(objects) == 1
+    assert store.get(request_key("feed", "https://b.example/feed")) == {"entries": [1, 2]}
+    assert request_key("feed", "https://c.example/feed") not in store
+    with pytest.raises(KeyError):
+        store.get(request_key("feed", "https://c.example/feed"))
@@ -287,7 +287,13 @@ export function NewsInsights({ onNavigate, onLogout }: NewsInsightsProps) {
                                 {article.title}
                               </h3>
 
-                              <div className="text-sm text-gray-600 dark:text-gray-300 line-clamp-3 flex-1" dangerouslySetInnerHTML={{ __html: article.summary }} />
+                              {article.thumbnail && (
+                                <img src={article.thumbnail} alt="" loading="lazy" className="w-full h-40 object-cover rounded-lg" />
+                              )}
+
+                              <p className="text-sm text-gray-600 dark:text-gray-300 line-clamp-3 flex-1">
+                                {article.summary_text}
+                              </p>
 
                               <div className="pt-4 mt-auto border-t border-gray-100 dark:border-slate-700">
                                 <a